@@ -0,0 +1,54 @@
+# DownloadBenchmark.py
+
+# Downloads the files of a range of mods from the stand-in CDN of FakeNexusServer with DownloadManager, at several concurrency levels,
+# and reports the throughput, resumed bytes and failures. Some downloads can be cut off halfway (--drop-rate) to exercise resuming,
+# and every file is checked against the size and MD5 hash of its metadata. Also checks that the API key is never sent to the CDN.
+# Usage: python benchmarks/DownloadBenchmark.py [--mods 50] [--concurrency 1 4 8] [--drop-rate 0.1] [--latency 0.01]
+
+# Imports Required Dependencies
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from Engine import NexusApi, DownloadManager
+from FakeNexusServer import FakeNexusServer
+
+gameDomain = "baldursgate3"
+apiKey = "benchmark"
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark parallel, resumable mod file downloads against a local stand-in CDN.")
+    parser.add_argument("--mods", type=int, default=50, help="Download every file of mods 1 to N.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Numbers of files downloaded at once to benchmark.")
+    parser.add_argument("--drop-rate", type=float, default=0.1, help="Fraction of downloads cut off halfway by the CDN.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Delay (in seconds) added by the server before every response.")
+    parser.add_argument("--max-file-size", type=int, default=4000000, help="Maximum size (in bytes) of the files.")
+    arguments = parser.parse_args(argv)
+    
+    server = FakeNexusServer(apiKey=apiKey, latency=arguments.latency, catalogSize=arguments.mods, maxFileSize=arguments.max_file_size, fileMd5=True, dropRate=arguments.drop_rate)
+    with server, NexusApi(apiKey, apiUrl=server.url) as nexusMods:
+        files = [(modId, file) for modId in range(1, arguments.mods + 1) for file in nexusMods.getModFiles(gameDomain, modId).json()["files"]]
+        totalBytes = sum(file["size_in_bytes"] for _,file in files)
+        print("{0} file(s), {1:.1f} MiB, drop rate {2}".format(len(files), totalBytes / (1024 * 1024), arguments.drop_rate))
+        print("{0:>12} {1:>10} {2:>10} {3:>14} {4:>9} {5:>14}".format("concurrency", "time (s)", "MiB/s", "resumed (MiB)", "failed", "CDN requests"))
+        
+        for concurrency in arguments.concurrency:
+            server.resetStats()
+            with tempfile.TemporaryDirectory() as directory, DownloadManager(nexusMods, directory, maxConcurrency=concurrency, backoffFactor=0.05) as downloader:
+                start = time.perf_counter()
+                results = downloader.downloadFiles(gameDomain, files)
+                elapsed = time.perf_counter() - start
+            stats = server.getStats()
+            if (stats["downloadApiKeys"] > 0):
+                print("The API key was sent to the CDN!")
+                return 1
+            failed = sum(1 for result in results if not result.ok)
+            resumed = sum(result.resumedBytes for result in results if result.ok)
+            print("{0:>12} {1:>10.2f} {2:>10.1f} {3:>14.1f} {4:>9} {5:>14}".format(concurrency, elapsed, totalBytes / (1024 * 1024) / elapsed, resumed / (1024 * 1024), failed, stats["downloads"]))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,615 @@
+# FakeNexusServer.py
+
+# A local stand-in for the Nexus Mods API, used by the benchmarks so they need no API key or network access.
+# Serves validate.json, games/{game}.json, mods/{id}.json, mods/{id}/files.json, mods/updated.json, the mod feeds, endorsements, md5_search and download links with deterministic data,
+# with configurable latency, error rates and rate limit headers. The download links point to a stand-in CDN on the same server,
+# which serves the file contents with range requests and can drop connections midway to exercise resumed downloads.
+# Usage: python benchmarks/FakeNexusServer.py [--port 8080] [--latency 0.05] [--error-rate 0.01]
+#        then point NexusApi at it with NexusApi("benchmark", apiUrl="http://127.0.0.1:8080/")
+
+# Imports Required Dependencies
+import argparse
+import hashlib
+import heapq
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class FakeNexusServer:
+    """A threaded HTTP server answering like the Nexus Mods API.
+
+    Mod data is derived from the mod ID alone, so every run sees the same catalog. Mods with an ID up to catalogSize exist, others return 404. A fraction of the mods (updatedFraction) was updated an hour before the server started, every other mod more than a month before, so getUpdated() returns the same mods for every period.
+
+    Mods can be added (FakeNexusServer.addMods()) or updated (FakeNexusServer.updateMods()) while the server runs, which shows in the mod responses and in the feeds: latest_added.json returns the mods with the highest IDs, latest_updated.json the mods updated last. trending.json returns the first mods of the catalog, unless set with FakeNexusServer.setTrending().
+
+    Every response carries the X-RL-* rate limit headers of the API key used, each key having its own quota. The daily quota is used first, then the hourly quota, then requests are answered with 429 until the server is restarted (or until the next quota period, see quotaPeriod).
+
+    Files are served by the stand-in CDN under /cdn/, without API key, quota or injected errors (apart from dropped connections). Their contents are derived from the file ID.
+    md5_search.json finds the files whose MD5 hash was computed: every file served by the CDN, and the files listed by files.json with fileMd5.
+
+    On top of the random error rates, the next requests can be answered with a given status code (FakeNexusServer.failRequests()), and a key can be revoked while the server runs (FakeNexusServer.revokeApiKey()), e.g. to test the retries of a client.
+    """
+    
+    # The feeds returned by trending.json, latest_added.json and latest_updated.json hold this many mods
+    feedSize = 10
+    # The mod categories of every game. Mods are spread over categoryCount categories, named after these with a number added past the first round
+    categoryNames = ("Armour","Weapons","Gameplay","Visuals","User Interface","Utilities","Spells","Classes","Races","Companions")
+    categoryCount = 50
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, apiKey = "benchmark", latency: float = 0.0, jitter: float = 0.0, errorRate: float = 0.0, rateLimitRate: float = 0.0, retryAfter: float = 0, dailyLimit: int = 1000000, hourlyLimit: int = 100, catalogSize: int = 100000, updatedFraction: float = 0.05, descriptionSize: int = 2000, maxFileSize: int = 4000000, fileMd5: bool = False, dropRate: float = 0.0, quotaPeriod: float = None, seed: int = 0):
+        """Create a new FakeNexusServer object. The server is not started until FakeNexusServer.start() is called.
+
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 0 (any free port, see FakeNexusServer.url).
+            apiKey (str or list, optional): The only API key accepted, or a list of the API keys accepted. Defaults to "benchmark".
+            latency (float, optional): The delay (in seconds) added before every response. Defaults to 0.0.
+            jitter (float, optional): The maximum random delay (in seconds) added on top of latency. Defaults to 0.0.
+            errorRate (float, optional): The fraction of requests answered with a 503 error. Defaults to 0.0.
+            rateLimitRate (float, optional): The fraction of requests answered with a 429 error, on top of the quota. Defaults to 0.0.
+            retryAfter (float, optional): The Retry-After header (in seconds) of 429 responses. Defaults to 0.
+            dailyLimit (int, optional): The daily quota of requests. Defaults to 1000000, so the benchmarks are not paced by the RateLimiter.
+            hourlyLimit (int, optional): The hourly quota of requests, used once the daily quota runs out. Defaults to 100.
+            catalogSize (int, optional): The number of mods that exist (IDs 1 to catalogSize). Defaults to 100000.
+            updatedFraction (float, optional): The fraction of the mods updated recently. Defaults to 0.05.
+            descriptionSize (int, optional): The length (in characters) of the mod descriptions, which make up most of a mod response. Defaults to 2000.
+            maxFileSize (int, optional): The maximum size (in bytes) of the mod files. Defaults to 4000000.
+            fileMd5 (bool, optional): If files.json includes the MD5 hash of each file (computed on first use, which is slow for whole catalogs). Defaults to False.
+            dropRate (float, optional): The fraction of file downloads cut off halfway by the CDN. Defaults to 0.0.
+            quotaPeriod (float, optional): The number of seconds after which the quota of every key is restored, reported as the reset time of both quotas. Defaults to None (the hourly and daily reset times are reported, but the quota is never restored).
+            seed (int, optional): The seed of the injected errors and latency jitter. Defaults to 0.
+        """
+        self.apiKeys = list(apiKey) if (isinstance(apiKey,(list,tuple))) else [apiKey]
+        self.apiKey = self.apiKeys[0]
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.rateLimitRate = rateLimitRate
+        self.retryAfter = retryAfter
+        self.dailyLimit = dailyLimit
+        self.hourlyLimit = hourlyLimit
+        self.catalogSize = catalogSize
+        self.updatedFraction = updatedFraction
+        self.maxFileSize = maxFileSize
+        self.fileMd5 = fileMd5
+        self.dropRate = dropRate
+        self.quotaPeriod = quotaPeriod
+        
+        # Every time served is relative to the start time, in whole seconds
+        self.startTime = int(time.time())
+        self._description = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (descriptionSize // 57 + 1))[:descriptionSize]
+        self._updatedMods = None
+        self._md5s = {}
+        # The updated and creation times of the mods added or updated while the server runs
+        self._modTimes = {}
+        self._createdTimes = {}
+        # The IDs of the mods of trending.json (see FakeNexusServer.setTrending())
+        self._trending = None
+        
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        # The [daily, hourly] quota remaining of each key
+        self._quota = {key: [dailyLimit,hourlyLimit] for key in self.apiKeys}
+        self._quotaResetAt = (time.time() + quotaPeriod) if (quotaPeriod is not None) else None
+        self._stats = {"requests": 0,"endpoints": {},"statuses": {},"keys": {},"downloads": 0,"downloadBytes": 0,"downloadApiKeys": 0,"downloadPeak": 0}
+        # The status codes the next requests are answered with (see FakeNexusServer.failRequests())
+        self._failures = []
+        # The next downloads cut off halfway (see FakeNexusServer.dropDownloads()), and the downloads being sent
+        self._drops = 0
+        self._downloadsInFlight = 0
+        # The file ID of each MD5 hash computed, found by md5_search.json
+        self._md5Files = {}
+        
+        self._httpServer = ThreadingHTTPServer((host, port), _FakeNexusHandler)
+        self._httpServer.daemon_threads = True
+        self._httpServer.fakeNexus = self
+        self._thread = None
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.stop()
+    
+    @property
+    def url(self) -> str:
+        """The base URL of the server, to use as the apiUrl of NexusApi."""
+        host, port = self._httpServer.server_address[:2]
+        return "http://" + str(host) + ":" + str(port) + "/"
+    
+    def start(self):
+        """Start serving requests on a background thread.
+
+        Returns:
+            FakeNexusServer: The server itself.
+        """
+        if (self._thread is None):
+            # A short poll interval, so FakeNexusServer.stop() returns quickly
+            self._thread = threading.Thread(target=self._httpServer.serve_forever, kwargs={"poll_interval": 0.05}, name="FakeNexusServer", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving requests and close the listening socket."""
+        if (self._thread is not None):
+            self._httpServer.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpServer.server_close()
+    
+    def getStats(self) -> dict:
+        """Returns the requests served since the server started (or since the last FakeNexusServer.resetStats()).
+
+        Returns:
+            dict: "requests" (total API requests), "endpoints" (requests per endpoint), "statuses" (responses per status code), "keys" (requests per API key), "downloads" (CDN requests), "downloadBytes" (bytes sent by the CDN), "downloadPeak" (the most CDN requests served at once) and "downloadApiKeys" (CDN requests that carried an apikey header, which should never happen).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["endpoints"] = dict(self._stats["endpoints"])
+            stats["statuses"] = dict(self._stats["statuses"])
+            stats["keys"] = dict(self._stats["keys"])
+            return stats
+    
+    def resetStats(self):
+        """Reset the request counters and restore the full quota."""
+        with self._lock:
+            self._stats = {"requests": 0,"endpoints": {},"statuses": {},"keys": {},"downloads": 0,"downloadBytes": 0,"downloadApiKeys": 0,"downloadPeak": 0}
+            self._quota = {key: [self.dailyLimit,self.hourlyLimit] for key in self.apiKeys}
+            if (self.quotaPeriod is not None):
+                self._quotaResetAt = time.time() + self.quotaPeriod
+    
+    def addMods(self, count: int) -> list:
+        """Add new mods to the catalog, created and updated now.
+
+        Returns:
+            list: The IDs of the new mods.
+        """
+        with self._lock:
+            now = int(time.time())
+            modIds = list(range(self.catalogSize + 1, self.catalogSize + count + 1))
+            for modId in modIds:
+                self._modTimes[modId] = now
+                self._createdTimes[modId] = now
+            self.catalogSize += count
+        return modIds
+    
+    def updateMods(self, modIds: list):
+        """Mark mods of the catalog as updated now."""
+        with self._lock:
+            now = int(time.time())
+            for modId in modIds:
+                self._modTimes[modId] = now
+    
+    def setTrending(self, modIds: list):
+        """Replace the mods returned by trending.json (in order)."""
+        with self._lock:
+            self._trending = list(modIds)
+    
+    def failRequests(self, statusCode: int, count: int = 1):
+        """Answer the next API requests (not the CDN downloads) with an error, whatever their API key. The quota is still used.
+
+        Args:
+            statusCode (int): The status code of the responses (e.g. 429 or 503). 429 responses carry the Retry-After header of the server.
+            count (int, optional): The number of requests to answer with the error. Defaults to 1.
+        """
+        with self._lock:
+            self._failures.extend([statusCode] * count)
+    
+    def dropDownloads(self, count: int = 1):
+        """Cut off the next file downloads of the CDN halfway through their body, on top of the random drop rate."""
+        with self._lock:
+            self._drops += count
+    
+    def revokeApiKey(self, apiKey: str):
+        """Stop accepting an API key, so its requests are answered with 401."""
+        with self._lock:
+            self._quota.pop(apiKey, None)
+    
+    def isUpdated(self, modId: int) -> bool:
+        """True if the mod is one of the recently updated mods (returned by updated.json)."""
+        return (modId * 40503) % 10000 < self.updatedFraction * 10000
+    
+    def getModUpdated(self, modId: int) -> int:
+        """Returns the time the mod page was last updated (epoch seconds), as served by mods/{id}.json."""
+        if (modId in self._modTimes):
+            return self._modTimes[modId]
+        if (self.isUpdated(modId)):
+            return self.startTime - 3600 - (modId % 3600)
+        return self.startTime - 40 * 86400 - (modId * 2654435761) % (365 * 86400)
+    
+    def getModJson(self, game: str, modId: int) -> dict:
+        """Returns the mods/{id}.json response of a mod, without sending a request."""
+        return self._mod(game, modId)
+    
+    def getFileContent(self, fileId: int) -> bytes:
+        """Returns the contents of a mod file, as served by the stand-in CDN."""
+        size = self._fileSize(fileId)
+        block = hashlib.sha256(str(fileId).encode("ascii")).digest() * 2048
+        return (block * (size // len(block) + 1))[:size]
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the FakeNexusServer class
+    #
+    ################################
+    
+    def _handle(self, method: str, path: str, headers) -> tuple:
+        """Build the response to a request.
+
+        Returns:
+            tuple: The (status code, headers, body) of the response. The body is None for 304 responses.
+        """
+        endpoint, status, body, extraHeaders = "other", 404, {"message": "Not Found"}, {}
+        
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + (self._random.random() * self.jitter if (self.jitter > 0) else 0.0)
+            if ((self._quotaResetAt is not None) and (time.time() >= self._quotaResetAt)):
+                self._quota = {key: [self.dailyLimit,self.hourlyLimit] for key in self.apiKeys}
+                self._quotaResetAt += self.quotaPeriod * ((time.time() - self._quotaResetAt) // self.quotaPeriod + 1)
+            apiKey = headers.get("apikey")
+            quota = self._quota.get(apiKey)
+            if (quota is None):
+                quotaLeft = False
+            elif (quota[0] > 0):
+                quota[0] -= 1
+                quotaLeft = True
+            elif (quota[1] > 0):
+                quota[1] -= 1
+                quotaLeft = True
+            else:
+                quotaLeft = False
+            rateLimitHeaders = self._rateLimitHeaders(quota)
+            failure = self._failures.pop(0) if (self._failures) else None
+        
+        if (delay > 0):
+            time.sleep(delay)
+        
+        route = path.split("?", 1)[0]
+        modMatch = re.fullmatch(r"/v1/games/(\w+)/mods/(\d+)(/files)?\.json", route)
+        linkMatch = re.fullmatch(r"/v1/games/(\w+)/mods/(\d+)/files/(\d+)/download_link\.json", route)
+        md5Match = re.fullmatch(r"/v1/games/(\w+)/mods/md5_search/(\w+)\.json", route)
+        endorseMatch = re.fullmatch(r"/v1/games/(\w+)/mods/(\d+)/(endorse|abstain)\.json", route)
+        feedMatch = re.fullmatch(r"/v1/games/(\w+)/mods/(updated|trending|latest_added|latest_updated)\.json", route)
+        gameMatch = re.fullmatch(r"/v1/games/(\w+)\.json", route)
+        if (modMatch is not None):
+            endpoint = "files" if (modMatch.group(3)) else "mod"
+        elif (feedMatch is not None):
+            endpoint = feedMatch.group(2)
+        elif (gameMatch is not None):
+            endpoint = "game"
+        elif (linkMatch is not None):
+            endpoint = "download_link"
+        elif (endorseMatch is not None):
+            endpoint = endorseMatch.group(3)
+        elif (md5Match is not None):
+            endpoint = "md5_search"
+        elif (route == "/v1/users/validate.json"):
+            endpoint = "validate"
+        
+        if (quota is None):
+            status, body = 401, {"message": "Please provide a valid API Key"}
+        elif (failure is not None):
+            status, body = failure, {"message": "Injected error"}
+            if (failure == 429):
+                extraHeaders["Retry-After"] = str(self.retryAfter)
+        elif (not quotaLeft) or (roll < self.rateLimitRate):
+            status, body = 429, {"msg": "You have fired too many requests. Please wait for some time."}
+            extraHeaders["Retry-After"] = str(self.retryAfter)
+        elif (roll < self.rateLimitRate + self.errorRate):
+            status, body = 503, {"message": "Service Unavailable"}
+        elif (endpoint == "validate"):
+            status, body = 200, {"user_id": self.apiKeys.index(apiKey) + 1,"key": apiKey,"name": "benchmark","is_premium": False,"is_supporter": False,"email": "benchmark@example.com","profile_url": ""}
+        elif (endpoint in ("mod","files")):
+            game, modId = modMatch.group(1), int(modMatch.group(2))
+            if (modId < 1) or (modId > self.catalogSize):
+                status, body = 404, {"code": 404,"message": "No Mod Found"}
+            elif (endpoint == "files"):
+                status, body = 200, self._modFiles(game, modId)
+            else:
+                etag = '"' + str(modId) + "-" + str(self.getModUpdated(modId)) + '"'
+                extraHeaders["ETag"] = etag
+                if (headers.get("If-None-Match") == etag):
+                    status, body = 304, None
+                else:
+                    status, body = 200, self._mod(game, modId)
+        elif (endpoint == "download_link"):
+            game, modId, fileId = linkMatch.group(1), int(linkMatch.group(2)), int(linkMatch.group(3))
+            if (modId < 1) or (modId > self.catalogSize) or (fileId // 10 != modId) or (fileId % 10 > modId % 4):
+                status, body = 404, {"code": 404,"message": "File not found"}
+            else:
+                status, body = 200, [{"name": "Fake CDN","short_name": "Fake CDN","URI": self.url + "cdn/" + game + "/" + str(modId) + "/" + str(fileId)}]
+        elif (endpoint in ("endorse","abstain")):
+            modId = int(endorseMatch.group(2))
+            if (method != "POST"):
+                status, body = 405, {"message": "Method Not Allowed"}
+            elif (modId < 1) or (modId > self.catalogSize):
+                status, body = 404, {"code": 404,"message": "No Mod Found"}
+            else:
+                status, body = 200, {"message": "SUCCESS","status": "Endorsed" if (endpoint == "endorse") else "Abstained"}
+        elif (endpoint == "md5_search"):
+            game, fileId = md5Match.group(1), self._md5Files.get(md5Match.group(2).lower())
+            if (fileId is None) or (fileId // 10 > self.catalogSize):
+                status, body = 404, {"code": 404,"message": "No File found with md5 " + md5Match.group(2)}
+            else:
+                modId = fileId // 10
+                fileDetails = next(file for file in self._modFiles(game, modId)["files"] if file["file_id"] == fileId)
+                fileDetails["md5"] = md5Match.group(2).lower()
+                status, body = 200, [{"mod": self._mod(game, modId),"file_details": fileDetails}]
+        elif (endpoint == "updated"):
+            status, body = 200, self._getUpdatedMods()
+        elif (endpoint == "game"):
+            status, body = 200, self._game(gameMatch.group(1))
+        elif (feedMatch is not None):
+            status, body = 200, [self._mod(feedMatch.group(1), modId) for modId in self._feedMods(feedMatch.group(2))]
+        
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["endpoints"][endpoint] = self._stats["endpoints"].get(endpoint, 0) + 1
+            self._stats["statuses"][status] = self._stats["statuses"].get(status, 0) + 1
+            if (quota is not None):
+                self._stats["keys"][apiKey] = self._stats["keys"].get(apiKey, 0) + 1
+        
+        rateLimitHeaders.update(extraHeaders)
+        return status, rateLimitHeaders, body
+    
+    def _rateLimitHeaders(self, quota: list) -> dict:
+        """The X-RL-* headers of the current quota of a key (the full quota for unknown keys). Must be called with the lock held."""
+        now = time.time()
+        if (self._quotaResetAt is not None):
+            hourlyReset = dailyReset = datetime.fromtimestamp(self._quotaResetAt, timezone.utc)
+        else:
+            hourlyReset = datetime.fromtimestamp(now - now % 3600 + 3600, timezone.utc)
+            dailyReset = datetime.fromtimestamp(now - now % 86400 + 86400, timezone.utc)
+        if (quota is None):
+            quota = [self.dailyLimit,self.hourlyLimit]
+        return {
+            "X-RL-Hourly-Limit": str(self.hourlyLimit),
+            "X-RL-Hourly-Remaining": str(quota[1]),
+            "X-RL-Hourly-Reset": hourlyReset.isoformat(),
+            "X-RL-Daily-Limit": str(self.dailyLimit),
+            "X-RL-Daily-Remaining": str(quota[0]),
+            "X-RL-Daily-Reset": dailyReset.isoformat(),
+        }
+    
+    def _mod(self, game: str, modId: int) -> dict:
+        """The mods/{id}.json response of a mod."""
+        updated = self.getModUpdated(modId)
+        created = self._createdTimes.get(modId, updated - (modId % 1000 + 1) * 86400)
+        return {
+            "name": "Mod " + str(modId),
+            "summary": "Summary of mod " + str(modId),
+            "description": self._description,
+            "picture_url": "https://staticdelivery.nexusmods.com/mods/0/images/" + str(modId) + "/" + str(modId) + "-1.png",
+            "mod_downloads": modId * 37 % 100000,
+            "mod_unique_downloads": modId * 17 % 50000,
+            "uid": modId,
+            "mod_id": modId,
+            "game_id": 0,
+            "allow_rating": True,
+            "domain_name": game,
+            "category_id": modId % FakeNexusServer.categoryCount + 1,
+            "version": "1." + str(modId % 10),
+            "endorsement_count": modId * 7 % 5000,
+            "created_timestamp": created,
+            "created_time": FakeNexusServer._isoTime(created),
+            "updated_timestamp": updated,
+            "updated_time": FakeNexusServer._isoTime(updated),
+            "author": "Author " + str(modId % 100),
+            "uploaded_by": "Author " + str(modId % 100),
+            "uploaded_users_profile_url": "https://www.nexusmods.com/users/" + str(modId % 100),
+            "contains_adult_content": False,
+            "status": "published",
+            "available": True,
+            "user": {"member_id": modId % 100,"member_group_id": 27,"name": "Author " + str(modId % 100)},
+            "endorsement": None,
+        }
+    
+    def _game(self, game: str) -> dict:
+        """The games/{game}.json response of a game."""
+        categories = []
+        for categoryId in range(1, FakeNexusServer.categoryCount + 1):
+            name = FakeNexusServer.categoryNames[(categoryId - 1) % len(FakeNexusServer.categoryNames)]
+            if (categoryId > len(FakeNexusServer.categoryNames)):
+                name += " " + str((categoryId - 1) // len(FakeNexusServer.categoryNames) + 1)
+            categories.append({"category_id": categoryId,"name": name,"parent_category": False})
+        return {"id": 0,"name": game,"domain_name": game,"mods": self.catalogSize,"categories": categories}
+    
+    def _modFiles(self, game: str, modId: int) -> dict:
+        """The mods/{id}/files.json response of a mod (one to four files)."""
+        updated = self.getModUpdated(modId)
+        files = []
+        for index in range(modId % 4 + 1):
+            fileId = modId * 10 + index
+            size = self._fileSize(fileId)
+            uploaded = updated - (3 - index) * 86400
+            files.append({
+                "id": [fileId, 0],
+                "uid": fileId,
+                "file_id": fileId,
+                "name": "Mod " + str(modId) + " file " + str(index + 1),
+                "version": "1." + str(index),
+                "category_id": 1 if (index == 0) else 4,
+                "category_name": "MAIN" if (index == 0) else "OLD_VERSION",
+                "is_primary": index == 0,
+                "size": size // 1024,
+                "file_name": "mod_" + str(modId) + "_" + str(index + 1) + ".zip",
+                "uploaded_timestamp": uploaded,
+                "uploaded_time": FakeNexusServer._isoTime(uploaded),
+                "mod_version": "1." + str(index),
+                "external_virus_scan_url": None,
+                "description": "File " + str(index + 1) + " of mod " + str(modId),
+                "size_kb": size // 1024,
+                "size_in_bytes": size,
+                "changelog_html": None,
+                "content_preview_link": None,
+            })
+            if (self.fileMd5):
+                files[-1]["md5"] = self._fileMd5(fileId)
+        updates = [{"old_file_id": modId * 10 + index - 1,"new_file_id": modId * 10 + index,"old_file_name": "","new_file_name": "","uploaded_timestamp": updated,"uploaded_time": FakeNexusServer._isoTime(updated)} for index in range(1, len(files))]
+        return {"files": files,"file_updates": updates}
+    
+    def _handleDownload(self, path: str, headers) -> tuple:
+        """Build the response of the stand-in CDN to a file request (/cdn/{game}/{modId}/{fileId}), honoring "Range: bytes=start-end".
+
+        Returns:
+            tuple: The (status code, headers, body) of the response, and the number of bytes to send before dropping the connection (None to send the whole body).
+        """
+        match = re.fullmatch(r"/cdn/(\w+)/(\d+)/(\d+)", path.split("?", 1)[0])
+        with self._lock:
+            self._stats["downloads"] += 1
+            if (headers.get("apikey") is not None):
+                self._stats["downloadApiKeys"] += 1
+            dropped = (self._random.random() < self.dropRate) or (self._drops > 0)
+            if (self._drops > 0):
+                self._drops -= 1
+            delay = self.latency
+            self._downloadsInFlight += 1
+            self._stats["downloadPeak"] = max(self._stats["downloadPeak"], self._downloadsInFlight)
+        if (delay > 0):
+            time.sleep(delay)
+        if (match is None):
+            return 404, {}, b"Not Found", None
+        
+        fileId = int(match.group(3))
+        content = self.getFileContent(fileId)
+        self._fileMd5(fileId)
+        size = len(content)
+        status, responseHeaders = 200, {"Content-Type": "application/octet-stream","Accept-Ranges": "bytes"}
+        rangeMatch = re.fullmatch(r"bytes=(\d+)-(\d*)", headers.get("Range") or "")
+        if (rangeMatch is not None):
+            start = int(rangeMatch.group(1))
+            end = min(int(rangeMatch.group(2)), size - 1) if (rangeMatch.group(2)) else size - 1
+            if (start >= size) or (start > end):
+                return 416, {"Content-Range": "bytes */" + str(size)}, b"", None
+            content = content[start:end + 1]
+            status = 206
+            responseHeaders["Content-Range"] = "bytes " + str(start) + "-" + str(end) + "/" + str(size)
+        
+        sent = len(content) // 2 if dropped else None
+        with self._lock:
+            self._stats["downloadBytes"] += len(content) if (sent is None) else sent
+        return status, responseHeaders, content, sent
+    
+    def _downloadFinished(self):
+        """Called once the response of a CDN request is sent (see FakeNexusServer._handleDownload())."""
+        with self._lock:
+            self._downloadsInFlight -= 1
+    
+    def _fileSize(self, fileId: int) -> int:
+        """The size (in bytes) of a mod file."""
+        return (fileId * 7919) % self.maxFileSize + 1024
+    
+    def _fileMd5(self, fileId: int) -> str:
+        """The MD5 hash of a mod file. Computed once, on first use, then found by md5_search.json."""
+        md5 = self._md5s.get(fileId)
+        if (md5 is None):
+            md5 = hashlib.md5(self.getFileContent(fileId)).hexdigest()
+            self._md5s[fileId] = md5
+            self._md5Files[md5] = fileId
+        return md5
+    
+    def _getUpdatedMods(self) -> list:
+        """The updated.json response, the same for every period. The mods of the catalog are listed once, on first use, then the mods added or updated since are appended."""
+        if (self._updatedMods is None):
+            self._updatedMods = [{"mod_id": modId,"latest_file_update": self.getModUpdated(modId),"latest_mod_activity": self.getModUpdated(modId)} for modId in range(1, self.catalogSize + 1) if self.isUpdated(modId)]
+        with self._lock:
+            modTimes = dict(self._modTimes)
+        if (len(modTimes) == 0):
+            return self._updatedMods
+        return [mod for mod in self._updatedMods if mod["mod_id"] not in modTimes] + [{"mod_id": modId,"latest_file_update": updated,"latest_mod_activity": updated} for modId,updated in modTimes.items()]
+    
+    def _feedMods(self, feed: str) -> list:
+        """The IDs of the mods of a feed: the feedSize mods with the highest IDs (latest_added), updated last (latest_updated), or the first mods of the catalog unless set (trending)."""
+        if (feed == "latest_added"):
+            return list(range(self.catalogSize, max(self.catalogSize - FakeNexusServer.feedSize, 0), -1))
+        if (feed == "latest_updated"):
+            latest = heapq.nlargest(FakeNexusServer.feedSize, self._getUpdatedMods(), key=lambda mod: (mod["latest_mod_activity"], mod["mod_id"]))
+            return [mod["mod_id"] for mod in latest]
+        if (self._trending is not None):
+            return list(self._trending)
+        return list(range(1, min(FakeNexusServer.feedSize, self.catalogSize) + 1))
+    
+    def _isoTime(timestamp: int) -> str:
+        """Format epoch seconds like the times of the API (e.g. "2024-01-01T00:00:00.000+00:00")."""
+        return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds")
+
+class _FakeNexusHandler(BaseHTTPRequestHandler):
+    """Request handler of FakeNexusServer. Keeps connections alive, like the API."""
+    
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which would otherwise add a delayed ACK to every response
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self._respond("GET")
+    
+    def do_POST(self):
+        self._respond("POST")
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _respond(self, method: str):
+        sent = None
+        download = self.path.startswith("/cdn/")
+        if (download):
+            status, headers, content, sent = self.server.fakeNexus._handleDownload(self.path, self.headers)
+        else:
+            status, headers, body = self.server.fakeNexus._handle(method, self.path, self.headers)
+            content = b"" if (body is None) else json.dumps(body).encode("utf-8")
+            if (body is not None):
+                headers["Content-Type"] = "application/json; charset=utf-8"
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(content)))
+            for name,value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            if (sent is None):
+                self.wfile.write(content)
+            else:
+                # Drop the connection partway through the body
+                self.wfile.write(content[:sent])
+                self.close_connection = True
+        finally:
+            if (download):
+                self.server.fakeNexus._downloadFinished()
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Nexus Mods API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+    parser.add_argument("--api-key", default="benchmark", help="The API key accepted (several keys separated by commas, each with its own quota).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay (in seconds) added before every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random delay (in seconds) added on top of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503 error.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with a 429 error.")
+    parser.add_argument("--daily-limit", type=int, default=1000000, help="Daily quota of requests.")
+    parser.add_argument("--hourly-limit", type=int, default=100, help="Hourly quota of requests, used once the daily quota runs out.")
+    parser.add_argument("--catalog-size", type=int, default=100000, help="Number of mods that exist (IDs 1 to N).")
+    parser.add_argument("--file-md5", action="store_true", help="Include the MD5 hash of each file in files.json.")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of file downloads cut off halfway.")
+    parser.add_argument("--quota-period", type=float, default=None, help="Number of seconds after which the quota of every key is restored.")
+    arguments = parser.parse_args(argv)
+    
+    server = FakeNexusServer(arguments.host, arguments.port, arguments.api_key.split(","), arguments.latency, arguments.jitter, arguments.error_rate, arguments.rate_limit_rate, dailyLimit=arguments.daily_limit, hourlyLimit=arguments.hourly_limit, catalogSize=arguments.catalog_size, fileMd5=arguments.file_md5, dropRate=arguments.drop_rate, quotaPeriod=arguments.quota_period)
+    print("Serving a fake Nexus Mods API on " + server.url + " (API key \"" + arguments.api_key + "\"). Press Ctrl+C to stop.")
+    server.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
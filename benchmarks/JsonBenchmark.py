@@ -0,0 +1,99 @@
+# JsonBenchmark.py
+
+# Decodes and encodes the JSON handled by a sync with every JSON backend installed (see JsonCodec): mod responses of the stand-in server (whole, and only the
+# fields compared by a sync), an updated.json response, and the lines of a .jsonl mod list (decoded, and encoded for .jsonl and .json files).
+# Reports the best time of each operation, and its speedup over the stdlib json module. The decoded values and encoded text of every backend are compared.
+# Usage: python benchmarks/JsonBenchmark.py [--mods 2000] [--updated 50000] [--list-size 20000] [--repeat 5]
+
+# Imports Required Dependencies
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from Engine import JsonCodec, ShardPool
+from Engine.JsonCodec import orjson, msgspec
+from FakeNexusServer import FakeNexusServer
+
+gameDomain = "baldursgate3"
+updatedFields = ("mod_id","latest_file_update","latest_mod_activity")
+
+def generatePayloads(arguments: argparse.Namespace) -> dict:
+    """Generate the JSON documents of each operation, encoded by the stdlib json module like the API and the mod list files of earlier versions."""
+    with FakeNexusServer(catalogSize=arguments.mods) as server:
+        modResponses = [json.dumps(server.getModJson(gameDomain, modId)).encode("utf-8") for modId in range(1, arguments.mods + 1)]
+        startTime = server.startTime
+    updated = [{"mod_id": modId,"latest_file_update": startTime - modId * 7,"latest_mod_activity": startTime - modId * 5} for modId in range(1, arguments.updated + 1)]
+    modList = [{
+        "name": "Mod " + str(modId) + " – Édition",
+        "id": modId,
+        "updatedTime": "2024-01-01T00:00:00.000+00:00",
+        "lastDownloaded": "2024-01-02T00:00:00.000000+00:00",
+        "url": "https://www.nexusmods.com/" + gameDomain + "/mods/" + str(modId),
+    } for modId in range(1, arguments.list_size + 1)]
+    return {
+        "modResponses": modResponses,
+        "updated": json.dumps(updated).encode("utf-8"),
+        "modListLines": [json.dumps(mod, ensure_ascii=False) for mod in modList],
+        "modList": modList,
+    }
+
+def getOperations(payloads: dict) -> list:
+    """Returns the name of each operation, with the function running it with a codec."""
+    return [
+        ("decode mod responses", lambda codec: [codec.loads(content) for content in payloads["modResponses"]]),
+        ("decode mod fields", lambda codec: [codec.decodeFields(content, ShardPool.modFields) for content in payloads["modResponses"]]),
+        ("decode updated.json", lambda codec: codec.decodeFieldsList(payloads["updated"], updatedFields)),
+        ("decode .jsonl mod list", lambda codec: [codec.loads(line) for line in payloads["modListLines"]]),
+        ("encode .jsonl mod list", lambda codec: [codec.dumps(mod) for mod in payloads["modList"]]),
+        ("encode .json mod list", lambda codec: [codec.dumpsIndented(mod) for mod in payloads["modList"]]),
+    ]
+
+def timeIt(function, argument, repeat: int) -> tuple:
+    """Returns the best time (in seconds) of a function over repeat runs, along with its last result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if (best is None) else min(best, elapsed)
+    return best, result
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON backends used to decode the API responses and to read and write mod lists.")
+    parser.add_argument("--mods", type=int, default=2000, help="Number of mod responses decoded.")
+    parser.add_argument("--updated", type=int, default=50000, help="Number of mods in the updated.json response.")
+    parser.add_argument("--list-size", type=int, default=20000, help="Number of mods in the mod list.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (the best is reported).")
+    arguments = parser.parse_args(argv)
+    
+    codecs = [JsonCodec(backend) for backend in JsonCodec.backends if JsonCodec.isAvailable(backend)]
+    # The stdlib json module is the reference, in the first column
+    codecs.sort(key=lambda codec: codec.backend != "json")
+    versions = {"orjson": orjson.__version__ if (orjson is not None) else None,"msgspec": msgspec.__version__ if (msgspec is not None) else None}
+    print("JSON backends: " + ", ".join(codec.backend + ((" " + versions[codec.backend]) if (versions.get(codec.backend)) else "") for codec in codecs))
+    if (len(codecs) == 1):
+        print("Only the stdlib json module is installed. Install orjson or msgspec to compare them (python -m pip install orjson msgspec).")
+    
+    payloads = generatePayloads(arguments)
+    print("{0:<24}".format("operation") + "".join("{0:>22}".format(codec.backend + " (s)") for codec in codecs))
+    for name, operation in getOperations(payloads):
+        cells = []
+        baselineTime = None
+        expected = None
+        for codec in codecs:
+            elapsed, result = timeIt(operation, codec, arguments.repeat)
+            if (expected is None):
+                baselineTime, expected = elapsed, result
+            elif (result != expected):
+                print("Results of " + codec.backend + " differ for " + name + "!")
+                return 1
+            cells.append("{0:.4f}".format(elapsed) if (codec.backend == "json") else "{0:.4f} ({1:4.1f}x)".format(elapsed, baselineTime / elapsed))
+        print("{0:<24}".format(name) + "".join("{0:>22}".format(cell) for cell in cells), flush=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,55 @@
+# KeyPoolBenchmark.py
+
+# Fetches the same mods with 1, 2, 4... API keys against a local FakeNexusServer whose quota is restored every --quota-period seconds,
+# and reports the throughput, the requests sent with each key and the 429 responses received. With one key the sync is paced by the quota
+# of that key (--quota requests per period), with several keys each request goes to the key with the most budget left (see ApiKeyPool).
+# Usage: python benchmarks/KeyPoolBenchmark.py [--keys 1 2 4] [--mods 2000] [--quota 200] [--quota-period 2] [--max-concurrency 16]
+
+# Imports Required Dependencies
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from Engine import NexusApi
+from FakeNexusServer import FakeNexusServer
+
+gameDomain = "baldursgate3"
+
+def runScenario(arguments: argparse.Namespace, keyCount: int) -> dict:
+    """Fetch every mod with keyCount API keys.
+
+    Returns:
+        dict: The elapsed time, the mods fetched, the requests per key and the responses per status code.
+    """
+    apiKeys = ["benchmark" + str(index) for index in range(keyCount)]
+    with FakeNexusServer(apiKey=apiKeys, latency=arguments.latency, dailyLimit=arguments.quota, hourlyLimit=0, quotaPeriod=arguments.quota_period, catalogSize=arguments.mods) as server:
+        with NexusApi(apiKeys if (keyCount > 1) else apiKeys[0], poolSize=arguments.max_concurrency, apiUrl=server.url) as nexusApi:
+            server.resetStats()
+            start = time.perf_counter()
+            results = nexusApi.getMods(gameDomain, range(1, arguments.mods + 1), maxConcurrency=arguments.max_concurrency)
+            elapsed = time.perf_counter() - start
+        stats = server.getStats()
+    fetched = sum(1 for result in results if result.ok)
+    return {"elapsed": elapsed,"fetched": fetched,"keys": [stats["keys"].get(apiKey, 0) for apiKey in apiKeys],"statuses": stats["statuses"]}
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the throughput of a sync with several API keys against a local stand-in for the API.")
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 2, 4], help="Numbers of API keys to compare.")
+    parser.add_argument("--mods", type=int, default=2000, help="Number of mods fetched.")
+    parser.add_argument("--quota", type=int, default=200, help="Requests allowed per key and quota period.")
+    parser.add_argument("--quota-period", type=float, default=2, help="Number of seconds after which the quota of every key is restored.")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="Maximum number of requests in flight at once.")
+    parser.add_argument("--latency", type=float, default=0.005, help="Delay (in seconds) added by the server before every response.")
+    arguments = parser.parse_args(argv)
+    
+    print("{0} mods, {1} requests per key every {2:g} s".format(arguments.mods, arguments.quota, arguments.quota_period))
+    print("{0:>5} {1:>10} {2:>10} {3:>9} {4:>6}  {5}".format("keys", "elapsed", "mods/s", "fetched", "429", "requests per key"))
+    for keyCount in arguments.keys:
+        result = runScenario(arguments, keyCount)
+        print("{0:>5} {1:>8.2f} s {2:>10.0f} {3:>9} {4:>6}  {5}".format(keyCount, result["elapsed"], result["fetched"] / result["elapsed"], result["fetched"], result["statuses"].get(429, 0), " ".join(str(count) for count in result["keys"])), flush=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,71 @@
+# SearchBenchmark.py
+
+# Builds a local ModMirror of a catalog of mods (generated by FakeNexusServer, without sending requests), then measures the latency (p50/p99)
+# of full-text and field searches over it. Without the mirror, each of these searches needs one getMod() request per mod of the game.
+# Usage: python benchmarks/SearchBenchmark.py [--mods 100000] [--repeat 200] [--no-fts]
+
+# Imports Required Dependencies
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from Engine import ModMirror
+from FakeNexusServer import FakeNexusServer
+
+gameDomain = "baldursgate3"
+
+# The searches to measure, as (name, arguments of ModMirror.search()).
+# The cost of a full-text search grows with the number of mods matching it (all of them are ranked), so searches of each kind are measured
+searches = [
+    ("full text (rare word)", {"query": "4217"}),
+    ("full text (2 words)", {"query": "mod 4217"}),
+    ("full text (10% of mods)", {"query": "weapons"}),
+    ("full text (every mod)", {"query": "summ"}),
+    ("author", {"author": "Author 42"}),
+    ("category name", {"category": "Spells 3"}),
+    ("text + category", {"query": "4217", "category": "Weapons", "game": gameDomain}),
+    ("every mod + category", {"query": "mod", "category": "Weapons", "game": gameDomain}),
+]
+
+def percentile(values: list, fraction: float) -> float:
+    """Returns a percentile (nearest rank) of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark searches over a local mod metadata mirror.")
+    parser.add_argument("--mods", type=int, default=100000, help="Number of mods in the mirror.")
+    parser.add_argument("--repeat", type=int, default=200, help="Number of times each search is run.")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of results of each search.")
+    parser.add_argument("--no-fts", action="store_true", help="Search without the FTS5 index (as when SQLite is built without FTS5).")
+    arguments = parser.parse_args(argv)
+    
+    server = FakeNexusServer(catalogSize=arguments.mods)
+    with tempfile.TemporaryDirectory() as tempDirectory, ModMirror(str(Path(tempDirectory) / "mirror.db")) as mirror:
+        if (arguments.no_fts):
+            mirror._fullText = False
+        
+        start = time.perf_counter()
+        mirror.setCategories(gameDomain, server._game(gameDomain)["categories"])
+        batchSize = 10000
+        for first in range(1, arguments.mods + 1, batchSize):
+            mirror.putMany(gameDomain, [server.getModJson(gameDomain, modId) for modId in range(first, min(first + batchSize, arguments.mods + 1))])
+        elapsed = time.perf_counter() - start
+        print("Mirrored {0} mod(s) in {1:.2f} s ({2:.0f} mods/s), full-text index: {3}".format(len(mirror), elapsed, len(mirror) / elapsed, mirror.fullText))
+        print("Without the mirror, each search needs {0} getMod() request(s).".format(arguments.mods))
+        print("{0:>24} {1:>9} {2:>11} {3:>11}".format("search", "results", "p50", "p99"))
+        
+        for name,searchArguments in searches:
+            latencies = []
+            for _ in range(arguments.repeat):
+                start = time.perf_counter()
+                results = mirror.search(limit=arguments.limit, **searchArguments)
+                latencies.append(time.perf_counter() - start)
+            print("{0:>24} {1:>9} {2:>8.3f} ms {3:>8.3f} ms".format(name, len(results), percentile(latencies, 0.50) * 1000, percentile(latencies, 0.99) * 1000), flush=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
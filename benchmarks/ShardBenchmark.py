@@ -0,0 +1,88 @@
+# ShardBenchmark.py
+
+# Checks a generated mod list of --mods mods against a FakeNexusServer running in its own process, once in a single process and once with each number
+# of worker processes (--processes, see ShardPool), and reports the throughput along with the CPU time spent in the main process, which is what limits
+# a single process (decoding the responses and comparing the mods all hold the GIL). The output lists of every run are compared, and must be identical.
+# Usage: python benchmarks/ShardBenchmark.py [--mods 20000] [--processes 2 4] [--max-concurrency 8] [--latency 0.01]
+
+# Imports Required Dependencies
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+benchmarkDirectory = Path(__file__).resolve().parent
+sys.path.insert(0, str(benchmarkDirectory.parent / "src"))
+from Engine import NexusApi, ShardPool
+import ModListManager
+
+gameDomain = "baldursgate3"
+apiKey = "benchmark"
+
+def startServer(arguments: argparse.Namespace) -> tuple:
+    """Start the stand-in server in its own process, so it doesn't take CPU time from the main process of the benchmark.
+
+    Returns:
+        tuple: The server process and the URL of the server.
+    """
+    command = [sys.executable, str(benchmarkDirectory / "FakeNexusServer.py"), "--port", "0", "--latency", str(arguments.latency), "--catalog-size", str(arguments.mods)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    # The first line reads 'Serving a fake Nexus Mods API on <url> (API key "benchmark")...'
+    url = server.stdout.readline().split(" on ", 1)[1].split(" ", 1)[0]
+    return server, url
+
+def runScenario(arguments: argparse.Namespace, url: str, processes: int) -> dict:
+    """Check every mod of the list, with worker processes if processes > 0.
+
+    Returns:
+        dict: The elapsed time, the CPU time of the main process, the failed mods and the output list.
+    """
+    # Every mod was downloaded after its last update, so only the comparison runs (no mod is flagged)
+    modList = [{"name": "","id": modId,"updatedTime": "","lastDownloaded": "2100-01-01T00:00:00.000000+00:00","url": "https://www.nexusmods.com/" + gameDomain + "/mods/" + str(modId)} for modId in range(1, arguments.mods + 1)]
+    with NexusApi(apiKey, poolSize=arguments.max_concurrency, apiUrl=url, keyValidation="deferred") as nexusApi:
+        shardPool = ShardPool(apiKey, processes=processes, maxConcurrency=arguments.max_concurrency, apiUrl=url) if (processes > 0) else None
+        try:
+            if (shardPool is not None):
+                # Start the workers before timing, as a long sync would only start them once
+                shardPool.open()
+                shardPool.getMods(gameDomain, [1])
+            startCpu = time.process_time()
+            start = time.perf_counter()
+            result = ModListManager.checkModList(nexusApi, gameDomain, modList, [], arguments.max_concurrency, shardPool=shardPool)
+            elapsed = time.perf_counter() - start
+            cpu = time.process_time() - startCpu
+        finally:
+            if (shardPool is not None):
+                shardPool.close()
+    return {"elapsed": elapsed,"cpu": cpu,"failed": len(result["failedMods"]),"outputModList": result["outputModList"]}
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the sharded sync (worker processes) against a single process.")
+    parser.add_argument("--mods", type=int, default=20000, help="Number of mods in the list.")
+    parser.add_argument("--processes", type=int, nargs="+", default=[2, 4], help="Numbers of worker processes to compare with a single process.")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Maximum number of requests in flight at once (in each worker).")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay (in seconds) added by the server before every response.")
+    arguments = parser.parse_args(argv)
+    
+    logging.getLogger("ModListManager").setLevel(logging.WARNING)
+    server, url = startServer(arguments)
+    try:
+        print("{0} mods, {1} CPU(s)".format(arguments.mods, os.cpu_count()))
+        print("{0:>10} {1:>10} {2:>10} {3:>14} {4:>16} {5:>8} {6:>10}".format("processes", "elapsed", "mods/s", "main CPU", "main CPU/mod", "failed", "output"))
+        baseline = None
+        for processes in [0] + arguments.processes:
+            result = runScenario(arguments, url, processes)
+            if (baseline is None):
+                baseline = result["outputModList"]
+            output = "same" if (result["outputModList"] == baseline) else "DIFFERENT"
+            print("{0:>10} {1:>8.2f} s {2:>10.0f} {3:>12.2f} s {4:>13.1f} us {5:>8} {6:>10}".format(processes or "-", result["elapsed"], arguments.mods / result["elapsed"], result["cpu"], result["cpu"] / arguments.mods * 1000000, result["failed"], output), flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
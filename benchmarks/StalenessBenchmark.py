@@ -0,0 +1,96 @@
+# StalenessBenchmark.py
+
+# Compares the per-mod staleness loop (fromisoformat, astimezone, compare) with the batch Staleness.findStale() pass.
+# Usage: python benchmarks/StalenessBenchmark.py [--sizes 10000 100000 1000000] [--repeat 3]
+
+# Imports Required Dependencies
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from Engine import ModRecord, Staleness
+from Engine.Staleness import numpy
+
+def generateModList(size: int, seed: int = 0) -> list:
+    """Generate a mod list in the mod info format. About 10% of the mods have no lastDownloaded and about 30% are stale."""
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc).timestamp()
+    modList = []
+    for modId in range(1, size + 1):
+        updated = start + rng.randrange(0, 365 * 86400)
+        downloaded = None
+        roll = rng.random()
+        if (roll >= 0.1):
+            downloaded = updated - rng.randrange(1, 86400) if (roll < 0.4) else updated + rng.randrange(1, 86400)
+        modList.append({
+            "name": "Mod " + str(modId),
+            "id": modId,
+            "updatedTime": datetime.fromtimestamp(updated, timezone.utc).isoformat(timespec="milliseconds"),
+            "lastDownloaded": None if (downloaded is None) else datetime.fromtimestamp(downloaded, timezone.utc).isoformat(timespec="microseconds"),
+            "url": "https://www.nexusmods.com/baldursgate3/mods/" + str(modId),
+        })
+    return modList
+
+def loopStaleness(modList: list) -> list:
+    """The original per-mod loop of ModListManager."""
+    updatesRequired = []
+    for index,mod in enumerate(modList):
+        if (not mod["lastDownloaded"]):
+            updatesRequired.append(index)
+            continue
+        lastDownloadedTime = datetime.fromisoformat(mod["lastDownloaded"])
+        lastUpdatedTime = datetime.fromisoformat(mod["updatedTime"]).astimezone(lastDownloadedTime.tzinfo)
+        if (lastDownloadedTime < lastUpdatedTime):
+            updatesRequired.append(index)
+    return updatesRequired
+
+def recordLoopStaleness(records: list) -> list:
+    """A per-mod loop over ModRecord objects (integer times, no parsing)."""
+    return [index for index,record in enumerate(records) if (record.lastDownloaded is None) or record.isStale()]
+
+def batchStaleness(records: list) -> list:
+    """The batch pass over ModRecord objects, including building the arrays."""
+    updatedTimes, lastDownloadedTimes = Staleness.toArrays([record.updatedTime for record in records], [record.lastDownloaded for record in records])
+    return Staleness.findStale(updatedTimes, lastDownloadedTimes)
+
+def timeIt(function, argument, repeat: int) -> tuple:
+    """Returns the best time (in seconds) of a function over repeat runs, along with its last result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if (best is None) else min(best, elapsed)
+    return best, result
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the staleness evaluation of mod lists.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="Mod list sizes to benchmark.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (the best is reported).")
+    arguments = parser.parse_args(argv)
+    
+    backend = ("numpy " + numpy.__version__) if (numpy is not None) else "array (stdlib)"
+    print("Staleness backend: " + backend)
+    print("{0:>10} {1:>14} {2:>14} {3:>14} {4:>14} {5:>9}".format("mods", "loop (s)", "records (s)", "batch (s)", "findStale (s)", "speedup"))
+    for size in arguments.sizes:
+        modList = generateModList(size)
+        records = [ModRecord.fromDict("baldursgate3", mod) for mod in modList]
+        arrays = Staleness.toArrays([record.updatedTime for record in records], [record.lastDownloaded for record in records])
+        
+        loopTime, expected = timeIt(loopStaleness, modList, arguments.repeat)
+        recordTime, recordResult = timeIt(recordLoopStaleness, records, arguments.repeat)
+        batchTime, batchResult = timeIt(batchStaleness, records, arguments.repeat)
+        findTime, findResult = timeIt(lambda values: Staleness.findStale(*values), arrays, arguments.repeat)
+        if not (expected == recordResult == batchResult == findResult):
+            print("Results differ for " + str(size) + " mods!")
+            return 1
+        print("{0:>10} {1:>14.4f} {2:>14.4f} {3:>14.4f} {4:>14.4f} {5:>8.1f}x".format(size, loopTime, recordTime, batchTime, findTime, loopTime / findTime))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
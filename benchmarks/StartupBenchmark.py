@@ -0,0 +1,83 @@
+# StartupBenchmark.py
+
+# Measures the startup cost of the Engine package: the time to import it (lazily, or loading every class as the package did before),
+# and the time until a NexusApi object is ready with each key validation mode ("eager", "cached", "deferred") against a local FakeNexusServer.
+# Every sample runs in a fresh interpreter, so nothing is reused from an earlier sample (except the on-disk cache of the "cached" mode).
+# Usage: python benchmarks/StartupBenchmark.py [--repeat 10] [--latency 0.05]
+
+# Imports Required Dependencies
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+benchmarkDirectory = Path(__file__).resolve().parent
+sourceDirectory = benchmarkDirectory.parent / "src"
+from FakeNexusServer import FakeNexusServer
+
+apiKey = "benchmark"
+
+# The code run in the child interpreter for each scenario. {apiKey}, {url} and {cacheFile} are replaced before running it
+scenarios = [
+    ("import Engine (every class)", "import Engine\nfor name in Engine.__all__: getattr(Engine, name)"),
+    ("import Engine", "import Engine"),
+    ("from Engine import NexusApi", "from Engine import NexusApi"),
+    ("import ModListManager", "import ModListManager"),
+    ("NexusApi (eager)", "from Engine import NexusApi\nNexusApi({apiKey!r}, apiUrl={url!r}, keyValidation='eager').close()"),
+    ("NexusApi (cached)", "from Engine import NexusApi, ResponseCache\nwith ResponseCache({cacheFile!r}) as cache:\n    NexusApi({apiKey!r}, apiUrl={url!r}, cache=cache, keyValidation='cached').close()"),
+    ("NexusApi (deferred)", "from Engine import NexusApi\nNexusApi({apiKey!r}, apiUrl={url!r}, keyValidation='deferred').close()"),
+]
+
+# Measures the scenario from within the child, after the interpreter itself started
+childTemplate = "import sys, time\nsys.path.insert(0, {source!r})\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)\n"
+
+def runSample(code: str) -> tuple:
+    """Run the code of a scenario in a fresh interpreter.
+
+    Returns:
+        tuple: The time measured by the child (in seconds) and the total time of the process, including the interpreter startup (in seconds).
+    """
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", childTemplate.format(source=str(sourceDirectory), code=code)], stdout=subprocess.PIPE, check=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+    total = time.perf_counter() - start
+    return float(completed.stdout.strip().splitlines()[-1]), total
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the Engine package and the time to create a NexusApi object with each key validation mode.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of samples of each scenario (the median is reported).")
+    parser.add_argument("--latency", type=float, default=0.05, help="Delay (in seconds) added by the server before every response, e.g. the round-trip time to the API.")
+    parser.add_argument("--output", help="Save the results to this JSON file.")
+    arguments = parser.parse_args(argv)
+    
+    results = []
+    with FakeNexusServer(apiKey=apiKey, latency=arguments.latency) as server, tempfile.TemporaryDirectory() as tempDirectory:
+        cacheFile = str(Path(tempDirectory) / "responses.db")
+        print("Server latency: {0} ms, {1} sample(s) per scenario".format(arguments.latency * 1000, arguments.repeat))
+        print("{0:>30} {1:>14} {2:>16} {3:>20}".format("scenario", "median (ms)", "process (ms)", "validate requests"))
+        for name,code in scenarios:
+            code = code.format(apiKey=apiKey, url=server.url, cacheFile=cacheFile)
+            # Warm up once (file system caches, and the validation cached by the "cached" mode) before taking samples
+            runSample(code)
+            server.resetStats()
+            samples = [runSample(code) for _ in range(arguments.repeat)]
+            result = {
+                "scenario": name,
+                "median": statistics.median(sample[0] for sample in samples),
+                "process": statistics.median(sample[1] for sample in samples),
+                "validateRequests": server.getStats()["endpoints"].get("validate", 0),
+            }
+            results.append(result)
+            print("{0:>30} {1:>14.1f} {2:>16.1f} {3:>20}".format(name, result["median"] * 1000, result["process"] * 1000, result["validateRequests"]), flush=True)
+    
+    if (arguments.output):
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            json.dump({"latency": arguments.latency, "repeat": arguments.repeat, "results": results}, f, indent=4)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
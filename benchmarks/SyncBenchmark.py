@@ -0,0 +1,218 @@
+# SyncBenchmark.py
+
+# Runs the full mod list update flow (load, check every mod, compare, save, record the sync) against a local FakeNexusServer,
+# and reports the throughput, request latency (p50/p99), peak RSS and number of requests of each scenario.
+# Each scenario runs in its own process, so the peak RSS is not inflated by earlier scenarios or by the server.
+# Results can be saved with --output and compared with an earlier run (e.g. of another commit) with --compare.
+# Usage: python benchmarks/SyncBenchmark.py [--sizes 100 1000 10000] [--modes full incremental] [--latency 0.01] [--output results.json] [--compare baseline.json]
+
+# Imports Required Dependencies
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+benchmarkDirectory = Path(__file__).resolve().parent
+sys.path.insert(0, str(benchmarkDirectory.parent / "src"))
+from FakeNexusServer import FakeNexusServer
+
+gameDomain = "baldursgate3"
+apiKey = "benchmark"
+
+class LatencyRecorder:
+    """Request hook (see NexusApi hooks) keeping the duration of every request, for exact percentiles."""
+    
+    def __init__(self):
+        self.latencies = []
+    
+    def onResponse(self, event):
+        self.latencies.append(event.elapsed)
+
+def percentile(values: list, fraction: float) -> float:
+    """Returns a percentile (nearest rank) of a list of values, or None if it is empty."""
+    if (not values):
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def peakRss() -> int:
+    """Returns the peak resident set size of this process (in bytes), or None if unavailable (Windows)."""
+    if (resource is None):
+        return None
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return maxRss if (sys.platform == "darwin") else maxRss * 1024
+
+def generateModList(server: FakeNexusServer, size: int) -> list:
+    """Generate a mod list of mods 1 to size, as saved by an earlier sync against the server: every mod was downloaded after its last update, except the recently updated mods."""
+    modList = []
+    for modId in range(1, size + 1):
+        updated = server.getModUpdated(modId)
+        # The list was saved before the recent updates
+        if (server.isUpdated(modId)):
+            updated -= 30 * 86400
+        modList.append({
+            "name": "Mod " + str(modId),
+            "id": modId,
+            "updatedTime": datetime.fromtimestamp(updated, timezone.utc).isoformat(timespec="milliseconds"),
+            "lastDownloaded": datetime.fromtimestamp(updated + 3600, timezone.utc).isoformat(timespec="microseconds"),
+            "url": "https://www.nexusmods.com/" + gameDomain + "/mods/" + str(modId),
+        })
+    return modList
+
+def runScenario(arguments: argparse.Namespace) -> dict:
+    """Run one scenario in this process (started by runScenarios()) and return its measurements."""
+    import logging
+    import ModListManager
+    from Engine import NexusApi, RequestMetrics
+    logging.getLogger("ModListManager").setLevel(logging.ERROR)
+    
+    workDirectory = Path(arguments.work_dir)
+    inputFile = workDirectory / "modList.json"
+    outputFile = workDirectory / "modList.out.json"
+    syncStateFile = str(workDirectory / "syncState.json")
+    syncKey = gameDomain + "/" + inputFile.name
+    recorder = LatencyRecorder()
+    metrics = RequestMetrics()
+    
+    start = time.perf_counter()
+    with NexusApi(apiKey, poolSize=arguments.concurrency, apiUrl=arguments.url, hooks=[recorder, metrics]) as nexusMods:
+        inputModList = ModListManager.loadModList(inputFile)
+        result = ModListManager.checkModList(nexusMods, gameDomain, inputModList, [], arguments.concurrency, arguments.mode == "incremental", syncStateFile, syncKey)
+        ModListManager.saveModList(outputFile, result["outputModList"])
+        ModListManager.recordSync(syncStateFile, syncKey, result["syncStarted"], result["failedMods"])
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "elapsed": elapsed,
+        "mods": len(result["outputModList"]),
+        "checkedMods": result["checkedCount"],
+        "updatesRequired": len(result["updatesRequired"]),
+        "failedMods": len(result["failedMods"]),
+        "modsPerSecond": len(result["outputModList"]) / elapsed,
+        "latencyP50": percentile(recorder.latencies, 0.50),
+        "latencyP99": percentile(recorder.latencies, 0.99),
+        "retries": sum(endpoint["retries"] for endpoint in metrics.getStats()["endpoints"].values()),
+        "peakRss": peakRss(),
+    }
+
+def runScenarios(arguments: argparse.Namespace) -> list:
+    """Start the server, then run each scenario in a child process."""
+    results = []
+    server = FakeNexusServer(apiKey=apiKey, latency=arguments.latency, jitter=arguments.jitter, errorRate=arguments.error_rate, rateLimitRate=arguments.rate_limit_rate, catalogSize=max(arguments.sizes), updatedFraction=arguments.updated_fraction)
+    with server, tempfile.TemporaryDirectory() as tempDirectory:
+        for size in arguments.sizes:
+            modList = generateModList(server, size)
+            for mode in arguments.modes:
+                workDirectory = Path(tempDirectory) / (str(size) + "-" + mode)
+                workDirectory.mkdir()
+                with open(workDirectory / "modList.json", "w", encoding="utf-8") as f:
+                    json.dump(modList, f, indent=4)
+                # The incremental scenario continues from a sync recorded two hours ago
+                if (mode == "incremental"):
+                    with open(workDirectory / "syncState.json", "w", encoding="utf-8") as f:
+                        json.dump({gameDomain + "/modList.json": {"lastSync": server.startTime - 7200,"failedMods": []}}, f)
+                
+                server.resetStats()
+                command = [sys.executable, str(Path(__file__).resolve()), "--run-scenario", "--url", server.url, "--work-dir", str(workDirectory), "--mode", mode, "--concurrency", str(arguments.concurrency)]
+                completed = subprocess.run(command, stdout=subprocess.PIPE, check=True, text=True)
+                result = json.loads(completed.stdout)
+                result.update({"scenario": str(size) + "/" + mode,"size": size,"mode": mode,"requests": server.getStats()["requests"]})
+                results.append(result)
+                printResult(result)
+    return results
+
+def formatBytes(value) -> str:
+    return "n/a" if (value is None) else "{0:.1f} MiB".format(value / (1024 * 1024))
+
+def formatMilliseconds(value) -> str:
+    return "n/a" if (value is None) else "{0:.2f} ms".format(value * 1000)
+
+def printHeader():
+    print("{0:>18} {1:>9} {2:>10} {3:>12} {4:>11} {5:>11} {6:>12} {7:>9}".format("scenario", "requests", "time (s)", "mods/s", "p50", "p99", "peak RSS", "failed"))
+
+def printResult(result: dict):
+    print("{0:>18} {1:>9} {2:>10.2f} {3:>12.1f} {4:>11} {5:>11} {6:>12} {7:>9}".format(result["scenario"], result["requests"], result["elapsed"], result["modsPerSecond"], formatMilliseconds(result["latencyP50"]), formatMilliseconds(result["latencyP99"]), formatBytes(result["peakRss"]), result["failedMods"]), flush=True)
+
+def printComparison(results: list, baseline: dict):
+    """Print the change of each measurement against a baseline run (as saved with --output)."""
+    baselineResults = {result["scenario"]: result for result in baseline.get("results", [])}
+    print("\nCompared with " + str(baseline.get("commit") or "baseline") + ":")
+    print("{0:>18} {1:>10} {2:>10} {3:>10} {4:>10} {5:>10}".format("scenario", "requests", "mods/s", "p50", "p99", "peak RSS"))
+    for result in results:
+        previous = baselineResults.get(result["scenario"])
+        if (previous is None):
+            print("{0:>18} {1:>10}".format(result["scenario"], "(new)"))
+            continue
+        changes = []
+        for field in ("requests", "modsPerSecond", "latencyP50", "latencyP99", "peakRss"):
+            if (not previous.get(field)) or (result.get(field) is None):
+                changes.append("n/a")
+            else:
+                changes.append("{0:+.1f}%".format((result[field] - previous[field]) * 100 / previous[field]))
+        print("{0:>18} {1:>10} {2:>10} {3:>10} {4:>10} {5:>10}".format(result["scenario"], *changes))
+
+def currentCommit() -> str:
+    """Returns the commit of the working tree, or None if it is not a git checkout."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=benchmarkDirectory, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the mod list update flow against a local fake Nexus Mods API.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Mod list sizes to benchmark.")
+    parser.add_argument("--modes", nargs="+", choices=["full", "incremental"], default=["full", "incremental"], help="Check every mod (full), or only the mods updated since the last sync (incremental).")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of mods checked at once.")
+    parser.add_argument("--latency", type=float, default=0.01, help="Delay (in seconds) added by the server before every response.")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Maximum random delay (in seconds) added on top of the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503 error.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with a 429 error.")
+    parser.add_argument("--updated-fraction", type=float, default=0.05, help="Fraction of the mods updated since the last sync.")
+    parser.add_argument("--output", help="Save the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare the results with an earlier run saved with --output.")
+    # Internal arguments, used to run one scenario in a child process
+    parser.add_argument("--run-scenario", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    arguments = parser.parse_args(argv)
+    
+    if (arguments.run_scenario):
+        print(json.dumps(runScenario(arguments)))
+        return 0
+    
+    print("Server latency: {0} ms (+ up to {1} ms), error rate: {2}, 429 rate: {3}, concurrency: {4}".format(arguments.latency * 1000, arguments.jitter * 1000, arguments.error_rate, arguments.rate_limit_rate, arguments.concurrency))
+    printHeader()
+    results = runScenarios(arguments)
+    
+    report = {
+        "commit": currentCommit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {field: getattr(arguments, field) for field in ("sizes", "modes", "concurrency", "latency", "jitter", "error_rate", "rate_limit_rate", "updated_fraction")},
+        "results": results,
+    }
+    if (arguments.output):
+        with open(arguments.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+        print("Results saved to " + arguments.output)
+    if (arguments.compare):
+        with open(arguments.compare, encoding="utf-8") as f:
+            printComparison(results, json.load(f))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,92 @@
+# WatchBenchmark.py
+
+# Runs a ModWatcher against a local FakeNexusServer while mods are added and updated on the server, and reports the requests sent, the payloads skipped
+# because their hash didn't change, and the delay until each change is reported. Changes happen during the first third of the run only, so the watcher
+# has to keep up with them, then back off while nothing changes. Each run is compared with polling every feed at a fixed interval (--min-interval).
+# The catalog of the stand-in server is shared by every game, so each change shows in the feeds of every game watched.
+# Usage: python benchmarks/WatchBenchmark.py [--games 10] [--duration 30] [--changes 20] [--min-interval 0.5] [--max-interval 8]
+
+# Imports Required Dependencies
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from Engine import ModWatcher, NexusApi
+from FakeNexusServer import FakeNexusServer
+
+def percentile(values: list, fraction: float) -> float:
+    """Returns a percentile (nearest rank) of a list of values."""
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def runScenario(arguments: argparse.Namespace, maxInterval: float) -> dict:
+    """Watch the games for the duration of the run while a background thread changes the catalog.
+
+    Returns:
+        dict: The requests sent, the events received, the watcher stats and the delays (in seconds) until each change was reported.
+    """
+    games = ["game" + str(index) for index in range(arguments.games)]
+    changedAt = {}
+    reportedAt = {}
+    
+    def record(event: dict):
+        key = (event["game"],event["modId"])
+        if (key not in reportedAt):
+            reportedAt[key] = time.monotonic()
+    
+    with FakeNexusServer(catalogSize=arguments.catalogSize, latency=arguments.latency) as server, NexusApi("benchmark", apiUrl=server.url, keyValidation="deferred") as nexusApi:
+        watcher = ModWatcher(nexusApi, games, [record], minInterval=arguments.min_interval, maxInterval=maxInterval, maxConcurrency=arguments.max_concurrency)
+        # Take the first snapshot of every feed before anything changes
+        watcher.poll()
+        server.resetStats()
+        
+        def change():
+            rng = random.Random(arguments.seed)
+            pause = arguments.duration / 3 / arguments.changes
+            for index in range(arguments.changes):
+                time.sleep(pause)
+                if (index % 2 == 0):
+                    modIds = server.addMods(1)
+                else:
+                    modIds = [rng.randint(1, arguments.catalogSize)]
+                    server.updateMods(modIds)
+                now = time.monotonic()
+                for game in games:
+                    changedAt[(game,modIds[0])] = now
+        
+        changer = threading.Thread(target=change, daemon=True)
+        changer.start()
+        watcher.run(arguments.duration)
+        changer.join()
+        requests = server.getStats()["requests"]
+    
+    delays = [reportedAt[key] - changedAt[key] for key in changedAt if key in reportedAt]
+    return {"requests": requests,"changes": len(changedAt),"reported": len(delays),"delays": delays,"stats": watcher.getStats()}
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the feed watcher against a local stand-in for the API.")
+    parser.add_argument("--games", type=int, default=10, help="Number of games watched.")
+    parser.add_argument("--duration", type=float, default=30, help="Duration (in seconds) of each run.")
+    parser.add_argument("--changes", type=int, default=20, help="Number of mods added or updated during the first third of each run.")
+    parser.add_argument("--min-interval", type=float, default=0.5, help="Interval (in seconds) between two polls of a feed that changed.")
+    parser.add_argument("--max-interval", type=float, default=8, help="Longest interval (in seconds) between two polls of the adaptive watcher.")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="Maximum number of feeds polled at once.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay (in seconds) added by the server before every response.")
+    parser.add_argument("--catalog-size", dest="catalogSize", type=int, default=10000, help="Number of mods in the catalog.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the mods updated.")
+    arguments = parser.parse_args(argv)
+    
+    print("{0} game(s) x 4 feeds, {1} change(s) during the first {2:.0f} s of {3:.0f} s".format(arguments.games, arguments.changes, arguments.duration / 3, arguments.duration))
+    print("{0:>22} {1:>9} {2:>11} {3:>9} {4:>9} {5:>10} {6:>10}".format("schedule", "requests", "unchanged", "events", "missed", "p50 delay", "p99 delay"))
+    for name,maxInterval in [("fixed " + str(arguments.min_interval) + " s", arguments.min_interval), ("adaptive " + str(arguments.min_interval) + "-" + str(arguments.max_interval) + " s", arguments.max_interval)]:
+        result = runScenario(arguments, maxInterval)
+        delays = result["delays"] or [0.0]
+        print("{0:>22} {1:>9} {2:>10.0%} {3:>9} {4:>9} {5:>8.2f} s {6:>8.2f} s".format(name, result["requests"], result["stats"]["unchanged"] / max(result["stats"]["polls"], 1), result["stats"]["events"], result["changes"] - result["reported"], percentile(delays, 0.50), percentile(delays, 0.99)), flush=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
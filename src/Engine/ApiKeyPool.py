@@ -0,0 +1,158 @@
+# ApiKeyPool.py
+
+# Imports Required Dependencies
+import threading
+
+from .RateLimiter import RateLimiter
+
+class ApiKeyPool:
+    """A pool of API keys (e.g. of several authorised accounts), each paced by its own RateLimiter from the quota headers of its own responses.
+
+    Each request is sent with the key that can send it soonest, then with the most remaining budget, so the throughput of a sync grows with the number of keys instead of being capped by the quota of one key.
+    A key answered with response code 401 (e.g. revoked) is disabled, and the other keys are used instead.
+
+    The pool never sleeps itself, like RateLimiter, so the same object can be used by NexusApi and AsyncNexusApi, and shared between several of them. All methods are thread-safe.
+    """
+    
+    def __init__(self, apiKeys: list, rateLimiters: list = None):
+        """Create a new ApiKeyPool object.
+
+        Args:
+            apiKeys (list): The API keys (str). Duplicates are ignored.
+            rateLimiters (list, optional): The RateLimiter of each key, in the same order as apiKeys. Defaults to None (a new RateLimiter for each key).
+
+        Raises:
+            Exception: If apiKeys is empty or holds anything but non-empty strings (str).
+            Exception: If rateLimiters doesn't hold one RateLimiter for each key.
+        """
+        if ((not isinstance(apiKeys,(list,tuple))) or (len(apiKeys) == 0)):
+            raise Exception("Valid API keys not provided. API keys must be a non-empty list.")
+        for apiKey in apiKeys:
+            if ((not isinstance(apiKey,str)) or (apiKey == "")):
+                raise Exception("Valid API key not provided. API key value must be a non-empty string (str).")
+        if ((rateLimiters is not None) and (len(rateLimiters) != len(apiKeys))):
+            raise Exception("Valid rate limiters not provided. There must be one rate limiter for each API key.")
+        
+        self._lock = threading.Lock()
+        # The state of each key, in the order given
+        self._keys = {}
+        for index,apiKey in enumerate(apiKeys):
+            if (apiKey not in self._keys):
+                rateLimiter = rateLimiters[index] if (rateLimiters is not None) else RateLimiter()
+                self._keys[apiKey] = {"rateLimiter": rateLimiter,"inFlight": 0,"requests": 0,"disabled": None}
+    
+    def __len__(self) -> int:
+        """The number of keys still in use (not disabled)."""
+        with self._lock:
+            return sum(1 for state in self._keys.values() if state["disabled"] is None)
+    
+    def __contains__(self, apiKey: str) -> bool:
+        return apiKey in self._keys
+    
+    def acquire(self, apiKey: str = None) -> tuple:
+        """Select the key of the next request, and reserve a slot for it from the RateLimiter of the key. Must be followed by ApiKeyPool.release() once the request is finished.
+
+        Args:
+            apiKey (str, optional): Use this key instead of selecting one (e.g. to validate it). Defaults to None (the key that can send the request soonest, then with the most budget left).
+
+        Raises:
+            Exception: If every key of the pool is disabled.
+
+        Returns:
+            tuple: The API key to send the request with, its RateLimiter, and the number of seconds to wait before sending the request (see RateLimiter.reserve()).
+        """
+        with self._lock:
+            if (apiKey is None):
+                apiKey = self._select() if (len(self._keys) > 1) else next(iter(self._keys))
+            state = self._keys[apiKey]
+            state["inFlight"] += 1
+            state["requests"] += 1
+        return apiKey, state["rateLimiter"], state["rateLimiter"].reserve()
+    
+    def release(self, apiKey: str, statusCode: int = None) -> bool:
+        """Mark a request acquired with ApiKeyPool.acquire() as finished. The quota of the response should be fed to the RateLimiter of the key beforehand.
+
+        Args:
+            apiKey (str): The key the request was sent with.
+            statusCode (int, optional): The response code received, or None if the request failed. A key answered with 401 is disabled. Defaults to None.
+
+        Returns:
+            bool: True if the key was disabled and another key is still in use, so the request can be sent again with it.
+        """
+        with self._lock:
+            state = self._keys[apiKey]
+            state["inFlight"] = max(state["inFlight"] - 1,0)
+            if ((statusCode != 401) or (len(self._keys) == 1)):
+                return False
+            if (state["disabled"] is None):
+                state["disabled"] = "Response code = 401"
+            return any(other["disabled"] is None for other in self._keys.values())
+    
+    def getApiKeys(self) -> list:
+        """Returns the keys still in use (not disabled), in the order given."""
+        with self._lock:
+            return [apiKey for apiKey,state in self._keys.items() if state["disabled"] is None]
+    
+    def getRateLimiter(self, apiKey: str) -> RateLimiter:
+        """Returns the RateLimiter of a key of the pool."""
+        return self._keys[apiKey]["rateLimiter"]
+    
+    def getRemaining(self) -> dict:
+        """Returns the remaining request budget of the keys still in use, added up.
+
+        Returns:
+            dict: The quota last reported for the keys ("hourlyLimit", "hourlyRemaining", "dailyLimit", "dailyRemaining" and "budget" added up, "hourlyReset" and "dailyReset" the earliest), as returned by RateLimiter.getRemaining() for a single key. A value unknown for every key is None.
+        """
+        with self._lock:
+            rateLimiters = [state["rateLimiter"] for state in self._keys.values() if state["disabled"] is None]
+        total = {}
+        for remaining in (rateLimiter.getRemaining() for rateLimiter in rateLimiters):
+            for key,value in remaining.items():
+                if (value is None):
+                    total.setdefault(key,None)
+                elif (total.get(key) is None):
+                    total[key] = value
+                elif (key.endswith("Reset")):
+                    total[key] = min(total[key],value)
+                else:
+                    total[key] += value
+        return total
+    
+    def getStats(self) -> list:
+        """Returns the usage and quota of each key. Keys are masked, only their last 4 characters are shown.
+
+        Returns:
+            list: For each key, in the order given: "key" (masked), "requests" (requests sent, not counting the validation of the key), "inFlight", "disabled" (the reason the key was disabled, or None), and its quota (see RateLimiter.getRemaining()).
+        """
+        with self._lock:
+            keys = [(apiKey,dict(state)) for apiKey,state in self._keys.items()]
+        stats = []
+        for apiKey,state in keys:
+            keyStats = {"key": "****" + apiKey[-4:],"requests": state["requests"],"inFlight": state["inFlight"],"disabled": state["disabled"]}
+            keyStats.update(state["rateLimiter"].getRemaining())
+            stats.append(keyStats)
+        return stats
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the ApiKeyPool class
+    #
+    ################################
+    
+    def _select(self) -> str:
+        """Select the key that can send a request soonest, then with the most budget left, then with the fewest requests in flight. Must be called with the lock held."""
+        best = None
+        bestScore = None
+        for apiKey,state in self._keys.items():
+            if (state["disabled"] is not None):
+                continue
+            rateLimiter = state["rateLimiter"]
+            budget = rateLimiter.getRemaining()["budget"]
+            # A key whose quota is still unknown is tried before the keys known to have some budget left
+            score = (rateLimiter.estimateWait(), -(budget if (budget is not None) else float("inf")), state["inFlight"])
+            if ((bestScore is None) or (score < bestScore)):
+                best, bestScore = apiKey, score
+        if (best is None):
+            raise Exception("No valid API key left. Every API key of the pool was answered with response code 401.")
+        return best
@@ -0,0 +1,786 @@
+# AsyncNexusApi.py
+
+# Imports Required Dependencies
+import asyncio
+import time
+
+# aiohttp is only required when AsyncNexusApi is used
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .ApiKeyPool import ApiKeyPool
+from .NexusResponse import NexusResponse, BatchResult
+from .RateLimiter import RateLimiter
+from .RequestMetrics import RequestEvent
+
+class AsyncNexusApi:
+    """Asyncio interface for the Nexus Mods website API. Requires active user API token for use.
+
+    Mirrors the methods of NexusApi, but every request is awaited so the event loop is never blocked. All requests share a single pooled aiohttp session, so many requests can be kept in flight at once.
+    Requires the aiohttp library: python -m pip install aiohttp
+
+    The object must be used as an asynchronous context manager (e.g. "async with AsyncNexusApi(apiKey) as nexusMods:"), or opened with AsyncNexusApi.open() and closed with AsyncNexusApi.close().
+
+    All documentation for the Nexus Mods API can be found here: https://app.swaggerhub.com/apis-docs/NexusMods/nexus-mods_public_api_params_in_form_data/1.0
+    """
+    
+    # The API URL to access. This is the Base URL for Nexus Mods API
+    _api_url = "https://api.nexusmods.com/"
+    
+    def __init__(self, apiKey, poolSize: int = 100, maxRetries: int = 3, backoffFactor: float = 0.5, keepAlive: bool = True, timeout: float = 30, apiUrl: str = None, rateLimiter: RateLimiter = None, hooks: list = None):
+        """Create a new AsyncNexusApi object using the specified API Key
+
+        The API key is validated when the object is opened (see AsyncNexusApi.open()). With several API keys, each request is sent with the key that has the most budget left (see ApiKeyPool).
+
+        Args:
+            apiKey (str, list or ApiKeyPool): The API access key to interract with Nexus Mods, a list of keys, or a pool of keys (which can be shared between several objects).
+            poolSize (int, optional): The maximum number of connections to keep open to the API. Defaults to 100.
+            maxRetries (int, optional): The number of times a request is retried on connection errors, 429 responses or server errors (5xx). Defaults to 3.
+            backoffFactor (float, optional): The backoff factor applied between retries (in seconds). Defaults to 0.5.
+            keepAlive (bool, optional): If connections should be kept alive between requests. Defaults to True.
+            timeout (float, optional): The timeout (in seconds) for each request. Defaults to 30.
+            apiUrl (str, optional): The base URL of the API, e.g. to use a local stand-in server. Defaults to None (https://api.nexusmods.com/).
+            rateLimiter (RateLimiter, optional): The scheduler used to pace requests. Can be shared between several objects using the same API key. Only used with a single API key, each key of a list or pool has its own. Defaults to None (a new RateLimiter).
+            hooks (list, optional): Request hooks notified of every request attempt (see RequestEvent), e.g. a RequestMetrics or OpenTelemetryHook object. Defaults to None (no hooks, no instrumentation overhead).
+
+        Raises:
+            Exception: If the aiohttp library is not installed.
+            Exception: If apiKey is not a string (str), a list of them or an ApiKeyPool, or has length = 0.
+            Exception: If rateLimiter is used with a list or pool of API keys.
+            Exception: If poolSize is not >0 or maxRetries is <0.
+        """
+        
+        if (aiohttp is None):
+            raise Exception("AsyncNexusApi requires the aiohttp library. Install it with: python -m pip install aiohttp")
+        
+        # Validate apiKey is a non-empty string, a list of them (checked by ApiKeyPool) or a pool
+        if (isinstance(apiKey,(list,tuple,ApiKeyPool))):
+            if (rateLimiter is not None):
+                raise Exception("Valid rate limiter not provided. Each API key of a list or pool has its own rate limiter, rateLimiter can only be used with a single API key.")
+        else:
+            AsyncNexusApi._checkApiKey(apiKey)
+        
+        # Validate the session configuration
+        if ((not isinstance(poolSize,int)) or poolSize <= 0):
+            raise Exception("Valid pool size not provided. Pool size must be value >0")
+        if ((not isinstance(maxRetries,int)) or maxRetries < 0):
+            raise Exception("Valid max retries not provided. Max retries must be value >=0")
+        
+        # Override the base URL for this object only
+        if (apiUrl is not None):
+            self._api_url = apiUrl if apiUrl.endswith("/") else apiUrl + "/"
+        
+        self._poolSize = poolSize
+        self._maxRetries = maxRetries
+        self._backoffFactor = backoffFactor
+        self._keepAlive = keepAlive
+        self._timeout = timeout
+        self._rateLimiter = rateLimiter if (rateLimiter is not None) else RateLimiter()
+        self._keyPool = AsyncNexusApi._toKeyPool(apiKey,self._rateLimiter)
+        self._session = None
+        self._lastResponse = None
+        self._hooks = tuple(hooks) if (hooks is not None) else ()
+        self._updateHooks()
+    
+    async def __aenter__(self):
+        await self.open()
+        return self
+    
+    async def __aexit__(self, excType, excValue, traceback):
+        await self.close()
+    
+    async def open(self):
+        """Create the pooled session and validate the API key(s). Must be called from within a running event loop.
+
+        Does nothing if the object is already open.
+
+        Raises:
+            Exception: If API key fails validation response.
+
+        Returns:
+            AsyncNexusApi: A reference to the AsyncNexusApi object
+        """
+        if (self._session is not None):
+            return self
+        
+        connector = aiohttp.TCPConnector(limit=self._poolSize, force_close=(not self._keepAlive))
+        self._session = aiohttp.ClientSession(connector=connector, headers={ "accept": "application/json" }, timeout=aiohttp.ClientTimeout(total=self._timeout))
+        
+        try:
+            await self._validateKeyPool(self._keyPool)
+        except Exception:
+            await self.close()
+            raise
+        
+        return self
+    
+    async def close(self):
+        """Close the underlying session and release all pooled connections.
+        """
+        if (self._session is not None):
+            await self._session.close()
+            self._session = None
+    
+    def getLastResponse(self) -> NexusResponse:
+        """Retrieve the last response obtained from the API.
+
+        The NexusResponse is immutable, so it is returned without copying.
+
+        Returns:
+            NexusResponse: The response last returned by the API
+        """
+        return self._lastResponse
+    
+    def addHook(self, hook):
+        """Add a request hook, notified of every request attempt sent to the API.
+
+        A hook is any object with an onRequest(event) method (called just before the request is sent) and/or an onResponse(event) method (called once the response is received or the request failed). See RequestEvent. Exceptions raised by a hook are not caught.
+
+        Args:
+            hook (object): The hook to add (e.g. a RequestMetrics or OpenTelemetryHook object).
+        """
+        self._hooks = self._hooks + (hook,)
+        self._updateHooks()
+    
+    def removeHook(self, hook):
+        """Remove a request hook added with addHook() (or the hooks argument).
+
+        Args:
+            hook (object): The hook to remove.
+        """
+        self._hooks = tuple(existing for existing in self._hooks if existing is not hook)
+        self._updateHooks()
+    
+    def getRateLimit(self) -> dict:
+        """Returns the remaining request budget, as reported by the rate limit headers of the last responses.
+
+        Returns:
+            dict: The quota last reported by the API ("hourlyLimit", "hourlyRemaining", "hourlyReset", "dailyLimit", "dailyRemaining", "dailyReset"), along with "budget", the estimated number of requests that can still be sent before the next reset (None if unknown).
+        """
+        return self._keyPool.getRemaining()
+    
+    def getKeyStats(self) -> list:
+        """Returns the usage and remaining quota of each API key (see ApiKeyPool.getStats()).
+
+        Returns:
+            list: The requests sent, requests in flight, disabled state and quota of each key. Keys are masked.
+        """
+        return self._keyPool.getStats()
+    
+    async def setApiKey(self,apiKey):
+        """Set a new API key (or list or pool of keys) for the AsyncNexusApi object.
+
+        This otherwise followes the same validation process as the AsyncNexusApi.open() method. The keys of a list or pool are validated concurrently.
+
+        Args:
+            apiKey (str, list or ApiKeyPool): The API access key to interract with Nexus Mods, a list of keys, or a pool of keys.
+
+        Raises:
+            Exception: If apiKey is not a string (str), a list of them or an ApiKeyPool, or has length = 0.
+            Exception: If API key fails validation response.
+
+        Returns:
+            AsyncNexusApi: A reference to the AsyncNexusApi object
+        """
+        
+        # Validate apiKey is a non-empty string, a list of them (checked by ApiKeyPool) or a pool
+        if (not isinstance(apiKey,(list,tuple,ApiKeyPool))):
+            AsyncNexusApi._checkApiKey(apiKey)
+        
+        await self.open()
+        
+        # Validate the new API key(s), then use them for the next requests
+        keyPool = AsyncNexusApi._toKeyPool(apiKey,self._rateLimiter)
+        await self._validateKeyPool(keyPool)
+        self._keyPool = keyPool
+        
+        return self
+    
+    
+    ################################
+    # Games
+    # Game specific routes (E.g. retreiving the mod categories of a game)
+    ################################
+    
+    async def getGame(self,game:str):
+        """Returns the information of a game, including its mod categories.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + ".json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="game")
+    
+    
+    ################################
+    # Mods
+    # Mod specific routes (E.g. retreiving latest mods, endorsing a mod)
+    ################################
+    
+    async def getUpdated(self,game:str,time = "1w"):
+        """Returns updated mods for a game in the given period.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            time (str, optional): The time period to check up to the present. Must be 1d (1 day), 1w (1 week), or 1m (1 month). Defaults to "1w".
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the time period provided is not "1d", "1w", or "1m".
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Validate the time period
+        if ((not time == "1d") and (not time == "1w") and (not time == "1m")):
+            raise Exception("Valid time not provided. Time must be 1d (1 day), 1w (1 week), or 1m (1 month)")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/updated.json?period=" + time
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="updated")
+    
+    
+    async def getLatestAdded(self,game:str):
+        """Returns the 10 latest added mods for a game.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/latest_added.json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="latestAdded")
+    
+    
+    async def getLatestUpdated(self,game:str):
+        """Returns the 10 latest updated mods for a game.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/latest_updated.json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="latestUpdated")
+    
+    
+    async def getTrending(self,game:str):
+        """Returns the top 10 trending mods for a game.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+
+        Returns:
+            NexusResponse: The response information received from the API
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/trending.json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="trending")
+    
+    
+    async def getMod(self,game:str,id:int):
+        """Returns a specific mod with the matching ID number.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            id (int): The mod ID to get.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the mod ID is not >0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(id,int)) or id <= 0):
+            raise Exception("Valid mod ID not provided. Mod ID must be value >0")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +".json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="mod")
+    
+    async def getMods(self,game:str,ids:list,maxConcurrency:int = 50,progressCallback = None) -> list:
+        """Returns many mods with the matching ID numbers, with up to maxConcurrency requests in flight at once.
+
+        Errors are reported per mod ID in the returned BatchResult objects and do not stop the rest of the batch.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to get.
+            maxConcurrency (int, optional): The maximum number of requests in flight at once. Defaults to 50.
+            progressCallback (function, optional): Called as progressCallback(completed, total, result) each time a mod is finished. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If maxConcurrency is not >0.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids.
+        """
+        
+        # Send API requests and return the results
+        return await self._runBatch(self.getMod,game,ids,maxConcurrency,progressCallback)
+    
+    async def endorseMod(self,game:str,id:int):
+        """Sends a request to endorse a specific mod on the server.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            id (int): The mod ID to get.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the mod ID is not >0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(id,int)) or id <= 0):
+            raise Exception("Valid mod ID not provided. Mod ID must be value >0")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/endorse.json"
+        
+        # Send API request and return the response
+        return await self._request("POST",request_url,endpoint="endorse")
+    
+    async def abstainMod(self,game:str,id:int):
+        """Sends a request to abstain endorsing a specific mod on the server.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            id (int): The mod ID to get.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the mod ID is not >0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(id,int)) or id <= 0):
+            raise Exception("Valid mod ID not provided. Mod ID must be value >0")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/abstain.json"
+        
+        # Send API request and return the response
+        return await self._request("POST",request_url,endpoint="abstain")
+    
+    
+    ################################
+    #
+    # Mod Files
+    # File specific routes (E.g. retreiving file information, retreiving download link)
+    #
+    ################################
+    
+    async def getModFiles(self,game:str,id:int):
+        """Returns the files for a specific mod with the matching ID number.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            id (int): The mod ID to get.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the mod ID is not >0.
+
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(id,int)) or id <= 0):
+            raise Exception("Valid mod ID not provided. Mod ID must be value >0")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/files.json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="files")
+    
+    async def getModsFiles(self,game:str,ids:list,maxConcurrency:int = 50,progressCallback = None) -> list:
+        """Returns the files for many mods with the matching ID numbers, with up to maxConcurrency requests in flight at once.
+
+        Errors are reported per mod ID in the returned BatchResult objects and do not stop the rest of the batch.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to get the files of.
+            maxConcurrency (int, optional): The maximum number of requests in flight at once. Defaults to 50.
+            progressCallback (function, optional): Called as progressCallback(completed, total, result) each time a mod is finished. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If maxConcurrency is not >0.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids.
+        """
+        
+        # Send API requests and return the results
+        return await self._runBatch(self.getModFiles,game,ids,maxConcurrency,progressCallback)
+    
+    async def getDownloadLink(self,game:str,id:int,fileId:int,key:str = None,expires:int = None):
+        """Returns the download links (one per CDN mirror) of a specific file of a mod.
+
+        Premium members can request any file. Other members need the key and expires values of the nxm:// link from the "Download with Manager" button on the website.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            id (int): The mod ID of the file.
+            fileId (int): The ID of the file (see getModFiles()).
+            key (str, optional): The key of the nxm:// link. Defaults to None.
+            expires (int, optional): The expiry time of the nxm:// link. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the mod ID or file ID is not >0.
+
+        Returns:
+            NexusResponse: The response information received from the API. The JSON body is a list of mirrors, each with a "name", "short_name" and "URI".
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(id,int)) or id <= 0):
+            raise Exception("Valid mod ID not provided. Mod ID must be value >0")
+        if ((not isinstance(fileId,int)) or fileId <= 0):
+            raise Exception("Valid file ID not provided. File ID must be value >0")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/files/"+ str(fileId) +"/download_link.json"
+        if ((key is not None) and (expires is not None)):
+            request_url += "?key=" + str(key) + "&expires=" + str(expires)
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="download_link")
+    
+    async def md5Search(self,game:str,md5:str):
+        """Returns the mod files matching an MD5 hash (e.g. to check a downloaded file).
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            md5 (str): The MD5 hash of the file (32 hexadecimal characters).
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the MD5 hash is not a string of 32 hexadecimal characters.
+
+        Returns:
+            NexusResponse: The response information received from the API. The JSON body is a list of matches, each with the "mod" and the "file_details" of a file. Response code 404 if no file matches.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(md5,str)) or (len(md5) != 32) or any(character not in "0123456789abcdefABCDEF" for character in md5)):
+            raise Exception("Valid MD5 hash not provided. MD5 hash must be a string of 32 hexadecimal characters.")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/md5_search/" + md5 + ".json"
+        
+        # Send API request and return the response
+        return await self._request("GET",request_url,endpoint="md5_search")
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the AsyncNexusApi class
+    #
+    ################################
+    
+    def _updateHooks(self):
+        """Cache the bound onRequest/onResponse methods of the hooks, so requests without hooks skip the instrumentation entirely."""
+        self._requestHooks = tuple(hook.onRequest for hook in self._hooks if hasattr(hook,"onRequest"))
+        self._responseHooks = tuple(hook.onResponse for hook in self._hooks if hasattr(hook,"onResponse"))
+        self._instrumented = (len(self._requestHooks) + len(self._responseHooks)) > 0
+    
+    async def _request(self, method: str, url: str, headers: dict = None, endpoint: str = None, keyPool: ApiKeyPool = None) -> NexusResponse:
+        """Send a request to the API through the pooled session and store it as the last response.
+
+        Sends the request with the API key selected by the ApiKeyPool and waits for the RateLimiter of that key before sending. Retries with jittered backoff on 429 responses (any method) and server errors (GET only, so an endorsement is never sent twice). GET requests are also retried on connection errors, matching the retries of NexusApi.
+        With several keys, a key answered with 429 is held back while the retry goes to another key, and a key answered with 401 is disabled and the request sent again with another key.
+
+        Args:
+            method (str): The HTTP method to use (e.g. "GET").
+            url (str): The full URL of the request.
+            headers (dict, optional): Headers to send in addition to the session headers. Defaults to None.
+            endpoint (str, optional): The name of the endpoint reported to the request hooks (e.g. "mod"). Defaults to None ("other").
+            keyPool (ApiKeyPool, optional): The keys to send the request with, instead of the keys of the object (e.g. to validate a key). The response is then not stored as the last response. Defaults to None.
+
+        Returns:
+            NexusResponse: The response received from the API.
+        """
+        await self.open()
+        storeResponse = (headers is None) and (keyPool is None)
+        if (keyPool is None):
+            keyPool = self._keyPool
+        
+        attempt = 0
+        while True:
+            # Select the API key, then wait for its rate limiter before sending
+            apiKey, rateLimiter, delay = keyPool.acquire()
+            if (delay > 0):
+                await asyncio.sleep(delay)
+            
+            # Notify the request hooks (if any)
+            event = None
+            if (self._instrumented):
+                event = RequestEvent(method, url, endpoint or "other", attempt, delay)
+                for hook in self._requestHooks:
+                    hook(event)
+                event.startTime = time.monotonic()
+            
+            try:
+                async with self._session.request(method, url, headers=AsyncNexusApi._withApiKey(headers,apiKey)) as response:
+                    content = await response.read()
+                    nexusResponse = NexusResponse(str(response.url), response.status, response.headers.copy(), content)
+            except Exception as e:
+                rateLimiter.update(None)
+                keyPool.release(apiKey)
+                if (event is not None):
+                    event.elapsed = time.monotonic() - event.startTime
+                    event.error = e
+                    for hook in self._responseHooks:
+                        hook(event)
+                # Only GET requests are retried, and only on connection errors
+                if ((not isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))) or (method != "GET") or (attempt >= self._maxRetries)):
+                    raise
+                await asyncio.sleep(self._backoffFactor * (2 ** attempt))
+                attempt += 1
+                continue
+            rateLimiter.update(nexusResponse.rateLimit)
+            keyDisabled = keyPool.release(apiKey,nexusResponse.status_code)
+            
+            if (event is not None):
+                event.elapsed = time.monotonic() - event.startTime
+                event.response = nexusResponse
+                for hook in self._responseHooks:
+                    hook(event)
+            
+            # Retry on rate limit and server errors, and with another key if this one was disabled
+            statusCode = nexusResponse.status_code
+            retryable = keyDisabled or (statusCode == 429) or ((method == "GET") and (statusCode in (500,502,503,504)))
+            if ((not retryable) or (attempt >= self._maxRetries)):
+                break
+            if (not keyDisabled):
+                # Hold this key back. Another key (if any) can send the retry right away, otherwise the retry waits here
+                delay = rateLimiter.backoff(attempt, RateLimiter._parseRetryAfter(nexusResponse.headers.get("Retry-After")))
+                if (len(keyPool) == 1):
+                    await asyncio.sleep(delay)
+            attempt += 1
+        
+        if (storeResponse):
+            self._lastResponse = nexusResponse
+        return nexusResponse
+    
+    async def _runBatch(self, method, game: str, ids: list, maxConcurrency: int, progressCallback) -> list:
+        """Await a per-mod method (e.g. AsyncNexusApi.getMod) for many mod IDs, with up to maxConcurrency requests in flight at once.
+
+        Args:
+            method (function): The coroutine method to call as method(game, id).
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to request.
+            maxConcurrency (int): The maximum number of requests in flight at once.
+            progressCallback (function): Called as progressCallback(completed, total, result) each time a mod is finished, or None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If maxConcurrency is not >0.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Validate all mod IDs before sending any request
+        ids = list(ids)
+        for id in ids:
+            if ((not isinstance(id,int)) or id <= 0):
+                raise Exception("Valid mod ID not provided. Mod ID must be value >0 (received " + str(id) + ")")
+        
+        if ((not isinstance(maxConcurrency,int)) or maxConcurrency <= 0):
+            raise Exception("Valid max concurrency not provided. Max concurrency must be value >0")
+        
+        total = len(ids)
+        completed = 0
+        semaphore = asyncio.Semaphore(maxConcurrency)
+        
+        async def fetch(id):
+            nonlocal completed
+            async with semaphore:
+                try:
+                    result = BatchResult(id, response=await method(game,id))
+                except Exception as e:
+                    result = BatchResult(id, error=e)
+            completed += 1
+            if (progressCallback is not None):
+                progressCallback(completed,total,result)
+            return result
+        
+        # gather() keeps the input order, whichever request finishes first
+        return list(await asyncio.gather(*[fetch(id) for id in ids]))
+    
+    def _toKeyPool(apiKey, rateLimiter: RateLimiter) -> ApiKeyPool:
+        """Returns the ApiKeyPool of an API key, list of keys or pool. A single key is paced by the given RateLimiter."""
+        if (isinstance(apiKey,ApiKeyPool)):
+            return apiKey
+        if (isinstance(apiKey,(list,tuple))):
+            return ApiKeyPool(list(apiKey))
+        return ApiKeyPool([apiKey],[rateLimiter])
+    
+    def _withApiKey(headers: dict, apiKey: str) -> dict:
+        """Returns the headers of a request with the apikey header added."""
+        if (headers is None):
+            return {"apikey": apiKey}
+        return dict(headers, apikey=apiKey)
+    
+    def _checkApiKey(apiKey):
+        """Raise an exception if an API key is not a non-empty string (str)."""
+        if (not isinstance(apiKey,str)):
+            raise Exception("Valid API key not provided. API key value must be string (str).")
+        if (apiKey == ""):
+            raise Exception("Valid API key not provided. Game cannot be empty string (len = 0).")
+    
+    async def _validateKeyPool(self, keyPool: ApiKeyPool):
+        """Validate every API key of a pool concurrently.
+
+        Raises:
+            Exception: If an API key fails validation response.
+        """
+        await asyncio.gather(*[self._validateApiKey(apiKey,keyPool.getRateLimiter(apiKey)) for apiKey in keyPool.getApiKeys()])
+    
+    async def _validateApiKey(self, apiKey: str, rateLimiter: RateLimiter):
+        """Send a validation request to the API for the given API key.
+
+        Args:
+            apiKey (str): The API access key to validate.
+            rateLimiter (RateLimiter): The RateLimiter of the key, updated with the quota of the response.
+
+        Raises:
+            Exception: If API key fails validation response.
+        """
+        
+        # Prepare validation API key request
+        validation_url = self._api_url + "v1/users/validate.json"
+        
+        # Send validation API key request, with this key only
+        validation_response = await self._request("GET", validation_url, endpoint="validate", keyPool=ApiKeyPool([apiKey],[rateLimiter]))
+        validation_response_code = validation_response.status_code
+        
+        # Check if the response was invalid
+        if validation_response_code != 200:
+            # If not response code 200, apiKey is invalid
+            raise Exception("Validation response error. Response code = " + str(validation_response_code) + ", JSON: " + str(validation_response.json()))
@@ -0,0 +1,321 @@
+# DownloadManager.py
+
+# Imports Required Dependencies
+import hashlib
+import os
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .NexusApi import NexusApi
+
+class DownloadResult:
+    """The result of downloading a single mod file (see DownloadManager.downloadFiles()).
+
+    Holds the mod and file IDs, along with either the path of the downloaded file or the exception raised while downloading it.
+    """
+    
+    __slots__ = ("modId","fileId","path","size","md5","resumedBytes","error")
+    
+    def __init__(self, modId: int, fileId: int, path: Path = None, size: int = 0, md5: str = None, resumedBytes: int = 0, error: Exception = None):
+        """Create a new DownloadResult object.
+
+        Args:
+            modId (int): The ID of the mod.
+            fileId (int): The ID of the file.
+            path (Path, optional): The path of the downloaded file. Defaults to None.
+            size (int, optional): The size of the downloaded file (in bytes). Defaults to 0.
+            md5 (str, optional): The MD5 hash of the downloaded file (hex). Defaults to None.
+            resumedBytes (int, optional): The bytes kept from an earlier, interrupted download instead of being downloaded again. Defaults to 0.
+            error (Exception, optional): The exception raised while downloading the file. Defaults to None.
+        """
+        self.modId = modId
+        self.fileId = fileId
+        self.path = path
+        self.size = size
+        self.md5 = md5
+        self.resumedBytes = resumedBytes
+        self.error = error
+    
+    def __repr__(self):
+        if self.error is not None:
+            return "<DownloadResult mod={0} file={1} error={2!r}>".format(self.modId,self.fileId,self.error)
+        return "<DownloadResult mod={0} file={1} path={2}>".format(self.modId,self.fileId,self.path)
+    
+    @property
+    def ok(self) -> bool:
+        """True if the file was downloaded and verified."""
+        return (self.error is None) and (self.path is not None)
+
+class DownloadManager:
+    """Downloads mod files from the Nexus Mods CDN, several at once, resuming interrupted downloads.
+
+    Download links are requested through a NexusApi object, then the files are downloaded through a separate pooled session, so the API key is never sent to the CDN.
+    Each file is streamed to "<file ID>-<file name>.part" in chunks (never held in memory whole), and renamed to its final name only once it is verified:
+    - Its size must match the "size_in_bytes" of the file metadata (when provided).
+    - Its MD5 hash must match the "md5" of the file metadata when provided. The files.json of the API has no md5, so the hash is otherwise looked up with NexusApi.md5Search(), which must return the same file ID (one API request per file). With md5Search=False, only the size of these files is checked.
+    An interrupted download resumes from the end of its .part file with an HTTP range request, either on the next attempt or on the next run.
+    """
+    
+    def __init__(self, nexusApi: NexusApi, directory: str, maxConcurrency: int = 4, chunkSize: int = 256*1024, maxRetries: int = 3, backoffFactor: float = 0.5, timeout: float = 60, mirror: str = None, md5Search: bool = True):
+        """Create a new DownloadManager object.
+
+        Args:
+            nexusApi (NexusApi): The API interface used to request the download links.
+            directory (str): The directory to save the files to. Created if it doesn't exist.
+            maxConcurrency (int, optional): The maximum number of files downloaded at once. Defaults to 4.
+            chunkSize (int, optional): The size (in bytes) of the chunks written to disk. Data received since the last full chunk is downloaded again after a connection error. Defaults to 256 KiB.
+            maxRetries (int, optional): The number of times a download is resumed after a connection error. Defaults to 3.
+            backoffFactor (float, optional): The delay (in seconds) before the first resume, doubled for each following one. Defaults to 0.5.
+            timeout (float, optional): The timeout (in seconds) for connecting and for each read. Defaults to 60.
+            mirror (str, optional): The short name of the preferred CDN mirror (e.g. "Nexus CDN"). Defaults to None (the first mirror returned by the API).
+            md5Search (bool, optional): If the MD5 hash of a file whose metadata has no md5 is checked with NexusApi.md5Search(). Defaults to True.
+
+        Raises:
+            Exception: If maxConcurrency or chunkSize is not >0, or maxRetries is <0.
+        """
+        if ((not isinstance(maxConcurrency,int)) or maxConcurrency <= 0):
+            raise Exception("Valid max concurrency not provided. Max concurrency must be value >0")
+        if ((not isinstance(chunkSize,int)) or chunkSize <= 0):
+            raise Exception("Valid chunk size not provided. Chunk size must be value >0")
+        if ((not isinstance(maxRetries,int)) or maxRetries < 0):
+            raise Exception("Valid max retries not provided. Max retries must be value >=0")
+        
+        self._nexusApi = nexusApi
+        self._directory = Path(directory)
+        self._maxConcurrency = maxConcurrency
+        self._chunkSize = chunkSize
+        self._maxRetries = maxRetries
+        self._backoffFactor = backoffFactor
+        self._timeout = timeout
+        self._mirror = mirror
+        self._md5Search = md5Search
+        
+        # The CDN session shares nothing with the API session, in particular not its apikey header
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=maxConcurrency)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the CDN session and release all pooled connections."""
+        self._session.close()
+    
+    def getDownloadUrl(self, game: str, modId: int, fileId: int, key: str = None, expires: int = None) -> str:
+        """Request the download link of a file, from the preferred mirror if available.
+
+        Args:
+            game (str): The game domain of the mod.
+            modId (int): The ID of the mod.
+            fileId (int): The ID of the file.
+            key (str, optional): The key of the nxm:// link (required for non-premium members). Defaults to None.
+            expires (int, optional): The expiry time of the nxm:// link. Defaults to None.
+
+        Raises:
+            Exception: If the API does not return any download link (e.g. 403 for non-premium members without a key).
+
+        Returns:
+            str: The URL of the file on the CDN.
+        """
+        response = self._nexusApi.getDownloadLink(game,modId,fileId,key,expires)
+        if (response.status_code != 200):
+            raise Exception("Download link of file " + str(fileId) + " not available. Response code = " + str(response.status_code))
+        mirrors = response.json()
+        if (not mirrors):
+            raise Exception("Download link of file " + str(fileId) + " not available. No mirror returned")
+        for mirror in mirrors:
+            if ((self._mirror is not None) and (mirror.get("short_name") == self._mirror)):
+                return mirror["URI"]
+        return mirrors[0]["URI"]
+    
+    def downloadFile(self, game: str, modId: int, file: dict, url: str = None) -> DownloadResult:
+        """Download a single mod file, resuming an earlier partial download of it if there is one.
+
+        Args:
+            game (str): The game domain of the mod.
+            modId (int): The ID of the mod.
+            file (dict): The file metadata, as returned in the "files" list of getModFiles(). Uses "file_id", "file_name", "size_in_bytes" and "md5" (if provided).
+            url (str, optional): The URL of the file on the CDN. Defaults to None (requested with DownloadManager.getDownloadUrl()).
+
+        Raises:
+            Exception: If the file could not be downloaded, or does not match its size or MD5 hash.
+            Exception: If the MD5 hash could not be looked up (the .part file is then kept, so the next attempt checks it again without downloading it).
+
+        Returns:
+            DownloadResult: The downloaded file.
+        """
+        fileId = file["file_id"]
+        # Only the base name is used, so a file name can never point outside of the directory
+        fileName = Path(str(file.get("file_name") or fileId)).name
+        filePath = self._directory / fileName
+        # Keyed by file ID too, so files of the same name (e.g. of different mods) downloaded at once never share a .part file
+        partPath = self._directory / (str(fileId) + "-" + fileName + ".part")
+        expectedSize = file.get("size_in_bytes")
+        expectedMd5 = file.get("md5")
+        
+        # Already downloaded (e.g. by an earlier run)
+        if (Path.exists(filePath) and (expectedSize is not None) and (filePath.stat().st_size == expectedSize)):
+            md5 = DownloadManager._hashFile(filePath,self._chunkSize).hexdigest()
+            if (self._verify(game,fileId,expectedSize,md5,expectedSize,expectedMd5) is None):
+                return DownloadResult(modId,fileId,filePath,expectedSize,md5,expectedSize)
+        
+        self._directory.mkdir(parents=True, exist_ok=True)
+        if (url is None):
+            url = self.getDownloadUrl(game,modId,fileId)
+        
+        md5, size, resumedBytes = self._transferWithRetries(url,partPath,expectedSize)
+        failure = self._verify(game,fileId,size,md5,expectedSize,expectedMd5)
+        
+        # The bytes kept from an earlier download may belong to another version of the file: download it again from the start
+        if ((failure is not None) and (resumedBytes > 0)):
+            os.remove(partPath)
+            md5, size, resumedBytes = self._transferWithRetries(url,partPath,expectedSize)
+            failure = self._verify(game,fileId,size,md5,expectedSize,expectedMd5)
+        
+        if (failure is not None):
+            os.remove(partPath)
+            raise Exception("Downloaded file " + str(fileId) + " " + failure)
+        os.replace(partPath,filePath)
+        return DownloadResult(modId,fileId,filePath,size,md5,resumedBytes)
+    
+    def downloadFiles(self, game: str, files: list, progressCallback = None) -> list:
+        """Download many mod files at once, over a bounded thread pool.
+
+        Errors are reported per file in the returned DownloadResult objects and do not stop the rest of the downloads.
+
+        Args:
+            game (str): The game domain of the mods.
+            files (list): The files to download, as (modId, file) pairs, where file is the file metadata returned in the "files" list of getModFiles().
+            progressCallback (function, optional): Called as progressCallback(completed, total, result) each time a file is finished. Called from the calling thread. Defaults to None.
+
+        Returns:
+            list: A DownloadResult for each file, in the same order as files.
+        """
+        files = list(files)
+        total = len(files)
+        results = [None] * total
+        if (total == 0):
+            return results
+        
+        def download(index, modId, file):
+            try:
+                return index, self.downloadFile(game,modId,file)
+            except Exception as e:
+                return index, DownloadResult(modId,file.get("file_id"),error=e)
+        
+        # Results are stored by index so they keep the input order, whichever download finishes first
+        completed = 0
+        with ThreadPoolExecutor(max_workers=min(self._maxConcurrency,total)) as executor:
+            futures = [executor.submit(download,index,modId,file) for index,(modId,file) in enumerate(files)]
+            for future in as_completed(futures):
+                index, result = future.result()
+                results[index] = result
+                completed += 1
+                if (progressCallback is not None):
+                    progressCallback(completed,total,result)
+        
+        return results
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the DownloadManager class
+    #
+    ################################
+    
+    def _verify(self, game: str, fileId: int, size: int, md5: str, expectedSize: int, expectedMd5: str) -> str:
+        """Check a downloaded file against its size and MD5 hash. Without an expected hash, the hash is looked up with NexusApi.md5Search() (unless md5Search is False).
+
+        Raises:
+            Exception: If the MD5 hash could not be looked up (e.g. server error or exhausted quota).
+
+        Returns:
+            str: The reason the file failed the check, or None if it passed.
+        """
+        if ((expectedSize is not None) and (size != expectedSize)):
+            return "is " + str(size) + " bytes, expected " + str(expectedSize)
+        if (expectedMd5):
+            if (md5 != expectedMd5):
+                return "failed the MD5 check (" + md5 + ", expected " + str(expectedMd5) + ")"
+            return None
+        if (not self._md5Search):
+            return None
+        
+        response = self._nexusApi.md5Search(game,md5)
+        if (response.status_code == 404):
+            return "failed the MD5 check (" + md5 + " matches no file)"
+        if (response.status_code != 200):
+            raise Exception("MD5 hash of file " + str(fileId) + " could not be checked. Response code = " + str(response.status_code))
+        fileIds = [(match.get("file_details") or {}).get("file_id") for match in response.json()]
+        if (fileId not in fileIds):
+            return "failed the MD5 check (" + md5 + " matches file(s) " + ", ".join(str(id) for id in fileIds) + ")"
+        return None
+    
+    def _transferWithRetries(self, url: str, partPath: Path, expectedSize: int) -> tuple:
+        """Download a file to its .part file with DownloadManager._transfer(), resuming it after connection errors (up to maxRetries times).
+
+        Returns:
+            tuple: The (MD5 hex digest, size in bytes) of the whole .part file, and the bytes that were already in the .part file.
+        """
+        attempt = 0
+        while True:
+            try:
+                return self._transfer(url,partPath,expectedSize)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+                if (attempt >= self._maxRetries):
+                    raise
+                time.sleep(self._backoffFactor * (2 ** attempt))
+                attempt += 1
+    
+    def _transfer(self, url: str, partPath: Path, expectedSize: int) -> tuple:
+        """Download a file to its .part file, continuing from the end of the .part file if it exists.
+
+        Returns:
+            tuple: The (MD5 hex digest, size in bytes) of the whole .part file, and the bytes that were already in the .part file.
+        """
+        offset = partPath.stat().st_size if Path.exists(partPath) else 0
+        
+        # The .part file is already complete (e.g. interrupted before the rename)
+        if ((expectedSize is not None) and (offset == expectedSize)):
+            return DownloadManager._hashFile(partPath,self._chunkSize).hexdigest(), offset, offset
+        if ((expectedSize is not None) and (offset > expectedSize)):
+            os.remove(partPath)
+            offset = 0
+        
+        headers = {"Range": "bytes=" + str(offset) + "-"} if (offset > 0) else None
+        with self._session.get(url, headers=headers, stream=True, timeout=self._timeout) as response:
+            if (response.status_code == 416):
+                # Nothing left to send: the .part file holds the whole file, or is not part of this file at all
+                os.remove(partPath)
+                raise requests.ConnectionError("Range not satisfiable for " + partPath.name + ", restarting the download")
+            response.raise_for_status()
+            
+            # A 200 response to a range request sends the whole file again
+            if ((offset > 0) and (response.status_code != 206)):
+                offset = 0
+            md5 = DownloadManager._hashFile(partPath,self._chunkSize) if (offset > 0) else hashlib.md5()
+            size = offset
+            with open(partPath, "ab" if (offset > 0) else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self._chunkSize):
+                    f.write(chunk)
+                    md5.update(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        return md5.hexdigest(), size, offset
+    
+    def _hashFile(path: Path, chunkSize: int):
+        """Returns the MD5 hash object of a file, read in chunks."""
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunkSize), b""):
+                md5.update(chunk)
+        return md5
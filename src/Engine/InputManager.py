@@ -5,10 +5,18 @@ import logging
 dateFormat = '%Y-%m-%d %H:%M:%S'
 logFormat = '[%(asctime)s.%(msecs)03d] %(name)s (%(levelname)s): %(msg)s'
 log = logging.getLogger("InputManager")
-logging.basicConfig(format=logFormat,datefmt=dateFormat)
 # Log Level = INFO
 log.setLevel(logging.INFO)
 
+def _logPrompt(prompt: str):
+    """Log a prompt at INFO level, configuring the root logger on first use if the application didn't.
+
+    Logging is not configured when the module is imported, so importing the Engine package leaves the logging setup of the application untouched.
+    """
+    # Does nothing if the root logger already has handlers
+    logging.basicConfig(format=logFormat,datefmt=dateFormat)
+    log.info(prompt)
+
 class InputManager():
     """An interface that handles user input and input logging
     """
@@ -23,7 +31,7 @@ class InputManager():
         """
         
         log.debug("Arg(s) received: \n\tprompt = \"{0}\"".format(prompt))
-        log.info(prompt)
+        _logPrompt(prompt)
         userInput = input()
         log.debug("Received user input: \n\tuserInput = \"{0}\"".format(userInput))
         log.debug("Returning userInput = \"{0}\"".format(userInput))
@@ -36,7 +44,7 @@ class InputManager():
             prompt (str, optional): The prompt to provide the user. Defaults to "Press enter to continue...".
         """
         log.debug("Arg(s) received: \n\tprompt = \"{0}\"".format(prompt))
-        log.info(prompt)
+        _logPrompt(prompt)
         userInput = input()
         log.debug("waitInput() passed.")
         return
@@ -59,7 +67,7 @@ class InputManager():
         
         # Log inputs
         log.debug("Arg(s) received:\n\tprompt = \"{0}\",\n\tpositive = \"{1}\",\n\tnegative = \"{2}\",\n\tignoreCase = \"{3}\"".format(prompt,positive,negative,ignoreCase))
-        log.info(prompt)
+        _logPrompt(prompt)
         userInput = input()
         # Log userInput
         log.debug("Received user input:\n\tuserInput = \"{0}\"".format(userInput))
@@ -94,7 +102,7 @@ class InputManager():
         # Log inputs
         log.debug("Arg(s) received:\n\tprompt = \"{0}\",\n\tpositive = \"{1}\",\n\tignoreCase = \"{2}\"".format(prompt,positive,ignoreCase))
         positiveResponse = positive
-        log.info(prompt)
+        _logPrompt(prompt)
         userInput = input()
         # Log userInput
         log.debug("Received user input:\n\tuserInput = \"{0}\"".format(userInput))
@@ -127,7 +135,7 @@ class InputManager():
         
         log.debug("Arg(s) received:\n\tprompt = \"{0}\",\n\negative = \"{1}\",\n\tignoreCase = \"{2}\"".format(prompt,negative,ignoreCase))
         negativeResponse = negative
-        log.info(prompt)
+        _logPrompt(prompt)
         userInput = input()
         # Log userInput
         log.debug("Received user input:\n\tuserInput = \"{0}\"".format(userInput))
@@ -0,0 +1,247 @@
+# JsonCodec.py
+
+# Imports Required Dependencies
+import json
+import re
+import threading
+from typing import Optional
+
+# orjson and msgspec are optional. Without them, the stdlib json module is used instead
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class JsonCodec:
+    """Pluggable JSON encoder and decoder, used for the API responses (see NexusResponse.json()) and the mod list files.
+
+    Uses orjson or msgspec when installed, which decode and encode several times faster than the stdlib json module, and the json module otherwise. Every backend produces the same text:
+    - JsonCodec.dumps() writes compact JSON (no spaces after separators) without escaping non-ASCII characters.
+    - JsonCodec.dumpsIndented() writes the layout of json.dumps(value, indent=4, ensure_ascii=False).
+
+    Floats are the only exception: orjson and msgspec may write them in another notation (e.g. 0.0000238 instead of 2.38e-05), which decodes to the same value, and write NaN and Infinity as null. The mod lists hold none.
+    Payloads a faster backend rejects but the json module accepts (e.g. NaN when decoding, integers beyond 64 bits, dict keys that aren't strings) fall back to the json module.
+
+    JsonCodec.decodeFields() decodes only some fields of JSON objects (e.g. the fields of a mod compared by a sync). With msgspec, the objects are decoded straight into typed structs, skipping the other fields (e.g. the mod description) without building them.
+    The fields of the mod responses and updated.json are declared with their types (see JsonCodec.fieldTypes), so msgspec checks them while decoding, and a payload of an unexpected type falls back to the json module. Other fields are decoded as any JSON value.
+    """
+    
+    # The backends, in order of preference when none is requested
+    backends = ("orjson","msgspec","json")
+    
+    # The codec used by NexusResponse and the mod list files (see JsonCodec.setDefault())
+    default = None
+    
+    # The types of the fields decoded by JsonCodec.decodeFields() with msgspec (any field may be null). Fields not listed are decoded as any JSON value
+    fieldTypes = {
+        "mod_id": int,
+        "name": str,
+        "updated_time": str,
+        "updated_timestamp": int,
+        "created_time": str,
+        "created_timestamp": int,
+        "latest_file_update": int,
+        "latest_mod_activity": int,
+    }
+    
+    # Lines of indented JSON, with their indentation (orjson only indents by 2 spaces)
+    _indentPattern = re.compile(r"\n( *)")
+    
+    def __init__(self, backend: str = None):
+        """Create a new JsonCodec object.
+
+        Args:
+            backend (str, optional): The backend to use: "orjson", "msgspec" or "json". Defaults to None (the first backend installed, in the order of JsonCodec.backends).
+
+        Raises:
+            Exception: If the backend is unknown or not installed.
+        """
+        if (backend is None):
+            backend = next(name for name in JsonCodec.backends if JsonCodec.isAvailable(name))
+        if (backend not in JsonCodec.backends):
+            raise Exception("Valid JSON backend not provided. Backend must be orjson, msgspec or json")
+        if (not JsonCodec.isAvailable(backend)):
+            raise Exception("JSON backend " + backend + " is not installed. Install it with: python -m pip install " + backend)
+        
+        self._backend = backend
+        # Typed decoders of JsonCodec.decodeFields(), keyed by the fields decoded
+        self._lock = threading.Lock()
+        self._fieldDecoders = {}
+        self._useStructs = (msgspec is not None) and (backend != "json")
+        if (backend == "orjson"):
+            self._loads = orjson.loads
+            self._dumps = lambda value: orjson.dumps(value).decode("utf-8")
+            self._dumpsIndented = lambda value: JsonCodec._indentPattern.sub(JsonCodec._doubleIndent, orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8"))
+        elif (backend == "msgspec"):
+            self._loads = msgspec.json.decode
+            self._dumps = lambda value: msgspec.json.encode(value).decode("utf-8")
+            self._dumpsIndented = lambda value: msgspec.json.format(msgspec.json.encode(value), indent=4).decode("utf-8")
+        else:
+            self._loads = json.loads
+            self._dumps = JsonCodec._jsonDumps
+            self._dumpsIndented = JsonCodec._jsonDumpsIndented
+    
+    def __repr__(self):
+        return "<JsonCodec backend={0}>".format(self._backend)
+    
+    @property
+    def backend(self) -> str:
+        """The name of the backend used ("orjson", "msgspec" or "json")."""
+        return self._backend
+    
+    def loads(self, data):
+        """Decode a JSON document.
+
+        Args:
+            data (bytes or str): The JSON document.
+
+        Raises:
+            ValueError: If the document is not valid JSON (json.JSONDecodeError, as raised by the json module).
+
+        Returns:
+            any: The decoded value.
+        """
+        try:
+            return self._loads(data)
+        except ValueError:
+            return json.loads(data)
+    
+    def dumps(self, value) -> str:
+        """Encode a value as compact JSON, without escaping non-ASCII characters.
+
+        Args:
+            value (any): The value to encode.
+
+        Raises:
+            TypeError: If the value can't be encoded (as raised by the json module).
+
+        Returns:
+            str: The JSON document.
+        """
+        try:
+            return self._dumps(value)
+        except (TypeError,ValueError,OverflowError):
+            return JsonCodec._jsonDumps(value)
+    
+    def dumpsIndented(self, value) -> str:
+        """Encode a value as JSON indented by 4 spaces, with the layout of json.dumps(value, indent=4, ensure_ascii=False).
+
+        Args:
+            value (any): The value to encode.
+
+        Raises:
+            TypeError: If the value can't be encoded (as raised by the json module).
+
+        Returns:
+            str: The JSON document.
+        """
+        try:
+            return self._dumpsIndented(value)
+        except (TypeError,ValueError,OverflowError):
+            return JsonCodec._jsonDumpsIndented(value)
+    
+    def decodeFields(self, data, fields: tuple) -> dict:
+        """Decode only some fields of a JSON object (e.g. the fields of a mod compared by a sync).
+
+        Args:
+            data (bytes or str): The JSON document, holding an object.
+            fields (tuple): The names of the fields to decode.
+
+        Raises:
+            ValueError: If the document is not valid JSON, or doesn't hold an object.
+
+        Returns:
+            dict: The value of each field (None if missing from the object).
+        """
+        if (self._useStructs):
+            try:
+                decoded = self._getFieldDecoder(tuple(fields),False).decode(data)
+                return {field: getattr(decoded,field) for field in fields}
+            except ValueError:
+                pass
+        value = self.loads(data)
+        if (not isinstance(value,dict)):
+            raise ValueError("JSON object expected, received " + type(value).__name__)
+        return {field: value.get(field) for field in fields}
+    
+    def decodeFieldsList(self, data, fields: tuple) -> list:
+        """Decode only some fields of each JSON object of an array (e.g. the list of updated mods of a game).
+
+        Args:
+            data (bytes or str): The JSON document, holding an array of objects.
+            fields (tuple): The names of the fields to decode.
+
+        Raises:
+            ValueError: If the document is not valid JSON, or doesn't hold an array of objects.
+
+        Returns:
+            list: For each object, in order, the value of each field (None if missing from the object).
+        """
+        if (self._useStructs):
+            try:
+                decoded = self._getFieldDecoder(tuple(fields),True).decode(data)
+                return [{field: getattr(item,field) for field in fields} for item in decoded]
+            except ValueError:
+                pass
+        value = self.loads(data)
+        if ((not isinstance(value,list)) or (not all(isinstance(item,dict) for item in value))):
+            raise ValueError("JSON array of objects expected")
+        return [{field: item.get(field) for field in fields} for item in value]
+    
+    def setDefault(backend: str = None) -> "JsonCodec":
+        """Replace the codec used by NexusResponse and the mod list files (e.g. to compare the backends).
+
+        Args:
+            backend (str, optional): The backend to use: "orjson", "msgspec" or "json". Defaults to None (the first backend installed).
+
+        Raises:
+            Exception: If the backend is unknown or not installed.
+
+        Returns:
+            JsonCodec: The new default codec.
+        """
+        JsonCodec.default = JsonCodec(backend)
+        return JsonCodec.default
+    
+    def isAvailable(backend: str) -> bool:
+        """Returns True if a backend ("orjson", "msgspec" or "json") is installed."""
+        if (backend == "orjson"):
+            return orjson is not None
+        if (backend == "msgspec"):
+            return msgspec is not None
+        return backend == "json"
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the JsonCodec class
+    #
+    ################################
+    
+    def _getFieldDecoder(self, fields: tuple, many: bool):
+        """Returns the msgspec decoder of a struct holding the given fields (or of an array of them if many is True), created on first use."""
+        decoder = self._fieldDecoders.get((fields,many))
+        if (decoder is None):
+            with self._lock:
+                decoder = self._fieldDecoders.get((fields,many))
+                if (decoder is None):
+                    struct = msgspec.defstruct("Fields", [(field, Optional[JsonCodec.fieldTypes.get(field,object)], None) for field in fields])
+                    decoder = msgspec.json.Decoder(list[struct] if (many) else struct)
+                    self._fieldDecoders[(fields,many)] = decoder
+        return decoder
+    
+    def _doubleIndent(match) -> str:
+        """Turn the 2-space indentation of orjson into the 4-space indentation of the json module."""
+        return "\n" + match.group(1) * 2
+    
+    def _jsonDumps(value) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",",":"))
+    
+    def _jsonDumpsIndented(value) -> str:
+        return json.dumps(value, ensure_ascii=False, indent=4)
+
+JsonCodec.default = JsonCodec()
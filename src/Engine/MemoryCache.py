@@ -0,0 +1,150 @@
+# MemoryCache.py
+
+# Imports Required Dependencies
+import threading
+import time
+from collections import OrderedDict
+
+class MemoryCache:
+    """Bounded in-process LRU cache of API responses, with single-flight request coalescing.
+
+    Responses are kept for the TTL of their endpoint, and the least recently used response is evicted once maxSize is reached. Only responses with status code 200 are cached.
+    When several threads request the same key at once, only the first one sends the request. The others wait for it and receive the same response (NexusResponse objects are immutable, so they can be shared).
+
+    All methods are thread-safe.
+    """
+    
+    # Default time to live (in seconds) of each cached endpoint
+    _defaultTtls = {"mod": 300, "files": 300, "trending": 60, "latestAdded": 60, "latestUpdated": 60}
+    
+    def __init__(self, maxSize: int = 200, ttls: dict = None):
+        """Create a new MemoryCache object.
+
+        Args:
+            maxSize (int, optional): The maximum number of responses to keep. Defaults to 200.
+            ttls (dict, optional): The time to live (in seconds) of each endpoint, e.g. {"mod": 60}. Endpoints not provided use the defaults. A TTL of 0 disables caching for the endpoint, but concurrent requests are still coalesced. Defaults to None.
+
+        Raises:
+            Exception: If maxSize is not >0.
+            Exception: If any TTL is not a number >=0.
+        """
+        
+        if ((not isinstance(maxSize,int)) or maxSize <= 0):
+            raise Exception("Valid max size not provided. Max size must be value >0")
+        
+        self._ttls = dict(MemoryCache._defaultTtls)
+        if (ttls is not None):
+            for endpoint,ttl in ttls.items():
+                if ((not isinstance(ttl,(int,float))) or ttl < 0):
+                    raise Exception("Valid TTL not provided for endpoint \"" + str(endpoint) + "\". TTL must be value >=0")
+                self._ttls[endpoint] = ttl
+        
+        self._maxSize = maxSize
+        self._lock = threading.Lock()
+        # Cached responses as key: (expiry time, response), in least to most recently used order
+        self._entries = OrderedDict()
+        # Requests currently being sent, as key: _Flight
+        self._inFlight = {}
+        
+        self._stats = {"hits": 0,"misses": 0,"coalesced": 0,"evictions": 0}
+    
+    def fetch(self, key, endpoint: str, send):
+        """Returns the response for a key from the cache, sending the request only if it isn't cached or already in flight.
+
+        Args:
+            key (tuple): The cache key (e.g. ("baldursgate3", "mod", 123)).
+            endpoint (str): The name of the endpoint, used to select the TTL.
+            send (function): Called as send() to send the request. Must return a NexusResponse.
+
+        Raises:
+            Exception: Any exception raised by send(), including to the callers that waited on it.
+
+        Returns:
+            NexusResponse: The cached response, or the response received from the API.
+        """
+        with self._lock:
+            # Cache hit
+            entry = self._entries.get(key)
+            if (entry is not None):
+                if (entry[0] > time.monotonic()):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+            
+            # Same request already in flight, wait for it
+            flight = self._inFlight.get(key)
+            if (flight is not None):
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                flight = _Flight()
+                self._inFlight[key] = flight
+                self._stats["misses"] += 1
+                leader = True
+        
+        if (not leader):
+            flight.event.wait()
+            if (flight.error is not None):
+                raise flight.error
+            return flight.response
+        
+        # Send the request, then share the result with every waiting caller
+        try:
+            flight.response = send()
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inFlight[key]
+                if ((flight.response is not None) and (flight.response.status_code == 200)):
+                    self._store(key, endpoint, flight.response)
+            flight.event.set()
+        return flight.response
+    
+    def clear(self):
+        """Remove every cached response.
+        """
+        with self._lock:
+            self._entries.clear()
+    
+    def getStats(self) -> dict:
+        """Returns the cache counters.
+
+        Returns:
+            dict: "hits" (served from the cache), "misses" (request sent), "coalesced" (waited on an identical request in flight), "evictions" (removed to respect maxSize) and "size" (responses currently cached).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        return stats
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the MemoryCache class
+    #
+    ################################
+    
+    def _store(self, key, endpoint: str, response):
+        """Store a response, evicting the least recently used ones if required. Must be called with the lock held."""
+        ttl = self._ttls.get(endpoint,0)
+        if (ttl <= 0):
+            return
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self._entries.move_to_end(key)
+        while (len(self._entries) > self._maxSize):
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+
+class _Flight:
+    """A request in flight, shared by every caller waiting for the same key."""
+    
+    __slots__ = ("event","response","error")
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+        self.error = None
@@ -0,0 +1,309 @@
+# ModListStore.py
+
+# Imports Required Dependencies
+import bisect
+import sqlite3
+import threading
+from pathlib import Path
+
+from .JsonCodec import JsonCodec
+from .ModRecord import ModRecord
+
+class ModListStore:
+    """Indexed store of the mods of a mod list, keyed by (game, modId).
+
+    Mods are kept as ModRecord objects in a dict in list order, so lookups, inserts and updates are O(1) however large the list is. Secondary indexes on "updatedTime" and "lastDownloaded" (sorted by epoch microseconds) are built on first use and rebuilt only after a change to that field.
+
+    Every change is tracked, so only the mods that changed since the last ModListStore.commit() are written to the database (if the store is backed by one). Fields of the mod info other than the standard ones (see ModRecord.extra) are stored as a JSON object, so they survive a reload and an unchanged mod is never written again. All methods are thread-safe.
+    """
+    
+    # Fields with a secondary index
+    _indexedFields = ("updatedTime","lastDownloaded")
+    
+    def __init__(self, path: str = None, name: str = ""):
+        """Create a new ModListStore object, loading the mods of the list from the database if one is provided.
+
+        Args:
+            path (str, optional): The path of the SQLite database file backing the store. Defaults to None (in memory only).
+            name (str, optional): The name of the mod list in the database, so several lists can share one database (e.g. "data.json"). Defaults to "".
+        """
+        self._lock = threading.Lock()
+        self._name = name
+        # Mods as (game, modId): ModRecord, in list order
+        self._records = {}
+        # Position of each mod in the database, as (game, modId): position. Gaps are allowed, only the order matters
+        self._positions = {}
+        self._nextPosition = 0
+        # Keys changed or removed since the last commit
+        self._dirty = set()
+        self._removed = set()
+        # Secondary indexes as field: sorted list of (epoch microseconds, position, key). None until used
+        self._indexes = {field: None for field in ModListStore._indexedFields}
+        
+        self._connection = None
+        if (path is not None):
+            if (path != ":memory:"):
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS mods (list TEXT NOT NULL, game TEXT NOT NULL, id INTEGER NOT NULL, position INTEGER, name TEXT, updatedTime TEXT, lastDownloaded TEXT, url TEXT, extra TEXT, PRIMARY KEY (list, game, id))")
+            # Databases created by earlier versions have no extra column
+            if ("extra" not in [column[1] for column in self._connection.execute("PRAGMA table_info(mods)")]):
+                self._connection.execute("ALTER TABLE mods ADD COLUMN extra TEXT")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS modsUpdatedTime ON mods (list, updatedTime)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS modsLastDownloaded ON mods (list, lastDownloaded)")
+            self._connection.commit()
+            for game,id,position,modName,updatedTime,lastDownloaded,extra in self._connection.execute("SELECT game, id, position, name, updatedTime, lastDownloaded, extra FROM mods WHERE list = ? ORDER BY position", (name,)):
+                mod = JsonCodec.default.loads(extra) if (extra) else {}
+                mod.update({"name": modName,"id": id,"updatedTime": updatedTime,"lastDownloaded": lastDownloaded})
+                self._records[(game,id)] = ModRecord.fromDict(game,mod)
+                self._positions[(game,id)] = position
+                self._nextPosition = position + 1
+    
+    def fromModList(game: str, modList: list, path: str = None, name: str = ""):
+        """Create a new ModListStore object holding the mods of a mod list.
+
+        Args:
+            game (str): The game domain of the mods.
+            modList (list): The mods of the list (in the mod info format).
+            path (str, optional): The path of the SQLite database file backing the store. Mods of the list that differ from the database are marked as changed. Defaults to None (in memory only).
+            name (str, optional): The name of the mod list in the database. Defaults to "".
+
+        Returns:
+            ModListStore: The store.
+        """
+        store = ModListStore(path, name)
+        store.replace(game,modList)
+        if (path is None):
+            store._dirty.clear()
+        return store
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def __contains__(self, key):
+        return key in self._records
+    
+    def __iter__(self):
+        with self._lock:
+            records = list(self._records.values())
+        return iter(records)
+    
+    def close(self):
+        """Close the database connection (if any). Uncommitted changes are discarded.
+        """
+        with self._lock:
+            if (self._connection is not None):
+                self._connection.close()
+                self._connection = None
+    
+    def get(self, game: str, modId: int) -> ModRecord:
+        """Returns the record of a mod.
+
+        Args:
+            game (str): The game domain of the mod.
+            modId (int): The ID of the mod.
+
+        Returns:
+            ModRecord: The record (should be treated as read-only, use ModListStore.put() with a copy to change it), or None if the mod is not in the list.
+        """
+        return self._records.get((game,modId))
+    
+    def put(self, game: str, mod) -> bool:
+        """Add a mod to the end of the list, or update it in place if it is already in the list.
+
+        Args:
+            game (str): The game domain of the mod.
+            mod (ModRecord | dict): The record, or the mod info (missing fields are set to None). The record is stored as is and should not be altered afterwards.
+
+        Returns:
+            bool: True if the mod was added or changed, False if it was already up to date.
+        """
+        mod = ModListStore._toRecord(game,mod)
+        key = (game,mod.id)
+        with self._lock:
+            previous = self._records.get(key)
+            if (previous == mod):
+                return False
+            self._records[key] = mod
+            if (previous is None):
+                self._positions[key] = self._nextPosition
+                self._nextPosition += 1
+            self._dirty.add(key)
+            self._removed.discard(key)
+            # Only the indexes of the fields that changed are rebuilt
+            for field in ModListStore._indexedFields:
+                if ((previous is None) or (getattr(previous,field) != getattr(mod,field))):
+                    self._indexes[field] = None
+        return True
+    
+    def replace(self, game: str, modList: list) -> int:
+        """Replace the mods of a game with the mods of a mod list, in its order. Only the mods that differ are marked as changed.
+
+        Args:
+            game (str): The game domain of the mods.
+            modList (list): The mods of the list (ModRecord objects or mod info).
+
+        Returns:
+            int: The number of mods added, changed or removed.
+        """
+        changed = 0
+        with self._lock:
+            previousRecords = self._records
+            previousPositions = self._positions
+            self._records = {key: mod for key,mod in previousRecords.items() if key[0] != game}
+            self._positions = {key: position for key,position in previousPositions.items() if key[0] != game}
+            # Mods of the game follow the mods of the other games
+            position = self._nextPosition if (len(self._records) > 0) else 0
+            for mod in modList:
+                mod = ModListStore._toRecord(game,mod)
+                key = (game,mod.id)
+                self._records[key] = mod
+                self._positions[key] = position
+                if ((previousRecords.get(key) != mod) or (previousPositions.get(key) != position)):
+                    self._dirty.add(key)
+                    self._removed.discard(key)
+                    changed += 1
+                position += 1
+            self._nextPosition = position
+            for key in previousRecords:
+                if ((key[0] == game) and (key not in self._records)):
+                    self._removed.add(key)
+                    self._dirty.discard(key)
+                    changed += 1
+            self._indexes = {field: None for field in ModListStore._indexedFields}
+        return changed
+    
+    def remove(self, game: str, modId: int) -> bool:
+        """Remove a mod from the list.
+
+        Args:
+            game (str): The game domain of the mod.
+            modId (int): The ID of the mod.
+
+        Returns:
+            bool: True if the mod was removed, False if it was not in the list.
+        """
+        key = (game,modId)
+        with self._lock:
+            if (self._records.pop(key,None) is None):
+                return False
+            del self._positions[key]
+            self._dirty.discard(key)
+            self._removed.add(key)
+            self._indexes = {field: None for field in ModListStore._indexedFields}
+        return True
+    
+    def updatedSince(self, since: int) -> list:
+        """Returns the mods with an updatedTime later than a time, using the updatedTime index.
+
+        Args:
+            since (int): The time as epoch microseconds (see ModRecord.toEpoch()).
+
+        Returns:
+            list: The record of each mod, oldest update first.
+        """
+        return self._range("updatedTime",since,None)
+    
+    def downloadedBefore(self, before: int) -> list:
+        """Returns the mods with a lastDownloaded earlier than a time, using the lastDownloaded index.
+
+        Args:
+            before (int): The time as epoch microseconds (see ModRecord.toEpoch()).
+
+        Returns:
+            list: The record of each mod, oldest download first.
+        """
+        return self._range("lastDownloaded",None,before)
+    
+    def notDownloaded(self) -> list:
+        """Returns the mods without a lastDownloaded time, in list order.
+
+        Returns:
+            list: The record of each mod.
+        """
+        with self._lock:
+            return [mod for mod in self._records.values() if mod.lastDownloaded is None]
+    
+    def toModList(self, game: str = None) -> list:
+        """Returns the mods in list order, in the mod info format.
+
+        Args:
+            game (str, optional): Only return the mods of this game domain. Defaults to None (all games).
+
+        Returns:
+            list: The mod info of each mod.
+        """
+        with self._lock:
+            return [mod.toDict() for key,mod in self._records.items() if (game is None) or (key[0] == game)]
+    
+    def getChanged(self) -> list:
+        """Returns the keys of the mods added, changed or removed since the last commit.
+
+        Returns:
+            list: The (game, modId) of each mod.
+        """
+        with self._lock:
+            return list(self._dirty | self._removed)
+    
+    def commit(self) -> int:
+        """Write the mods added, changed or removed since the last commit to the database. Unchanged mods are not written again.
+
+        Returns:
+            int: The number of mods written or deleted (0 if the store has no database).
+        """
+        with self._lock:
+            changed = len(self._dirty) + len(self._removed)
+            if (self._connection is None):
+                self._dirty.clear()
+                self._removed.clear()
+                return 0
+            if (changed > 0):
+                rows = []
+                for key in self._dirty:
+                    record = self._records[key]
+                    mod = record.toDict()
+                    extra = JsonCodec.default.dumps(record.extra) if (record.extra) else None
+                    rows.append((self._name,key[0],key[1],self._positions[key],mod["name"],mod["updatedTime"],mod["lastDownloaded"],mod["url"],extra))
+                self._connection.executemany("INSERT OR REPLACE INTO mods (list, game, id, position, name, updatedTime, lastDownloaded, url, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._connection.executemany("DELETE FROM mods WHERE list = ? AND game = ? AND id = ?", [(self._name,key[0],key[1]) for key in self._removed])
+                self._connection.commit()
+            self._dirty.clear()
+            self._removed.clear()
+        return changed
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the ModListStore class
+    #
+    ################################
+    
+    def _toRecord(game: str, mod) -> ModRecord:
+        """Returns the record of a mod, converting a mod info into a new record."""
+        if isinstance(mod, ModRecord):
+            return mod
+        return ModRecord.fromDict(game,mod)
+    
+    def _range(self, field: str, low: int, high: int) -> list:
+        """Returns the mods with a field strictly between low and high (either can be None for no limit), using the index of the field."""
+        with self._lock:
+            index = self._indexes[field]
+            if (index is None):
+                index = []
+                for position,(key,mod) in enumerate(self._records.items()):
+                    epoch = getattr(mod,field)
+                    if (epoch is not None):
+                        index.append((epoch,position,key))
+                index.sort()
+                self._indexes[field] = index
+            start = 0 if (low is None) else bisect.bisect_right(index,(low,float("inf")))
+            end = len(index) if (high is None) else bisect.bisect_left(index,(high,-1))
+            return [self._records[key] for epoch,position,key in index[start:end]]
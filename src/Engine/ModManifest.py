@@ -0,0 +1,109 @@
+# ModManifest.py
+
+class ModManifest:
+    """A compact manifest of the files of one mod, used to tell whether the files of a mod changed or only its page did.
+
+    Each file is kept as a (fileId, version, size, uploadedTime) tuple, sorted by file ID, where size is in bytes and uploadedTime is in epoch seconds. The manifest also keeps the updatedTime of the mod page it was taken at (epoch microseconds, see ModRecord), so a page that did not change again since can be skipped without requesting its files.
+
+    Manifests convert to and from the files.json response of the API with ModManifest.fromFilesJson(), and to and from the manifest file with ModManifest.fromDict() and ModManifest.toDict():
+    {"id": 123,"updatedTime": 1704067200000000,"files": [[fileId, "version", sizeInBytes, uploadedTimestamp], ...]}
+    """
+    
+    __slots__ = ("game","id","files","updatedTime")
+    
+    def __init__(self, game: str, id: int, files, updatedTime: int = None):
+        """Create a new ModManifest object.
+
+        Args:
+            game (str): The game domain of the mod.
+            id (int): The ID of the mod.
+            files (iterable): The (fileId, version, size, uploadedTime) of each file of the mod, in any order.
+            updatedTime (int, optional): The updatedTime of the mod page when the manifest was taken, as epoch microseconds. Defaults to None.
+        """
+        self.game = game
+        self.id = id
+        self.files = tuple(sorted((tuple(file) for file in files), key=lambda file: file[0]))
+        self.updatedTime = updatedTime
+    
+    def fromFilesJson(game: str, id: int, filesJson: dict, updatedTime: int = None):
+        """Create a new ModManifest object from the files.json response of a mod (see NexusApi.getModFiles()).
+
+        Args:
+            game (str): The game domain of the mod.
+            id (int): The ID of the mod.
+            filesJson (dict): The decoded response.
+            updatedTime (int, optional): The updatedTime of the mod page, as epoch microseconds. Defaults to None.
+
+        Raises:
+            Exception: If the response has no "files" list.
+
+        Returns:
+            ModManifest: The manifest.
+        """
+        if ((not isinstance(filesJson,dict)) or (not isinstance(filesJson.get("files"),list))):
+            raise Exception("Valid files response not provided. Response must contain a \"files\" list")
+        files = []
+        for file in filesJson["files"]:
+            size = file.get("size_in_bytes")
+            if ((size is None) and (file.get("size_kb") is not None)):
+                size = file["size_kb"] * 1024
+            files.append((file["file_id"],file.get("version"),size,file.get("uploaded_timestamp")))
+        return ModManifest(game,id,files,updatedTime)
+    
+    def fromDict(game: str, manifest: dict):
+        """Create a new ModManifest object from an entry of the manifest file.
+
+        Args:
+            game (str): The game domain of the mod.
+            manifest (dict): The entry, as written by ModManifest.toDict().
+
+        Returns:
+            ModManifest: The manifest.
+        """
+        return ModManifest(game,manifest["id"],manifest.get("files",[]),manifest.get("updatedTime"))
+    
+    def toDict(self) -> dict:
+        """Returns the entry of the manifest, as written to the manifest file.
+
+        Returns:
+            dict: The entry.
+        """
+        return {"id": self.id,"updatedTime": self.updatedTime,"files": [list(file) for file in self.files]}
+    
+    def diff(self, previous) -> dict:
+        """Compare the files of the manifest with an earlier manifest of the same mod.
+
+        Args:
+            previous (ModManifest): The earlier manifest, or None if there is none (every file is then added).
+
+        Returns:
+            dict: The IDs of the files "added", "removed" and "changed" (same file ID, different version, size or upload time) since the earlier manifest. Every list is empty if the files did not change.
+        """
+        current = {file[0]: file for file in self.files}
+        earlier = {file[0]: file for file in previous.files} if (previous is not None) else {}
+        return {
+            "added": [fileId for fileId in current if fileId not in earlier],
+            "removed": [fileId for fileId in earlier if fileId not in current],
+            "changed": [fileId for fileId,file in current.items() if (fileId in earlier) and (earlier[fileId] != file)],
+        }
+    
+    def uploadedAfter(self, time: int) -> list:
+        """Returns the IDs of the files uploaded after the given time.
+
+        Args:
+            time (int): The time, as epoch microseconds (e.g. ModRecord.lastDownloaded).
+
+        Returns:
+            list: The IDs of the files, in ascending order. Files without an upload time are included.
+        """
+        return [file[0] for file in self.files if (file[3] is None) or (file[3] * 1000000 > time)]
+    
+    def __eq__(self, other):
+        if not isinstance(other, ModManifest):
+            return NotImplemented
+        return (self.game == other.game) and (self.id == other.id) and (self.files == other.files)
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return "<ModManifest {0}/{1} files={2}>".format(self.game,self.id,len(self.files))
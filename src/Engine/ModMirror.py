@@ -0,0 +1,365 @@
+# ModMirror.py
+
+# Imports Required Dependencies
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+class ModMirror:
+    """Local mirror of the metadata of mods (name, summary, author, category, version, ...), searchable without sending any request.
+
+    The mirror is kept in a SQLite database. Mods are added from the responses of getMod() (or of the mod feeds, e.g. getTrending()) with ModMirror.put(), and kept fresh with ModMirror.sync(), which requests again only the mods that a single getUpdated() request reports as changed since they were mirrored.
+
+    Name, summary, author and category are indexed in a SQLite FTS5 full-text index, so a search takes well under a millisecond however many mods are mirrored. If SQLite was built without FTS5, searches fall back to a scan of the mirror.
+    Category names are only known once the categories of the game are mirrored (see ModMirror.setCategories()). All methods are thread-safe.
+    """
+    
+    # Columns of the mirrored mods, and the field of the mod response each comes from
+    _fields = (("name","name"),("summary","summary"),("author","author"),("uploadedBy","uploaded_by"),("categoryId","category_id"),("version","version"),("endorsements","endorsement_count"),("downloads","mod_downloads"),("updatedTimestamp","updated_timestamp"),("available","available"),("adult","contains_adult_content"))
+    
+    # Seconds in each period accepted by NexusApi.getUpdated(). A month is counted as 28 days so the period always covers the full gap
+    _updatedPeriods = (("1d", 24*60*60),("1w", 7*24*60*60),("1m", 28*24*60*60))
+    # Safety margin (in seconds) covering clock differences with the server
+    _syncMargin = 60*60
+    
+    def __init__(self, path: str):
+        """Create a new ModMirror object, creating the database if it doesn't exist.
+
+        Args:
+            path (str): The path of the SQLite database file (":memory:" for a mirror in memory only).
+        """
+        # If the required directories don't exist, make them
+        if (path != ":memory:"):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS mods (game TEXT NOT NULL, id INTEGER NOT NULL, " + ", ".join(column for column,_ in ModMirror._fields) + ", storedAt REAL, PRIMARY KEY (game, id))")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS modsAuthor ON mods (author COLLATE NOCASE)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS modsUploadedBy ON mods (uploadedBy COLLATE NOCASE)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS modsCategory ON mods (categoryId, game)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS modsEndorsements ON mods (endorsements)")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS categories (game TEXT NOT NULL, id INTEGER NOT NULL, name TEXT, parentId INTEGER, PRIMARY KEY (game, id))")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS syncState (game TEXT PRIMARY KEY, lastSync REAL)")
+        
+        # The full-text index shares the rowid of the mods table
+        try:
+            self._connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS modsSearch USING fts5(name, summary, author, category, tokenize = 'unicode61 remove_diacritics 2')")
+            self._fullText = True
+        except sqlite3.OperationalError:
+            self._fullText = False
+        self._connection.commit()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM mods").fetchone()[0]
+    
+    def close(self):
+        """Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+    
+    @property
+    def fullText(self) -> bool:
+        """True if searches use the FTS5 full-text index, False if they scan the mirror (SQLite built without FTS5)."""
+        return self._fullText
+    
+    def put(self, game: str, modJson: dict) -> bool:
+        """Add or update a mod from its response (see NexusApi.getMod()).
+
+        Args:
+            game (str): The game domain of the mod.
+            modJson (dict): The decoded response.
+
+        Raises:
+            Exception: If the response has no "mod_id".
+
+        Returns:
+            bool: True if the mod was added or changed.
+        """
+        return self.putMany(game,[modJson]) > 0
+    
+    def putMany(self, game: str, modJsons) -> int:
+        """Add or update several mods at once, in a single transaction (e.g. the response of NexusApi.getTrending()).
+
+        Args:
+            game (str): The game domain of the mods.
+            modJsons (iterable): The decoded responses.
+
+        Raises:
+            Exception: If any response has no "mod_id".
+
+        Returns:
+            int: The number of mods added or changed.
+        """
+        rows = []
+        for modJson in modJsons:
+            if ((not isinstance(modJson,dict)) or (not isinstance(modJson.get("mod_id"),int))):
+                raise Exception("Valid mod response not provided. Response must contain a \"mod_id\"")
+            rows.append((modJson["mod_id"],) + tuple(ModMirror._toColumn(modJson.get(field)) for _,field in ModMirror._fields))
+        
+        storedAt = time.time()
+        changed = 0
+        with self._lock, self._connection:
+            categories = self._loadCategories(game)
+            for row in rows:
+                existing = self._connection.execute("SELECT rowid, " + ", ".join(column for column,_ in ModMirror._fields) + " FROM mods WHERE game = ? AND id = ?", (game,row[0])).fetchone()
+                if (existing is None):
+                    rowid = self._connection.execute("INSERT INTO mods VALUES (?, ?, " + ", ".join("?" for _ in ModMirror._fields) + ", ?)", (game,) + row + (storedAt,)).lastrowid
+                elif (tuple(existing)[1:] != row[1:]):
+                    rowid = existing["rowid"]
+                    self._connection.execute("UPDATE mods SET " + ", ".join(column + " = ?" for column,_ in ModMirror._fields) + ", storedAt = ? WHERE rowid = ?", row[1:] + (storedAt,rowid))
+                else:
+                    # Unchanged, only record that the mod is up to date
+                    self._connection.execute("UPDATE mods SET storedAt = ? WHERE rowid = ?", (storedAt,existing["rowid"]))
+                    continue
+                changed += 1
+                if (self._fullText):
+                    self._index(rowid,dict(zip((column for column,_ in ModMirror._fields),row[1:])),categories)
+        return changed
+    
+    def get(self, game: str, id: int) -> dict:
+        """Returns a mirrored mod.
+
+        Args:
+            game (str): The game domain of the mod.
+            id (int): The ID of the mod.
+
+        Returns:
+            dict: The mod (see ModMirror.search()), or None if it isn't mirrored.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT m.*, c.name AS category FROM mods m LEFT JOIN categories c ON c.game = m.game AND c.id = m.categoryId WHERE m.game = ? AND m.id = ?", (game,id)).fetchone()
+        return ModMirror._toDict(row) if (row is not None) else None
+    
+    def remove(self, game: str, id: int) -> bool:
+        """Remove a mod from the mirror (e.g. a mod deleted from Nexus Mods).
+
+        Args:
+            game (str): The game domain of the mod.
+            id (int): The ID of the mod.
+
+        Returns:
+            bool: True if the mod was mirrored.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT rowid FROM mods WHERE game = ? AND id = ?", (game,id)).fetchone()
+            if (row is None):
+                return False
+            self._connection.execute("DELETE FROM mods WHERE rowid = ?", (row["rowid"],))
+            if (self._fullText):
+                self._connection.execute("DELETE FROM modsSearch WHERE rowid = ?", (row["rowid"],))
+        return True
+    
+    def setCategories(self, game: str, categories: list) -> int:
+        """Mirror the mod categories of a game, so mods can be searched by category name.
+
+        Args:
+            game (str): The game domain.
+            categories (list): The "categories" of the game (see NexusApi.getGame()), as dicts with "category_id", "name" and "parent_category".
+
+        Returns:
+            int: The number of categories.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM categories WHERE game = ?", (game,))
+            self._connection.executemany("INSERT INTO categories VALUES (?, ?, ?, ?)", [(game,category["category_id"],category.get("name"),category.get("parent_category") or None) for category in categories])
+            # Index the category names of the mods already mirrored
+            if (self._fullText):
+                names = self._loadCategories(game)
+                for row in self._connection.execute("SELECT rowid, categoryId FROM mods WHERE game = ?", (game,)).fetchall():
+                    self._connection.execute("UPDATE modsSearch SET category = ? WHERE rowid = ?", (names.get(row["categoryId"]),row["rowid"]))
+        return len(categories)
+    
+    def search(self, query: str = None, game: str = None, author: str = None, category = None, limit: int = 50) -> list:
+        """Search the mirrored mods.
+
+        Every word of the query must match the start of a word of the name, summary, author or category of the mod (case and accents are ignored). The other arguments filter the results on exact values.
+
+        Args:
+            query (str, optional): The words to search for (e.g. "better inventory"). Defaults to None (every mod matching the filters).
+            game (str, optional): Only return mods of this game domain. Defaults to None (every game).
+            author (str, optional): Only return mods of this author (case is ignored). Defaults to None.
+            category (int or str, optional): Only return mods of this category, by ID or by name (case is ignored). Defaults to None.
+            limit (int, optional): The maximum number of mods to return. Defaults to 50.
+
+        Raises:
+            Exception: If limit is not >0.
+
+        Returns:
+            list: The mods found, best matches first (most endorsed first without a query), as dicts with "game", "id", "name", "summary", "author", "uploadedBy", "categoryId", "category" (None if the categories of the game aren't mirrored), "version", "endorsements", "downloads", "updatedTimestamp" (epoch seconds), "available", "adult" and "storedAt" (epoch seconds).
+        """
+        if ((not isinstance(limit,int)) or limit <= 0):
+            raise Exception("Valid limit not provided. Limit must be value >0")
+        
+        words = re.findall(r"\w+", query) if (query is not None) else []
+        fullText = (len(words) > 0) and (self._fullText)
+        conditions = []
+        args = []
+        if (fullText):
+            # Quoted words can't be read as FTS5 operators, the * matches words starting with them
+            conditions.append("modsSearch MATCH ?")
+            args.append(" ".join('"' + word + '"*' for word in words))
+        else:
+            for word in words:
+                conditions.append("(m.name LIKE ? OR m.summary LIKE ? OR m.author LIKE ? OR m.uploadedBy LIKE ? OR c.name LIKE ?)")
+                args.extend(["%" + word + "%"] * 5)
+        
+        # Each filter is written so it can use an index of the mods table
+        if (game is not None):
+            conditions.append("m.game = ?")
+            args.append(game)
+        if (author is not None):
+            conditions.append("m.rowid IN (SELECT rowid FROM mods WHERE author = ? COLLATE NOCASE UNION SELECT rowid FROM mods WHERE uploadedBy = ? COLLATE NOCASE)")
+            args.extend([author,author])
+        if (isinstance(category,int)):
+            conditions.append("m.categoryId = ?")
+            args.append(category)
+        elif (category is not None):
+            conditions.append("(m.categoryId, m.game) IN (SELECT id, game FROM categories WHERE name = ? COLLATE NOCASE)")
+            args.append(category)
+        
+        where = (" WHERE " + " AND ".join(conditions)) if (len(conditions) > 0) else ""
+        join = " LEFT JOIN categories c ON c.game = m.game AND c.id = m.categoryId"
+        if (fullText):
+            # Rank the matches left after the filters (bm25() is only computed for those, unlike the rank column), then read only the mods returned
+            filtered = " JOIN mods m ON m.rowid = modsSearch.rowid" if (len(conditions) > 1) else ""
+            ranked = "SELECT modsSearch.rowid AS id, bm25(modsSearch) AS score FROM modsSearch" + filtered + where + " ORDER BY score, modsSearch.rowid LIMIT ?"
+            sql = "SELECT m.*, c.name AS category FROM (" + ranked + ") s JOIN mods m ON m.rowid = s.id" + join + " ORDER BY s.score, m.rowid"
+        else:
+            sql = "SELECT m.*, c.name AS category FROM mods m" + join + where + " ORDER BY m.endorsements DESC, m.rowid DESC LIMIT ?"
+        args.append(limit)
+        
+        with self._lock:
+            rows = self._connection.execute(sql, args).fetchall()
+        return [ModMirror._toDict(row) for row in rows]
+    
+    def sync(self, nexusApi, game: str, ids: list = None, maxConcurrency: int = 8, addNew: bool = False) -> dict:
+        """Keep the mirror of a game fresh: mirror the given mods that aren't mirrored yet, and request again the mirrored mods that changed since they were mirrored.
+
+        Changed mods are found with a single getUpdated() request, covering the time since the last sync of the game. If the game was never synced, only the given mods are requested. If it was last synced more than a month ago, every mirrored mod of the game is requested again.
+        The categories of the game are requested with getGame() on the first sync, and again when every mod is requested.
+        Mods that no longer exist (response code 404) are removed from the mirror. The sync time is only recorded if every request succeeded, so mods that could not be requested are found again by the next sync.
+
+        Args:
+            nexusApi (NexusApi): The API interface to use.
+            game (str): The game domain.
+            ids (list, optional): IDs of mods to mirror if they aren't mirrored yet. Defaults to None.
+            maxConcurrency (int, optional): The maximum number of mods to request at once. Defaults to 8.
+            addNew (bool, optional): If the mods reported by getUpdated() that aren't mirrored yet should be mirrored too. Defaults to False.
+
+        Returns:
+            dict: "period" (the getUpdated() period used, or None), "requested" (mods requested), "changed" (mods added or changed), "removed" (IDs of the mods removed) and "failed" (IDs of the mods that could not be requested, or None for the getGame() or getUpdated() request).
+        """
+        syncStarted = time.time()
+        with self._lock:
+            storedAt = {row["id"]: row["storedAt"] for row in self._connection.execute("SELECT id, storedAt FROM mods WHERE game = ?", (game,))}
+            row = self._connection.execute("SELECT lastSync FROM syncState WHERE game = ?", (game,)).fetchone()
+        lastSync = row["lastSync"] if (row is not None) else None
+        
+        # Mods to request, in order and without duplicates
+        fetchIds = {}
+        for id in (ids or []):
+            if (id not in storedAt):
+                fetchIds[id] = None
+        
+        failed = []
+        period = ModMirror._selectPeriod(lastSync,syncStarted)
+        if (period is None):
+            # Categories of a game rarely change, only request them on the first sync (and the monthly refresh)
+            response = nexusApi.getGame(game)
+            if (response.status_code != 200):
+                failed.append(None)
+            else:
+                self.setCategories(game,response.json().get("categories") or [])
+        if ((lastSync is not None) and (period is None)):
+            # Last synced too long ago for getUpdated(), refresh every mirrored mod
+            for id in storedAt:
+                fetchIds[id] = None
+        elif (period is not None):
+            response = nexusApi.getUpdated(game,period)
+            if (response.status_code != 200):
+                failed.append(None)
+            else:
+                for mod in response.json():
+                    activity = max(mod.get("latest_mod_activity") or 0,mod.get("latest_file_update") or 0)
+                    # Request the mods mirrored before their latest activity
+                    if (mod["mod_id"] in storedAt):
+                        if (activity > storedAt[mod["mod_id"]] - ModMirror._syncMargin):
+                            fetchIds[mod["mod_id"]] = None
+                    elif (addNew):
+                        fetchIds[mod["mod_id"]] = None
+        
+        changed = 0
+        removed = []
+        if (len(fetchIds) > 0):
+            modJsons = []
+            for result in nexusApi.getMods(game,list(fetchIds),maxConcurrency):
+                if (result.ok):
+                    modJsons.append(result.response.json())
+                elif ((result.response is not None) and (result.response.status_code == 404)):
+                    if (self.remove(game,result.id)):
+                        removed.append(result.id)
+                else:
+                    failed.append(result.id)
+            changed = self.putMany(game,modJsons)
+        
+        if (len(failed) == 0):
+            with self._lock, self._connection:
+                self._connection.execute("INSERT OR REPLACE INTO syncState VALUES (?, ?)", (game,syncStarted))
+        return {"period": period,"requested": len(fetchIds),"changed": changed,"removed": removed,"failed": failed}
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the ModMirror class
+    #
+    ################################
+    
+    def _loadCategories(self, game: str) -> dict:
+        """Returns the category names of a game, keyed by category ID. Must be called with the lock held."""
+        return {row["id"]: row["name"] for row in self._connection.execute("SELECT id, name FROM categories WHERE game = ?", (game,))}
+    
+    def _index(self, rowid: int, mod: dict, categories: dict):
+        """Replace the full-text index entry of a mod. Must be called with the lock held."""
+        authors = mod["author"] or ""
+        if (mod["uploadedBy"] and (mod["uploadedBy"] != mod["author"])):
+            authors += " " + mod["uploadedBy"]
+        self._connection.execute("DELETE FROM modsSearch WHERE rowid = ?", (rowid,))
+        self._connection.execute("INSERT INTO modsSearch (rowid, name, summary, author, category) VALUES (?, ?, ?, ?, ?)", (rowid,mod["name"],mod["summary"],authors,categories.get(mod["categoryId"])))
+    
+    def _selectPeriod(lastSync: float, now: float) -> str:
+        """Returns the shortest getUpdated() period covering the time since the last sync, or None if there is none (never synced, or more than a month ago)."""
+        if (lastSync is None):
+            return None
+        elapsed = now - lastSync + ModMirror._syncMargin
+        for period,seconds in ModMirror._updatedPeriods:
+            if (elapsed <= seconds):
+                return period
+        return None
+    
+    def _toColumn(value):
+        """Convert a field of the mod response to its column value (booleans are stored as 0/1)."""
+        if (isinstance(value,bool)):
+            return int(value)
+        return value
+    
+    def _toDict(row: sqlite3.Row) -> dict:
+        """Convert a row of the mods table (joined with its category name) to the mod dict returned by the search."""
+        mod = dict(row)
+        for column in ("available","adult"):
+            if (mod[column] is not None):
+                mod[column] = bool(mod[column])
+        return mod
@@ -0,0 +1,130 @@
+# ModRecord.py
+
+# Imports Required Dependencies
+from datetime import datetime, timezone
+
+class ModRecord:
+    """A compact record of one mod of a mod list.
+
+    Times are stored as integer epoch microseconds (UTC) instead of ISO 8601 strings, so they are parsed once when the record is created and compared as plain integers afterwards. The URL of the mod page is not stored, it is derived from the game domain and mod ID.
+
+    Records convert to and from the mod info format of the mod list files with ModRecord.fromDict() and ModRecord.toDict():
+    {"name": "ABC123","id": 123,"updatedTime": "YYYY-MM-DDTHH:MM:SS.SSS+TZ","lastDownloaded": "YYYY-MM-DDTHH:MM:SS.SSSSSS+TZ","url": "https://www.nexusmods.com/gameDomain/mods/modId"}
+    """
+    
+    __slots__ = ("game","id","name","updatedTime","lastDownloaded","extra")
+    
+    # Fields of the mod info format, in order
+    _fields = ("name","id","updatedTime","lastDownloaded","url")
+    
+    # Start of the epoch, used to convert times exactly (without going through floats)
+    _epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    
+    def __init__(self, game: str, id: int, name: str = None, updatedTime: int = None, lastDownloaded: int = None, extra: dict = None):
+        """Create a new ModRecord object.
+
+        Args:
+            game (str): The game domain of the mod.
+            id (int): The ID of the mod.
+            name (str, optional): The name of the mod. Defaults to None.
+            updatedTime (int, optional): The time the mod page was last updated, as epoch microseconds. Defaults to None.
+            lastDownloaded (int, optional): The time the mod was last downloaded, as epoch microseconds. Defaults to None.
+            extra (dict, optional): Any other fields of the mod info, kept as they are. Defaults to None.
+        """
+        self.game = game
+        self.id = id
+        self.name = name
+        self.updatedTime = updatedTime
+        self.lastDownloaded = lastDownloaded
+        self.extra = extra
+    
+    def fromDict(game: str, mod: dict):
+        """Create a new ModRecord object from a mod info.
+
+        Args:
+            game (str): The game domain of the mod.
+            mod (dict): The mod info, as read from a mod list file.
+
+        Raises:
+            ValueError: If a time is not a valid ISO 8601 time.
+
+        Returns:
+            ModRecord: The record.
+        """
+        extra = {field: value for field,value in mod.items() if field not in ModRecord._fields}
+        return ModRecord(game,mod.get("id"),mod.get("name"),ModRecord.toEpoch(mod.get("updatedTime")),ModRecord.toEpoch(mod.get("lastDownloaded")),extra or None)
+    
+    def toDict(self) -> dict:
+        """Returns the mod info of the record, as written to a mod list file. Times are written in UTC.
+
+        Returns:
+            dict: The mod info.
+        """
+        # The API returns updatedTime with millisecond precision, keep that format unless more precision is required
+        updatedTimespec = "milliseconds" if ((self.updatedTime is None) or (self.updatedTime % 1000 == 0)) else "microseconds"
+        mod = {"name": self.name,"id": self.id,"updatedTime": ModRecord.fromEpoch(self.updatedTime,updatedTimespec),"lastDownloaded": ModRecord.fromEpoch(self.lastDownloaded,"microseconds"),"url": self.url}
+        if (self.extra):
+            mod.update(self.extra)
+        return mod
+    
+    def copy(self):
+        """Returns a copy of the record.
+
+        Returns:
+            ModRecord: The copy.
+        """
+        return ModRecord(self.game,self.id,self.name,self.updatedTime,self.lastDownloaded,dict(self.extra) if self.extra else None)
+    
+    @property
+    def url(self) -> str:
+        """The URL of the mod page."""
+        return "https://www.nexusmods.com/" + str(self.game) + "/mods/" + str(self.id)
+    
+    def isStale(self) -> bool:
+        """True if the mod page was updated after the mod was last downloaded (False if either time is unknown)."""
+        return (self.lastDownloaded is not None) and (self.updatedTime is not None) and (self.lastDownloaded < self.updatedTime)
+    
+    def __eq__(self, other):
+        if not isinstance(other, ModRecord):
+            return NotImplemented
+        return (self.game == other.game) and (self.id == other.id) and (self.name == other.name) and (self.updatedTime == other.updatedTime) and (self.lastDownloaded == other.lastDownloaded) and (self.extra == other.extra)
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return "<ModRecord {0}/{1} name={2!r}>".format(self.game,self.id,self.name)
+    
+    def toEpoch(value: str) -> int:
+        """Convert an ISO 8601 time (e.g. "2024-01-01T00:00:00.000+00:00") into epoch microseconds.
+
+        Args:
+            value (str): The time. Times without a timezone are read as UTC.
+
+        Raises:
+            ValueError: If the time is not a valid ISO 8601 time.
+
+        Returns:
+            int: The time as epoch microseconds, or None if no time is provided.
+        """
+        if (not value):
+            return None
+        time = datetime.fromisoformat(value)
+        if (time.tzinfo is None):
+            time = time.replace(tzinfo=timezone.utc)
+        delta = time - ModRecord._epoch
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+    
+    def fromEpoch(value: int, timespec: str = "microseconds") -> str:
+        """Convert epoch microseconds into an ISO 8601 time in UTC (e.g. "2024-01-01T00:00:00.000000+00:00").
+
+        Args:
+            value (int): The time as epoch microseconds.
+            timespec (str, optional): The precision of the time (see datetime.isoformat()). Defaults to "microseconds".
+
+        Returns:
+            str: The time, or None if no time is provided.
+        """
+        if (value is None):
+            return None
+        seconds, microseconds = divmod(value, 1000000)
+        return datetime.fromtimestamp(seconds, timezone.utc).replace(microsecond=microseconds).isoformat(timespec=timespec)
@@ -0,0 +1,431 @@
+# ModWatcher.py
+
+# Imports Required Dependencies
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+class ModWatcher:
+    """Watches the mod feeds of many games, and reports only the mods that were added or updated (or started trending) since the last poll.
+
+    Each feed of each game (getLatestAdded(), getLatestUpdated(), getTrending() and getUpdated()) is polled on its own adaptive schedule: every minInterval seconds while it changes, backing off up to maxInterval seconds while it doesn't.
+    A hash of each response is kept, so an unchanged payload is skipped without being decoded. A changed payload is compared with the snapshot of the last poll of the same feed, and an event is sent to every sink for each change found.
+    A mod is reported once per change, by the first feed to show it (a new mod is reported as added as long as it wasn't updated since it was created, unless getUpdated(), whose entries hold no creation time, shows it first). The first poll of a feed only takes its snapshot, so a new watcher doesn't report every mod already in the feeds. Snapshots can be kept in a state file, so a restarted watcher only reports the changes made while it was stopped.
+
+    Events are dicts: {"event": "added", "updated" or "trending", "game": "baldursgate3", "modId": 123, "feed": "latestAdded", "version": (the latest update of the mod, epoch seconds), "detectedAt": (epoch seconds), "item": (the entry of the feed)}.
+    Sinks are functions called with each event, e.g. an EventFile (JSON Lines file) or an EventSocket (local socket).
+    """
+    
+    # The feeds that can be watched, mapped to the NexusApi method requesting them, in polling order
+    _feedMethods = {
+        "latestAdded": "getLatestAdded",
+        "latestUpdated": "getLatestUpdated",
+        "updated": "getUpdated",
+        "trending": "getTrending",
+    }
+    
+    # The number of mods of each game whose latest reported version is kept, so a change shown by several feeds is only reported once
+    _reportedSize = 10000
+    
+    # Factor applied to the interval of a feed after each poll without changes (or with an error)
+    _backoff = 2
+    
+    def __init__(self, nexusApi, games: list, sinks: list = None, feeds: list = None, minInterval: float = 60, maxInterval: float = 900, updatedPeriod: str = "1d", maxConcurrency: int = 4, stateFile: str = None):
+        """Create a new ModWatcher object. Nothing is polled until ModWatcher.poll(), ModWatcher.run() or ModWatcher.start() is called.
+
+        Args:
+            nexusApi (NexusApi): The API interface to use. Its RateLimiter paces the polls of every feed.
+            games (list): The game domains to watch (e.g. ["baldursgate3", "skyrimspecialedition"]).
+            sinks (list, optional): Functions called as sink(event) for each event. More can be added with ModWatcher.addSink(). Defaults to None.
+            feeds (list, optional): The feeds to watch, among "latestAdded", "latestUpdated", "updated" and "trending". Defaults to None (every feed).
+            minInterval (float, optional): The interval (in seconds) between two polls of a feed that changed. Defaults to 60.
+            maxInterval (float, optional): The longest interval (in seconds) between two polls of a feed. Defaults to 900.
+            updatedPeriod (str, optional): The period of the getUpdated() feed: 1d, 1w or 1m. Defaults to "1d".
+            maxConcurrency (int, optional): The maximum number of feeds polled at once. Defaults to 4.
+            stateFile (str, optional): The JSON file to keep the snapshots in across restarts. Defaults to None (snapshots kept in memory only).
+
+        Raises:
+            Exception: If no game is provided, a feed is unknown, or the intervals, period or maxConcurrency are not valid.
+        """
+        if ((not isinstance(games,(list,tuple))) or (len(games) == 0) or (not all(isinstance(game,str) and (game != "") for game in games))):
+            raise Exception("Valid games not provided. Games must be a non-empty list of game domains (str).")
+        feeds = list(ModWatcher._feedMethods) if (feeds is None) else list(feeds)
+        if ((len(feeds) == 0) or (not set(feeds).issubset(ModWatcher._feedMethods))):
+            raise Exception("Valid feeds not provided. Feeds must be among " + ", ".join(ModWatcher._feedMethods))
+        if ((not isinstance(minInterval,(int,float))) or minInterval <= 0):
+            raise Exception("Valid min interval not provided. Min interval must be value >0")
+        if ((not isinstance(maxInterval,(int,float))) or maxInterval < minInterval):
+            raise Exception("Valid max interval not provided. Max interval must be value >= min interval")
+        if (updatedPeriod not in ("1d","1w","1m")):
+            raise Exception("Valid updated period not provided. Period must be 1d (1 day), 1w (1 week), or 1m (1 month)")
+        if ((not isinstance(maxConcurrency,int)) or maxConcurrency <= 0):
+            raise Exception("Valid max concurrency not provided. Max concurrency must be value >0")
+        
+        self._nexusApi = nexusApi
+        self._sinks = list(sinks or [])
+        self._minInterval = minInterval
+        self._maxInterval = maxInterval
+        self._updatedPeriod = updatedPeriod
+        self._maxConcurrency = maxConcurrency
+        self._stateFile = Path(stateFile) if stateFile else None
+        self._stopEvent = threading.Event()
+        self._thread = None
+        self._stats = {"polls": 0,"unchanged": 0,"errors": 0,"events": 0,"sinkErrors": 0}
+        # The latest version of each mod reported (or known from the first snapshots), keyed by game then mod ID, least recently changed first
+        self._reported = {}
+        
+        # The schedule and snapshot of each (game, feed), in polling order
+        self._watches = {}
+        for game in dict.fromkeys(games):
+            for feed in ModWatcher._feedMethods:
+                if (feed in feeds):
+                    self._watches[(game,feed)] = {"interval": minInterval,"nextPoll": 0.0,"hash": None,"items": None}
+        self._loadState()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.stop()
+    
+    def addSink(self, sink):
+        """Add a function called as sink(event) for each event.
+
+        Args:
+            sink (function): The sink to add (e.g. an EventFile or EventSocket).
+        """
+        self._sinks.append(sink)
+    
+    def getStats(self) -> dict:
+        """Returns the activity of the watcher since it was created.
+
+        Returns:
+            dict: "polls" (requests sent), "unchanged" (responses skipped because their hash didn't change), "errors" (failed polls), "events" (events sent) and "sinkErrors" (exceptions raised by the sinks, which are otherwise ignored).
+        """
+        return dict(self._stats)
+    
+    def getSchedule(self) -> dict:
+        """Returns the current interval of each feed.
+
+        Returns:
+            dict: The interval (in seconds) until the next poll of each feed, keyed by "game/feed".
+        """
+        return {game + "/" + feed: watch["interval"] for (game,feed),watch in self._watches.items()}
+    
+    def poll(self, force: bool = False) -> list:
+        """Poll every feed that is due (or every feed, if forced), then send the events found to the sinks.
+
+        Args:
+            force (bool, optional): If every feed should be polled now, whatever its schedule. Defaults to False.
+
+        Returns:
+            list: The events found, in feed order.
+        """
+        now = time.monotonic()
+        due = [key for key,watch in self._watches.items() if (force) or (watch["nextPoll"] <= now)]
+        if (len(due) == 0):
+            return []
+        
+        # Requests are sent in parallel, the responses are compared in feed order so the events are in a stable order
+        with ThreadPoolExecutor(max_workers=min(self._maxConcurrency,len(due))) as executor:
+            responses = list(executor.map(self._fetch,due))
+        
+        events = []
+        changed = False
+        for key,response in zip(due,responses):
+            watch = self._watches[key]
+            self._stats["polls"] += 1
+            if ((response is None) or (response.status_code != 200)):
+                self._stats["errors"] += 1
+                watch["interval"] = min(watch["interval"] * ModWatcher._backoff,self._maxInterval)
+            else:
+                digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+                if (digest == watch["hash"]):
+                    self._stats["unchanged"] += 1
+                    watch["interval"] = min(watch["interval"] * ModWatcher._backoff,self._maxInterval)
+                else:
+                    events.extend(self._compare(key,response.json()))
+                    watch["hash"] = digest
+                    watch["interval"] = self._minInterval
+                    changed = True
+            watch["nextPoll"] = time.monotonic() + watch["interval"]
+        
+        for event in events:
+            self._emit(event)
+        if (changed):
+            self._saveState()
+        return events
+    
+    def run(self, duration: float = None):
+        """Poll the feeds on their schedule until ModWatcher.stop() is called (or for a limited time).
+
+        Args:
+            duration (float, optional): The time (in seconds) to run for. Defaults to None (until stopped).
+        """
+        end = None if (duration is None) else time.monotonic() + duration
+        self._stopEvent.clear()
+        while (not self._stopEvent.is_set()):
+            self.poll()
+            nextPoll = min(watch["nextPoll"] for watch in self._watches.values())
+            if (end is not None):
+                if (time.monotonic() >= end):
+                    break
+                nextPoll = min(nextPoll,end)
+            self._stopEvent.wait(max(nextPoll - time.monotonic(),0))
+    
+    def start(self):
+        """Run the watcher on a background thread, until ModWatcher.stop() is called.
+
+        Returns:
+            ModWatcher: The watcher itself.
+        """
+        if (self._thread is None):
+            self._stopEvent.clear()
+            self._thread = threading.Thread(target=self.run, name="ModWatcher", daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop the watcher, waiting for the polls in progress to finish."""
+        self._stopEvent.set()
+        if ((self._thread is not None) and (self._thread is not threading.current_thread())):
+            self._thread.join()
+        self._thread = None
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the ModWatcher class
+    #
+    ################################
+    
+    def _fetch(self, key: tuple):
+        """Request a feed of a game.
+
+        Returns:
+            NexusResponse: The response, or None if the request could not be sent.
+        """
+        game, feed = key
+        method = getattr(self._nexusApi,ModWatcher._feedMethods[feed])
+        try:
+            if (feed == "updated"):
+                return method(game,self._updatedPeriod)
+            return method(game)
+        except Exception:
+            return None
+    
+    def _compare(self, key: tuple, payload) -> list:
+        """Update the snapshot of a feed with a new payload.
+
+        Returns:
+            list: The events of the mods that changed (or entered the feed) since the last snapshot. Empty on the first snapshot.
+        """
+        game, feed = key
+        items = {}
+        entries = {}
+        for entry in (payload if isinstance(payload,list) else []):
+            modId = entry.get("mod_id")
+            if (modId is not None):
+                items[modId] = ModWatcher._version(entry)
+                entries[modId] = entry
+        
+        watch = self._watches[key]
+        previous = watch["items"]
+        watch["items"] = items
+        events = []
+        detectedAt = time.time()
+        for modId,version in items.items():
+            if (feed == "trending"):
+                # Trending mods are reported as they enter the feed, whatever their version
+                if ((previous is not None) and (modId not in previous)):
+                    events.append({"event": "trending","game": game,"modId": modId,"feed": feed,"version": version,"detectedAt": detectedAt,"item": entries[modId]})
+                continue
+            if (not self._remember(game,modId,version)):
+                continue
+            if (previous is not None):
+                # A mod never updated since it was created is reported as added, even if the feed of the latest updated mods shows it first
+                added = (feed == "latestAdded") or (entries[modId].get("created_timestamp") == version)
+                events.append({"event": "added" if added else "updated","game": game,"modId": modId,"feed": feed,"version": version,"detectedAt": detectedAt,"item": entries[modId]})
+        return events
+    
+    def _remember(self, game: str, modId: int, version: int) -> bool:
+        """Record the latest version of a mod reported (or known from the first snapshots). Only the last _reportedSize mods of each game are kept.
+
+        Returns:
+            bool: True if the version is newer than the one recorded before, so it wasn't reported yet.
+        """
+        reported = self._reported.setdefault(game,{})
+        known = reported.pop(modId,None)
+        if ((known is not None) and (known >= version)):
+            reported[modId] = known
+            return False
+        reported[modId] = version
+        if (len(reported) > ModWatcher._reportedSize):
+            del reported[next(iter(reported))]
+        return True
+    
+    def _version(entry: dict) -> int:
+        """The latest update of a feed entry (epoch seconds): updated_timestamp for mods, the latest activity for getUpdated() entries."""
+        if ("updated_timestamp" in entry):
+            return entry.get("updated_timestamp") or 0
+        return max(entry.get("latest_file_update") or 0,entry.get("latest_mod_activity") or 0)
+    
+    def _emit(self, event: dict):
+        """Send an event to every sink. A sink raising an exception doesn't stop the others, or the watcher."""
+        self._stats["events"] += 1
+        for sink in self._sinks:
+            try:
+                sink(event)
+            except Exception:
+                self._stats["sinkErrors"] += 1
+    
+    def _loadState(self):
+        """Load the snapshots of the state file, if there is one."""
+        if ((self._stateFile is None) or (not Path.exists(self._stateFile))):
+            return
+        with open(self._stateFile, encoding='utf-8') as f:
+            state = json.load(f)
+        for (game,feed),watch in self._watches.items():
+            snapshot = state.get(game + "/" + feed)
+            if (snapshot is not None):
+                watch["hash"] = snapshot["hash"]
+                watch["items"] = {int(modId): version for modId,version in snapshot["items"].items()}
+        for game,reported in state.get("reported",{}).items():
+            self._reported[game] = {int(modId): version for modId,version in reported.items()}
+    
+    def _saveState(self):
+        """Write the snapshots to the state file (replaced only once fully written), if there is one."""
+        if (self._stateFile is None):
+            return
+        state = {}
+        for (game,feed),watch in self._watches.items():
+            if (watch["items"] is not None):
+                state[game + "/" + feed] = {"hash": watch["hash"],"items": watch["items"]}
+        state["reported"] = self._reported
+        self._stateFile.parent.mkdir(parents=True, exist_ok=True)
+        tempPath = self._stateFile.with_name(self._stateFile.name + ".tmp")
+        with open(tempPath, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tempPath,self._stateFile)
+
+class EventFile:
+    """A ModWatcher sink appending each event to a JSON Lines file (one event per line), flushed as it is written."""
+    
+    def __init__(self, path: str):
+        """Create a new EventFile object.
+
+        Args:
+            path (str): The path of the file. Created (along with its directory) if it doesn't exist, appended to otherwise.
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+    
+    def __call__(self, event: dict):
+        line = json.dumps(event, separators=(",",":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            self._file.close()
+
+class EventSocket:
+    """A ModWatcher sink sending each event to every client connected to a local socket, as JSON Lines.
+
+    Clients connect at any time and receive the events sent from then on (e.g. "nc 127.0.0.1 8765", or "nc -U watcher.sock"). A client that disconnects is dropped.
+    """
+    
+    def __init__(self, address):
+        """Create a new EventSocket object and start accepting clients on a background thread.
+
+        Args:
+            address (str or tuple): "host:port" or a (host, port) tuple for a TCP socket (port 0 picks any free port, see EventSocket.address), or the path of a Unix domain socket.
+
+        Raises:
+            Exception: If the address is not valid, or Unix domain sockets are not available (e.g. on Windows).
+        """
+        if (isinstance(address,str) and (":" in address) and (address.rsplit(":",1)[1].isdigit())):
+            host, port = address.rsplit(":",1)
+            address = (host,int(port))
+        if (isinstance(address,tuple)):
+            self._server = socket.create_server(address)
+        elif (isinstance(address,str) and (address != "")):
+            if (not hasattr(socket,"AF_UNIX")):
+                raise Exception("Valid address not provided. Unix domain sockets are not available, use \"host:port\".")
+            if (Path.exists(Path(address))):
+                os.remove(address)
+            self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._server.bind(address)
+            self._server.listen()
+        else:
+            raise Exception("Valid address not provided. Address must be \"host:port\", a (host, port) tuple or a socket path.")
+        self._clients = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._accept, name="EventSocket", daemon=True)
+        self._thread.start()
+    
+    def __call__(self, event: dict):
+        line = (json.dumps(event, separators=(",",":")) + "\n").encode("utf-8")
+        with self._lock:
+            for client in list(self._clients):
+                try:
+                    client.sendall(line)
+                except OSError:
+                    self._clients.remove(client)
+                    client.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    @property
+    def address(self):
+        """The address the socket listens on: a (host, port) tuple, or the socket path."""
+        return self._server.getsockname()
+    
+    @property
+    def clientCount(self) -> int:
+        """The number of clients connected."""
+        with self._lock:
+            return len(self._clients)
+    
+    def close(self):
+        """Stop accepting clients, and disconnect every client."""
+        self._server.close()
+        with self._lock:
+            for client in self._clients:
+                client.close()
+            self._clients = []
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the EventSocket class
+    #
+    ################################
+    
+    def _accept(self):
+        """Accept clients until the socket is closed."""
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            with self._lock:
+                self._clients.append(client)
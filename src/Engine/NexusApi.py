@@ -2,8 +2,20 @@
 
 # Imports Required Dependencies
 import copy
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .ApiKeyPool import ApiKeyPool
+from .NexusResponse import NexusResponse, BatchResult
+from .RateLimiter import RateLimiter
+from .RequestMetrics import RequestEvent
+from .ResponseCache import ResponseCache
+from .MemoryCache import MemoryCache
 
 class NexusApi:
     """Interface for the Nexus Mods website API. Requires active user API token for use.
@@ -16,92 +28,229 @@ class NexusApi:
     # The API URL to access. This is the Base URL for Nexus Mods API
     _api_url = "https://api.nexusmods.com/"
     
-    def __init__(self, apiKey: str):
+    def __init__(self, apiKey, poolSize: int = 10, maxRetries: int = 3, backoffFactor: float = 0.5, keepAlive: bool = True, timeout: float = 30, copyResponses: bool = False, apiUrl: str = None, rateLimiter: RateLimiter = None, cache: ResponseCache = None, memoryCache: MemoryCache = None, hooks: list = None, keyValidation: str = "eager"):
         """Create a new NexusApi object using the specified API Key
 
+        All requests are sent through a single pooled session, so connections to the API are reused between calls instead of performing a new TCP + TLS handshake each time.
+        Requests are paced by a RateLimiter that reads the quota headers of every response, and are retried with jittered backoff on 429 and server errors (5xx).
+        With several API keys (e.g. of several authorised accounts), each key is paced by its own RateLimiter, and each request is sent with the key that has the most budget left (see ApiKeyPool).
+        The object should be closed with NexusApi.close() when finished, or used as a context manager (e.g. "with NexusApi(apiKey) as nexusMods:").
+
         Args:
-            apiKey (str): The API access key to interract with Nexus Mods.
+            apiKey (str, list or ApiKeyPool): The API access key to interract with Nexus Mods, a list of keys, or a pool of keys (which can be shared between several objects).
+            poolSize (int, optional): The maximum number of connections to keep open to the API. Defaults to 10.
+            maxRetries (int, optional): The number of times a request is retried on connection errors, 429 responses or server errors (5xx). Defaults to 3.
+            backoffFactor (float, optional): The backoff factor applied between retries on connection errors (in seconds). Defaults to 0.5.
+            keepAlive (bool, optional): If connections should be kept alive between requests. Defaults to True.
+            timeout (float, optional): The timeout (in seconds) for each request. Defaults to 30.
+            copyResponses (bool, optional): If True, every method returns a deep copy of the original requests.Response instead of a shared NexusResponse (previous behavior). Defaults to False.
+            apiUrl (str, optional): The base URL of the API, e.g. to use a local stand-in server. Defaults to None (https://api.nexusmods.com/).
+            rateLimiter (RateLimiter, optional): The scheduler used to pace requests. Can be shared between several objects using the same API key. Only used with a single API key, each key of a list or pool has its own. Defaults to None (a new RateLimiter).
+            cache (ResponseCache, optional): The on-disk cache used by getMod() and getModFiles(). Cannot be used with copyResponses. Defaults to None (no cache).
+            memoryCache (MemoryCache, optional): The in-process LRU cache used by getMod(), getModFiles(), getTrending(), getLatestAdded() and getLatestUpdated(), checked before the on-disk cache. Concurrent identical requests are coalesced into one. Cannot be used with copyResponses. Defaults to None (no cache).
+            hooks (list, optional): Request hooks notified of every request attempt (see RequestEvent), e.g. a RequestMetrics or OpenTelemetryHook object. Defaults to None (no hooks, no instrumentation overhead).
+            keyValidation (str, optional): When the API key (or every key of a list or pool) is validated. "eager" sends the validation request now (in parallel for several keys). "cached" sends it only if the key wasn't validated within the TTL of the "validate" endpoint of the cache (a day by default), and requires cache. "deferred" sends none, an invalid key then fails every request with response code 401. Defaults to "eager".
 
         Raises:
-            Exception: If apiKey is not a string (str) or has length = 0.
+            Exception: If apiKey is not a string (str), a list of them or an ApiKeyPool, or has length = 0.
+            Exception: If rateLimiter is used with a list or pool of API keys.
+            Exception: If poolSize is not >0 or maxRetries is <0.
+            Exception: If copyResponses is used with cache or memoryCache.
+            Exception: If keyValidation is not "eager", "cached" or "deferred", or is "cached" without a cache.
             Exception: If API key fails validation response.
         """
         
-        # Validate apiKey is a non-empty string
-        if (not isinstance(apiKey,str)):
-            raise Exception("Valid API key not provided. API key value must be string (str).")
-        if (apiKey == ""):
-            raise Exception("Valid API key not provided. Game cannot be empty string (len = 0).")
-        
-        
-        # Prepare validation API key request
-        validation_url = self._api_url + "v1/users/validate.json"
-        validation_headers = { "accept": "application/json" , "apikey": apiKey}
-        validation_response = requests.get(validation_url, headers=validation_headers)
-        
-        # Send validation API key request
-        validation_response_code = validation_response.status_code
-        
-        # Check if the response was invalid
-        if validation_response_code != 200:
-            # If not response code 200, apiKey is invalid
-            raise Exception("Validation response error. Response code = " + str(validation_response_code) + ", JSON: " + str(validation_response.json()))
-        
-        self._apiKey = apiKey
+        # Validate apiKey is a non-empty string, a list of them (checked by ApiKeyPool) or a pool
+        if (isinstance(apiKey,(list,tuple,ApiKeyPool))):
+            if (rateLimiter is not None):
+                raise Exception("Valid rate limiter not provided. Each API key of a list or pool has its own rate limiter, rateLimiter can only be used with a single API key.")
+        else:
+            NexusApi._checkApiKey(apiKey)
+        
+        # Validate the session configuration
+        if ((not isinstance(poolSize,int)) or poolSize <= 0):
+            raise Exception("Valid pool size not provided. Pool size must be value >0")
+        if ((not isinstance(maxRetries,int)) or maxRetries < 0):
+            raise Exception("Valid max retries not provided. Max retries must be value >=0")
+        if (copyResponses and ((cache is not None) or (memoryCache is not None))):
+            raise Exception("Cached responses cannot be copied. copyResponses must be False when a cache is provided.")
+        if (keyValidation not in ("eager","cached","deferred")):
+            raise Exception("Valid key validation not provided. Key validation must be eager, cached or deferred")
+        if ((keyValidation == "cached") and (cache is None)):
+            raise Exception("Cached key validation requires a cache. cache must be provided when keyValidation is cached.")
+        
+        # Override the base URL for this object only
+        if (apiUrl is not None):
+            self._api_url = apiUrl if apiUrl.endswith("/") else apiUrl + "/"
+        
+        self._timeout = timeout
+        self._maxRetries = maxRetries
+        self._rateLimiter = rateLimiter if (rateLimiter is not None) else RateLimiter()
+        self._copyResponses = copyResponses
+        self._cache = cache
+        self._memoryCache = memoryCache
         self._lastResponse = None
-        
-    def getLastResponse(self) -> requests.Response:
-        """Retrieve a copy of the last response obtained from the API.
-        
-        Creates a deep copy of the original response so that it is not alterred accidentally.
+        self._hooks = tuple(hooks) if (hooks is not None) else ()
+        self._updateHooks()
+        
+        # Initialize the pooled session used for every request
+        self._session = self._createSession(poolSize,maxRetries,backoffFactor,keepAlive)
+        
+        # Validate the API key(s). Each request is then sent with a key selected by the pool
+        keyPool = NexusApi._toKeyPool(apiKey,self._rateLimiter)
+        try:
+            self._validateKeyPool(keyPool,keyValidation)
+        except Exception:
+            self._session.close()
+            raise
+        self._keyPool = keyPool
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the underlying session and release all pooled connections.
+
+        The NexusApi object should not be used after it has been closed.
+        """
+        self._session.close()
+    
+    def getLastResponse(self) -> NexusResponse:
+        """Retrieve the last response obtained from the API.
+
+        The NexusResponse is immutable, so it is returned without copying. If the NexusApi object was created with copyResponses=True, a deep copy of the original requests.Response is returned instead.
 
         Returns:
-            Response: The response last returned by the API
+            NexusResponse: The response last returned by the API
         """
-        return copy.deepcopy(self._lastResponse)
+        if (self._copyResponses):
+            return copy.deepcopy(self._lastResponse)
+        return self._lastResponse
     
-    def setApiKey(self,apiKey: str):
-        """Set a new API key for the NexusApi object.
-        
-        This otherwise followes the same validation process as the NexusApi.__init__() method.
+    def addHook(self, hook):
+        """Add a request hook, notified of every request attempt sent to the API.
+
+        A hook is any object with an onRequest(event) method (called just before the request is sent) and/or an onResponse(event) method (called once the response is received or the request failed). See RequestEvent. Exceptions raised by a hook are not caught.
 
         Args:
-            apiKey (str): The API access key to interract with Nexus Mods.
+            hook (object): The hook to add (e.g. a RequestMetrics or OpenTelemetryHook object).
+        """
+        self._hooks = self._hooks + (hook,)
+        self._updateHooks()
+    
+    def removeHook(self, hook):
+        """Remove a request hook added with addHook() (or the hooks argument).
+
+        Args:
+            hook (object): The hook to remove.
+        """
+        self._hooks = tuple(existing for existing in self._hooks if existing is not hook)
+        self._updateHooks()
+    
+    def getCacheStats(self) -> dict:
+        """Returns the hit/miss/revalidation counters of the on-disk cache (see ResponseCache.getStats()).
+
+        Returns:
+            dict: The cache counters, or None if no cache is used.
+        """
+        if (self._cache is None):
+            return None
+        return self._cache.getStats()
+    
+    def getMemoryCacheStats(self) -> dict:
+        """Returns the hit/miss/coalescing counters of the in-memory cache (see MemoryCache.getStats()).
+
+        Returns:
+            dict: The cache counters, or None if no in-memory cache is used.
+        """
+        if (self._memoryCache is None):
+            return None
+        return self._memoryCache.getStats()
+    
+    def getRateLimit(self) -> dict:
+        """Returns the remaining request budget, as reported by the rate limit headers of the last responses.
+
+        Returns:
+            dict: The quota last reported by the API ("hourlyLimit", "hourlyRemaining", "hourlyReset", "dailyLimit", "dailyRemaining", "dailyReset"), along with "budget", the estimated number of requests that can still be sent before the next reset (None if unknown).
+        """
+        return self._keyPool.getRemaining()
+    
+    def getKeyStats(self) -> list:
+        """Returns the usage and remaining quota of each API key (see ApiKeyPool.getStats()).
+
+        Returns:
+            list: The requests sent, requests in flight, disabled state and quota of each key. Keys are masked.
+        """
+        return self._keyPool.getStats()
+    
+    def setApiKey(self,apiKey,keyValidation: str = "eager"):
+        """Set a new API key (or list or pool of keys) for the NexusApi object.
+
+        This otherwise followes the same validation process as the NexusApi.__init__() method. The keys of a list or pool are validated in parallel, and the "cached" and "deferred" validations skip the round-trip.
+
+        Args:
+            apiKey (str, list or ApiKeyPool): The API access key to interract with Nexus Mods, a list of keys, or a pool of keys.
+            keyValidation (str, optional): When the API key is validated: "eager", "cached" or "deferred" (see NexusApi.__init__()). Defaults to "eager".
 
         Raises:
-            Exception: If apiKey is not a string (str) or has length = 0.
+            Exception: If apiKey is not a string (str), a list of them or an ApiKeyPool, or has length = 0.
+            Exception: If keyValidation is not "eager", "cached" or "deferred", or is "cached" without a cache.
             Exception: If API key fails validation response.
-            
+
         Returns:
             Response: A reference to the NexusApi object
         """
         
-        # Validate apiKey is a non-empty string
-        if (not isinstance(apiKey,str)):
-            raise Exception("Valid API key not provided. API key value must be string (str).")
-        if (apiKey == ""):
-            raise Exception("Valid API key not provided. Game cannot be empty string (len = 0).")
+        # Validate apiKey is a non-empty string, a list of them (checked by ApiKeyPool) or a pool
+        if (not isinstance(apiKey,(list,tuple,ApiKeyPool))):
+            NexusApi._checkApiKey(apiKey)
+        if (keyValidation not in ("eager","cached","deferred")):
+            raise Exception("Valid key validation not provided. Key validation must be eager, cached or deferred")
+        if ((keyValidation == "cached") and (self._cache is None)):
+            raise Exception("Cached key validation requires a cache. cache must be provided when keyValidation is cached.")
         
-        
-        # Prepare validation API key request
-        validation_url = self._api_url + "v1/users/validate.json"
-        validation_headers = { "accept": "application/json" , "apikey": apiKey}
-        validation_response = requests.get(validation_url, headers=validation_headers)
-        
-        # Send validation API key request
-        validation_response_code = validation_response.status_code
-        
-        # Check if the response was invalid
-        if validation_response_code != 200:
-            # If not response code 200, apiKey is invalid
-            raise Exception("Validation response error. Response code = " + str(validation_response_code) + ", JSON: " + str(validation_response.json()))
-        
-        
-        self._apiKey = apiKey
+        # Validate the new API key(s), then use them for the next requests
+        keyPool = NexusApi._toKeyPool(apiKey,self._rateLimiter)
+        self._validateKeyPool(keyPool,keyValidation)
+        self._keyPool = keyPool
         
         return self
+    
+    
+    ################################
+    # Games
+    # Game specific routes (E.g. retreiving the mod categories of a game)
+    ################################
+    
+    def getGame(self,game:str):
+        """Returns the information of a game, including its mod categories.
 
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
 
+        Returns:
+            NexusResponse: The response information received from the API.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + ".json"
+        
+        # Send API request and return the response
+        return self._request("GET",request_url,endpoint="game")
+    
+    
     ################################
     # Mods
     # Mod specific routes (E.g. retreiving latest mods, endorsing a mod)
@@ -119,7 +268,7 @@ class NexusApi:
             Exception: If the time period provided is not "1d", "1w", or "1m".
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -134,13 +283,9 @@ class NexusApi:
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/updated.json?period=" + time
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
         
-        # Send API request
-        self._lastResponse = requests.get(request_url, headers=request_headers)
-        
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API request and return the response
+        return self._request("GET",request_url,endpoint="updated")
     
     
     def getLatestAdded(self,game:str):
@@ -153,7 +298,7 @@ class NexusApi:
             Exception: If the game domain provided is not a string (str) or has length = 0.
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -164,13 +309,9 @@ class NexusApi:
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/latest_added.json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
-        
-        # Send API request
-        self._lastResponse = requests.get(request_url, headers=request_headers)
         
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API request (or use the cached response) and return the response
+        return self._cachedRequest("latestAdded",game,None,request_url)
     
     
     def getLatestUpdated(self,game:str):
@@ -183,7 +324,7 @@ class NexusApi:
             Exception: If the game domain provided is not a string (str) or has length = 0.
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -194,13 +335,9 @@ class NexusApi:
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/latest_updated.json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
         
-        # Send API request
-        self._lastResponse = requests.get(request_url, headers=request_headers)
-        
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API request (or use the cached response) and return the response
+        return self._cachedRequest("latestUpdated",game,None,request_url)
     
     
     def getTrending(self,game:str):
@@ -213,7 +350,7 @@ class NexusApi:
             Exception: If the game domain provided is not a string (str) or has length = 0.
 
         Returns:
-            Response: The response information received from the API
+            NexusResponse: The response information received from the API
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -224,13 +361,9 @@ class NexusApi:
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/trending.json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
-        
-        # Send API request
-        self._lastResponse = requests.get(request_url, headers=request_headers)
         
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API request (or use the cached response) and return the response
+        return self._cachedRequest("trending",game,None,request_url)
     
     
     def getMod(self,game:str,id:int):
@@ -245,7 +378,7 @@ class NexusApi:
             Exception: If the mod ID is not >0.
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -254,18 +387,38 @@ class NexusApi:
         if (game == ""):
             raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
         
-        if ((not isinstance(id,int)) and id <= 0):
+        if ((not isinstance(id,int)) or id <= 0):
             raise Exception("Valid mod ID not provided. Mod ID must be value >0")
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +".json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
         
-        # Send API request
-        self._lastResponse = requests.get(request_url, headers=request_headers)
+        # Send API request (or use the cached response) and return the response
+        return self._cachedRequest("mod",game,id,request_url)
+    
+    def getMods(self,game:str,ids:list,maxConcurrency:int = 8,progressCallback = None) -> list:
+        """Returns many mods with the matching ID numbers, fetched in parallel over a bounded thread pool.
+
+        Errors are reported per mod ID in the returned BatchResult objects and do not stop the rest of the batch.
+        The poolSize of the NexusApi object should be at least maxConcurrency, otherwise connections will not be reused between requests.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to get.
+            maxConcurrency (int, optional): The maximum number of requests in flight at once. Defaults to 8.
+            progressCallback (function, optional): Called as progressCallback(completed, total, result) each time a mod is finished. Called from the calling thread. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If maxConcurrency is not >0.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids.
+        """
         
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API requests and return the results
+        return self._runBatch(self.getMod,game,ids,maxConcurrency,progressCallback)
     
     def endorseMod(self,game:str,id:int):
         """Sends a request to endorse a specific mod on the server.
@@ -279,7 +432,7 @@ class NexusApi:
             Exception: If the mod ID is not >0.
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -288,18 +441,14 @@ class NexusApi:
         if (game == ""):
             raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
         
-        if ((not isinstance(id,int)) and id <= 0):
+        if ((not isinstance(id,int)) or id <= 0):
             raise Exception("Valid mod ID not provided. Mod ID must be value >0")
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/endorse.json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
-        
-        # Send API request
-        self._lastResponse = requests.post(request_url, headers=request_headers)
         
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API request and return the response
+        return self._request("POST",request_url,endpoint="endorse")
     
     def abstainMod(self,game:str,id:int):
         """Sends a request to abstain endorsing a specific mod on the server.
@@ -313,7 +462,7 @@ class NexusApi:
             Exception: If the mod ID is not >0.
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -322,18 +471,14 @@ class NexusApi:
         if (game == ""):
             raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
         
-        if ((not isinstance(id,int)) and id <= 0):
+        if ((not isinstance(id,int)) or id <= 0):
             raise Exception("Valid mod ID not provided. Mod ID must be value >0")
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/abstain.json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
         
-        # Send API request
-        self._lastResponse = requests.post(request_url, headers=request_headers)
-        
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API request and return the response
+        return self._request("POST",request_url,endpoint="abstain")
     
     
     ################################
@@ -355,7 +500,7 @@ class NexusApi:
             Exception: If the mod ID is not >0.
 
         Returns:
-            Response: The response information received from the API.
+            NexusResponse: The response information received from the API.
         """
         
         # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
@@ -364,18 +509,107 @@ class NexusApi:
         if (game == ""):
             raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
         
-        if ((not isinstance(id,int)) and id <= 0):
+        if ((not isinstance(id,int)) or id <= 0):
             raise Exception("Valid mod ID not provided. Mod ID must be value >0")
         
         # Prepare API request
         request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/files.json"
-        request_headers = { "accept": "application/json" , "apikey": self._apiKey}
         
-        # Send API request
-        self._lastResponse = requests.get(request_url, headers=request_headers)
+        # Send API request (or use the cached response) and return the response
+        return self._cachedRequest("files",game,id,request_url)
+    
+    def getModsFiles(self,game:str,ids:list,maxConcurrency:int = 8,progressCallback = None) -> list:
+        """Returns the files for many mods with the matching ID numbers, fetched in parallel over a bounded thread pool.
+
+        Errors are reported per mod ID in the returned BatchResult objects and do not stop the rest of the batch.
+        The poolSize of the NexusApi object should be at least maxConcurrency, otherwise connections will not be reused between requests.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to get the files of.
+            maxConcurrency (int, optional): The maximum number of requests in flight at once. Defaults to 8.
+            progressCallback (function, optional): Called as progressCallback(completed, total, result) each time a mod is finished. Called from the calling thread. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If maxConcurrency is not >0.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids.
+        """
         
-        # Return the response
-        return copy.deepcopy(self._lastResponse)
+        # Send API requests and return the results
+        return self._runBatch(self.getModFiles,game,ids,maxConcurrency,progressCallback)
+    
+    def getDownloadLink(self,game:str,id:int,fileId:int,key:str = None,expires:int = None):
+        """Returns the download links (one per CDN mirror) of a specific file of a mod.
+
+        Premium members can request any file. Other members need the key and expires values of the nxm:// link from the "Download with Manager" button on the website.
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            id (int): The mod ID of the file.
+            fileId (int): The ID of the file (see getModFiles()).
+            key (str, optional): The key of the nxm:// link. Defaults to None.
+            expires (int, optional): The expiry time of the nxm:// link. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the mod ID or file ID is not >0.
+
+        Returns:
+            NexusResponse: The response information received from the API. The JSON body is a list of mirrors, each with a "name", "short_name" and "URI".
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(id,int)) or id <= 0):
+            raise Exception("Valid mod ID not provided. Mod ID must be value >0")
+        if ((not isinstance(fileId,int)) or fileId <= 0):
+            raise Exception("Valid file ID not provided. File ID must be value >0")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/"+ str(id) +"/files/"+ str(fileId) +"/download_link.json"
+        if ((key is not None) and (expires is not None)):
+            request_url += "?key=" + str(key) + "&expires=" + str(expires)
+        
+        # Send API request and return the response. Download links expire, so they are never cached
+        return self._request("GET",request_url,endpoint="download_link")
+    
+    def md5Search(self,game:str,md5:str):
+        """Returns the mod files matching an MD5 hash (e.g. to check a downloaded file).
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            md5 (str): The MD5 hash of the file (32 hexadecimal characters).
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If the MD5 hash is not a string of 32 hexadecimal characters.
+
+        Returns:
+            NexusResponse: The response information received from the API. The JSON body is a list of matches, each with the "mod" and the "file_details" of a file. Response code 404 if no file matches.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        if ((not isinstance(md5,str)) or (len(md5) != 32) or any(character not in "0123456789abcdefABCDEF" for character in md5)):
+            raise Exception("Valid MD5 hash not provided. MD5 hash must be a string of 32 hexadecimal characters.")
+        
+        # Prepare API request
+        request_url = self._api_url + "v1/games/" + game + "/mods/md5_search/" + md5 + ".json"
+        
+        # Send API request and return the response
+        return self._request("GET",request_url,endpoint="md5_search")
     
     ################################
     # 
@@ -384,6 +618,287 @@ class NexusApi:
     # 
     ################################
     
+    def _createSession(self, poolSize: int, maxRetries: int, backoffFactor: float, keepAlive: bool) -> requests.Session:
+        """Create the pooled session used to send every request to the API.
+
+        Args:
+            poolSize (int): The maximum number of connections to keep open to the API.
+            maxRetries (int): The number of times a request is retried on connection errors.
+            backoffFactor (float): The backoff factor applied between retries (in seconds).
+            keepAlive (bool): If connections should be kept alive between requests.
+
+        Returns:
+            Session: The configured session.
+        """
+        
+        # Retries on 429 and server errors are handled by NexusApi._request(), so the RateLimiter sees every response
+        retries = Retry(total=maxRetries, connect=maxRetries, read=maxRetries, status=0, backoff_factor=backoffFactor, allowed_methods=("GET",), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolSize, max_retries=retries)
+        
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        
+        # Headers shared by every request
+        session.headers["accept"] = "application/json"
+        if (not keepAlive):
+            session.headers["connection"] = "close"
+        
+        return session
+    
+    def _updateHooks(self):
+        """Cache the bound onRequest/onResponse methods of the hooks, so requests without hooks skip the instrumentation entirely."""
+        self._requestHooks = tuple(hook.onRequest for hook in self._hooks if hasattr(hook,"onRequest"))
+        self._responseHooks = tuple(hook.onResponse for hook in self._hooks if hasattr(hook,"onResponse"))
+        self._instrumented = (len(self._requestHooks) + len(self._responseHooks)) > 0
+    
+    def _request(self, method: str, url: str, headers: dict = None, endpoint: str = None, keyPool: ApiKeyPool = None) -> NexusResponse:
+        """Send a request to the API through the pooled session and store it as the last response.
+
+        Sends the request with the API key selected by the ApiKeyPool and waits for the RateLimiter of that key before sending. Retries with jittered backoff on 429 responses (any method) and server errors (GET only, so an endorsement is never sent twice).
+        With several keys, a key answered with 429 is held back while the retry goes to another key, and a key answered with 401 is disabled and the request sent again with another key.
+
+        Args:
+            method (str): The HTTP method to use (e.g. "GET").
+            url (str): The full URL of the request.
+            headers (dict, optional): Headers to send in addition to the session headers. Defaults to None.
+            endpoint (str, optional): The name of the endpoint reported to the request hooks (e.g. "mod"). Defaults to None ("other").
+            keyPool (ApiKeyPool, optional): The keys to send the request with, instead of the keys of the object (e.g. to validate a key). The response is then neither stored as the last response nor copied. Defaults to None.
+
+        Returns:
+            NexusResponse: The response received from the API. If copyResponses is enabled, a deep copy of the requests.Response instead.
+        """
+        storeResponse = (keyPool is None)
+        if (keyPool is None):
+            keyPool = self._keyPool
+        
+        attempt = 0
+        while True:
+            # Select the API key, then wait for its rate limiter before sending
+            apiKey, rateLimiter, delay = keyPool.acquire()
+            if (delay > 0):
+                time.sleep(delay)
+            
+            # Notify the request hooks (if any)
+            event = None
+            if (self._instrumented):
+                event = RequestEvent(method, url, endpoint or "other", attempt, delay)
+                for hook in self._requestHooks:
+                    hook(event)
+                event.startTime = time.monotonic()
+            
+            try:
+                response = self._session.request(method, url, headers=NexusApi._withApiKey(headers,apiKey), timeout=self._timeout)
+            except Exception as e:
+                rateLimiter.update(None)
+                keyPool.release(apiKey)
+                if (event is not None):
+                    event.elapsed = time.monotonic() - event.startTime
+                    event.error = e
+                    for hook in self._responseHooks:
+                        hook(event)
+                raise
+            nexusResponse = NexusResponse.fromRequests(response)
+            rateLimiter.update(nexusResponse.rateLimit)
+            keyDisabled = keyPool.release(apiKey,nexusResponse.status_code)
+            
+            if (event is not None):
+                event.elapsed = time.monotonic() - event.startTime
+                event.response = nexusResponse
+                for hook in self._responseHooks:
+                    hook(event)
+            
+            # Retry on rate limit and server errors, and with another key if this one was disabled
+            statusCode = nexusResponse.status_code
+            retryable = keyDisabled or (statusCode == 429) or ((method == "GET") and (statusCode in (500,502,503,504)))
+            if ((not retryable) or (attempt >= self._maxRetries)):
+                break
+            if (not keyDisabled):
+                # Hold this key back. Another key (if any) can send the retry right away, otherwise the retry waits here
+                delay = rateLimiter.backoff(attempt, RateLimiter._parseRetryAfter(nexusResponse.headers.get("Retry-After")))
+                if (len(keyPool) == 1):
+                    time.sleep(delay)
+            attempt += 1
+        
+        if (not storeResponse):
+            return nexusResponse
+        
+        # Keep the original response only if copies of it are requested
+        if (self._copyResponses):
+            self._lastResponse = response
+            return copy.deepcopy(response)
+        
+        self._lastResponse = nexusResponse
+        return self._lastResponse
+    
+    def _cachedRequest(self, endpoint: str, game: str, id: int, url: str) -> NexusResponse:
+        """Send a GET request to the API through the in-memory and on-disk caches, if they are provided.
+
+        Args:
+            endpoint (str): The name of the endpoint used as part of the cache key (e.g. "mod").
+            game (str): The game domain of the request.
+            id (int): The mod ID of the request, or None for game-wide endpoints (not stored in the on-disk cache).
+            url (str): The full URL of the request.
+
+        Returns:
+            NexusResponse: The cached response, or the response received from the API.
+        """
+        if ((self._cache is None) and (self._memoryCache is None)):
+            return self._request("GET",url,endpoint=endpoint)
+        
+        def send():
+            if ((self._cache is None) or (id is None)):
+                return self._request("GET",url,endpoint=endpoint)
+            return self._cache.fetch(game,endpoint,id,lambda headers: self._request("GET",url,headers,endpoint))
+        
+        if (self._memoryCache is None):
+            response = send()
+        else:
+            response = self._memoryCache.fetch((game,endpoint,id),endpoint,send)
+        self._lastResponse = response
+        return response
+    
+    def _runBatch(self, method, game: str, ids: list, maxConcurrency: int, progressCallback) -> list:
+        """Call a per-mod method (e.g. NexusApi.getMod) for many mod IDs in parallel over a bounded thread pool.
+
+        Args:
+            method (function): The method to call as method(game, id).
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to request.
+            maxConcurrency (int): The maximum number of requests in flight at once.
+            progressCallback (function): Called as progressCallback(completed, total, result) each time a mod is finished, or None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If maxConcurrency is not >0.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Validate all mod IDs before sending any request
+        ids = list(ids)
+        for id in ids:
+            if ((not isinstance(id,int)) or id <= 0):
+                raise Exception("Valid mod ID not provided. Mod ID must be value >0 (received " + str(id) + ")")
+        
+        if ((not isinstance(maxConcurrency,int)) or maxConcurrency <= 0):
+            raise Exception("Valid max concurrency not provided. Max concurrency must be value >0")
+        
+        total = len(ids)
+        results = [None] * total
+        if (total == 0):
+            return results
+        
+        def fetch(index, id):
+            try:
+                return index, BatchResult(id, response=method(game,id))
+            except Exception as e:
+                return index, BatchResult(id, error=e)
+        
+        # Results are stored by index so they keep the input order, whichever request finishes first
+        completed = 0
+        with ThreadPoolExecutor(max_workers=min(maxConcurrency,total)) as executor:
+            futures = [executor.submit(fetch,index,id) for index,id in enumerate(ids)]
+            for future in as_completed(futures):
+                index, result = future.result()
+                results[index] = result
+                completed += 1
+                if (progressCallback is not None):
+                    progressCallback(completed,total,result)
+        
+        return results
+    
+    def _toKeyPool(apiKey, rateLimiter: RateLimiter) -> ApiKeyPool:
+        """Returns the ApiKeyPool of an API key, list of keys or pool. A single key is paced by the given RateLimiter."""
+        if (isinstance(apiKey,ApiKeyPool)):
+            return apiKey
+        if (isinstance(apiKey,(list,tuple))):
+            return ApiKeyPool(list(apiKey))
+        return ApiKeyPool([apiKey],[rateLimiter])
+    
+    def _withApiKey(headers: dict, apiKey: str) -> dict:
+        """Returns the headers of a request with the apikey header added."""
+        if (headers is None):
+            return {"apikey": apiKey}
+        return dict(headers, apikey=apiKey)
+    
+    def _validateKeyPool(self, keyPool: ApiKeyPool, keyValidation: str):
+        """Validate every API key of a pool, as selected by keyValidation ("eager", "cached" or "deferred").
+
+        Raises:
+            Exception: If an API key fails validation response.
+        """
+        apiKeys = keyPool.getApiKeys()
+        if (keyValidation == "eager"):
+            if (len(apiKeys) == 1):
+                self._validateApiKey(apiKeys[0],keyPool.getRateLimiter(apiKeys[0]))
+                return
+            # Several keys are validated at once, list() raises the first failure
+            with ThreadPoolExecutor(max_workers=min(len(apiKeys),8)) as executor:
+                list(executor.map(lambda apiKey: self._validateApiKey(apiKey,keyPool.getRateLimiter(apiKey)),apiKeys))
+        elif (keyValidation == "cached"):
+            for apiKey in apiKeys:
+                self._validateApiKeyCached(apiKey,keyPool.getRateLimiter(apiKey))
+    
+    def _validateApiKey(self, apiKey: str, rateLimiter: RateLimiter):
+        """Send a validation request to the API for the given API key.
+
+        Args:
+            apiKey (str): The API access key to validate.
+            rateLimiter (RateLimiter): The RateLimiter of the key, which paces the request and is updated with the quota of the response.
+
+        Raises:
+            Exception: If API key fails validation response.
+        """
+        
+        # Prepare validation API key request
+        validation_url = self._api_url + "v1/users/validate.json"
+        
+        # Send validation API key request, with this key only
+        validation_response = self._request("GET", validation_url, endpoint="validate", keyPool=ApiKeyPool([apiKey],[rateLimiter]))
+        validation_response_code = validation_response.status_code
+        
+        # Check if the response was invalid
+        if validation_response_code != 200:
+            # If not response code 200, apiKey is invalid
+            raise Exception("Validation response error. Response code = " + str(validation_response_code) + ", JSON: " + str(validation_response.json()))
+    
+    def _validateApiKeyCached(self, apiKey: str, rateLimiter: RateLimiter):
+        """Validate the given API key through the on-disk cache, sending the validation request only if the key wasn't validated within the TTL of the "validate" endpoint.
+
+        Only the outcome is cached, keyed by a hash of the key. Neither the key nor the user details of the validation response are written to the cache.
+
+        Args:
+            apiKey (str): The API access key to validate.
+            rateLimiter (RateLimiter): The RateLimiter of the key, updated with the quota of the validation response (if sent).
+
+        Raises:
+            Exception: If API key fails validation response.
+        """
+        keyId = int(hashlib.sha256(apiKey.encode("utf-8")).hexdigest()[:15], 16)
+        
+        def send(headers):
+            # Raises if the key is invalid, so only valid keys are cached
+            self._validateApiKey(apiKey,rateLimiter)
+            return NexusResponse(self._api_url + "v1/users/validate.json", 200, {}, b"{}")
+        
+        self._cache.fetch("", "validate", keyId, send)
+    
+    def _checkApiKey(apiKey):
+        """Raise an exception if an API key is not a non-empty string (str)."""
+        if (not isinstance(apiKey,str)):
+            raise Exception("Valid API key not provided. API key value must be string (str).")
+        if (apiKey == ""):
+            raise Exception("Valid API key not provided. Game cannot be empty string (len = 0).")
+    
     def _isStr(input) -> bool:
         """Test if a given variable is a string (str) 
 
@@ -0,0 +1,170 @@
+# NexusResponse.py
+
+# Imports Required Dependencies
+from types import MappingProxyType
+
+from .JsonCodec import JsonCodec
+
+class NexusResponse:
+    """A lightweight, immutable response received from the Nexus Mods API.
+
+    Holds only the status code, headers, rate limit information and the raw body of a response. The JSON body is decoded lazily the first time NexusResponse.json() is called (with JsonCodec.default) and reused afterwards.
+
+    As the object cannot be altered, it can be shared between callers without copying. The decoded JSON is also shared, so it should be treated as read-only.
+    """
+    
+    __slots__ = ("_url","_statusCode","_headers","_content","_json","_rateLimit")
+    
+    # Rate limit headers returned by the API, mapped to the keys used in NexusResponse.rateLimit
+    _rateLimitHeaders = {
+        "X-RL-Hourly-Limit": "hourlyLimit",
+        "X-RL-Hourly-Remaining": "hourlyRemaining",
+        "X-RL-Hourly-Reset": "hourlyReset",
+        "X-RL-Daily-Limit": "dailyLimit",
+        "X-RL-Daily-Remaining": "dailyRemaining",
+        "X-RL-Daily-Reset": "dailyReset",
+    }
+    
+    # Sentinel value used to mark the JSON body as not decoded yet
+    _notDecoded = object()
+    
+    def __init__(self, url: str, statusCode: int, headers, content: bytes):
+        """Create a new NexusResponse object.
+
+        Args:
+            url (str): The URL the response was received from.
+            statusCode (int): The HTTP status code of the response.
+            headers (Mapping): The headers of the response. Lookups are case-insensitive if a case-insensitive mapping is provided (e.g. requests.structures.CaseInsensitiveDict).
+            content (bytes): The raw body of the response.
+        """
+        object.__setattr__(self,"_url",url)
+        object.__setattr__(self,"_statusCode",statusCode)
+        object.__setattr__(self,"_headers",MappingProxyType(headers))
+        object.__setattr__(self,"_content",content)
+        object.__setattr__(self,"_json",NexusResponse._notDecoded)
+        object.__setattr__(self,"_rateLimit",NexusResponse._parseRateLimit(headers))
+    
+    def fromRequests(response):
+        """Create a new NexusResponse object from a requests.Response object.
+
+        Args:
+            response (Response): The response received from the requests library.
+
+        Returns:
+            NexusResponse: The immutable response.
+        """
+        return NexusResponse(response.url,response.status_code,response.headers,response.content)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("NexusResponse objects are immutable.")
+    
+    def __delattr__(self, name):
+        raise AttributeError("NexusResponse objects are immutable.")
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __repr__(self):
+        return "<NexusResponse [{0}]>".format(self._statusCode)
+    
+    @property
+    def url(self) -> str:
+        """The URL the response was received from."""
+        return self._url
+    
+    @property
+    def status_code(self) -> int:
+        """The HTTP status code of the response. Named to match requests.Response.status_code."""
+        return self._statusCode
+    
+    @property
+    def ok(self) -> bool:
+        """True if the status code is less than 400."""
+        return self._statusCode < 400
+    
+    @property
+    def headers(self):
+        """A read-only view of the response headers."""
+        return self._headers
+    
+    @property
+    def content(self) -> bytes:
+        """The raw body of the response."""
+        return self._content
+    
+    @property
+    def text(self) -> str:
+        """The body of the response decoded as UTF-8."""
+        return self._content.decode("utf-8", errors="replace")
+    
+    @property
+    def rateLimit(self) -> dict:
+        """The rate limit information returned with the response.
+
+        Contains the keys "hourlyLimit", "hourlyRemaining", "dailyLimit" and "dailyRemaining" (int) and "hourlyReset" and "dailyReset" (str). Any value missing from the response is None.
+        """
+        return self._rateLimit
+    
+    def json(self):
+        """Returns the JSON body of the response. The body is decoded on the first call only.
+
+        Returns:
+            any: The decoded JSON body.
+        """
+        if self._json is NexusResponse._notDecoded:
+            object.__setattr__(self,"_json",JsonCodec.default.loads(self._content))
+        return self._json
+    
+    def _parseRateLimit(headers) -> MappingProxyType:
+        """Read the rate limit headers from a response.
+
+        Args:
+            headers (Mapping): The headers of the response.
+
+        Returns:
+            MappingProxyType: A read-only mapping of the rate limit information.
+        """
+        rateLimit = {}
+        for header,key in NexusResponse._rateLimitHeaders.items():
+            value = headers.get(header)
+            if (value is not None) and (not key.endswith("Reset")):
+                try:
+                    value = int(value)
+                except ValueError:
+                    value = None
+            rateLimit[key] = value
+        return MappingProxyType(rateLimit)
+
+
+class BatchResult:
+    """The result of a single request made as part of a batch (e.g. NexusApi.getMods()).
+
+    Holds the ID that was requested, along with either the response received from the API or the exception raised while sending the request.
+    """
+    
+    __slots__ = ("id","response","error")
+    
+    def __init__(self, id: int, response = None, error: Exception = None):
+        """Create a new BatchResult object.
+
+        Args:
+            id (int): The ID that was requested.
+            response (NexusResponse, optional): The response received from the API. Defaults to None.
+            error (Exception, optional): The exception raised while sending the request. Defaults to None.
+        """
+        self.id = id
+        self.response = response
+        self.error = error
+    
+    def __repr__(self):
+        if self.error is not None:
+            return "<BatchResult id={0} error={1!r}>".format(self.id,self.error)
+        return "<BatchResult id={0} response={1!r}>".format(self.id,self.response)
+    
+    @property
+    def ok(self) -> bool:
+        """True if the request was sent successfully and the API returned status code 200."""
+        return (self.error is None) and (self.response is not None) and (self.response.status_code == 200)
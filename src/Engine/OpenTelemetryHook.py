@@ -0,0 +1,62 @@
+# OpenTelemetryHook.py
+
+# Imports Required Dependencies
+
+# opentelemetry-api is only required when OpenTelemetryHook is used
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+from .RequestMetrics import RequestEvent
+
+class OpenTelemetryHook:
+    """Request hook that reports every request sent to the API as an OpenTelemetry span.
+
+    Each attempt becomes a client span named "nexusapi <endpoint>", with the HTTP method, URL, status code, response size, attempt number and remaining quota as attributes. Failed requests record the exception and an error status.
+    Requires the OpenTelemetry API (python -m pip install opentelemetry-api), plus an SDK and exporter configured by the application for the spans to go anywhere.
+    """
+    
+    def __init__(self, tracer = None):
+        """Create a new OpenTelemetryHook object.
+
+        Args:
+            tracer (Tracer, optional): The tracer used to create the spans. Defaults to None (the tracer of the global tracer provider).
+
+        Raises:
+            Exception: If the OpenTelemetry API is not installed.
+        """
+        if (trace is None):
+            raise Exception("OpenTelemetryHook requires the opentelemetry-api library. Install it with: python -m pip install opentelemetry-api")
+        self._tracer = tracer if (tracer is not None) else trace.get_tracer("NexusApi")
+    
+    def onRequest(self, event: RequestEvent):
+        """Start the span of a request (request hook, see RequestEvent).
+
+        Args:
+            event (RequestEvent): The request about to be sent.
+        """
+        event.context["span"] = self._tracer.start_span("nexusapi " + str(event.endpoint), kind=trace.SpanKind.CLIENT, attributes={"http.method": event.method,"http.url": event.url,"nexusapi.endpoint": str(event.endpoint),"nexusapi.attempt": event.attempt,"nexusapi.rate_limit_wait": event.wait})
+    
+    def onResponse(self, event: RequestEvent):
+        """End the span of a request (request hook, see RequestEvent).
+
+        Args:
+            event (RequestEvent): The finished request.
+        """
+        span = event.context.pop("span", None)
+        if (span is None):
+            return
+        if (event.error is not None):
+            span.record_exception(event.error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, type(event.error).__name__))
+        else:
+            response = event.response
+            span.set_attribute("http.status_code", response.status_code)
+            span.set_attribute("http.response_content_length", len(response.content))
+            for field in ("hourlyRemaining","dailyRemaining"):
+                if (response.rateLimit.get(field) is not None):
+                    span.set_attribute("nexusapi.rate_limit." + field, response.rateLimit[field])
+            if (response.status_code >= 400):
+                span.set_status(trace.Status(trace.StatusCode.ERROR, "HTTP " + str(response.status_code)))
+        span.end()
@@ -0,0 +1,249 @@
+# RateLimiter.py
+
+# Imports Required Dependencies
+import random
+import threading
+import time
+from datetime import datetime
+
+class RateLimiter:
+    """Token bucket request scheduler driven by the Nexus Mods rate limit headers.
+
+    Nexus Mods allows a daily quota of requests, after which a smaller hourly quota applies. The quota remaining is returned with every response (X-RL-Daily-Remaining, X-RL-Hourly-Remaining and their reset times), and is fed into the scheduler with RateLimiter.update().
+
+    While plenty of quota remains, requests are sent as fast as they are made. Requests are accepted as long as either quota has some left, so once both the daily and hourly quotas drop to lowWater or below, the bucket refills at remaining / seconds until the next reset that restores some quota (usually the hourly reset, rather than the end of the day), so the rest of the quota is spread evenly up to that reset instead of ending in 429 responses.
+
+    Once the quota is used up, requests wait for the reset. The requests queued meanwhile are spread after the reset, burst requests per second, instead of all being sent at once: the first responses report the new quota, which paces the requests made after them.
+
+    The scheduler never sleeps itself. RateLimiter.reserve() and RateLimiter.backoff() return the number of seconds to wait, so the same object can be used by both threads (time.sleep) and asyncio (asyncio.sleep). All methods are thread-safe.
+    """
+    
+    def __init__(self, burst: int = 10, lowWater: int = 50, baseBackoff: float = 0.5, maxBackoff: float = 60):
+        """Create a new RateLimiter object.
+
+        Args:
+            burst (int, optional): The maximum number of requests sent back-to-back once requests are being paced. Defaults to 10.
+            lowWater (int, optional): The remaining quota at which requests start being paced. Defaults to 50.
+            baseBackoff (float, optional): The base delay (in seconds) used when backing off after a 429 or server error. Defaults to 0.5.
+            maxBackoff (float, optional): The maximum delay (in seconds) used when backing off. Defaults to 60.
+
+        Raises:
+            Exception: If burst is not >0 or lowWater is <0.
+        """
+        
+        if ((not isinstance(burst,int)) or burst <= 0):
+            raise Exception("Valid burst not provided. Burst must be value >0")
+        if ((not isinstance(lowWater,int)) or lowWater < 0):
+            raise Exception("Valid low water mark not provided. Low water mark must be value >=0")
+        
+        self._lock = threading.Lock()
+        self._burst = burst
+        self._lowWater = lowWater
+        self._baseBackoff = baseBackoff
+        self._maxBackoff = maxBackoff
+        
+        # Quota state, as last reported by the API
+        self._quota = {"hourlyLimit": None,"hourlyRemaining": None,"hourlyReset": None,"dailyLimit": None,"dailyRemaining": None,"dailyReset": None}
+        
+        # Requests that can still be sent before the quota runs out (None until the first response is received)
+        self._budget = None
+        # Wall clock time (epoch seconds) when the budget is reset
+        self._resetAt = None
+        # Requests reserved after the budget ran out, waiting for the reset
+        self._queuedForReset = 0
+        # Requests reserved but not yet answered. Responses do not include them in the remaining quota
+        self._inFlight = 0
+        
+        # Token bucket used to pace requests. A rate of None means requests are not being paced
+        self._tokens = float(burst)
+        self._rate = None
+        self._lastRefill = time.monotonic()
+        
+        # Monotonic time until which every request is held back after a 429 or server error
+        self._backoffUntil = 0.0
+    
+    def reserve(self) -> float:
+        """Reserve a slot for one request.
+
+        Returns:
+            float: The number of seconds to wait before sending the request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._backoffUntil - now, 0.0)
+            self._inFlight += 1
+            
+            # Quota unknown (no response received yet): send immediately
+            if (self._budget is None):
+                return wait
+            
+            # Quota exhausted: wait for the reset, spread after the first burst requests. The next response received afterwards reports the new quota
+            if (self._budget <= 0):
+                wait = max(wait, self._resetWait(self._queuedForReset))
+                self._queuedForReset += 1
+                return wait
+            
+            self._budget -= 1
+            
+            # Plenty of quota left: send immediately
+            if (self._rate is None):
+                return wait
+            
+            # Refill the bucket, then take one token. A negative balance schedules the request after earlier reservations
+            self._tokens = min(self._tokens + (now - self._lastRefill) * self._rate, float(self._burst))
+            self._lastRefill = now
+            self._tokens -= 1
+            if (self._tokens < 0):
+                wait = max(wait, -self._tokens / self._rate)
+            return wait
+    
+    def estimateWait(self) -> float:
+        """Estimate the wait of the next request, without reserving a slot (e.g. to choose between several API keys, see ApiKeyPool).
+
+        Returns:
+            float: The number of seconds RateLimiter.reserve() would return now.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self._backoffUntil - now, 0.0)
+            if ((self._budget is None) or ((self._rate is None) and (self._budget > 0))):
+                return wait
+            if (self._budget <= 0):
+                return max(wait, self._resetWait(self._queuedForReset))
+            tokens = min(self._tokens + (now - self._lastRefill) * self._rate, float(self._burst)) - 1
+            if (tokens < 0):
+                wait = max(wait, -tokens / self._rate)
+            return wait
+    
+    def update(self, rateLimit) -> None:
+        """Update the quota from the rate limit information of a response (see NexusResponse.rateLimit).
+
+        Should be called once for every request reserved with RateLimiter.reserve(), even if no rate limit information is available.
+
+        Args:
+            rateLimit (Mapping): The rate limit information of the response, or None.
+        """
+        with self._lock:
+            if (self._inFlight > 0):
+                self._inFlight -= 1
+            
+            if (not rateLimit):
+                return
+            for key in self._quota:
+                if (rateLimit.get(key) is not None):
+                    self._quota[key] = rateLimit[key]
+            
+            hourlyRemaining = self._quota["hourlyRemaining"]
+            dailyRemaining = self._quota["dailyRemaining"]
+            if ((hourlyRemaining is None) and (dailyRemaining is None)):
+                return
+            
+            # Requests are accepted as long as either quota has some left (the hourly allowance takes over once the daily quota is used up),
+            # and the quota is restored by the next reset of either, which is usually the hourly reset rather than the end of the day
+            self._resetAt = self._nextResetAt()
+            
+            # Requests still in flight have not been counted by the API yet
+            self._budget = max(dailyRemaining or 0,hourlyRemaining or 0) - self._inFlight
+            if (self._budget > 0):
+                self._queuedForReset = 0
+            
+            # Pace the requests once the budget is low, spreading it evenly up to the reset
+            if (self._budget > self._lowWater):
+                self._rate = None
+            else:
+                rate = max(self._budget,1) / max(self._secondsUntilReset(),1.0)
+                if (self._rate is None):
+                    self._tokens = min(self._tokens, float(self._burst))
+                    self._lastRefill = time.monotonic()
+                self._rate = rate
+    
+    def backoff(self, attempt: int, retryAfter: float = None) -> float:
+        """Hold back all requests after a 429 or server error response.
+
+        Uses exponential backoff with full jitter. If the server provided a Retry-After value, the delay is never shorter than it.
+
+        Args:
+            attempt (int): The number of attempts already made for the request (0 for the first retry).
+            retryAfter (float, optional): The Retry-After value (in seconds) provided by the server. Defaults to None.
+
+        Returns:
+            float: The number of seconds to wait before retrying the request.
+        """
+        delay = random.uniform(0, min(self._maxBackoff, self._baseBackoff * (2 ** attempt)))
+        if (retryAfter is not None):
+            delay = max(delay, retryAfter)
+        with self._lock:
+            self._backoffUntil = max(self._backoffUntil, time.monotonic() + delay)
+        return delay
+    
+    def getRemaining(self) -> dict:
+        """Returns the remaining request budget.
+
+        Returns:
+            dict: The quota last reported by the API ("hourlyLimit", "hourlyRemaining", "hourlyReset", "dailyLimit", "dailyRemaining", "dailyReset"), along with "budget", the estimated number of requests that can still be sent before the next reset (None if unknown).
+        """
+        with self._lock:
+            remaining = dict(self._quota)
+            remaining["budget"] = self._budget
+            return remaining
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the RateLimiter class
+    #
+    ################################
+    
+    def _secondsUntilReset(self) -> float:
+        """Returns the number of seconds until the quota is reset (0 if unknown)."""
+        if (self._resetAt is None):
+            return 0.0
+        return max(self._resetAt - time.time(), 0.0)
+    
+    def _nextResetAt(self) -> float:
+        """Returns the earliest reset time (epoch seconds) of the daily and hourly quotas that restores some quota (the hourly reset is skipped if its limit is 0), or None if unknown."""
+        resets = []
+        for window in ("daily","hourly"):
+            limit = self._quota[window + "Limit"]
+            resetAt = RateLimiter._parseReset(self._quota[window + "Reset"])
+            if ((resetAt is not None) and ((limit is None) or (limit > 0))):
+                resets.append(resetAt)
+        return min(resets) if (resets) else None
+    
+    def _resetWait(self, queued: int) -> float:
+        """Returns the number of seconds a request waits for the quota to be reset, when queued requests are already waiting for it. The first burst requests are sent at the reset, then burst more every second."""
+        return self._secondsUntilReset() + (queued // self._burst)
+    
+    def _parseReset(reset) -> float:
+        """Parse a reset time header (e.g. "2024-01-01T00:00:00+00:00" or "2024-01-01 00:00:00 +0000") into epoch seconds.
+
+        Args:
+            reset (str): The reset time returned by the API.
+
+        Returns:
+            float: The reset time as epoch seconds, or None if it could not be parsed.
+        """
+        if (not reset):
+            return None
+        for parse in (datetime.fromisoformat, lambda value: datetime.strptime(value,"%Y-%m-%d %H:%M:%S %z")):
+            try:
+                return parse(reset).timestamp()
+            except ValueError:
+                pass
+        return None
+    
+    def _parseRetryAfter(retryAfter) -> float:
+        """Parse a Retry-After header given in seconds.
+
+        Args:
+            retryAfter (str): The Retry-After value returned by the API.
+
+        Returns:
+            float: The number of seconds to wait, or None if it could not be parsed.
+        """
+        if (not retryAfter):
+            return None
+        try:
+            return max(float(retryAfter),0.0)
+        except ValueError:
+            return None
@@ -0,0 +1,251 @@
+# RequestMetrics.py
+
+# Imports Required Dependencies
+import bisect
+import threading
+
+class RequestEvent:
+    """A single request attempt sent to the API, passed to the request hooks of NexusApi and AsyncNexusApi.
+
+    Hooks are objects with an onRequest(event) method, called just before the request is sent, and/or an onResponse(event) method, called once the response is received (or the request failed). The same event object is passed to both, so a hook can keep its own state in event.context.
+    Every attempt is a separate event, so retries are reported with attempt >0.
+    """
+    
+    __slots__ = ("method","url","endpoint","attempt","wait","startTime","elapsed","response","error","context")
+    
+    def __init__(self, method: str, url: str, endpoint: str, attempt: int = 0, wait: float = 0.0):
+        """Create a new RequestEvent object.
+
+        Args:
+            method (str): The HTTP method of the request (e.g. "GET").
+            url (str): The full URL of the request.
+            endpoint (str): The name of the endpoint (e.g. "mod", "files", "updated").
+            attempt (int, optional): The number of attempts already made for the request (0 for the first one). Defaults to 0.
+            wait (float, optional): The time (in seconds) the request was held back by the rate limiter. Defaults to 0.0.
+        """
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.wait = wait
+        # Monotonic time the request was sent, and its duration (in seconds) once finished
+        self.startTime = None
+        self.elapsed = None
+        # The NexusResponse received, or the exception raised while sending the request
+        self.response = None
+        self.error = None
+        # Free storage for the hooks (e.g. a tracing span)
+        self.context = {}
+    
+    def __repr__(self):
+        return "<RequestEvent {0} {1} attempt={2}>".format(self.method,self.endpoint,self.attempt)
+
+
+class RequestMetrics:
+    """Request hook that records per-endpoint metrics of every request sent to the API.
+
+    Records, for each endpoint:
+    - A histogram of the request latency (in seconds) and of the response size (in bytes).
+    - The number of responses of each status code, of failed requests (by exception type) and of retries.
+    - The time spent waiting for the rate limiter.
+    The remaining quota reported by the last response is also kept.
+
+    Add it to an API object with NexusApi.addHook() (or the hooks argument), then read the metrics with RequestMetrics.getStats() or export them in the Prometheus text format with RequestMetrics.toPrometheus(). All methods are thread-safe.
+    """
+    
+    # Default histogram buckets (upper bounds) of the latency (in seconds) and response size (in bytes)
+    _defaultLatencyBuckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    _defaultSizeBuckets = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+    
+    def __init__(self, latencyBuckets: tuple = None, sizeBuckets: tuple = None):
+        """Create a new RequestMetrics object.
+
+        Args:
+            latencyBuckets (tuple, optional): The upper bounds (in seconds) of the latency histogram buckets, in ascending order. Defaults to None (5 ms to 10 s).
+            sizeBuckets (tuple, optional): The upper bounds (in bytes) of the response size histogram buckets, in ascending order. Defaults to None (256 B to 1 MiB).
+
+        Raises:
+            Exception: If the buckets are empty or not in ascending order.
+        """
+        self._latencyBuckets = RequestMetrics._validateBuckets(latencyBuckets if (latencyBuckets is not None) else RequestMetrics._defaultLatencyBuckets)
+        self._sizeBuckets = RequestMetrics._validateBuckets(sizeBuckets if (sizeBuckets is not None) else RequestMetrics._defaultSizeBuckets)
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Clear every recorded metric.
+        """
+        with self._lock:
+            # Histograms as endpoint: _Histogram
+            self._latency = {}
+            self._size = {}
+            # Counters as (endpoint, status code): count, (endpoint, exception name): count and endpoint: count
+            self._responses = {}
+            self._errors = {}
+            self._retries = {}
+            self._waitSeconds = 0.0
+            self._rateLimit = {"hourlyRemaining": None,"dailyRemaining": None}
+    
+    def onResponse(self, event: RequestEvent):
+        """Record a finished request (request hook, see RequestEvent).
+
+        Args:
+            event (RequestEvent): The finished request.
+        """
+        endpoint = event.endpoint
+        with self._lock:
+            latency = self._latency.get(endpoint)
+            if (latency is None):
+                latency = self._latency[endpoint] = _Histogram(self._latencyBuckets)
+                self._size[endpoint] = _Histogram(self._sizeBuckets)
+            if (event.elapsed is not None):
+                latency.observe(event.elapsed)
+            if (event.attempt > 0):
+                self._retries[endpoint] = self._retries.get(endpoint,0) + 1
+            self._waitSeconds += event.wait
+            
+            if (event.error is not None):
+                key = (endpoint,type(event.error).__name__)
+                self._errors[key] = self._errors.get(key,0) + 1
+                return
+            
+            response = event.response
+            key = (endpoint,response.status_code)
+            self._responses[key] = self._responses.get(key,0) + 1
+            self._size[endpoint].observe(len(response.content))
+            for field in self._rateLimit:
+                if (response.rateLimit.get(field) is not None):
+                    self._rateLimit[field] = response.rateLimit[field]
+    
+    def getStats(self) -> dict:
+        """Returns a summary of the recorded metrics.
+
+        Returns:
+            dict: "endpoints" (for each endpoint: "requests", "retries", "responses" by status code, "errors" by exception name, "latency" and "size" as "count", "sum", "mean", "p50" and "p99", estimated from the histograms), "waitSeconds" (total time held back by the rate limiter) and "rateLimit" (last "hourlyRemaining" and "dailyRemaining").
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint,latency in self._latency.items():
+                endpoints[endpoint] = {
+                    "requests": latency.count,
+                    "retries": self._retries.get(endpoint,0),
+                    "responses": {status: count for (responseEndpoint,status),count in self._responses.items() if responseEndpoint == endpoint},
+                    "errors": {name: count for (errorEndpoint,name),count in self._errors.items() if errorEndpoint == endpoint},
+                    "latency": latency.summary(),
+                    "size": self._size[endpoint].summary(),
+                }
+            return {"endpoints": endpoints,"waitSeconds": self._waitSeconds,"rateLimit": dict(self._rateLimit)}
+    
+    def toPrometheus(self, prefix: str = "nexusapi") -> str:
+        """Export the recorded metrics in the Prometheus text exposition format (e.g. for a node_exporter textfile or a /metrics endpoint).
+
+        Args:
+            prefix (str, optional): The prefix of every metric name. Defaults to "nexusapi".
+
+        Returns:
+            str: The metrics.
+        """
+        lines = []
+        with self._lock:
+            RequestMetrics._exportHistogram(lines, prefix + "_request_duration_seconds", "Latency of the requests sent to the API.", self._latency)
+            RequestMetrics._exportHistogram(lines, prefix + "_response_size_bytes", "Size of the response bodies received from the API.", self._size)
+            
+            lines.append("# HELP {0}_responses_total Responses received from the API, by status code.".format(prefix))
+            lines.append("# TYPE {0}_responses_total counter".format(prefix))
+            for (endpoint,status),count in sorted(self._responses.items()):
+                lines.append("{0}_responses_total{{endpoint=\"{1}\",status=\"{2}\"}} {3}".format(prefix,RequestMetrics._escape(endpoint),status,count))
+            
+            lines.append("# HELP {0}_request_errors_total Requests that failed without a response, by exception.".format(prefix))
+            lines.append("# TYPE {0}_request_errors_total counter".format(prefix))
+            for (endpoint,name),count in sorted(self._errors.items()):
+                lines.append("{0}_request_errors_total{{endpoint=\"{1}\",error=\"{2}\"}} {3}".format(prefix,RequestMetrics._escape(endpoint),RequestMetrics._escape(name),count))
+            
+            lines.append("# HELP {0}_retries_total Requests sent again after a 429, server error or connection error.".format(prefix))
+            lines.append("# TYPE {0}_retries_total counter".format(prefix))
+            for endpoint,count in sorted(self._retries.items()):
+                lines.append("{0}_retries_total{{endpoint=\"{1}\"}} {2}".format(prefix,RequestMetrics._escape(endpoint),count))
+            
+            lines.append("# HELP {0}_rate_limit_wait_seconds_total Time requests were held back by the rate limiter.".format(prefix))
+            lines.append("# TYPE {0}_rate_limit_wait_seconds_total counter".format(prefix))
+            lines.append("{0}_rate_limit_wait_seconds_total {1}".format(prefix,RequestMetrics._formatValue(self._waitSeconds)))
+            
+            lines.append("# HELP {0}_rate_limit_remaining Remaining request quota, as reported by the last response.".format(prefix))
+            lines.append("# TYPE {0}_rate_limit_remaining gauge".format(prefix))
+            for window,field in (("hourly","hourlyRemaining"),("daily","dailyRemaining")):
+                if (self._rateLimit[field] is not None):
+                    lines.append("{0}_rate_limit_remaining{{window=\"{1}\"}} {2}".format(prefix,window,self._rateLimit[field]))
+        return "\n".join(lines) + "\n"
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the RequestMetrics class
+    #
+    ################################
+    
+    def _validateBuckets(buckets) -> tuple:
+        """Returns the histogram buckets as a tuple, after checking they are in ascending order."""
+        buckets = tuple(buckets)
+        if ((len(buckets) == 0) or any(buckets[i] >= buckets[i+1] for i in range(len(buckets)-1))):
+            raise Exception("Valid histogram buckets not provided. Buckets must be a non-empty list of values in ascending order")
+        return buckets
+    
+    def _exportHistogram(lines: list, name: str, help: str, histograms: dict):
+        """Append the Prometheus lines of a histogram (one series per endpoint)."""
+        lines.append("# HELP {0} {1}".format(name,help))
+        lines.append("# TYPE {0} histogram".format(name))
+        for endpoint,histogram in sorted(histograms.items()):
+            label = RequestMetrics._escape(endpoint)
+            cumulative = 0
+            for bound,count in zip(histogram.buckets,histogram.counts):
+                cumulative += count
+                lines.append("{0}_bucket{{endpoint=\"{1}\",le=\"{2}\"}} {3}".format(name,label,RequestMetrics._formatValue(bound),cumulative))
+            lines.append("{0}_bucket{{endpoint=\"{1}\",le=\"+Inf\"}} {2}".format(name,label,histogram.count))
+            lines.append("{0}_sum{{endpoint=\"{1}\"}} {2}".format(name,label,RequestMetrics._formatValue(histogram.sum)))
+            lines.append("{0}_count{{endpoint=\"{1}\"}} {2}".format(name,label,histogram.count))
+    
+    def _formatValue(value) -> str:
+        """Format a number for the Prometheus text format."""
+        if (isinstance(value,float) and value.is_integer()):
+            return str(int(value)) if (abs(value) < 1e15) else repr(value)
+        return repr(value) if isinstance(value,float) else str(value)
+    
+    def _escape(value) -> str:
+        """Escape a label value for the Prometheus text format."""
+        return str(value).replace("\\","\\\\").replace("\"","\\\"").replace("\n","\\n")
+
+
+class _Histogram:
+    """A fixed-bucket histogram. Not thread-safe on its own (used under the lock of RequestMetrics)."""
+    
+    __slots__ = ("buckets","counts","count","sum")
+    
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        # Count of each bucket (not cumulative), plus the overflow bucket (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets,value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket (None if empty). Values in the overflow bucket are reported as the largest bound."""
+        if (self.count == 0):
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index,count in enumerate(self.counts):
+            if (count > 0) and (cumulative + count >= rank):
+                if (index >= len(self.buckets)):
+                    return self.buckets[-1]
+                lower = self.buckets[index-1] if (index > 0) else 0
+                return lower + (self.buckets[index] - lower) * max(rank - cumulative, 0) / count
+            cumulative += count
+        return self.buckets[-1]
+    
+    def summary(self) -> dict:
+        return {"count": self.count,"sum": self.sum,"mean": (self.sum / self.count) if (self.count > 0) else None,"p50": self.quantile(0.5),"p99": self.quantile(0.99)}
@@ -0,0 +1,181 @@
+# ResponseCache.py
+
+# Imports Required Dependencies
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from requests.structures import CaseInsensitiveDict
+
+from .JsonCodec import JsonCodec
+from .NexusResponse import NexusResponse
+
+class ResponseCache:
+    """Persistent on-disk cache of API responses, stored in a local SQLite database.
+
+    Responses are keyed by (game, endpoint, id) (e.g. ("baldursgate3", "mod", 123)). A cached response younger than the TTL of its endpoint is returned without sending any request.
+    Once it is older, a conditional request (If-None-Match / If-Modified-Since) is sent instead, and a 304 Not Modified response renews the cached copy without transferring the body again.
+
+    Hit, miss and revalidation counters of the API responses are kept for the lifetime of the object (see ResponseCache.getStats()). All methods are thread-safe.
+    """
+    
+    # Default time to live (in seconds) of each cached endpoint
+    _defaultTtls = {"mod": 3600, "files": 3600, "validate": 86400}
+    # Endpoints left out of the counters. The API key validation of NexusApi is looked up on every run, and is not a response of the API
+    _uncountedEndpoints = ("validate",)
+    
+    def __init__(self, path: str, ttls: dict = None):
+        """Create a new ResponseCache object, creating the database if it doesn't exist.
+
+        Args:
+            path (str): The path of the SQLite database file.
+            ttls (dict, optional): The time to live (in seconds) of each endpoint, e.g. {"mod": 600}. Endpoints not provided use their default (3600, or 86400 for the API key validation of NexusApi). A TTL of 0 revalidates on every request. Defaults to None.
+
+        Raises:
+            Exception: If any TTL is not a number >=0.
+        """
+        
+        self._ttls = dict(ResponseCache._defaultTtls)
+        if (ttls is not None):
+            for endpoint,ttl in ttls.items():
+                if ((not isinstance(ttl,(int,float))) or ttl < 0):
+                    raise Exception("Valid TTL not provided for endpoint \"" + str(endpoint) + "\". TTL must be value >=0")
+                self._ttls[endpoint] = ttl
+        
+        # If the required directories don't exist, make them
+        if (path != ":memory:"):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS responses (game TEXT NOT NULL, endpoint TEXT NOT NULL, id INTEGER NOT NULL, url TEXT, status INTEGER, headers TEXT, content BLOB, etag TEXT, lastModified TEXT, storedAt REAL, PRIMARY KEY (game, endpoint, id))")
+        self._connection.commit()
+        
+        self._stats = {"hits": 0,"misses": 0,"revalidated": 0,"changed": 0}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+    
+    def fetch(self, game: str, endpoint: str, id: int, send) -> NexusResponse:
+        """Returns the response for (game, endpoint, id) from the cache, sending a request only when required.
+
+        Args:
+            game (str): The game domain of the request.
+            endpoint (str): The name of the endpoint (e.g. "mod", "files").
+            id (int): The mod ID of the request.
+            send (function): Called as send(headers) to send the request, with the conditional headers to add (if any). Must return a NexusResponse.
+
+        Returns:
+            NexusResponse: The cached response, or the response received from the API.
+        """
+        entry = self._load(game, endpoint, id)
+        
+        counted = (endpoint not in ResponseCache._uncountedEndpoints)
+        
+        # Fresh cache hit, no request required
+        if ((entry is not None) and (time.time() - entry["storedAt"] < self._ttls.get(endpoint,0))):
+            if (counted):
+                self._count("hits")
+            return entry["response"]
+        
+        # Stale or missing, send a conditional request if possible
+        headers = {}
+        if (entry is not None):
+            if (entry["etag"]):
+                headers["If-None-Match"] = entry["etag"]
+            if (entry["lastModified"]):
+                headers["If-Modified-Since"] = entry["lastModified"]
+        response = send(headers)
+        
+        if ((entry is not None) and (response.status_code == 304)):
+            if (counted):
+                self._count("revalidated")
+            self._touch(game, endpoint, id)
+            return entry["response"]
+        
+        if (counted):
+            self._count("misses" if (entry is None) else "changed")
+        if (response.status_code == 200):
+            self._store(game, endpoint, id, response)
+        return response
+    
+    def invalidate(self, game: str, endpoint: str = None, id: int = None):
+        """Remove cached responses for a game, optionally limited to one endpoint and mod ID.
+
+        Args:
+            game (str): The game domain of the responses to remove.
+            endpoint (str, optional): The name of the endpoint. Defaults to None (all endpoints).
+            id (int, optional): The mod ID. Defaults to None (all mods).
+        """
+        query = "DELETE FROM responses WHERE game = ?"
+        args = [game]
+        if (endpoint is not None):
+            query += " AND endpoint = ?"
+            args.append(endpoint)
+        if (id is not None):
+            query += " AND id = ?"
+            args.append(id)
+        with self._lock:
+            self._connection.execute(query, args)
+            self._connection.commit()
+    
+    def getStats(self) -> dict:
+        """Returns the cache counters. Lookups of the API key validation of NexusApi are not counted.
+
+        Returns:
+            dict: "hits" (served from the cache without a request), "misses" (not cached), "revalidated" (304 Not Modified, body not transferred again), "changed" (stale and modified) and "requestsSaved" (hits).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["requestsSaved"] = stats["hits"]
+        return stats
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the ResponseCache class
+    #
+    ################################
+    
+    def _count(self, counter: str):
+        """Increment one of the cache counters."""
+        with self._lock:
+            self._stats[counter] += 1
+    
+    def _load(self, game: str, endpoint: str, id: int) -> dict:
+        """Load a cached response from the database.
+
+        Returns:
+            dict: The cached "response" (NexusResponse), "etag", "lastModified" and "storedAt", or None if not cached.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT url, status, headers, content, etag, lastModified, storedAt FROM responses WHERE game = ? AND endpoint = ? AND id = ?", (game, endpoint, id)).fetchone()
+        if (row is None):
+            return None
+        url, status, headers, content, etag, lastModified, storedAt = row
+        response = NexusResponse(url, status, CaseInsensitiveDict(JsonCodec.default.loads(headers)), content)
+        return {"response": response,"etag": etag,"lastModified": lastModified,"storedAt": storedAt}
+    
+    def _store(self, game: str, endpoint: str, id: int, response: NexusResponse):
+        """Store a response in the database, replacing any previous copy."""
+        headers = JsonCodec.default.dumps(dict(response.headers.items()))
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO responses (game, endpoint, id, url, status, headers, content, etag, lastModified, storedAt) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", (game, endpoint, id, response.url, response.status_code, headers, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time()))
+            self._connection.commit()
+    
+    def _touch(self, game: str, endpoint: str, id: int):
+        """Renew a cached response after it was revalidated."""
+        with self._lock:
+            self._connection.execute("UPDATE responses SET storedAt = ? WHERE game = ? AND endpoint = ? AND id = ?", (time.time(), game, endpoint, id))
+            self._connection.commit()
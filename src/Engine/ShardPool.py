@@ -0,0 +1,255 @@
+# ShardPool.py
+
+# Imports Required Dependencies
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.managers import BaseManager
+
+from .ApiKeyPool import ApiKeyPool
+from .JsonCodec import JsonCodec
+from .NexusApi import NexusApi
+from .NexusResponse import NexusResponse, BatchResult
+from .RateLimiter import RateLimiter
+from .ResponseCache import ResponseCache
+
+class ShardPool:
+    """Fetches the mods of very large catalogs with a pool of worker processes, so decoding the responses is not limited by the GIL of a single process.
+
+    The mod IDs are split into shards of shardSize consecutive IDs, each fetched by one of the worker processes. Every worker has its own NexusApi object (its own pooled session, and its own ResponseCache connection when cacheFile is used), sending up to maxConcurrency requests at once.
+    All the workers share one rate budget: the RateLimiter of each API key lives in a coordinator process, and every worker reserves its requests from it and feeds it the quota headers of its responses. The NexusApi object of the parent process should use the same budget, by being created with ShardPool.getKeyPool().
+
+    Each worker decodes its responses and only sends back the fields kept (see fields), re-encoded as compact JSON, so the parent process only decodes a few fields of each mod. With msgspec installed, the workers decode the kept fields straight into typed structs (see JsonCodec.decodeFields()), skipping the rest of each mod. Without fields, the workers send back the raw responses undecoded, and the parent decodes them whole. ShardPool.getMods() takes the same arguments as NexusApi.getMods() and returns the results in the same order as the IDs whatever the order the shards finish in, so the output of a sync is the same with or without shards.
+
+    The API keys are not validated by the workers. They should be validated beforehand (e.g. by the NexusApi object used for the rest of the sync).
+    """
+    
+    # The fields of the mod responses sent back by the workers by default (the fields compared by the sync)
+    modFields = ("mod_id","name","updated_time","updated_timestamp")
+    
+    # The NexusApi object of the current worker process, and the fields it sends back (set by ShardPool._initWorker())
+    _workerApi = None
+    _workerFields = None
+    
+    def __init__(self, apiKey, processes: int = None, maxConcurrency: int = 8, shardSize: int = 250, fields: tuple = modFields, apiUrl: str = None, cacheFile: str = None, cacheTtls: dict = None):
+        """Create a new ShardPool object. The worker processes are started by ShardPool.open() (or on first use).
+
+        Args:
+            apiKey (str or list): The API access key to interract with Nexus Mods, or a list of keys (see ApiKeyPool).
+            processes (int, optional): The number of worker processes. Defaults to None (the number of CPUs).
+            maxConcurrency (int, optional): The maximum number of requests in flight at once in each worker. Defaults to 8.
+            shardSize (int, optional): The number of mod IDs fetched by a worker at a time. Defaults to 250.
+            fields (tuple, optional): The fields of each mod sent back by the workers, or None for every field (e.g. to update a ModMirror). Defaults to ShardPool.modFields.
+            apiUrl (str, optional): The base URL of the API, e.g. to use a local stand-in server. Defaults to None (https://api.nexusmods.com/).
+            cacheFile (str, optional): The path of a ResponseCache database, opened by every worker. Defaults to None (no cache).
+            cacheTtls (dict, optional): The TTLs of the ResponseCache (see ResponseCache). Defaults to None.
+
+        Raises:
+            Exception: If apiKey is not a string (str) or a list of them, or has length = 0.
+            Exception: If processes, maxConcurrency or shardSize is not >0.
+        """
+        
+        # Validate apiKey is a non-empty string or a list of them
+        apiKeys = list(apiKey) if (isinstance(apiKey,(list,tuple))) else [apiKey]
+        if (len(apiKeys) == 0):
+            raise Exception("Valid API keys not provided. API keys must be a non-empty list.")
+        for key in apiKeys:
+            NexusApi._checkApiKey(key)
+        
+        if (processes is None):
+            processes = os.cpu_count() or 1
+        if ((not isinstance(processes,int)) or processes <= 0):
+            raise Exception("Valid process count not provided. Process count must be value >0")
+        if ((not isinstance(maxConcurrency,int)) or maxConcurrency <= 0):
+            raise Exception("Valid max concurrency not provided. Max concurrency must be value >0")
+        if ((not isinstance(shardSize,int)) or shardSize <= 0):
+            raise Exception("Valid shard size not provided. Shard size must be value >0")
+        
+        self._apiKeys = list(dict.fromkeys(apiKeys))
+        self._processes = processes
+        self._maxConcurrency = maxConcurrency
+        self._shardSize = shardSize
+        self._fields = tuple(fields) if (fields is not None) else None
+        self._apiUrl = apiUrl
+        self._cacheFile = cacheFile
+        self._cacheTtls = cacheTtls
+        self._coordinator = None
+        self._rateLimiters = None
+        self._keyPool = None
+        self._executor = None
+    
+    def __enter__(self):
+        return self.open()
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    def open(self):
+        """Start the coordinator and the worker processes. Does nothing if they are already started.
+
+        Returns:
+            ShardPool: A reference to the ShardPool object
+        """
+        if (self._executor is not None):
+            return self
+        
+        context = multiprocessing.get_context()
+        self._coordinator = _Coordinator(ctx=context)
+        self._coordinator.start()
+        try:
+            self._rateLimiters = [self._coordinator.RateLimiter() for _ in self._apiKeys]
+            self._keyPool = ApiKeyPool(self._apiKeys,[_SharedRateLimiter(rateLimiter) for rateLimiter in self._rateLimiters])
+            self._executor = ProcessPoolExecutor(max_workers=self._processes, mp_context=context, initializer=ShardPool._initWorker, initargs=(self._apiKeys,self._rateLimiters,self._maxConcurrency,self._fields,self._apiUrl,self._cacheFile,self._cacheTtls))
+        except Exception:
+            self.close()
+            raise
+        return self
+    
+    def close(self):
+        """Stop the worker processes and the coordinator.
+        """
+        if (self._executor is not None):
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._rateLimiters = None
+        self._keyPool = None
+        if (self._coordinator is not None):
+            self._coordinator.shutdown()
+            self._coordinator = None
+    
+    def getRateLimit(self) -> dict:
+        """Returns the remaining request budget shared by the workers (see NexusApi.getRateLimit()).
+
+        Returns:
+            dict: The quota last reported by the API, added up for every API key, or None if the workers are not started.
+        """
+        if (self._keyPool is None):
+            return None
+        return self._keyPool.getRemaining()
+    
+    def getKeyPool(self) -> ApiKeyPool:
+        """Returns a pool of the API keys paced by the RateLimiters shared by the workers, starting them if needed.
+
+        A NexusApi object created with it (e.g. the one planning the sync in the parent process) draws from the same rate budget as the workers, instead of pacing its requests with its own RateLimiters.
+
+        Returns:
+            ApiKeyPool: The pool of the API keys. It is only usable until ShardPool.close() is called.
+        """
+        self.open()
+        return self._keyPool
+    
+    def getMods(self,game:str,ids:list,maxConcurrency:int = None,progressCallback = None) -> list:
+        """Returns the information of many mods, fetched by the worker processes (see NexusApi.getMods()).
+
+        Args:
+            game (str): The game domain to use when polling Nexus Mods (e.g. "baldursgate3").
+            ids (list): The mod IDs to request.
+            maxConcurrency (int, optional): The maximum number of requests in flight at once in each worker. Defaults to None (the maxConcurrency of the ShardPool).
+            progressCallback (function, optional): Called as progressCallback(completed, total, result) for each mod, as each shard is finished. Defaults to None.
+
+        Raises:
+            Exception: If the game domain provided is not a string (str) or has length = 0.
+            Exception: If any mod ID is not >0.
+            Exception: If a worker process failed.
+
+        Returns:
+            list: A BatchResult for each mod ID, in the same order as ids. The responses only hold the fields kept (see fields), and no headers.
+        """
+        
+        # Validate the game domain string (DOES NOT GUARANTEE VALID RESPONSE)
+        if (not isinstance(game,str)):
+            raise Exception("Valid game domain not provided. Game value must be string (str).")
+        if (game == ""):
+            raise Exception("Valid game domain not provided. Game cannot be empty string (len = 0).")
+        
+        # Validate all mod IDs before sending any request
+        ids = list(ids)
+        for id in ids:
+            if ((not isinstance(id,int)) or id <= 0):
+                raise Exception("Valid mod ID not provided. Mod ID must be value >0 (received " + str(id) + ")")
+        
+        self.open()
+        
+        # Each shard is a slice of consecutive IDs, and its results go back to the same slice
+        total = len(ids)
+        results = [None] * total
+        completed = 0
+        futures = {}
+        for start in range(0, total, self._shardSize):
+            future = self._executor.submit(ShardPool._fetchShard, game, ids[start:start + self._shardSize], maxConcurrency or self._maxConcurrency)
+            futures[future] = start
+        for future in as_completed(futures):
+            start = futures[future]
+            for offset,shardResult in enumerate(future.result()):
+                result = ShardPool._toResult(shardResult)
+                results[start + offset] = result
+                completed += 1
+                if (progressCallback is not None):
+                    progressCallback(completed,total,result)
+        return results
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the ShardPool class
+    #
+    ################################
+    
+    def _initWorker(apiKeys: list, rateLimiters: list, maxConcurrency: int, fields: tuple, apiUrl: str, cacheFile: str, cacheTtls: dict):
+        """Create the NexusApi object of a worker process, pacing its requests with the shared RateLimiters."""
+        keyPool = ApiKeyPool(apiKeys,[_SharedRateLimiter(rateLimiter) for rateLimiter in rateLimiters])
+        cache = ResponseCache(cacheFile,cacheTtls) if (cacheFile) else None
+        ShardPool._workerApi = NexusApi(keyPool,poolSize=maxConcurrency,apiUrl=apiUrl,cache=cache,keyValidation="deferred")
+        ShardPool._workerFields = fields
+    
+    def _fetchShard(game: str, ids: list, maxConcurrency: int) -> list:
+        """Fetch a shard of mods in a worker process.
+
+        Returns:
+            list: For each mod, in the same order as ids: (mod ID, status code or None, the JSON body (of the fields kept, or the raw response without fields) or None, the error message or None).
+        """
+        shardResults = []
+        for result in ShardPool._workerApi.getMods(game,ids,maxConcurrency=maxConcurrency):
+            if (result.error is not None):
+                shardResults.append((result.id,None,None,str(result.error) or type(result.error).__name__))
+            elif (not result.ok):
+                shardResults.append((result.id,result.response.status_code,None,None))
+            elif (ShardPool._workerFields is not None):
+                modJson = JsonCodec.default.decodeFields(result.response.content,ShardPool._workerFields)
+                shardResults.append((result.id,200,JsonCodec.default.dumps(modJson).encode("utf-8"),None))
+            else:
+                shardResults.append((result.id,200,result.response.content,None))
+        return shardResults
+    
+    def _toResult(shardResult: tuple) -> BatchResult:
+        """Rebuild the BatchResult of a mod sent back by a worker."""
+        id, statusCode, content, error = shardResult
+        if (error is not None):
+            return BatchResult(id, error=Exception(error))
+        return BatchResult(id, response=NexusResponse("", statusCode, {}, content if (content is not None) else b""))
+
+class _SharedRateLimiter:
+    """Passes the calls of a NexusApi object to a RateLimiter of the coordinator process. The rate limit information of the responses is copied to a plain dict, so it can be sent to the coordinator."""
+    
+    def __init__(self, rateLimiter):
+        self._rateLimiter = rateLimiter
+    
+    def reserve(self) -> float:
+        return self._rateLimiter.reserve()
+    
+    def estimateWait(self) -> float:
+        return self._rateLimiter.estimateWait()
+    
+    def update(self, rateLimit) -> None:
+        self._rateLimiter.update(dict(rateLimit) if (rateLimit) else None)
+    
+    def backoff(self, attempt: int, retryAfter: float = None) -> float:
+        return self._rateLimiter.backoff(attempt, retryAfter)
+    
+    def getRemaining(self) -> dict:
+        return self._rateLimiter.getRemaining()
+
+class _Coordinator(BaseManager):
+    """The process holding the RateLimiters shared by the workers of a ShardPool."""
+
+_Coordinator.register("RateLimiter", RateLimiter)
@@ -0,0 +1,83 @@
+# Staleness.py
+
+# Imports Required Dependencies
+import operator
+from array import array
+from itertools import compress
+
+# NumPy is optional. Without it, the stdlib array module is used instead
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class Staleness:
+    """Batch staleness evaluation over whole mod lists.
+
+    A mod is stale (needs to be updated) if it was never downloaded, or if its mod page was updated after it was last downloaded. Every mod of a list is evaluated in a single vectorized pass over two arrays of epoch times (see ModRecord), using NumPy when it is installed and the stdlib array module otherwise.
+
+    Missing times are mapped to sentinel values, so that a single "lastDownloaded < updatedTime" comparison covers every case:
+    - A missing lastDownloaded (e.g. a new mod) is always stale.
+    - A missing updatedTime is never stale, unless lastDownloaded is missing too.
+    """
+    
+    # Sentinel values of missing times. A missing lastDownloaded is earlier than any updatedTime (even a missing one)
+    missingLastDownloaded = -(2 ** 63)
+    missingUpdatedTime = -(2 ** 63) + 1
+    
+    # Sentinel lastDownloaded value that excludes a mod from the results (e.g. a mod that could not be checked)
+    skipLastDownloaded = (2 ** 63) - 1
+    
+    def toArrays(updatedTimes, lastDownloadedTimes) -> tuple:
+        """Convert sequences of epoch times (None when missing) into arrays usable with Staleness.findStale().
+
+        Args:
+            updatedTimes (iterable): The updatedTime of each mod, as epoch microseconds or None.
+            lastDownloadedTimes (iterable): The lastDownloaded time of each mod, as epoch microseconds or None.
+
+        Returns:
+            tuple: The (updatedTimes, lastDownloadedTimes) arrays. NumPy int64 arrays if NumPy is installed, array('q') otherwise.
+        """
+        missingUpdated = Staleness.missingUpdatedTime
+        missingDownloaded = Staleness.missingLastDownloaded
+        updated = array('q', [missingUpdated if (value is None) else value for value in updatedTimes])
+        downloaded = array('q', [missingDownloaded if (value is None) else value for value in lastDownloadedTimes])
+        if (numpy is not None):
+            return numpy.frombuffer(updated, dtype=numpy.int64), numpy.frombuffer(downloaded, dtype=numpy.int64)
+        return updated, downloaded
+    
+    def findStale(updatedTimes, lastDownloadedTimes) -> list:
+        """Returns the indexes of the stale mods of a list, in a single vectorized pass.
+
+        Args:
+            updatedTimes (sequence): The updatedTime of each mod. Arrays returned by Staleness.toArrays(), or sequences of epoch microseconds or None.
+            lastDownloadedTimes (sequence): The lastDownloaded time of each mod, in the same order.
+
+        Raises:
+            Exception: If the sequences are not the same length.
+
+        Returns:
+            list: The indexes of the stale mods, in ascending order.
+        """
+        if (len(updatedTimes) != len(lastDownloadedTimes)):
+            raise Exception("Valid times not provided. updatedTimes and lastDownloadedTimes must be the same length")
+        
+        if (not Staleness._isArray(updatedTimes)) or (not Staleness._isArray(lastDownloadedTimes)):
+            updatedTimes, lastDownloadedTimes = Staleness.toArrays(updatedTimes, lastDownloadedTimes)
+        
+        if (numpy is not None) and isinstance(updatedTimes, numpy.ndarray) and isinstance(lastDownloadedTimes, numpy.ndarray):
+            return numpy.flatnonzero(lastDownloadedTimes < updatedTimes).tolist()
+        return list(compress(range(len(updatedTimes)), map(operator.lt, lastDownloadedTimes, updatedTimes)))
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the Staleness class
+    #
+    ################################
+    
+    def _isArray(values) -> bool:
+        """True if values is an int64 array (array('q') or a NumPy int64 array), i.e. holds no None."""
+        if isinstance(values, array):
+            return values.typecode == 'q'
+        return (numpy is not None) and isinstance(values, numpy.ndarray) and (values.dtype == numpy.int64)
@@ -0,0 +1,193 @@
+# SyncJournal.py
+
+# Imports Required Dependencies
+import json
+import os
+from pathlib import Path
+
+from .NexusResponse import NexusResponse, BatchResult
+
+class SyncJournal:
+    """Write-ahead journal of a mod list sync, so an interrupted run can resume without requesting the same mods again.
+
+    Every step of the sync is appended to a JSON Lines file as it happens: the plan of each list (the mods to request and the sync start time), the result of each mod received, and each decision taken afterwards (e.g. a mod marked as downloaded).
+    Each record is flushed to the operating system before the next request is sent, so a crash or a lost connection costs at most the requests in flight.
+
+    When a journal is opened for the same run (same runKey, e.g. a hash of the input lists) its records are replayed; a journal of another run is discarded. A record cut off by a crash is ignored. The journal is deleted with SyncJournal.complete() once the results are saved.
+    """
+    
+    # Fields of the mod responses kept in the journal (the fields compared by the sync)
+    _modFields = ("mod_id","name","updated_time","updated_timestamp")
+    
+    def __init__(self, path: str, runKey: str):
+        """Create a new SyncJournal object, replaying the journal file if it belongs to the same run.
+
+        Args:
+            path (str): The path of the journal file. Created (along with its directory) if it doesn't exist.
+            runKey (str): Identifies the run. A journal file written with another runKey is discarded.
+        """
+        self._path = Path(path)
+        self._runKey = runKey
+        self._plans = {}
+        self._results = {}
+        self._decisions = {}
+        self._resumed = False
+        
+        goodLength = self._replay()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if (goodLength is None):
+            self._file = open(self._path, "wb")
+            self._append({"type": "run","runKey": runKey})
+        else:
+            # Drop a record cut off by a crash before appending to the journal
+            self._file = open(self._path, "r+b")
+            self._file.truncate(goodLength)
+            self._file.seek(goodLength)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+    
+    @property
+    def resumed(self) -> bool:
+        """True if records of an interrupted run of the same sync were replayed."""
+        return self._resumed
+    
+    def getPlan(self, syncKey: str) -> dict:
+        """Returns the plan recorded for a mod list.
+
+        Args:
+            syncKey (str): The key of the list ("gameDomain/fileName").
+
+        Returns:
+            dict: "fetchIdList" (the mod IDs to request) and "syncStarted" (epoch seconds), or None if no plan was recorded.
+        """
+        return self._plans.get(syncKey)
+    
+    def recordPlan(self, syncKey: str, fetchIdList: list, syncStarted: float):
+        """Record the plan of a mod list.
+
+        Args:
+            syncKey (str): The key of the list ("gameDomain/fileName").
+            fetchIdList (list): The mod IDs to request.
+            syncStarted (float): The time the sync started (epoch seconds).
+        """
+        self._plans[syncKey] = {"fetchIdList": list(fetchIdList),"syncStarted": syncStarted}
+        self._append({"type": "plan","syncKey": syncKey,"fetchIdList": list(fetchIdList),"syncStarted": syncStarted})
+    
+    def getResults(self, game: str) -> dict:
+        """Returns the mod results recorded for a game.
+
+        Args:
+            game (str): The game domain of the mods.
+
+        Returns:
+            dict: The BatchResult of each mod, keyed by mod ID. The responses only hold the fields compared by the sync.
+        """
+        return dict(self._results.get(game,{}))
+    
+    def recordResult(self, game: str, result: BatchResult) -> bool:
+        """Record the result of a mod. Only mods received successfully are recorded, so the others are requested again on resume.
+
+        Args:
+            game (str): The game domain of the mod.
+            result (BatchResult): The result of the mod, as returned by NexusApi.getMods().
+
+        Returns:
+            bool: True if the result was recorded.
+        """
+        if (not result.ok):
+            return False
+        modJson = result.response.json()
+        mod = {field: modJson.get(field) for field in SyncJournal._modFields}
+        self._results.setdefault(game,{})[result.id] = SyncJournal._toResult(result.id,mod)
+        self._append({"type": "mod","game": game,"id": result.id,"mod": mod})
+        return True
+    
+    def getDecisions(self, game: str) -> dict:
+        """Returns the decisions recorded for the mods of a game.
+
+        Args:
+            game (str): The game domain of the mods.
+
+        Returns:
+            dict: The decision of each mod, keyed by mod ID (the latest one if several were recorded).
+        """
+        return dict(self._decisions.get(game,{}))
+    
+    def recordDecision(self, game: str, id: int, decision: dict):
+        """Record a decision taken for a mod (e.g. {"lastDownloaded": "..."}).
+
+        Args:
+            game (str): The game domain of the mod.
+            id (int): The ID of the mod.
+            decision (dict): The decision. Must be JSON serializable.
+        """
+        self._decisions.setdefault(game,{})[id] = decision
+        self._append({"type": "decision","game": game,"id": id,"decision": decision})
+    
+    def complete(self):
+        """Close and delete the journal, once the results of the run are saved."""
+        self.close()
+        try:
+            os.remove(self._path)
+        except FileNotFoundError:
+            pass
+    
+    def close(self):
+        """Close the journal file, keeping it so an interrupted run can be resumed."""
+        if (not self._file.closed):
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+    
+    ################################
+    #
+    # Internal methods
+    # For use only within the SyncJournal class
+    #
+    ################################
+    
+    def _replay(self) -> int:
+        """Load the records of the journal file if it belongs to the same run.
+
+        Returns:
+            int: The length (in bytes) of the valid records, or None if there is no journal of this run.
+        """
+        if (not Path.exists(self._path)):
+            return None
+        goodLength = 0
+        with open(self._path, "rb") as f:
+            for line in f:
+                # A line without a newline was cut off while being written
+                if (not line.endswith(b"\n")):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if (goodLength == 0):
+                    if ((record.get("type") != "run") or (record.get("runKey") != self._runKey)):
+                        return None
+                elif (record["type"] == "plan"):
+                    self._plans[record["syncKey"]] = {"fetchIdList": record["fetchIdList"],"syncStarted": record["syncStarted"]}
+                elif (record["type"] == "mod"):
+                    self._results.setdefault(record["game"],{})[record["id"]] = SyncJournal._toResult(record["id"],record["mod"])
+                elif (record["type"] == "decision"):
+                    self._decisions.setdefault(record["game"],{})[record["id"]] = record["decision"]
+                goodLength += len(line)
+        if (goodLength == 0):
+            return None
+        self._resumed = (len(self._plans) + len(self._results) + len(self._decisions)) > 0
+        return goodLength
+    
+    def _append(self, record: dict):
+        """Append a record to the journal and flush it to the operating system."""
+        self._file.write((json.dumps(record, separators=(",",":")) + "\n").encode("utf-8"))
+        self._file.flush()
+    
+    def _toResult(id: int, mod: dict) -> BatchResult:
+        """Rebuild the BatchResult of a mod from its recorded fields."""
+        return BatchResult(id, response=NexusResponse("", 200, {}, json.dumps(mod).encode("utf-8")))
@@ -1,2 +1,75 @@
-from .NexusApi import NexusApi
-from .InputManager import InputManager
\ No newline at end of file
+# Engine/__init__.py
+
+# The classes of the package are imported on first use (PEP 562), so importing one class doesn't pay for the dependencies of the others (e.g. aiohttp for AsyncNexusApi)
+import importlib
+import sys
+from typing import TYPE_CHECKING
+
+# The module of each class exported by the package
+_exports = {
+    "NexusApi": ".NexusApi",
+    "AsyncNexusApi": ".AsyncNexusApi",
+    "NexusResponse": ".NexusResponse",
+    "BatchResult": ".NexusResponse",
+    "RateLimiter": ".RateLimiter",
+    "ApiKeyPool": ".ApiKeyPool",
+    "ResponseCache": ".ResponseCache",
+    "MemoryCache": ".MemoryCache",
+    "RequestEvent": ".RequestMetrics",
+    "RequestMetrics": ".RequestMetrics",
+    "OpenTelemetryHook": ".OpenTelemetryHook",
+    "DownloadManager": ".DownloadManager",
+    "DownloadResult": ".DownloadManager",
+    "ModRecord": ".ModRecord",
+    "ModManifest": ".ModManifest",
+    "ModListStore": ".ModListStore",
+    "ModMirror": ".ModMirror",
+    "ModWatcher": ".ModWatcher",
+    "EventFile": ".ModWatcher",
+    "EventSocket": ".ModWatcher",
+    "Staleness": ".Staleness",
+    "InputManager": ".InputManager",
+    "SyncJournal": ".SyncJournal",
+    "ShardPool": ".ShardPool",
+    "JsonCodec": ".JsonCodec",
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name: str):
+    if (name not in _exports):
+        raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+    importlib.import_module(_exports[name], __name__)
+    # Importing a module binds it on the package under its own name, which is also the name of its class (e.g. Engine.NexusResponse).
+    # Bind the classes of every module loaded so far instead, so later lookups find them directly without calling __getattr__ again
+    for exportName,moduleName in _exports.items():
+        module = sys.modules.get(__name__ + moduleName)
+        if (module is not None):
+            globals()[exportName] = getattr(module, exportName)
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+# Static type checkers and IDEs don't run __getattr__
+if TYPE_CHECKING:
+    from .NexusApi import NexusApi
+    from .AsyncNexusApi import AsyncNexusApi
+    from .NexusResponse import NexusResponse, BatchResult
+    from .RateLimiter import RateLimiter
+    from .ApiKeyPool import ApiKeyPool
+    from .ResponseCache import ResponseCache
+    from .MemoryCache import MemoryCache
+    from .RequestMetrics import RequestEvent, RequestMetrics
+    from .OpenTelemetryHook import OpenTelemetryHook
+    from .DownloadManager import DownloadManager, DownloadResult
+    from .ModRecord import ModRecord
+    from .ModManifest import ModManifest
+    from .ModListStore import ModListStore
+    from .ModMirror import ModMirror
+    from .ModWatcher import ModWatcher, EventFile, EventSocket
+    from .Staleness import Staleness
+    from .InputManager import InputManager
+    from .SyncJournal import SyncJournal
+    from .ShardPool import ShardPool
+    from .JsonCodec import JsonCodec
@@ -1,13 +1,25 @@
 #!/usr/bin/env python
 
+# The other classes of the Engine package are imported by the functions that use them, so importing this script (e.g. for a short cron run) only loads what the run needs
 from Engine import NexusApi, InputManager
 
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 import webbrowser
 
+# Static type checkers and IDEs only
+if TYPE_CHECKING:
+    from Engine import ModMirror, ShardPool, SyncJournal
+
 
 # Initialize logger
 import logging
@@ -18,6 +30,917 @@ logging.basicConfig(format=logFormat,datefmt=dateFormat)
 # Log Level = INFO
 log.setLevel(logging.INFO)
 
+# Seconds in each period accepted by NexusApi.getUpdated(). A month is counted as 28 days so the period always covers the full gap.
+updatedPeriods = [("1d", 24*60*60),("1w", 7*24*60*60),("1m", 28*24*60*60)]
+# Safety margin added to the time since the last sync, covering clock differences with the server
+syncMargin = 60*60
+# Size (in characters) of the chunks read when streaming a mod list file
+readChunkSize = 64*1024
+
+@contextmanager
+def atomicWrite(filePath: Path):
+    """Open a temporary file next to filePath for writing, then rename it over filePath once written. The existing file is left untouched if writing fails.
+
+    Args:
+        filePath (Path): The path of the file to write.
+
+    Yields:
+        file: The temporary file, opened for writing text.
+    """
+    filePath = Path(filePath)
+    filePath.parent.mkdir(parents=True, exist_ok=True)
+    fd, tempPath = tempfile.mkstemp(prefix="." + filePath.name + ".", suffix=".tmp", dir=filePath.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tempPath, filePath)
+    except BaseException:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        raise
+
+def loadSyncState(syncStateFile: str) -> dict:
+    """Load the last sync time of each mod list.
+
+    Args:
+        syncStateFile (str): The path of the sync state file.
+
+    Returns:
+        dict: The sync state of each mod list, keyed by "gameDomain/fileName". Each contains "lastSync" (epoch seconds) and "failedMods" (mod IDs that could not be checked). Empty if the file doesn't exist or can't be read.
+    """
+    syncStatePath = Path(syncStateFile)
+    if (not Path.exists(syncStatePath)):
+        return {}
+    try:
+        with open(syncStatePath, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log.warning("Could not read sync state \"{0}\": {1}".format(syncStateFile,e))
+        return {}
+
+def saveSyncState(syncStateFile: str, syncState: dict):
+    """Save the last sync time of each mod list.
+
+    Args:
+        syncStateFile (str): The path of the sync state file.
+        syncState (dict): The sync state of each mod list, keyed by "gameDomain/fileName".
+    """
+    with atomicWrite(Path(syncStateFile)) as f:
+        json.dump(syncState, f, indent=4)
+
+def selectUpdatedPeriod(lastSync: float, now: float) -> str:
+    """Select the smallest getUpdated() period that covers the time since the last sync.
+
+    Args:
+        lastSync (float): The time of the last sync (epoch seconds), or None if never synced.
+        now (float): The current time (epoch seconds).
+
+    Returns:
+        str: "1d", "1w" or "1m", or None if the last sync is unknown or older than one month.
+    """
+    if (lastSync is None):
+        return None
+    elapsed = now - lastSync + syncMargin
+    for period,seconds in updatedPeriods:
+        if (elapsed <= seconds):
+            return period
+    return None
+
+def getUpdatedModIds(nexusMods: NexusApi, gameDomain: str, period: str) -> dict:
+    """Get the mods of a game updated within the given period, with a single request.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        gameDomain (str): The game domain to check.
+        period (str): The period to check ("1d", "1w" or "1m").
+
+    Returns:
+        dict: The latest activity time (epoch seconds) of each updated mod, keyed by mod ID. None if the request failed.
+    """
+    from Engine import JsonCodec
+    try:
+        response = nexusMods.getUpdated(gameDomain,period)
+    except Exception as e:
+        log.error("Failed to get updated mods: {0}".format(e))
+        return None
+    if (response.status_code != 200):
+        log.error("Failed to get updated mods: Response code = {0}".format(response.status_code))
+        return None
+    updatedMods = JsonCodec.default.decodeFieldsList(response.content,("mod_id","latest_file_update","latest_mod_activity"))
+    # Times missing from an entry (or null) count as 0, so one incomplete entry doesn't abort the sync
+    return {mod["mod_id"]: max(mod["latest_mod_activity"] or 0,mod["latest_file_update"] or 0) for mod in updatedMods if (mod["mod_id"] is not None)}
+
+def iterModList(filePath: Path):
+    """Read the mods of a mod list file one at a time, without loading the whole file at once.
+
+    JSON Lines files (.jsonl) hold one mod per line, decoded with JsonCodec.default. Any other file is read as a JSON array, decoded incrementally one mod at a time.
+
+    Args:
+        filePath (Path): The path of the mod list file.
+
+    Raises:
+        ValueError: If the file is not a valid mod list.
+
+    Yields:
+        dict: Each mod of the list, in order.
+    """
+    from Engine import JsonCodec
+    filePath = Path(filePath)
+    with open(filePath, encoding='utf-8') as f:
+        if (filePath.suffix == ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield JsonCodec.default.loads(line)
+            return
+        
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        started = False
+        finished = False
+        eof = False
+        while (not finished):
+            # Skip the whitespace and separators between mods
+            while ((position < len(buffer)) and (buffer[position] in " \t\r\n,[]")):
+                if (buffer[position] == "["):
+                    if (started):
+                        raise ValueError("\"{0}\" is not a valid mod list: unexpected '[' at character {1}".format(filePath,position))
+                    started = True
+                elif (buffer[position] == "]"):
+                    finished = True
+                    break
+                elif (not started):
+                    if (buffer[position] == ","):
+                        raise ValueError("\"{0}\" is not a valid mod list: expected '['".format(filePath))
+                position += 1
+            if (finished):
+                break
+            
+            # Decode the next mod, reading more of the file until it is complete
+            if (position < len(buffer)):
+                if (not started):
+                    raise ValueError("\"{0}\" is not a valid mod list: expected '['".format(filePath))
+                end = None
+                try:
+                    mod, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if (eof):
+                        raise
+                # A mod ending exactly at the end of the buffer may be cut off (e.g. a number), unless the file is fully read
+                if ((end is not None) and ((end < len(buffer)) or eof)):
+                    yield mod
+                    position = end
+                    continue
+            elif (eof):
+                if (started):
+                    raise ValueError("\"{0}\" is not a valid mod list: missing ']'".format(filePath))
+                raise ValueError("\"{0}\" is not a valid mod list: expected '['".format(filePath))
+            
+            chunk = f.read(readChunkSize)
+            eof = (not chunk)
+            buffer = buffer[position:] + chunk
+            position = 0
+
+def loadModList(filePath: Path) -> list:
+    """Load a mod list from a JSON (or JSON Lines) file.
+
+    Args:
+        filePath (Path): The path of the mod list file.
+
+    Returns:
+        list: The mods of the list.
+    """
+    inputModList = list(iterModList(filePath))
+    log.info("Loaded File \"{0}\" successfully! ({1} mod(s))".format(filePath,len(inputModList)))
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("{0}:\n{1}".format(filePath,json.dumps(inputModList)))
+    return inputModList
+
+def saveModList(outputFilePath: Path, outputModList):
+    """Save a mod list to a JSON (or JSON Lines, for .jsonl) file, one mod at a time.
+
+    The mods are written to a temporary file which then replaces the output file, so an interrupted save never leaves a partial list behind.
+
+    Args:
+        outputFilePath (Path): The path of the mod list file.
+        outputModList (iterable): The mods of the list (e.g. a list, or a generator).
+    """
+    from Engine import JsonCodec
+    outputFilePath = Path(outputFilePath)
+    log.info("Saving mod list as \"{0}\"".format(outputFilePath))
+    count = 0
+    with atomicWrite(outputFilePath) as f:
+        if (outputFilePath.suffix == ".jsonl"):
+            for mod in outputModList:
+                f.write(JsonCodec.default.dumps(mod))
+                f.write("\n")
+                count += 1
+        else:
+            # Same layout as json.dump(outputModList, f, indent=4)
+            for mod in outputModList:
+                f.write("[\n    " if (count == 0) else ",\n    ")
+                f.write(JsonCodec.default.dumpsIndented(mod).replace("\n","\n    "))
+                count += 1
+            f.write("[]" if (count == 0) else "\n]")
+    log.info("Saved {0} mod(s).".format(count))
+
+def planModList(nexusMods: NexusApi, gameDomain: str, inputModList: list, addModIdList: list, incrementalSync: bool = False, syncStateFile: str = None, syncKey: str = None, updatedCache: dict = None, journal: "SyncJournal" = None) -> dict:
+    """Build the list of mod IDs of a mod list (and the new mods to add), and decide which of them need to be requested individually.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        gameDomain (str): The game domain of the mods.
+        inputModList (list): The mods of the existing list (empty for a new list).
+        addModIdList (list): The IDs of new mods to add to the list, if they aren't there already.
+        incrementalSync (bool, optional): If only the mods updated since the last sync of the list should be requested individually. Defaults to False.
+        syncStateFile (str, optional): The path of the sync state file. Required for incrementalSync. Defaults to None.
+        syncKey (str, optional): The key of the list in the sync state file ("gameDomain/fileName"). Required for incrementalSync. Defaults to None.
+        updatedCache (dict, optional): getUpdated results already received during this run, keyed by (gameDomain, period). Shared between lists so each is requested once. Defaults to None.
+        journal (SyncJournal, optional): The journal of the run. The plan of an interrupted run is reused, otherwise the new plan is recorded. Requires syncKey. Defaults to None.
+
+    Returns:
+        dict: "modIdList" (every mod ID, in list order), "fetchIdList" (the mod IDs to request), "inputCount" (mods in the existing list), "syncStarted" (epoch seconds) and "store" (the existing mods, as a ModListStore).
+    """
+    from Engine import ModListStore
+    # Index the existing mods by (game, modId)
+    store = ModListStore.fromModList(gameDomain,inputModList)
+    if (len(store) < len(inputModList)):
+        log.warning("{0} duplicate mod(s) in the list, keeping the last of each.".format(len(inputModList)-len(store)))
+    modIdList = [mod.id for mod in store]
+    knownModIds = set(modIdList)
+    
+    # Get count of original mods
+    inputCount = len(modIdList)
+    
+    
+    # check additional mod IDs and add if missing
+    for modId in addModIdList:
+        if not modId in knownModIds:
+            knownModIds.add(modId)
+            modIdList.append(modId)
+            log.info("Added modId {0} to list.".format(modId))
+        else:
+            log.warning("ModId {0} already in loaded file, ignoring!".format(modId))
+    
+    log.info("List of modId's to check: {0}".format(modIdList))
+    
+    totalMods = len(modIdList)
+    newMods = totalMods-inputCount
+    log.info("Mod counts:\n\tExisting Mods = {0},\n\tNew Mods = {1},\n\tTotal Mods = {2}".format(inputCount,newMods,totalMods))
+    
+    # Decide which mods need to be requested individually. By default, every mod is requested
+    fetchIdList = modIdList
+    syncStarted = time.time()
+    journaledPlan = journal.getPlan(syncKey) if (journal is not None) else None
+    if (journaledPlan is not None):
+        # Resume the plan of the interrupted run, keeping its sync start time so the next incremental sync covers the whole gap
+        fetchIdList = journaledPlan["fetchIdList"]
+        syncStarted = journaledPlan["syncStarted"]
+        log.info("Resuming the interrupted sync of \"{0}\": {1} of {2} mod(s) to check.".format(syncKey,len(fetchIdList),totalMods))
+    elif (incrementalSync and (inputCount > 0)):
+        listSyncState = loadSyncState(syncStateFile).get(syncKey,{})
+        retryModIds = set(listSyncState.get("failedMods",[]))
+        period = selectUpdatedPeriod(listSyncState.get("lastSync"),syncStarted)
+        updatedMods = None
+        if (period is None):
+            log.info("\"{0}\" not synced within the last month. Checking every mod.".format(syncKey))
+        else:
+            # The same game and period are only requested once per run
+            if ((updatedCache is not None) and ((gameDomain,period) in updatedCache)):
+                updatedMods = updatedCache[(gameDomain,period)]
+            else:
+                updatedMods = getUpdatedModIds(nexusMods,gameDomain,period)
+                if (updatedCache is not None):
+                    updatedCache[(gameDomain,period)] = updatedMods
+            if (updatedMods is None):
+                log.warning("Incremental sync unavailable. Checking every mod.")
+        
+        if (updatedMods is not None):
+            fetchIdList = []
+            for modId in modIdList:
+                inputMod = store.get(gameDomain,modId)
+                # New mods, and mods that could not be checked during the last sync, are always requested
+                if ((inputMod is None) or (modId in retryModIds) or (not inputMod.name) or (inputMod.updatedTime is None)):
+                    fetchIdList.append(modId)
+                # Existing mods are requested only if they changed after their saved updatedTime (epoch seconds against epoch microseconds)
+                elif ((modId in updatedMods) and (updatedMods[modId] * 1000000 > inputMod.updatedTime)):
+                    fetchIdList.append(modId)
+            log.info("Incremental sync (period = {0}): {1} of {2} mod(s) need to be checked.".format(period,len(fetchIdList),totalMods))
+    if ((journal is not None) and (journaledPlan is None)):
+        journal.recordPlan(syncKey,fetchIdList,syncStarted)
+    
+    return {"modIdList": modIdList,"fetchIdList": fetchIdList,"inputCount": inputCount,"syncStarted": syncStarted,"store": store}
+
+def compareModList(gameDomain: str, plan: dict, modResultsById: dict) -> dict:
+    """Build the updated mod list from the requested mods, and flag the mods that need to be updated.
+
+    The existing mods are looked up by mod ID in the store of the plan, which then tracks the mods that changed.
+
+    Args:
+        gameDomain (str): The game domain of the mods.
+        plan (dict): The plan of the list (see planModList()).
+        modResultsById (dict): The BatchResult of each requested mod, keyed by mod ID. Mods of the list missing from it are kept unchanged.
+
+    Returns:
+        dict: "outputModList" (the updated mods, in list order), "updatesRequired" (indexes of the mods flagged for updates), "failedMods" (IDs of the mods that could not be checked) and "changedMods" (mods added or changed).
+    """
+    from Engine import ModRecord, Staleness
+    modIdList = plan["modIdList"]
+    store = plan["store"]
+    outputModList = []
+    failedMods = []
+    outputRecords = []
+    # Times compared for each mod (see Staleness.findStale())
+    updatedTimes = []
+    lastDownloadedTimes = []
+    
+    # Assemble the mod info of each mod while tracking index
+    for index,modId in enumerate(modIdList):
+        modResult = modResultsById.get(modId)
+        inputMod = store.get(gameDomain,modId)
+        
+        # If the mod wasn't requested, it hasn't changed since the last sync. Keep the existing mod info
+        if (modResult is None):
+            outputMod = inputMod.copy()
+        
+        # If the mod could not be retrieved, keep the existing mod info (if any) and don't flag it
+        elif (not modResult.ok):
+            if (modResult.error is not None):
+                log.error("Failed to check modId={0}: {1}".format(modId,modResult.error))
+            else:
+                log.error("Failed to check modId={0}: Response code = {1}".format(modId,modResult.response.status_code))
+            failedMods.append(modId)
+            if (inputMod is not None):
+                outputMod = inputMod.copy()
+            else:
+                outputMod = ModRecord(gameDomain,modId)
+            outputRecords.append(outputMod)
+            updatedTimes.append(outputMod.updatedTime)
+            lastDownloadedTimes.append(Staleness.skipLastDownloaded)
+            continue
+        
+        else:
+            getModJson = modResult.response.json()
+            
+            # Assemble Mod Info
+            outputMod = ModRecord(gameDomain,modId,getModJson["name"],ModRecord.toEpoch(getModJson["updated_time"]))
+            if (inputMod is not None):
+                # Copy old download timestamp
+                outputMod.lastDownloaded = inputMod.lastDownloaded
+                outputMod.extra = inputMod.extra
+        
+        outputRecords.append(outputMod)
+        updatedTimes.append(outputMod.updatedTime)
+        # New mods have no lastDownloaded, so they are always flagged
+        lastDownloadedTimes.append(outputMod.lastDownloaded)
+    
+    # Compare updatedTime and lastDownloaded of every mod at once
+    updatesRequired = Staleness.findStale(updatedTimes,lastDownloadedTimes)
+    for index in updatesRequired:
+        modId = modIdList[index]
+        if (store.get(gameDomain,modId) is None):
+            # Mod is new, needs to initialize update
+            log.warning("modId={0} is a new mod, flagging for update!".format(modId))
+        elif (outputRecords[index].lastDownloaded is None):
+            log.warning("modId={0} doesn't have lastDownloaded, flagging for update!".format(modId))
+        else:
+            log.warning("modId={0} hasn't updated since lastDownloaded, but the mod page has. Flagging for update!".format(modId))
+    
+    if (len(failedMods) > 0):
+        log.warning("{0} mod(s) could not be checked and were left unchanged: {1}".format(len(failedMods),failedMods))
+    
+    # Track the mods that changed, then convert the records back to the mod info format
+    changedMods = 0
+    for outputMod in outputRecords:
+        if (store.put(gameDomain,outputMod)):
+            changedMods += 1
+        outputModList.append(outputMod.toDict())
+    log.info("{0} of {1} mod(s) changed.".format(changedMods,len(outputModList)))
+    
+    return {"outputModList": outputModList,"updatesRequired": updatesRequired,"failedMods": failedMods,"changedMods": changedMods}
+
+def logProgress(completed: int, total: int, result):
+    """Log progress as each mod is checked (progress callback of NexusApi.getMods())."""
+    log.info("Checked modId={0} (mod #{1}/{2})".format(result.id,completed,total))
+
+def fetchMods(nexusMods: NexusApi, gameDomain: str, fetchIdList: list, maxConcurrency: int = 8, journal: "SyncJournal" = None, mirror: "ModMirror" = None) -> dict:
+    """Request the given mods in parallel, skipping the mods already received by an interrupted run.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use (or a ShardPool, to request the mods from its worker processes).
+        gameDomain (str): The game domain of the mods.
+        fetchIdList (list): The IDs of the mods to request.
+        maxConcurrency (int, optional): The maximum number of mods to check at once. Defaults to 8.
+        journal (SyncJournal, optional): The journal of the run. Each mod received is recorded as soon as it arrives. Defaults to None.
+        mirror (ModMirror, optional): The local metadata mirror, updated with every mod received. Defaults to None.
+
+    Returns:
+        dict: The BatchResult of each mod, keyed by mod ID.
+    """
+    if (journal is None):
+        modResults = nexusMods.getMods(game=gameDomain,ids=fetchIdList,maxConcurrency=maxConcurrency,progressCallback=logProgress)
+        mirrorMods(mirror,gameDomain,modResults)
+        return {modResult.id: modResult for modResult in modResults}
+    
+    journaledResults = journal.getResults(gameDomain)
+    modResultsById = {modId: journaledResults[modId] for modId in fetchIdList if modId in journaledResults}
+    remainingIds = [modId for modId in fetchIdList if modId not in modResultsById]
+    if (len(modResultsById) > 0):
+        log.info("{0} mod(s) of \"{1}\" already checked by the interrupted run, requesting the other {2}.".format(len(modResultsById),gameDomain,len(remainingIds)))
+    
+    def recordProgress(completed: int, total: int, result):
+        journal.recordResult(gameDomain,result)
+        logProgress(completed,total,result)
+    
+    modResults = nexusMods.getMods(game=gameDomain,ids=remainingIds,maxConcurrency=maxConcurrency,progressCallback=recordProgress)
+    # The journal only keeps the fields compared by the sync, so only the mods received now are mirrored
+    mirrorMods(mirror,gameDomain,modResults)
+    modResultsById.update({modResult.id: modResult for modResult in modResults})
+    return modResultsById
+
+def mirrorMods(mirror: "ModMirror", gameDomain: str, modResults: list) -> int:
+    """Add the mods received to the local metadata mirror.
+
+    Args:
+        mirror (ModMirror): The mirror, or None if there is none.
+        gameDomain (str): The game domain of the mods.
+        modResults (list): The BatchResult of each mod, as returned by NexusApi.getMods().
+
+    Returns:
+        int: The number of mods added or changed.
+    """
+    if (mirror is None):
+        return 0
+    changed = mirror.putMany(gameDomain,[modResult.response.json() for modResult in modResults if modResult.ok])
+    log.info("Mirrored {0} changed mod(s) of \"{1}\".".format(changed,gameDomain))
+    return changed
+
+def checkModList(nexusMods: NexusApi, gameDomain: str, inputModList: list, addModIdList: list, maxConcurrency: int = 8, incrementalSync: bool = False, syncStateFile: str = None, syncKey: str = None, journal: "SyncJournal" = None, mirror: "ModMirror" = None, shardPool: "ShardPool" = None) -> dict:
+    """Check every mod of a mod list (and the new mods to add) for updates on Nexus Mods.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        gameDomain (str): The game domain of the mods.
+        inputModList (list): The mods of the existing list (empty for a new list).
+        addModIdList (list): The IDs of new mods to add to the list, if they aren't there already.
+        maxConcurrency (int, optional): The maximum number of mods to check at once. Defaults to 8.
+        incrementalSync (bool, optional): If only the mods updated since the last sync of the list should be requested individually. Defaults to False.
+        syncStateFile (str, optional): The path of the sync state file. Required for incrementalSync. Defaults to None.
+        syncKey (str, optional): The key of the list in the sync state file ("gameDomain/fileName"). Required for incrementalSync. Defaults to None.
+        journal (SyncJournal, optional): The journal of the run (see openJournal()). An interrupted run resumes with its plan and the mods it already received. Requires syncKey. Defaults to None.
+        mirror (ModMirror, optional): The local metadata mirror, updated with every mod received. Defaults to None.
+        shardPool (ShardPool, optional): The worker processes requesting the mods, instead of nexusMods (which still plans the sync). The mods are compared in list order either way, so the output is the same. Defaults to None.
+
+    Returns:
+        dict: "outputModList" (the updated mods, in list order), "updatesRequired" (indexes of the mods flagged for updates), "failedMods" (IDs of the mods that could not be checked), "changedMods" (mods added or changed), "inputCount" (mods in the existing list), "checkedCount" (mods requested individually) and "syncStarted" (epoch seconds).
+    """
+    plan = planModList(nexusMods,gameDomain,inputModList,addModIdList,incrementalSync,syncStateFile,syncKey,journal=journal)
+    
+    # Check the modIds on NexusMods in parallel
+    modResultsById = fetchMods(shardPool if (shardPool is not None) else nexusMods,gameDomain,plan["fetchIdList"],maxConcurrency,journal,mirror)
+    
+    checkResult = compareModList(gameDomain,plan,modResultsById)
+    checkResult["inputCount"] = plan["inputCount"]
+    checkResult["checkedCount"] = len(plan["fetchIdList"])
+    checkResult["syncStarted"] = plan["syncStarted"]
+    return checkResult
+
+def checkModLists(nexusMods: NexusApi, modLists: list, maxConcurrency: int = 8, incrementalSync: bool = False, syncStateFile: str = None, journal: "SyncJournal" = None, mirror: "ModMirror" = None, shardPool: "ShardPool" = None) -> dict:
+    """Check several mod lists (of one or more games) for updates at once.
+
+    Every list is planned first, then each (game, modId) pair is requested only once, however many lists it appears in. The results are shared between the lists.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        modLists (list): The lists to check, as dicts with "game" (game domain), "modList" (the mods of the existing list), "add" (IDs of new mods to add) and "syncKey" (the key of the list in the sync state file).
+        maxConcurrency (int, optional): The maximum number of mods to check at once. Defaults to 8.
+        incrementalSync (bool, optional): If only the mods updated since the last sync of each list should be requested individually. Defaults to False.
+        syncStateFile (str, optional): The path of the sync state file. Required for incrementalSync. Defaults to None.
+        journal (SyncJournal, optional): The journal of the run, shared by every list (see openJournal()). Defaults to None.
+        mirror (ModMirror, optional): The local metadata mirror, updated with every mod received. Defaults to None.
+        shardPool (ShardPool, optional): The worker processes requesting the mods, instead of nexusMods (see checkModList()). Defaults to None.
+
+    Returns:
+        dict: "results" (the result of each list, in order, as returned by checkModList()), "requestedMods" (unique mods requested) and "duplicatesSkipped" (requests saved by sharing mods between lists).
+    """
+    # Plan every list, sharing the getUpdated results between lists of the same game
+    updatedCache = {}
+    plans = []
+    fetchIdsByGame = {}
+    references = 0
+    for modList in modLists:
+        plan = planModList(nexusMods,modList["game"],modList["modList"],modList["add"],incrementalSync,syncStateFile,modList["syncKey"],updatedCache,journal)
+        plans.append(plan)
+        references += len(plan["fetchIdList"])
+        fetchIds = fetchIdsByGame.setdefault(modList["game"],{})
+        for modId in plan["fetchIdList"]:
+            fetchIds[modId] = None
+    
+    # Request each unique (game, modId) once
+    resultsByGame = {}
+    requestedMods = 0
+    for gameDomain,fetchIds in fetchIdsByGame.items():
+        log.info("Checking {0} unique mod(s) of \"{1}\".".format(len(fetchIds),gameDomain))
+        resultsByGame[gameDomain] = fetchMods(shardPool if (shardPool is not None) else nexusMods,gameDomain,list(fetchIds),maxConcurrency,journal,mirror)
+        requestedMods += len(fetchIds)
+    
+    # Compare each list against the shared results
+    results = []
+    for modList,plan in zip(modLists,plans):
+        checkResult = compareModList(modList["game"],plan,resultsByGame[modList["game"]])
+        checkResult["inputCount"] = plan["inputCount"]
+        checkResult["checkedCount"] = len(plan["fetchIdList"])
+        checkResult["syncStarted"] = plan["syncStarted"]
+        results.append(checkResult)
+    return {"results": results,"requestedMods": requestedMods,"duplicatesSkipped": references - requestedMods}
+
+def openJournal(journalDirectory: str, journalName: str, runInputs) -> "SyncJournal":
+    """Open the journal of a run, resuming it if the previous run with the same inputs was interrupted.
+
+    Args:
+        journalDirectory (str): The directory of the journal files.
+        journalName (str): The name of the journal (e.g. the sync key of the list). "/" is replaced in the file name.
+        runInputs: The inputs of the run (e.g. the sync key, the input mod list and the mods to add). Must be JSON serializable. A journal written for other inputs is discarded.
+
+    Returns:
+        SyncJournal: The journal.
+    """
+    from Engine import SyncJournal
+    runKey = hashlib.sha256(json.dumps(runInputs, sort_keys=True, separators=(",",":")).encode("utf-8")).hexdigest()
+    journalPath = Path(journalDirectory) / (journalName.replace("/","_") + ".jsonl")
+    journal = SyncJournal(journalPath,runKey)
+    if (journal.resumed):
+        log.warning("Resuming the interrupted run from \"{0}\".".format(journalPath))
+    return journal
+
+def inferGameDomain(modList: list) -> str:
+    """Returns the game domain of a mod list, read from the URL of its mods (https://www.nexusmods.com/gameDomain/mods/modId).
+
+    Args:
+        modList (list): The mods of the list.
+
+    Returns:
+        str: The game domain, or None if no mod has a Nexus Mods URL.
+    """
+    for mod in modList:
+        parts = str(mod.get("url","")).split("/")
+        if ((len(parts) >= 6) and (parts[2].endswith("nexusmods.com")) and (parts[4] == "mods")):
+            return parts[3]
+    return None
+
+def persistModList(storeFile: str, syncKey: str, gameDomain: str, outputModList: list) -> int:
+    """Mirror a mod list into the mod list store database, writing only the mods that changed since the last run.
+
+    Args:
+        storeFile (str): The path of the store database.
+        syncKey (str): The name of the list in the database ("gameDomain/fileName").
+        gameDomain (str): The game domain of the mods.
+        outputModList (list): The mods of the list.
+
+    Returns:
+        int: The number of mods written or deleted.
+    """
+    from Engine import ModListStore
+    with ModListStore(storeFile,syncKey) as store:
+        store.replace(gameDomain,outputModList)
+        written = store.commit()
+    log.info("Stored {0} changed mod(s) of \"{1}\" in \"{2}\".".format(written,syncKey,storeFile))
+    return written
+
+def recordSync(syncStateFile: str, syncKey: str, syncStarted: float, failedMods: list):
+    """Record the sync time of a mod list. Mods that could not be checked are requested again next time.
+
+    Args:
+        syncStateFile (str): The path of the sync state file.
+        syncKey (str): The key of the list in the sync state file ("gameDomain/fileName").
+        syncStarted (float): The time the sync started (epoch seconds).
+        failedMods (list): The IDs of the mods that could not be checked.
+    """
+    syncState = loadSyncState(syncStateFile)
+    syncState[syncKey] = {"lastSync": syncStarted,"failedMods": failedMods}
+    saveSyncState(syncStateFile,syncState)
+    log.info("Recorded sync time for \"{0}\".".format(syncKey))
+
+def loadManifests(manifestFile: str) -> dict:
+    """Load the file manifests of the mods, as recorded when they were last downloaded (or confirmed unchanged).
+
+    Args:
+        manifestFile (str): The path of the manifest file.
+
+    Returns:
+        dict: The ModManifest of each mod, keyed by (gameDomain, modId). Empty if the file doesn't exist or can't be read.
+    """
+    from Engine import ModManifest
+    manifestPath = Path(manifestFile)
+    if (not Path.exists(manifestPath)):
+        return {}
+    try:
+        with open(manifestPath, encoding='utf-8') as f:
+            entries = json.load(f)
+        manifests = {}
+        for key,entry in entries.items():
+            gameDomain = key.rsplit("/",1)[0]
+            manifests[(gameDomain,entry["id"])] = ModManifest.fromDict(gameDomain,entry)
+        return manifests
+    except (OSError, ValueError, KeyError, AttributeError) as e:
+        log.warning("Could not read file manifests \"{0}\": {1}".format(manifestFile,e))
+        return {}
+
+def saveManifests(manifestFile: str, manifests: dict):
+    """Save the file manifests of the mods.
+
+    Args:
+        manifestFile (str): The path of the manifest file.
+        manifests (dict): The ModManifest of each mod, keyed by (gameDomain, modId).
+    """
+    entries = {gameDomain + "/" + str(modId): manifests[(gameDomain,modId)].toDict() for gameDomain,modId in sorted(manifests)}
+    with atomicWrite(Path(manifestFile)) as f:
+        json.dump(entries, f, separators=(",",":"))
+
+def checkModFiles(nexusMods: NexusApi, gameDomain: str, outputModList: list, updatesRequired: list, manifests: dict, maxConcurrency: int = 8) -> dict:
+    """Check the files of the mods flagged for updates, keeping only the mods whose files actually changed.
+
+    The files of every flagged mod that was downloaded before are requested in parallel, and compared with the manifest recorded when the mod was last downloaded. Without a manifest, the files uploaded after lastDownloaded count as changed.
+    Mods whose page was updated without any change to their files are no longer flagged, and their manifest is updated in manifests, so they are not requested again until their page changes again.
+    Mods never downloaded, and mods whose files could not be requested, stay flagged.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        gameDomain (str): The game domain of the mods.
+        outputModList (list): The mods of the list.
+        updatesRequired (list): The indexes of the mods flagged for updates.
+        manifests (dict): The ModManifest of each mod, keyed by (gameDomain, modId), as returned by loadManifests(). Updated in place.
+        maxConcurrency (int, optional): The maximum number of mods to check at once. Defaults to 8.
+
+    Returns:
+        dict: "updatesRequired" (indexes of the mods still flagged, in list order), "pageOnlyMods" (IDs of the mods no longer flagged), "fileChanges" (the file IDs "added", "removed" and "changed" of each flagged mod, keyed by mod ID), "fileManifests" (the manifest requested for each flagged index, see recordManifests()) and "failedMods" (IDs of the mods whose files could not be requested).
+    """
+    from Engine import ModManifest, ModRecord
+    keptIndexes = []
+    fetchIndexes = []
+    pageOnlyMods = []
+    for index in updatesRequired:
+        mod = outputModList[index]
+        # Mods never downloaded always need to be downloaded
+        if (not mod["lastDownloaded"]):
+            keptIndexes.append(index)
+            continue
+        # The files were already found unchanged for this version of the mod page
+        manifest = manifests.get((gameDomain,mod["id"]))
+        if ((manifest is not None) and (manifest.updatedTime is not None) and (manifest.updatedTime == ModRecord.toEpoch(mod["updatedTime"]))):
+            pageOnlyMods.append(mod["id"])
+            continue
+        fetchIndexes.append(index)
+    
+    # Request the files of the remaining mods in parallel
+    fileChanges = {}
+    fileManifests = {}
+    failedMods = []
+    if (len(fetchIndexes) > 0):
+        log.info("Checking the files of {0} mod(s).".format(len(fetchIndexes)))
+        fileResults = nexusMods.getModsFiles(game=gameDomain,ids=[outputModList[index]["id"] for index in fetchIndexes],maxConcurrency=maxConcurrency)
+    else:
+        fileResults = []
+    for index,fileResult in zip(fetchIndexes,fileResults):
+        mod = outputModList[index]
+        modId = mod["id"]
+        try:
+            if (not fileResult.ok):
+                raise Exception(fileResult.error if (fileResult.error is not None) else "Response code = " + str(fileResult.response.status_code))
+            manifest = ModManifest.fromFilesJson(gameDomain,modId,fileResult.response.json(),ModRecord.toEpoch(mod["updatedTime"]))
+        except Exception as e:
+            log.warning("Failed to get the files of modId={0}, keeping it flagged: {1}".format(modId,e))
+            keptIndexes.append(index)
+            failedMods.append(modId)
+            continue
+        
+        previous = manifests.get((gameDomain,modId))
+        if (previous is not None):
+            changes = manifest.diff(previous)
+        else:
+            changes = {"added": manifest.uploadedAfter(ModRecord.toEpoch(mod["lastDownloaded"])),"removed": [],"changed": []}
+        
+        if (changes["added"] or changes["removed"] or changes["changed"]):
+            log.info("modId={0} files changed: {1} added, {2} removed, {3} changed.".format(modId,len(changes["added"]),len(changes["removed"]),len(changes["changed"])))
+            keptIndexes.append(index)
+            fileChanges[modId] = changes
+            fileManifests[index] = manifest
+        else:
+            log.info("modId={0} page updated but its files did not change. No longer flagged for update.".format(modId))
+            pageOnlyMods.append(modId)
+            manifests[(gameDomain,modId)] = manifest
+    
+    return {"updatesRequired": sorted(keptIndexes),"pageOnlyMods": pageOnlyMods,"fileChanges": fileChanges,"fileManifests": fileManifests,"failedMods": failedMods}
+
+def recordManifests(manifests: dict, fileCheck: dict, indexes: list) -> int:
+    """Record the manifests requested by checkModFiles() for the mods marked as downloaded, so their next changes are compared against these files.
+
+    Args:
+        manifests (dict): The ModManifest of each mod, keyed by (gameDomain, modId). Updated in place.
+        fileCheck (dict): The result of checkModFiles() or downloadModUpdates().
+        indexes (list): The indexes of the mods marked as downloaded.
+
+    Returns:
+        int: The number of manifests recorded.
+    """
+    recorded = 0
+    for index in indexes:
+        manifest = fileCheck["fileManifests"].get(index)
+        if (manifest is not None):
+            manifests[(manifest.game,manifest.id)] = manifest
+            recorded += 1
+    return recorded
+
+def selectMainFile(files: list) -> dict:
+    """Returns the main file of a mod: its primary file, or else its most recently uploaded file of the MAIN category.
+
+    Args:
+        files (list): The "files" list of the files.json response of the mod.
+
+    Returns:
+        dict: The file metadata, or None if the mod has no main file.
+    """
+    mainFiles = [file for file in files if file.get("is_primary") or (file.get("category_name") == "MAIN")]
+    if (len(mainFiles) == 0):
+        return None
+    return max(mainFiles, key=lambda file: (bool(file.get("is_primary")), file.get("uploaded_timestamp") or 0))
+
+def downloadModUpdates(nexusMods: NexusApi, gameDomain: str, outputModList: list, indexes: list, downloadDirectory: str, maxConcurrency: int = 4, journal: "SyncJournal" = None) -> dict:
+    """Download the main file of the given mods (see DownloadManager), several at once.
+
+    Download links are only available to premium members through the API. Other mods fail with response code 403.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        gameDomain (str): The game domain of the mods.
+        outputModList (list): The mods of the list.
+        indexes (list): The indexes of the mods to download.
+        downloadDirectory (str): The directory to save the files to.
+        maxConcurrency (int, optional): The maximum number of files downloaded at once. Defaults to 4.
+        journal (SyncJournal, optional): The journal of the run. Each file downloaded is recorded, and the files already downloaded by an interrupted run are not downloaded again. Defaults to None.
+
+    Returns:
+        dict: "downloaded" (indexes of the mods downloaded), "files" (paths of the downloaded files), "fileManifests" (the manifest of each downloaded index, see recordManifests()) and "failedMods" (IDs of the mods that could not be downloaded).
+    """
+    from Engine import DownloadManager, ModManifest, ModRecord
+    downloaded = []
+    files = []
+    fileManifests = {}
+    failedMods = []
+    
+    # Keep the files already downloaded by the interrupted run
+    if (journal is not None):
+        decisions = journal.getDecisions(gameDomain)
+        remainingIndexes = []
+        for index in indexes:
+            decision = decisions.get(outputModList[index]["id"],{})
+            if (("path" in decision) and Path.exists(Path(decision["path"]))):
+                downloaded.append(index)
+                files.append(decision["path"])
+                fileManifests[index] = ModManifest.fromDict(gameDomain,decision["manifest"])
+            else:
+                remainingIndexes.append(index)
+        if (len(downloaded) > 0):
+            log.info("{0} file(s) already downloaded by the interrupted run.".format(len(downloaded)))
+        indexes = remainingIndexes
+    if (len(indexes) == 0):
+        return {"downloaded": downloaded,"files": files,"fileManifests": fileManifests,"failedMods": failedMods}
+    
+    # Find the main file of each mod
+    downloads = []
+    fileResults = nexusMods.getModsFiles(game=gameDomain,ids=[outputModList[index]["id"] for index in indexes],maxConcurrency=maxConcurrency)
+    for index,fileResult in zip(indexes,fileResults):
+        mod = outputModList[index]
+        mainFile = None
+        if (fileResult.ok):
+            filesJson = fileResult.response.json()
+            mainFile = selectMainFile(filesJson.get("files",[]))
+        if (mainFile is None):
+            log.warning("No main file found for modId={0}, not downloading it.".format(mod["id"]))
+            failedMods.append(mod["id"])
+            continue
+        downloads.append((index,mainFile))
+        fileManifests[index] = ModManifest.fromFilesJson(gameDomain,mod["id"],filesJson,ModRecord.toEpoch(mod["updatedTime"]))
+    
+    # Download the files
+    log.info("Downloading {0} file(s) to \"{1}\".".format(len(downloads),downloadDirectory))
+    progressCallback = None
+    if (journal is not None):
+        manifestsById = {outputModList[index]["id"]: fileManifests[index] for index,_ in downloads}
+        def progressCallback(completed: int, total: int, result):
+            # Record each file as soon as it is verified, so an interrupted run doesn't download it again
+            if (result.ok):
+                journal.recordDecision(gameDomain,result.modId,{"path": str(result.path),"manifest": manifestsById[result.modId].toDict()})
+    with DownloadManager(nexusMods,downloadDirectory,maxConcurrency) as downloader:
+        results = downloader.downloadFiles(gameDomain,[(outputModList[index]["id"],file) for index,file in downloads],progressCallback)
+    for (index,file),result in zip(downloads,results):
+        if (result.ok):
+            log.info("Downloaded modId={0} to \"{1}\".".format(result.modId,result.path))
+            downloaded.append(index)
+            files.append(str(result.path))
+        else:
+            log.error("Failed to download modId={0}: {1}".format(result.modId,result.error))
+            failedMods.append(result.modId)
+            del fileManifests[index]
+    return {"downloaded": downloaded,"files": files,"fileManifests": fileManifests,"failedMods": failedMods}
+
+def markDownloaded(outputModList: list, indexes: list, timeNow: str = None) -> int:
+    """Set the lastDownloaded time of the given mods.
+
+    Args:
+        outputModList (list): The mods of the list.
+        indexes (list): The indexes of the mods to mark.
+        timeNow (str, optional): The ISO time to set. Defaults to None (current time).
+
+    Returns:
+        int: The number of mods marked.
+    """
+    if (timeNow is None):
+        timeNow = datetime.now().astimezone(timezone.utc).isoformat(timespec='microseconds')
+    for index in indexes:
+        outputModList[index]["lastDownloaded"] = timeNow
+    return len(indexes)
+
+def applyMarkDownloaded(policy: str, outputModList: list, updatesRequired: list, inputCount: int) -> list:
+    """Apply a lastDownloaded policy of the headless mode ("none", "new" or "all") to the mods flagged for updates.
+
+    Returns:
+        list: The indexes of the mods marked as downloaded.
+    """
+    indexes = []
+    if (policy == "all"):
+        indexes = list(updatesRequired)
+    elif (policy == "new"):
+        indexes = [index for index in updatesRequired if index >= inputCount]
+    markDownloaded(outputModList,indexes)
+    return indexes
+
+def logApiUsage(nexusMods: NexusApi):
+    """Log the remaining API quota and cache counters.
+
+    Args:
+        nexusMods (NexusApi): The API interface used.
+    """
+    rateLimit = nexusMods.getRateLimit()
+    log.info("Remaining API quota:\n\tDaily = {0},\n\tHourly = {1}".format(rateLimit["dailyRemaining"],rateLimit["hourlyRemaining"]))
+    keyStats = nexusMods.getKeyStats()
+    if (len(keyStats) > 1):
+        for keyStat in keyStats:
+            log.info("API key {0}: Requests = {1}, Daily = {2}, Hourly = {3}{4}".format(keyStat["key"],keyStat["requests"],keyStat["dailyRemaining"],keyStat["hourlyRemaining"]," (disabled)" if (keyStat["disabled"] is not None) else ""))
+    cacheStats = nexusMods.getCacheStats()
+    if (cacheStats is not None):
+        log.info("Response cache:\n\tHits = {0},\n\tRevalidated = {1},\n\tMisses = {2}".format(cacheStats["hits"],cacheStats["revalidated"],cacheStats["misses"]+cacheStats["changed"]))
+
+def watchMods(nexusMods: NexusApi, config: dict, summary: dict, mirror: "ModMirror" = None) -> int:
+    """Watch the mod feeds of the games to watch (headless mode), logging each mod added or updated until interrupted (or for watchDuration seconds), then fill the summary.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        config (dict): The headless settings.
+        summary (dict): The summary to fill.
+        mirror (ModMirror, optional): The local metadata mirror, updated with every mod reported. Defaults to None.
+
+    Returns:
+        int: The number of polls that failed.
+    """
+    from Engine import ModWatcher, EventFile, EventSocket
+    def logEvent(event: dict):
+        log.info("Mod {0} on \"{1}\": modId={2} ({3})".format(event["event"],event["game"],event["modId"],event["item"].get("name") or event["feed"]))
+        # Feed entries of getUpdated() hold no mod details, only the other feeds can be mirrored
+        if ((mirror is not None) and ("name" in event["item"])):
+            mirror.put(event["game"],event["item"])
+    
+    sinks = [logEvent]
+    if (config["eventFile"]):
+        sinks.append(EventFile(config["eventFile"]))
+    if (config["eventSocket"]):
+        sinks.append(EventSocket(config["eventSocket"]))
+        log.info("Sending events to the clients of {0}.".format(sinks[-1].address))
+    
+    watcher = ModWatcher(nexusMods,config["watch"],sinks,minInterval=config["watchMinInterval"],maxInterval=config["watchMaxInterval"],maxConcurrency=config["maxConcurrency"],stateFile=config["watchStateFile"] or None)
+    log.info("Watching {0} game(s): {1}. Press Ctrl+C to stop.".format(len(config["watch"]),", ".join(config["watch"])))
+    started = time.monotonic()
+    try:
+        watcher.run(config["watchDuration"])
+    except KeyboardInterrupt:
+        log.info("Stopped watching.")
+    finally:
+        for sink in sinks[1:]:
+            sink.close()
+    
+    stats = watcher.getStats()
+    summary["games"] = list(config["watch"])
+    summary["duration"] = time.monotonic() - started
+    summary["events"] = stats["events"]
+    summary["polls"] = stats["polls"]
+    summary["unchanged"] = stats["unchanged"]
+    summary["failedPolls"] = stats["errors"]
+    return stats["errors"]
+
 # The function to be executed at runtime
 def main():
     
@@ -46,15 +969,41 @@ def main():
     # Pause/sleep constant. Change this if you want to have shorter pauses after each prompt. Recommended to keep at >=0.1
     pauseTime = 0.1
     
+    # The maximum number of mods to check at once.
+    maxConcurrency = 8
+    
+    # Response cache. Mods checked again within cacheTtl seconds are not requested again, and older ones are revalidated with the server.
+    # Set cacheFile to None to disable the cache.
+    cacheFile = "ModLists/.cache/responses.db"
+    cacheTtl = 3600
+    
+    # Incremental sync. When enabled, mods are only requested individually if a single getUpdated request shows they changed since the last sync of the list (new mods are always requested).
+    # Every mod is checked when the list was never synced, or last synced more than a month ago.
+    incrementalSync = True
+    syncStateFile = "ModLists/.cache/syncState.json"
+    
+    # File manifests. When enabled, the files of each mod flagged for updates are checked, and mods whose page changed without any new or changed files are not flagged.
+    # Set manifestFile to None to flag every mod whose page was updated.
+    manifestFile = "ModLists/.cache/manifests.json"
+    
+    # Sync journal. Every mod checked and every lastDownloaded answer is saved as it happens, so a run that is interrupted (e.g. closed or disconnected) resumes where it stopped the next time the same list is checked.
+    # Set journalDirectory to None to start over every time.
+    journalDirectory = "ModLists/.cache/journal"
+    
+    # Local mod metadata mirror. When set, the name, summary, author and category of every mod checked are kept in this database, searchable offline with the ModMirror class of the Engine package.
+    mirrorFile = None
+    
     # Default mod file name. If none is provided during the script, this is the name that gets used.
     defaultFileName = "data.json"
-
+    
     # END OF CONFIG
     
     ############################################
     
     # REST OF THE FRACKING SCRIPT. DO NOT TOUCH!
     
+    from Engine import ModMirror, ResponseCache
+    
     log.info("Beggining ModListManager.py script")
     
     log.info("Initializing \".\\ModLists\\\" and \".\\ModLists\\Results\\\" directories.")
@@ -72,227 +1021,590 @@ def main():
     time.sleep(pauseTime)
     
     log.info("Initializing NexusApi interface.")
-    nexusMods = NexusApi(apiKey)
-    
-    # Test if file exists
-    fileName = InputManager.basicInput("Enter mod list json file name: ")
-    time.sleep(pauseTime)
-    
-    # Check if file name is provided, if none is provided it will switch to the default
-    if (not fileName):
-        log.info("Blank file name provided! Using default name \"{0}\"".format(defaultFileName))
-        fileName = defaultFileName
-    
-    fileExtension = ".json"
-    filePath = Path(fileDirectory + fileName)
-    if (fileName[-len(fileExtension):] != fileExtension):
-        log.info("File name \"{0}\" missing extension. Appending '.json' to end.".format(fileName))
-        filePath = Path(fileDirectory + fileName + fileExtension)
-    
-    
-    
-    inputModList = None
-    modIdList = []
-    
-    
-    if Path.exists(filePath):
-        f = open(filePath)
-        inputModList = json.load(f)
-        log.info("Loaded File \"{0}\" successfully!".format(fileName))
-        log.info("{0}:\n{1}".format(fileName,json.dumps(inputModList)))
-        f.close()
-        for mod in inputModList:
-            modIdList.append(mod["id"])
-    else:
-        log.warning("Filename \"{0}\" not found!".format(fileName))
-        # If original mod list cannot be found, prompt user for input
-        continueOnFileNotFound = InputManager.falsyBooleanInput("Continue script (y/*)? ", "y")
+    responseCache = None
+    nexusMods = None
+    journal = None
+    mirror = None
+    # The cache, the session, the journal and the mirror are closed however the run ends
+    try:
+        if (cacheFile):
+            responseCache = ResponseCache(cacheFile,{"mod": cacheTtl,"files": cacheTtl})
+        # The API key is validated once a day at most when the cache is enabled
+        nexusMods = NexusApi(apiKey,poolSize=maxConcurrency,cache=responseCache,keyValidation="cached" if (responseCache is not None) else "eager")
+        
+        # Test if file exists
+        fileName = InputManager.basicInput("Enter mod list json file name: ")
         time.sleep(pauseTime)
-        # If the user wants to continue
-        if (continueOnFileNotFound):
-            log.info("Continuing script!")
-        else:
-            log.warning("Stopping script!")
-            return
-    
-    # Get count of original mods
-    inputCount = len(modIdList)
-    
-    
-    # check additional mod IDs and add if missing
-    for modId in addModIdList:
-        if not modId in modIdList:
-            modIdList.append(modId)
-            log.info("Added modId {0} to list.".format(modId))
+        
+        # Check if file name is provided, if none is provided it will switch to the default
+        if (not fileName):
+            log.info("Blank file name provided! Using default name \"{0}\"".format(defaultFileName))
+            fileName = defaultFileName
+        
+        fileExtension = ".json"
+        filePath = Path(fileDirectory + fileName)
+        if (fileName[-len(fileExtension):] != fileExtension):
+            log.info("File name \"{0}\" missing extension. Appending '.json' to end.".format(fileName))
+            filePath = Path(fileDirectory + fileName + fileExtension)
+        
+        
+        
+        inputModList = []
+        
+        
+        if Path.exists(filePath):
+            inputModList = loadModList(filePath)
         else:
-            log.warning("ModId {0} already in loaded file, ignoring!".format(modId))
-    
-    log.info("List of modId's to check: {0}".format(modIdList))
-    
-    outputModList = []
-    updatesRequired = []
-    
-    totalMods = len(modIdList)
-    newMods = totalMods-inputCount
-    log.info("Mod counts:\n\tExisting Mods = {0},\n\tNew Mods = {1},\n\tTotal Mods = {2}".format(inputCount,newMods,totalMods))
-    
-    # Mod Info format
-    # mod = {"name": "ABC123","id": 123,"updatedTime": "YYYY-MM-DDTHH:MM:SS.SSS+TZ","lastDownloaded":"YYYY-MM-DDTHH:MM:SS.SSS+TZ","url":"https://www.nexusmods.com/gameDomain/mods/modId"}
-    
-    
-    # Check all modIds on NexusMods while tracking index
-    for index,modId in enumerate(modIdList):
-        log.info("Checking modId={0} (mod #{1}/{2})".format(modId,(index+1),totalMods))
-        outputMod = {"name": None,"id": None,"updatedTime":None,"lastDownloaded":None,"url":None}
-        getMod = nexusMods.getMod(game=gameDomain,id=modId)
-        getModJson = getMod.json()
-        
-        # Assemble Mod Info
-        outputMod["name"] = getModJson["name"]
-        outputMod["id"] = modId
-        outputMod["updatedTime"] = getModJson["updated_time"]
-        outputMod["url"] = "https://www.nexusmods.com/"+gameDomain+"/mods/"+str(modId)
-        
-        
-        # Compare updatedTimestamp and lastUpdated timestamps
-        
-        # If it is before the end of the original list, run standard check. Else, automatically add to flagged update list
-        if (index < inputCount):
-            # If it doesn't have a timestamp, default to adding it to the list
-            if (not inputModList[index]["lastDownloaded"]):
-                log.warning("modId={0} doesn't have lastDownloaded, flagging for update!".format(modId))
-                updatesRequired.append(index)
+            log.warning("Filename \"{0}\" not found!".format(fileName))
+            # If original mod list cannot be found, prompt user for input
+            continueOnFileNotFound = InputManager.falsyBooleanInput("Continue script (y/*)? ", "y")
+            time.sleep(pauseTime)
+            # If the user wants to continue
+            if (continueOnFileNotFound):
+                log.info("Continuing script!")
             else:
-                # Copy old download timestamp
-                outputMod["lastDownloaded"] = inputModList[index]["lastDownloaded"]
-                
-                # Process timestamps
-                lastDownloadedTime = datetime.fromisoformat(outputMod["lastDownloaded"])
-                lastUpdatedTime = datetime.fromisoformat(outputMod["updatedTime"])
-                
-                # Change lastUpdatedTime to match lastDownloaded timezone
-                lastDownloadedTimezone = lastDownloadedTime.tzinfo
-                lastUpdatedTime = lastUpdatedTime.astimezone(lastDownloadedTimezone)
-                
-                # Compare the times to determine if an update occured since lastDownloaded
-                if (lastDownloadedTime < lastUpdatedTime):
-                    log.warning("modId={0} hasn't updated since lastDownloaded, but the mod page has. Flagging for update!".format(modId))
-                    updatesRequired.append(index)
-        else:
-            # Mod is new, needs to initialize update
-            log.warning("modId={0} is a new mod, flagging for update!".format(modId))
-            updatesRequired.append(index)
+                log.warning("Stopping script!")
+                return
         
-        outputModList.append(outputMod)
-        time.sleep(0.1)
-    
-    updateCount = len(updatesRequired)
-    if (updateCount > 0):
-        log.warning("{0} mod(s) flagged for updates!".format(updateCount))
-        # If the mods should be checked for updates. 
-        # Boolean. Will default to "False" on invalid input
-        addressUpdates = InputManager.falsyBooleanInput("Address updates (y/*)? ", "y")
-        time.sleep(pauseTime)
+        # Check the mods for updates
+        syncKey = gameDomain + "/" + filePath.name
+        if (journalDirectory):
+            journal = openJournal(journalDirectory,syncKey,[syncKey,inputModList,addModIdList])
+        if (mirrorFile):
+            mirror = ModMirror(mirrorFile)
+        checkResult = checkModList(nexusMods,gameDomain,inputModList,addModIdList,maxConcurrency,incrementalSync,syncStateFile,syncKey,journal,mirror)
+        outputModList = checkResult["outputModList"]
+        updatesRequired = checkResult["updatesRequired"]
+        failedMods = checkResult["failedMods"]
+        inputCount = checkResult["inputCount"]
+        decisions = journal.getDecisions(gameDomain) if (journal is not None) else {}
         
-        # If positive input received
-        if (addressUpdates):
-            
-            batchUpdate = InputManager.falsyBooleanInput("Open links en masse (y/*, will open all at once)? ", "y")
+        # Keep only the mods whose files changed
+        if (manifestFile):
+            manifests = loadManifests(manifestFile)
+            fileCheck = checkModFiles(nexusMods,gameDomain,outputModList,updatesRequired,manifests,maxConcurrency)
+            updatesRequired = fileCheck["updatesRequired"]
+        
+        logApiUsage(nexusMods)
+        
+        updateCount = len(updatesRequired)
+        if (updateCount > 0):
+            log.warning("{0} mod(s) flagged for updates!".format(updateCount))
+            # If the mods should be checked for updates. 
+            # Boolean. Will default to "False" on invalid input
+            addressUpdates = InputManager.falsyBooleanInput("Address updates (y/*)? ", "y")
             time.sleep(pauseTime)
-            batchLinks = []
             
-            timeNow = datetime.now().astimezone(timezone.utc).isoformat(timespec='microseconds')
-            # For each index flagged, address updates individually
-            for i,index in enumerate(updatesRequired):
-                # Assemble mod info for use
-                modName = outputModList[index]["name"]
-                modId = outputModList[index]["id"]
-                modUrl = outputModList[index]["url"]
-                modUpdatedTime = outputModList[index]["updatedTime"]
-                modLastDownloaded = outputModList[index]["lastDownloaded"]
-                modIsNew = (not (index < inputCount))
-                
-                # Log mod info
-                log.info("Mod Update #{0}/{1} \n\tName: {2}\n\tID: {3}\n\tURL: {4}\n\tIs new mod: {5}\n\tMod Page Updated: {6}\n\tLast Downloaded: {7}\n".format((i+1),updateCount,modName,modId,modUrl,modIsNew,modUpdatedTime,modLastDownloaded))
+            # If positive input received
+            if (addressUpdates):
                 
-                # Ask if you want to address this specific update
-                addressModUpdate = InputManager.falsyBooleanInput("Open modpage (y/*)? ", "y")
+                batchUpdate = InputManager.falsyBooleanInput("Open links en masse (y/*, will open all at once)? ", "y")
                 time.sleep(pauseTime)
-                if (addressModUpdate):
-                    # If batch links are enabled, add to list of links to open
-                    if (batchUpdate):
-                        batchLinks.append(modUrl)
-                    else:
-                        # Open the mod individually and prompt for input when done
-                        webbrowser.open(modUrl)
-                        # Wait for user input before proceeding
-                        InputManager.waitInput("Press enter/return when ready to continue...")
-                        time.sleep(pauseTime)
+                batchLinks = []
+                batchCount = 0
                 
-                # Ask if you want to update lastDownloaded to current time
-                addLastDownloaded = InputManager.falsyBooleanInput("Add current time as lastDownloaded (y/*)? ", "y")
-                time.sleep(pauseTime)
-                if (addLastDownloaded):
-                    outputModList[index]["lastDownloaded"] = timeNow
+                timeNow = datetime.now().astimezone(timezone.utc).isoformat(timespec='microseconds')
+                # For each index flagged, address updates individually
+                for i,index in enumerate(updatesRequired):
+                    # Assemble mod info for use
+                    modName = outputModList[index]["name"]
+                    modId = outputModList[index]["id"]
+                    modUrl = outputModList[index]["url"]
+                    modUpdatedTime = outputModList[index]["updatedTime"]
+                    modLastDownloaded = outputModList[index]["lastDownloaded"]
+                    modIsNew = (not (index < inputCount))
+                    
+                    # Log mod info
+                    log.info("Mod Update #{0}/{1} \n\tName: {2}\n\tID: {3}\n\tURL: {4}\n\tIs new mod: {5}\n\tMod Page Updated: {6}\n\tLast Downloaded: {7}\n".format((i+1),updateCount,modName,modId,modUrl,modIsNew,modUpdatedTime,modLastDownloaded))
+                    
+                    # Reuse the answer given before the run was interrupted
+                    if ("lastDownloaded" in decisions.get(modId,{})):
+                        log.info("Already addressed before the run was interrupted, skipping.")
+                        if (decisions[modId]["lastDownloaded"] is not None):
+                            outputModList[index]["lastDownloaded"] = decisions[modId]["lastDownloaded"]
+                            if (manifestFile):
+                                recordManifests(manifests,fileCheck,[index])
+                        continue
+                    
+                    # Ask if you want to address this specific update
+                    addressModUpdate = InputManager.falsyBooleanInput("Open modpage (y/*)? ", "y")
+                    time.sleep(pauseTime)
+                    if (addressModUpdate):
+                        # If batch links are enabled, add to list of links to open
+                        if (batchUpdate):
+                            batchLinks.append(modUrl)
+                        else:
+                            # Open the mod individually and prompt for input when done
+                            webbrowser.open(modUrl)
+                            # Wait for user input before proceeding
+                            InputManager.waitInput("Press enter/return when ready to continue...")
+                            time.sleep(pauseTime)
                     
-                batchCount = len(batchLinks)
-            if (batchUpdate and (batchCount > 0) ):
-                log.warning("Opening {0} mod page(s)! This may take a minute...".format(batchCount))
-                for link in batchLinks:
-                    webbrowser.open(link)
-                    time.sleep(0.5)
+                    # Ask if you want to update lastDownloaded to current time
+                    addLastDownloaded = InputManager.falsyBooleanInput("Add current time as lastDownloaded (y/*)? ", "y")
+                    time.sleep(pauseTime)
+                    if (addLastDownloaded):
+                        outputModList[index]["lastDownloaded"] = timeNow
+                        if (manifestFile):
+                            recordManifests(manifests,fileCheck,[index])
+                    if (journal is not None):
+                        journal.recordDecision(gameDomain,modId,{"lastDownloaded": timeNow if addLastDownloaded else None})
+                    
+                    batchCount = len(batchLinks)
+                if (batchUpdate and (batchCount > 0) ):
+                    log.warning("Opening {0} mod page(s)! This may take a minute...".format(batchCount))
+                    for link in batchLinks:
+                        webbrowser.open(link)
+                        time.sleep(0.5)
+                    
+                    log.info("Finished opening {0} mod pages!".format(batchCount))
                 
-                log.info("Finished opening {0} mod pages!".format(batchCount))
-            
-            log.info("Finished addressing all {0} updates!".format(updateCount))
-        else:
-            # Negative input was received
-            log.info("Ignoring updates!")
-    
-    
-    
-    
-    
-    
-    # Log final outputModList result
-    log.info("Output Mod List:\n{0}".format(outputModList))
+                log.info("Finished addressing all {0} updates!".format(updateCount))
+            else:
+                # Negative input was received
+                log.info("Ignoring updates!")
+        
+        
+        
+        
+        
+        
+        # Log final outputModList result
+        log.info("Output Mod List: {0} mod(s)".format(len(outputModList)))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Output Mod List:\n{0}".format(outputModList))
+        
+        
+        # Save to file
+        
+        # Generate new file name
+        outputFileName = fileName
+        
+        newFileName = InputManager.falsyBooleanInput("New file name (y/*)? ", "y")
+        time.sleep(pauseTime)
+        
+        if (newFileName):
+            outputFileName = InputManager.basicInput("Enter new file name: ")
+            time.sleep(pauseTime)
+        
+        
+        # Remove file extension if it exists
+        if (outputFileName[-len(fileExtension):] == fileExtension):
+            outputFileName = outputFileName[:-len(fileExtension)]
+        
+        # Generate default output file path
+        outputFilePath = Path(outputFileDirectory + outputFileName + fileExtension)
+        
+        
+        # If the output file name already exists, increase increment until new file name is reached
+        if Path.exists(outputFilePath):
+            log.warning("{0}{1} already exists!".format(outputFileName,fileExtension))
+            index = 0
+            while Path.exists(outputFilePath):
+                index += 1
+                outputFilePath = Path(outputFileDirectory + outputFileName + " (" + str(index) + ")" + fileExtension)
+        
+        
+        # Save output contents
+        saveModList(outputFilePath,outputModList)
+        
+        # Record the sync time of the list. Mods that could not be checked are requested again next time
+        if (incrementalSync):
+            recordSync(syncStateFile,syncKey,checkResult["syncStarted"],failedMods)
+        
+        # Save the manifests of the mods downloaded or found unchanged
+        if (manifestFile):
+            saveManifests(manifestFile,manifests)
+        
+        # The results are saved, the run no longer needs to be resumed
+        if (journal is not None):
+            journal.complete()
+    finally:
+        if (nexusMods is not None):
+            nexusMods.close()
+        if (journal is not None):
+            journal.close()
+        if (mirror is not None):
+            mirror.close()
+        if (responseCache is not None):
+            responseCache.close()
+
+
+# Default settings of the non-interactive (headless) mode. Each can be set in the config file (--config) or overridden by its command line argument
+headlessDefaults = {
+    "game": None,
+    "input": None,
+    "output": None,
+    "add": [],
+    "apiKeyEnv": "NEXUS_API_KEY",
+    "onMissing": "fail",
+    "markDownloaded": "none",
+    "maxConcurrency": 8,
+    "cacheFile": "ModLists/.cache/responses.db",
+    "cacheTtl": 3600,
+    "keyValidation": "cached",
+    "incremental": True,
+    "syncStateFile": "ModLists/.cache/syncState.json",
+    "manifestFile": "ModLists/.cache/manifests.json",
+    "download": None,
+    "journalDirectory": "ModLists/.cache/journal",
+    "summary": None,
+    "bulk": None,
+    "storeFile": None,
+    "mirrorFile": None,
+    "metricsFile": None,
+    "watch": None,
+    "eventFile": None,
+    "eventSocket": None,
+    "watchStateFile": "ModLists/.cache/watchState.json",
+    "watchMinInterval": 60,
+    "watchMaxInterval": 900,
+    "watchDuration": None,
+    "processes": 0,
+}
+
+# Exit codes of the headless mode
+EXIT_OK = 0
+EXIT_PARTIAL = 1
+EXIT_ERROR = 2
+
+def parseArguments(argv: list) -> argparse.Namespace:
+    """Parse the command line arguments of the headless mode.
+
+    Args:
+        argv (list): The command line arguments (without the script name).
+
+    Returns:
+        Namespace: The parsed arguments. Arguments not provided are None.
+    """
+    parser = argparse.ArgumentParser(prog="ModListManager.py", description="Check a mod list for updates on Nexus Mods without any prompts. Run without arguments for the interactive mode.", argument_default=None)
+    parser.add_argument("--config", help="JSON config file. Keys match the long argument names in camelCase (e.g. \"maxConcurrency\"). Command line arguments take precedence.")
+    parser.add_argument("--game", help="The game domain of the mod list (e.g. baldursgate3).")
+    parser.add_argument("--input", help="The mod list JSON (or JSON Lines, .jsonl) file to check.")
+    parser.add_argument("--output", help="The file to save the updated mod list to (overwritten). Defaults to ModLists/Results/<input file name>.")
+    parser.add_argument("--add", type=int, nargs="+", help="IDs of new mods to add to the list.")
+    parser.add_argument("--api-key-env", dest="apiKeyEnv", help="The environment variable holding the API key (or several keys separated by commas). Defaults to NEXUS_API_KEY.")
+    parser.add_argument("--on-missing", dest="onMissing", choices=["fail","continue"], help="What to do when the input file doesn't exist: fail, or continue with an empty list. Defaults to fail.")
+    parser.add_argument("--mark-downloaded", dest="markDownloaded", choices=["none","new","all"], help="Which mods flagged for updates get the current time as lastDownloaded: none, new mods only, or all. Defaults to none.")
+    parser.add_argument("--download", help="Download the main file of each mod flagged for updates to this directory, and set lastDownloaded of the mods downloaded. Requires a premium account.")
+    parser.add_argument("--max-concurrency", dest="maxConcurrency", type=int, help="The maximum number of mods to check at once. Defaults to 8.")
+    parser.add_argument("--processes", type=int, help="Request and decode the mods with this many worker processes (each with its own connections, all sharing the rate budget of the API key), for very large lists. Defaults to 0 (this process only).")
+    parser.add_argument("--cache-file", dest="cacheFile", help="The response cache database. Defaults to ModLists/.cache/responses.db.")
+    parser.add_argument("--no-cache", dest="cacheFile", action="store_const", const="", help="Disable the response cache.")
+    parser.add_argument("--cache-ttl", dest="cacheTtl", type=int, help="Seconds before a cached response is revalidated. Defaults to 3600.")
+    parser.add_argument("--key-validation", dest="keyValidation", choices=["eager","cached","deferred"], help="When the API key is validated: on every run (eager), once a day using the response cache (cached), or never, letting requests fail with an invalid key (deferred). Defaults to cached (eager without the cache).")
+    parser.add_argument("--no-incremental", dest="incremental", action="store_const", const=False, help="Check every mod instead of only the mods updated since the last sync.")
+    parser.add_argument("--sync-state", dest="syncStateFile", help="The sync state file used by incremental sync. Defaults to ModLists/.cache/syncState.json.")
+    parser.add_argument("--manifest-file", dest="manifestFile", help="The file manifests used to flag only the mods whose files changed, not just their page. Defaults to ModLists/.cache/manifests.json.")
+    parser.add_argument("--no-manifest", dest="manifestFile", action="store_const", const="", help="Flag every mod whose page was updated, without checking its files.")
+    parser.add_argument("--journal-dir", dest="journalDirectory", help="The directory of the sync journals, which let an interrupted run resume without requesting the same mods again. Defaults to ModLists/.cache/journal.")
+    parser.add_argument("--no-journal", dest="journalDirectory", action="store_const", const="", help="Start over instead of resuming an interrupted run.")
+    parser.add_argument("--summary", help="Also write the JSON summary to this file.")
+    parser.add_argument("--metrics-file", dest="metricsFile", help="Write per-endpoint request metrics (latency, response size, status codes, retries, quota) to this file in the Prometheus text format.")
+    parser.add_argument("--store-file", dest="storeFile", help="Also mirror the updated list(s) into this SQLite database, writing only the mods that changed since the last run.")
+    parser.add_argument("--mirror-file", dest="mirrorFile", help="Also keep the metadata (name, summary, author, category) of every mod checked in this SQLite database, searchable offline with the ModMirror class of the Engine package.")
+    parser.add_argument("--watch", nargs="+", help="Watch the mod feeds (latest added, latest updated, updated and trending) of these game domains and report each mod added or updated until interrupted, instead of checking a mod list.")
+    parser.add_argument("--event-file", dest="eventFile", help="With --watch, also append each event to this JSON Lines file.")
+    parser.add_argument("--event-socket", dest="eventSocket", help="With --watch, also send each event (as JSON Lines) to the clients connected to this local socket: host:port, or the path of a Unix domain socket.")
+    parser.add_argument("--watch-state", dest="watchStateFile", help="With --watch, the file keeping the last snapshot of each feed, so a restarted watcher only reports the changes made while it was stopped. Defaults to ModLists/.cache/watchState.json.")
+    parser.add_argument("--watch-min-interval", dest="watchMinInterval", type=float, help="With --watch, the seconds between two polls of a feed that changed. Defaults to 60.")
+    parser.add_argument("--watch-max-interval", dest="watchMaxInterval", type=float, help="With --watch, the longest time (in seconds) between two polls of a feed that doesn't change. Defaults to 900.")
+    parser.add_argument("--watch-duration", dest="watchDuration", type=float, help="With --watch, stop watching after this many seconds. Defaults to watching until interrupted.")
+    parser.add_argument("--bulk", nargs="?", const="ModLists", help="Check every mod list (*.json and *.jsonl) in a directory at once, requesting mods shared between lists only once. Defaults to ModLists. The game of each list is read from its mod URLs (--game is used for lists without any). --output is then the output directory.")
+    return parser.parse_args(argv)
+
+def loadHeadlessConfig(arguments: argparse.Namespace) -> dict:
+    """Merge the headless defaults, the config file and the command line arguments.
+
+    Args:
+        arguments (Namespace): The parsed command line arguments.
+
+    Raises:
+        Exception: If the config file can't be read, contains unknown keys, or the game or input is missing.
+
+    Returns:
+        dict: The headless settings.
+    """
+    config = dict(headlessDefaults)
     
+    if (arguments.config):
+        with open(arguments.config, encoding='utf-8') as f:
+            fileConfig = json.load(f)
+        unknownKeys = set(fileConfig) - set(headlessDefaults)
+        if (unknownKeys):
+            raise Exception("Unknown config key(s): " + ", ".join(sorted(unknownKeys)))
+        config.update(fileConfig)
     
-    # Save to file
+    for key in headlessDefaults:
+        value = getattr(arguments,key,None)
+        if (value is not None):
+            config[key] = value
     
-    # Generate new file name
-    outputFileName = fileName
+    if (config["bulk"] or config["watch"]):
+        return config
+    if (not config["game"]):
+        raise Exception("Game domain not provided. Use --game or the \"game\" config key.")
+    if (not config["input"]):
+        raise Exception("Input mod list not provided. Use --input or the \"input\" config key.")
+    return config
+
+def runBulk(nexusMods: NexusApi, config: dict, summary: dict, mirror: "ModMirror" = None, shardPool: "ShardPool" = None) -> int:
+    """Check every mod list of the bulk directory at once (headless mode), filling the summary.
+
+    Args:
+        nexusMods (NexusApi): The API interface to use.
+        config (dict): The headless settings.
+        summary (dict): The summary to fill.
+        mirror (ModMirror, optional): The local metadata mirror, updated with every mod received. Defaults to None.
+        shardPool (ShardPool, optional): The worker processes requesting the mods (see checkModList()). Defaults to None.
+
+    Raises:
+        Exception: If the bulk directory contains no mod lists, or the game of a list is unknown.
+
+    Returns:
+        int: The number of mods that could not be checked, across all lists.
+    """
+    bulkPath = Path(config["bulk"])
+    outputPath = Path(config["output"]) if config["output"] else bulkPath / "Results"
+    if (config["add"]):
+        log.warning("New mods (--add) are ignored in bulk mode.")
     
-    newFileName = InputManager.falsyBooleanInput("New file name (y/*)? ", "y")
-    time.sleep(pauseTime)
+    # Load every mod list, and find the game of each
+    modLists = []
+    for filePath in sorted(list(bulkPath.glob("*.json")) + list(bulkPath.glob("*.jsonl"))):
+        inputModList = loadModList(filePath)
+        gameDomain = inferGameDomain(inputModList) or config["game"]
+        if (not gameDomain):
+            raise Exception("Game domain of \"" + str(filePath) + "\" not found. Use --game or the \"game\" config key.")
+        modLists.append({"game": gameDomain,"modList": inputModList,"add": [],"syncKey": gameDomain + "/" + filePath.name,"input": filePath,"output": outputPath / filePath.name})
+    if (len(modLists) == 0):
+        raise Exception("No mod lists found in \"" + str(bulkPath) + "\".")
+    log.info("Checking {0} mod list(s) from \"{1}\".".format(len(modLists),bulkPath))
     
-    if (newFileName):
-        outputFileName = InputManager.basicInput("Enter new file name: ")
-        time.sleep(pauseTime)
+    # One journal covers every list of the run
+    journal = None
+    if (config["journalDirectory"]):
+        journal = openJournal(config["journalDirectory"],"bulk",[[modList["syncKey"],modList["modList"]] for modList in modLists])
+        summary["resumed"] = journal.resumed
     
+    try:
+        return checkBulk(nexusMods,config,summary,bulkPath,outputPath,modLists,journal,mirror,shardPool)
+    finally:
+        if (journal is not None):
+            journal.close()
+
+def checkBulk(nexusMods: NexusApi, config: dict, summary: dict, bulkPath: Path, outputPath: Path, modLists: list, journal: "SyncJournal", mirror: "ModMirror", shardPool: "ShardPool" = None) -> int:
+    """Check, download and save the mod lists loaded by runBulk(), filling the summary.
+
+    Returns:
+        int: The number of mods that could not be checked, across all lists.
+    """
+    # Check the mods of every list, requesting each unique mod once
+    bulkResult = checkModLists(nexusMods,modLists,config["maxConcurrency"],config["incremental"],config["syncStateFile"],journal,mirror,shardPool)
+    logApiUsage(nexusMods)
     
-    # Remove file extension if it exists
-    if (outputFileName[-len(fileExtension):] == fileExtension):
-        outputFileName = outputFileName[:-len(fileExtension)]
+    manifests = loadManifests(config["manifestFile"]) if config["manifestFile"] else None
+    failedCount = 0
+    for modList,checkResult in zip(modLists,bulkResult["results"]):
+        outputModList = checkResult["outputModList"]
+        updatesRequired = checkResult["updatesRequired"]
+        fileCheck = None
+        if (manifests is not None):
+            fileCheck = checkModFiles(nexusMods,modList["game"],outputModList,updatesRequired,manifests,config["maxConcurrency"])
+            updatesRequired = fileCheck["updatesRequired"]
+        downloadResult = None
+        if (config["download"]):
+            downloadResult = downloadModUpdates(nexusMods,modList["game"],outputModList,updatesRequired,config["download"],journal=journal)
+            markDownloaded(outputModList,downloadResult["downloaded"])
+            if (manifests is not None):
+                recordManifests(manifests,downloadResult,downloadResult["downloaded"])
+        markedDownloaded = applyMarkDownloaded(config["markDownloaded"],outputModList,[index for index in updatesRequired if (downloadResult is None) or (index not in downloadResult["downloaded"])],checkResult["inputCount"])
+        if (fileCheck is not None):
+            recordManifests(manifests,fileCheck,markedDownloaded)
         
-    # Generate default output file path
-    outputFilePath = Path(outputFileDirectory + outputFileName + fileExtension)
-    
-    
-    # If the output file name already exists, increase increment until new file name is reached
-    if Path.exists(outputFilePath):
-        log.warning("{0}{1} already exists!".format(outputFileName,fileExtension))
-        index = 0
-        while Path.exists(outputFilePath):
-            index += 1
-            outputFilePath = Path(outputFileDirectory + outputFileName + " (" + str(index) + ")" + fileExtension)
-    
+        saveModList(modList["output"],outputModList)
+        if (config["storeFile"]):
+            persistModList(config["storeFile"],modList["syncKey"],modList["game"],outputModList)
+        if (config["incremental"]):
+            recordSync(config["syncStateFile"],modList["syncKey"],checkResult["syncStarted"],checkResult["failedMods"])
+        
+        failedCount += len(checkResult["failedMods"]) + (len(downloadResult["failedMods"]) if downloadResult else 0)
+        summary["lists"].append({"game": modList["game"],"input": str(modList["input"]),"output": str(modList["output"]),"totalMods": len(outputModList),"checkedMods": checkResult["checkedCount"],"changedMods": checkResult["changedMods"],"updatesRequired": [outputModList[index]["id"] for index in updatesRequired],"pageOnlyUpdates": fileCheck["pageOnlyMods"] if fileCheck else [],"fileChanges": fileCheck["fileChanges"] if fileCheck else {},"failedMods": checkResult["failedMods"],"markedDownloaded": len(markedDownloaded),"downloaded": [outputModList[index]["id"] for index in downloadResult["downloaded"]] if downloadResult else [],"downloadFailed": downloadResult["failedMods"] if downloadResult else []})
+    if (manifests is not None):
+        saveManifests(config["manifestFile"],manifests)
+    if (journal is not None):
+        journal.complete()
     
-    log.info("Saving mod list as \"{0}\"".format(outputFilePath))
+    summary["input"] = str(bulkPath)
+    summary["output"] = str(outputPath)
+    summary["totalMods"] = sum(len(checkResult["outputModList"]) for checkResult in bulkResult["results"])
+    summary["checkedMods"] = bulkResult["requestedMods"]
+    summary["duplicatesSkipped"] = bulkResult["duplicatesSkipped"]
+    return failedCount
+
+def runHeadless(argv: list) -> int:
+    """Check a mod list (or every mod list of a directory, with --bulk) for updates without any prompts, then print a JSON summary to stdout. With --watch, watch the mod feeds of games instead.
+
+    Args:
+        argv (list): The command line arguments (without the script name).
+
+    Returns:
+        int: The exit code. EXIT_OK (0) on success, EXIT_PARTIAL (1) if some mods could not be checked, EXIT_ERROR (2) if the run failed.
+    """
+    from Engine import ModMirror, RequestMetrics, ResponseCache, ShardPool
+    arguments = parseArguments(argv)
+    if (arguments.watch):
+        summary = {"status": "error","games": [],"duration": 0,"events": 0,"polls": 0,"unchanged": 0,"failedPolls": 0,"rateLimit": None,"cache": None,"error": None}
+    elif (arguments.bulk):
+        summary = {"status": "error","input": None,"output": None,"lists": [],"totalMods": 0,"checkedMods": 0,"duplicatesSkipped": 0,"resumed": False,"rateLimit": None,"cache": None,"error": None}
+    else:
+        summary = {"status": "error","game": None,"input": None,"output": None,"totalMods": 0,"newMods": 0,"checkedMods": 0,"changedMods": 0,"updatesRequired": [],"pageOnlyUpdates": [],"fileChanges": {},"failedMods": [],"markedDownloaded": 0,"downloaded": [],"downloadFailed": [],"resumed": False,"rateLimit": None,"cache": None,"error": None}
+    exitCode = EXIT_ERROR
+    summaryFile = arguments.summary
+    nexusMods = None
+    responseCache = None
+    requestMetrics = None
+    journal = None
+    mirror = None
+    shardPool = None
     
-    # Save output contents
-    with open(outputFilePath, 'w', encoding='utf-8') as f:
-        json.dump(outputModList, f, ensure_ascii=False, indent=4)
+    try:
+        config = loadHeadlessConfig(arguments)
+        summaryFile = config["summary"]
+        
+        # Several API keys (e.g. of several authorised accounts) can be given separated by commas, each request is then sent with the key that has the most budget left
+        apiKeys = [key.strip() for key in os.environ.get(config["apiKeyEnv"],"").split(",") if key.strip()]
+        if (not apiKeys):
+            raise Exception("API key not found. Set the " + config["apiKeyEnv"] + " environment variable.")
+        apiKey = apiKeys if (len(apiKeys) > 1) else apiKeys[0]
+        
+        if ((not config["bulk"]) and (not config["watch"])):
+            gameDomain = config["game"]
+            filePath = Path(config["input"])
+            outputFilePath = Path(config["output"]) if config["output"] else Path("ModLists/Results") / filePath.name
+            summary["game"] = gameDomain
+            summary["input"] = str(filePath)
+            summary["output"] = str(outputFilePath)
+            
+            # Load the input mod list
+            inputModList = []
+            if Path.exists(filePath):
+                inputModList = loadModList(filePath)
+            elif (config["onMissing"] == "continue"):
+                log.warning("Filename \"{0}\" not found! Continuing with an empty list.".format(filePath))
+            else:
+                raise Exception("Input mod list \"" + str(filePath) + "\" not found.")
+        
+        if (config["cacheFile"]):
+            responseCache = ResponseCache(config["cacheFile"],{"mod": config["cacheTtl"],"files": config["cacheTtl"]})
+        if (config["metricsFile"]):
+            requestMetrics = RequestMetrics()
+        if (config["mirrorFile"]):
+            mirror = ModMirror(config["mirrorFile"])
+        keyValidation = config["keyValidation"]
+        if ((keyValidation == "cached") and (responseCache is None)):
+            keyValidation = "eager"
+        if ((config["processes"] > 1) and (not config["watch"])):
+            # The workers only send back the fields compared by the sync, unless the mirror needs every field
+            shardPool = ShardPool(apiKey,processes=config["processes"],maxConcurrency=config["maxConcurrency"],fields=None if (mirror is not None) else ShardPool.modFields,cacheFile=config["cacheFile"] or None,cacheTtls={"mod": config["cacheTtl"],"files": config["cacheTtl"]})
+            log.info("Checking the mods with {0} worker processes.".format(config["processes"]))
+        # With worker processes, the requests of this process draw from the rate budget shared by the workers
+        nexusMods = NexusApi(shardPool.getKeyPool() if (shardPool is not None) else apiKey,poolSize=config["maxConcurrency"],cache=responseCache,hooks=[requestMetrics] if (requestMetrics is not None) else None,keyValidation=keyValidation)
+        
+        if (config["watch"]):
+            failedCount = watchMods(nexusMods,config,summary,mirror)
+        elif (config["bulk"]):
+            failedCount = runBulk(nexusMods,config,summary,mirror,shardPool)
+        else:
+            # Check the mods for updates
+            syncKey = gameDomain + "/" + filePath.name
+            if (config["journalDirectory"]):
+                journal = openJournal(config["journalDirectory"],syncKey,[syncKey,inputModList,config["add"]])
+                summary["resumed"] = journal.resumed
+            checkResult = checkModList(nexusMods,gameDomain,inputModList,config["add"],config["maxConcurrency"],config["incremental"],config["syncStateFile"],syncKey,journal,mirror,shardPool)
+            outputModList = checkResult["outputModList"]
+            updatesRequired = checkResult["updatesRequired"]
+            inputCount = checkResult["inputCount"]
+            
+            # Keep only the mods whose files changed
+            if (config["manifestFile"]):
+                manifests = loadManifests(config["manifestFile"])
+                fileCheck = checkModFiles(nexusMods,gameDomain,outputModList,updatesRequired,manifests,config["maxConcurrency"])
+                updatesRequired = fileCheck["updatesRequired"]
+                summary["pageOnlyUpdates"] = fileCheck["pageOnlyMods"]
+                summary["fileChanges"] = fileCheck["fileChanges"]
+            logApiUsage(nexusMods)
+            
+            # Download the updates, then apply the lastDownloaded policy to the mods not downloaded
+            downloadedIndexes = []
+            if (config["download"]):
+                downloadResult = downloadModUpdates(nexusMods,gameDomain,outputModList,updatesRequired,config["download"],journal=journal)
+                downloadedIndexes = downloadResult["downloaded"]
+                markDownloaded(outputModList,downloadedIndexes)
+                if (config["manifestFile"]):
+                    recordManifests(manifests,downloadResult,downloadedIndexes)
+                summary["downloaded"] = [outputModList[index]["id"] for index in downloadedIndexes]
+                summary["downloadFailed"] = downloadResult["failedMods"]
+            markedIndexes = applyMarkDownloaded(config["markDownloaded"],outputModList,[index for index in updatesRequired if index not in downloadedIndexes],inputCount)
+            summary["markedDownloaded"] = len(markedIndexes)
+            if (config["manifestFile"]):
+                recordManifests(manifests,fileCheck,markedIndexes)
+                saveManifests(config["manifestFile"],manifests)
+            
+            saveModList(outputFilePath,outputModList)
+            if (config["storeFile"]):
+                persistModList(config["storeFile"],syncKey,gameDomain,outputModList)
+            if (config["incremental"]):
+                recordSync(config["syncStateFile"],syncKey,checkResult["syncStarted"],checkResult["failedMods"])
+            if (journal is not None):
+                journal.complete()
+            
+            summary["totalMods"] = len(outputModList)
+            summary["newMods"] = len(outputModList) - inputCount
+            summary["checkedMods"] = checkResult["checkedCount"]
+            summary["changedMods"] = checkResult["changedMods"]
+            summary["updatesRequired"] = [outputModList[index]["id"] for index in updatesRequired]
+            summary["failedMods"] = checkResult["failedMods"]
+            failedCount = len(checkResult["failedMods"]) + len(summary["downloadFailed"])
+        summary["rateLimit"] = nexusMods.getRateLimit()
+        if (len(apiKeys) > 1):
+            summary["apiKeys"] = nexusMods.getKeyStats()
+        summary["cache"] = nexusMods.getCacheStats()
+        
+        if (failedCount > 0):
+            summary["status"] = "partial"
+            exitCode = EXIT_PARTIAL
+        else:
+            summary["status"] = "ok"
+            exitCode = EXIT_OK
+    except Exception as e:
+        log.error("Headless run failed: {0}".format(e))
+        summary["error"] = str(e)
+    finally:
+        if (shardPool is not None):
+            shardPool.close()
+        if (nexusMods is not None):
+            nexusMods.close()
+        if (journal is not None):
+            journal.close()
+        if (mirror is not None):
+            mirror.close()
+        if (responseCache is not None):
+            responseCache.close()
+        if (requestMetrics is not None):
+            with atomicWrite(Path(config["metricsFile"])) as f:
+                f.write(requestMetrics.toPrometheus())
     
+    # Print the machine-readable summary
+    summaryJson = json.dumps(summary, indent=4)
+    print(summaryJson)
+    if (summaryFile):
+        with open(summaryFile, 'w', encoding='utf-8') as f:
+            f.write(summaryJson)
+    return exitCode
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    # Any command line argument switches to the headless mode
+    if (len(sys.argv) > 1):
+        sys.exit(runHeadless(sys.argv[1:]))
+    main()
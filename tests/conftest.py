@@ -0,0 +1,35 @@
+# conftest.py
+
+# Shared fixtures of the tests. The tests run against benchmarks/FakeNexusServer.py, a local stand-in for the API, so they need no API key or network access.
+# Usage: python -m pytest -q
+
+# Imports Required Dependencies
+import sys
+from pathlib import Path
+
+import pytest
+
+rootDirectory = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(rootDirectory / "src"))
+sys.path.insert(0, str(rootDirectory / "benchmarks"))
+from FakeNexusServer import FakeNexusServer
+
+@pytest.fixture
+def startServer():
+    """Returns a function starting a FakeNexusServer with the given options (see FakeNexusServer). Every server started is stopped at the end of the test."""
+    servers = []
+    
+    def start(**options) -> FakeNexusServer:
+        options.setdefault("catalogSize", 100)
+        server = FakeNexusServer(**options).start()
+        servers.append(server)
+        return server
+    
+    yield start
+    for server in servers:
+        server.stop()
+
+@pytest.fixture
+def fakeServer(startServer) -> FakeNexusServer:
+    """A FakeNexusServer of 100 mods, accepting the API key "benchmark"."""
+    return startServer()
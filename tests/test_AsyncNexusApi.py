@@ -0,0 +1,168 @@
+# test_AsyncNexusApi.py
+
+# Tests of AsyncNexusApi against a FakeNexusServer. Each test runs its own event loop (asyncio.run), so no pytest plugin is needed.
+
+# Imports Required Dependencies
+import asyncio
+import random
+
+import pytest
+
+pytest.importorskip("aiohttp")
+from Engine import AsyncNexusApi, RateLimiter
+
+gameDomain = "baldursgate3"
+
+def openApi(server, apiKey = "benchmark", **options) -> AsyncNexusApi:
+    """Returns an AsyncNexusApi object for the server, backing off for a few milliseconds only so the retries don't slow the tests down."""
+    if (isinstance(apiKey,str)):
+        options.setdefault("rateLimiter", RateLimiter(baseBackoff=0.01))
+    return AsyncNexusApi(apiKey, apiUrl=server.url, **options)
+
+def test_validatesApiKeyOnOpen(fakeServer):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            assert nexusMods.getRateLimit()["dailyRemaining"] is not None
+    asyncio.run(run())
+    assert fakeServer.getStats()["endpoints"] == {"validate": 1}
+
+def test_rejectsInvalidApiKey(fakeServer):
+    async def run():
+        nexusMods = openApi(fakeServer, "wrong")
+        with pytest.raises(Exception, match="Response code = 401"):
+            await nexusMods.open()
+        # The session of a failed validation is closed
+        assert nexusMods._session is None
+    asyncio.run(run())
+
+def test_rejectsInvalidArguments(fakeServer):
+    with pytest.raises(Exception, match="Valid API key"):
+        AsyncNexusApi("", apiUrl=fakeServer.url)
+    
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            for id in (0, -1, "5", 1.5):
+                with pytest.raises(Exception, match="Valid mod ID"):
+                    await nexusMods.getMod(gameDomain, id)
+            with pytest.raises(Exception, match="Valid game domain"):
+                await nexusMods.getModFiles("", 1)
+            with pytest.raises(Exception, match="Valid time"):
+                await nexusMods.getUpdated(gameDomain, "1y")
+    asyncio.run(run())
+    # Invalid arguments never reach the server
+    assert fakeServer.getStats()["endpoints"] == {"validate": 1}
+
+def test_getModGetModFilesAndGetUpdated(fakeServer):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            mod = await nexusMods.getMod(gameDomain, 5)
+            assert mod.status_code == 200
+            assert mod.json() == fakeServer.getModJson(gameDomain, 5)
+            assert nexusMods.getLastResponse() is mod
+            
+            files = await nexusMods.getModFiles(gameDomain, 7)
+            assert files.status_code == 200
+            assert [file["file_id"] for file in files.json()["files"]] == [70, 71, 72, 73]
+            
+            updated = await nexusMods.getUpdated(gameDomain, "1d")
+            assert updated.status_code == 200
+            assert {mod["mod_id"] for mod in updated.json()} == {modId for modId in range(1, 101) if fakeServer.isUpdated(modId)}
+            
+            missing = await nexusMods.getMod(gameDomain, 1000)
+            assert missing.status_code == 404
+    asyncio.run(run())
+
+def test_endorseAndAbstain(fakeServer):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            endorsed = await nexusMods.endorseMod(gameDomain, 3)
+            abstained = await nexusMods.abstainMod(gameDomain, 3)
+            return endorsed, abstained
+    endorsed, abstained = asyncio.run(run())
+    assert (endorsed.status_code, endorsed.json()["status"]) == (200, "Endorsed")
+    assert (abstained.status_code, abstained.json()["status"]) == (200, "Abstained")
+    endpoints = fakeServer.getStats()["endpoints"]
+    assert (endpoints["endorse"], endpoints["abstain"]) == (1, 1)
+
+@pytest.mark.parametrize("statusCode", [429, 500, 502, 503, 504])
+def test_retriesGetOnRateLimitAndServerErrors(fakeServer, statusCode):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            fakeServer.resetStats()
+            fakeServer.failRequests(statusCode, 2)
+            return await nexusMods.getMod(gameDomain, 1)
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert fakeServer.getStats()["statuses"] == {statusCode: 2, 200: 1}
+
+def test_stopsRetryingAfterMaxRetries(fakeServer):
+    async def run():
+        async with openApi(fakeServer, maxRetries=2) as nexusMods:
+            fakeServer.resetStats()
+            fakeServer.failRequests(503, 10)
+            return await nexusMods.getMod(gameDomain, 1)
+    response = asyncio.run(run())
+    assert response.status_code == 503
+    assert fakeServer.getStats()["requests"] == 3
+
+def test_doesNotRetryPostOnServerError(fakeServer):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            fakeServer.failRequests(503, 1)
+            return await nexusMods.endorseMod(gameDomain, 1)
+    response = asyncio.run(run())
+    # An endorsement the server may have applied is never sent twice
+    assert response.status_code == 503
+    assert fakeServer.getStats()["endpoints"]["endorse"] == 1
+
+def test_retriesPostOnRateLimit(fakeServer):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            fakeServer.failRequests(429, 1)
+            return await nexusMods.endorseMod(gameDomain, 1)
+    response = asyncio.run(run())
+    # A 429 response means the request was not processed, so it is safe to send again
+    assert response.status_code == 200
+    assert fakeServer.getStats()["endpoints"]["endorse"] == 2
+
+def test_unauthorizedKeyIsDisabled(startServer):
+    server = startServer(apiKey=["keyA", "keyB"])
+    
+    async def run():
+        async with openApi(server, ["keyA", "keyB"]) as nexusMods:
+            server.revokeApiKey("keyA")
+            results = await nexusMods.getMods(gameDomain, range(1, 21), maxConcurrency=4)
+            return results, nexusMods.getKeyStats()
+    results, keyStats = asyncio.run(run())
+    # The requests answered with 401 are sent again with the other key
+    assert all(result.ok for result in results)
+    assert keyStats[0]["disabled"] == "Response code = 401"
+    assert keyStats[1]["disabled"] is None
+    assert server.getStats()["keys"]["keyB"] >= 20
+
+def test_getModsKeepsInputOrder(startServer):
+    # Random latency, so the responses arrive out of order
+    server = startServer(jitter=0.02)
+    ids = list(range(1, 41)) + [1000]
+    random.Random(0).shuffle(ids)
+    progress = []
+    
+    async def run():
+        async with openApi(server) as nexusMods:
+            return await nexusMods.getMods(gameDomain, ids, maxConcurrency=8, progressCallback=lambda completed, total, result: progress.append((completed, total)))
+    results = asyncio.run(run())
+    assert [result.id for result in results] == ids
+    for result in results:
+        if (result.id == 1000):
+            assert result.response.status_code == 404
+        else:
+            assert result.response.json()["mod_id"] == result.id
+    assert progress == [(completed, len(ids)) for completed in range(1, len(ids) + 1)]
+
+def test_getModsValidatesEveryIdFirst(fakeServer):
+    async def run():
+        async with openApi(fakeServer) as nexusMods:
+            with pytest.raises(Exception, match="received 0"):
+                await nexusMods.getMods(gameDomain, [1, 2, 0, 3])
+    asyncio.run(run())
+    assert "mod" not in fakeServer.getStats()["endpoints"]
@@ -0,0 +1,152 @@
+# test_DownloadManager.py
+
+# Tests of DownloadManager against the stand-in CDN of a FakeNexusServer. The files.json of the server has no md5 (like the API) unless fileMd5 is set.
+
+# Imports Required Dependencies
+import hashlib
+
+import pytest
+
+from Engine import DownloadManager, NexusApi, RateLimiter
+
+gameDomain = "baldursgate3"
+
+@pytest.fixture
+def server(startServer):
+    """A FakeNexusServer serving small files (up to 200 KB), so the tests download quickly."""
+    return startServer(maxFileSize=200000)
+
+@pytest.fixture
+def nexusMods(server):
+    with NexusApi(server.apiKey, apiUrl=server.url, rateLimiter=RateLimiter(baseBackoff=0.01)) as nexusMods:
+        yield nexusMods
+
+def getFile(nexusMods: NexusApi, modId: int, index: int = 0) -> dict:
+    """Returns the metadata of a file of a mod, as listed by getModFiles()."""
+    return nexusMods.getModFiles(gameDomain, modId).json()["files"][index]
+
+def partPath(directory, file: dict):
+    """Returns the path of the .part file of a file while it is downloaded."""
+    return directory / (str(file["file_id"]) + "-" + file["file_name"] + ".part")
+
+def test_downloadIsVerifiedWithMd5Search(server, nexusMods, tmp_path):
+    file = getFile(nexusMods, 5)
+    assert "md5" not in file
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        result = downloader.downloadFile(gameDomain, 5, file)
+    content = server.getFileContent(file["file_id"])
+    assert result.ok
+    assert result.path == tmp_path / file["file_name"]
+    assert result.path.read_bytes() == content
+    assert (result.size, result.md5, result.resumedBytes) == (len(content), hashlib.md5(content).hexdigest(), 0)
+    assert server.getStats()["endpoints"]["md5_search"] == 1
+    # The API key is only sent to the API, never to the CDN
+    assert server.getStats()["downloadApiKeys"] == 0
+
+def test_md5SearchCanBeDisabled(server, nexusMods, tmp_path):
+    with DownloadManager(nexusMods, tmp_path, md5Search=False) as downloader:
+        assert downloader.downloadFile(gameDomain, 5, getFile(nexusMods, 5)).ok
+    assert "md5_search" not in server.getStats()["endpoints"]
+
+def test_md5MismatchIsRejected(server, nexusMods, tmp_path):
+    file = dict(getFile(nexusMods, 5), md5="0" * 32)
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        with pytest.raises(Exception, match="failed the MD5 check"):
+            downloader.downloadFile(gameDomain, 5, file)
+    assert list(tmp_path.iterdir()) == []
+    # The md5 of the metadata is checked without looking it up
+    assert "md5_search" not in server.getStats()["endpoints"]
+
+def test_md5MatchingAnotherFileIsRejected(server, nexusMods, tmp_path):
+    # The metadata of file 50, with the URL of file 60
+    file = getFile(nexusMods, 5)
+    file60 = getFile(nexusMods, 6)
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        url = downloader.getDownloadUrl(gameDomain, 6, file60["file_id"])
+        with pytest.raises(Exception, match="matches file\\(s\\) 60"):
+            downloader.downloadFile(gameDomain, 5, dict(file, size_in_bytes=file60["size_in_bytes"]), url)
+    assert list(tmp_path.iterdir()) == []
+
+def test_sizeMismatchIsRejected(server, nexusMods, tmp_path):
+    file = getFile(nexusMods, 5)
+    file["size_in_bytes"] += 1
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        with pytest.raises(Exception, match="expected " + str(file["size_in_bytes"])):
+            downloader.downloadFile(gameDomain, 5, file)
+    # Neither the .part file nor the final file is left behind
+    assert list(tmp_path.iterdir()) == []
+
+def test_resumesPartialFileWithRangeRequest(server, nexusMods, tmp_path):
+    file = getFile(nexusMods, 5)
+    content = server.getFileContent(file["file_id"])
+    partPath(tmp_path, file).write_bytes(content[:10000])
+    server.resetStats()
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        result = downloader.downloadFile(gameDomain, 5, file)
+    assert result.ok and (result.resumedBytes == 10000)
+    assert result.path.read_bytes() == content
+    assert server.getStats()["downloadBytes"] == len(content) - 10000
+
+def test_resumesInterruptedDownload(server, nexusMods, tmp_path):
+    file = getFile(nexusMods, 5)
+    content = server.getFileContent(file["file_id"])
+    server.resetStats()
+    server.dropDownloads(1)
+    # Small chunks, so the chunks received before the cut are written to the .part file
+    with DownloadManager(nexusMods, tmp_path, chunkSize=16*1024, backoffFactor=0.01) as downloader:
+        result = downloader.downloadFile(gameDomain, 5, file)
+    # The CDN cut off the first request halfway, and the second one sent the rest
+    assert result.ok and (0 < result.resumedBytes <= len(content) // 2)
+    assert result.path.read_bytes() == content
+    assert server.getStats()["downloads"] == 2
+    assert server.getStats()["downloadBytes"] == len(content) // 2 + len(content) - result.resumedBytes
+    assert not partPath(tmp_path, file).exists()
+
+def test_partialFileOfAnotherVersionIsDownloadedAgain(server, nexusMods, tmp_path):
+    file = getFile(nexusMods, 5)
+    content = server.getFileContent(file["file_id"])
+    partPath(tmp_path, file).write_bytes(b"\0" * 10000)
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        result = downloader.downloadFile(gameDomain, 5, file)
+    assert result.ok and (result.resumedBytes == 0)
+    assert result.path.read_bytes() == content
+
+def test_downloadedFileIsNotDownloadedAgain(server, nexusMods, tmp_path):
+    file = getFile(nexusMods, 5)
+    with DownloadManager(nexusMods, tmp_path) as downloader:
+        downloader.downloadFile(gameDomain, 5, file)
+        server.resetStats()
+        result = downloader.downloadFile(gameDomain, 5, file)
+    assert result.ok and (result.resumedBytes == result.size)
+    assert server.getStats()["downloads"] == 0
+
+def test_downloadFilesRunsConcurrently(startServer, tmp_path):
+    # The latency keeps each download open long enough to overlap with the others
+    server = startServer(maxFileSize=200000, latency=0.05)
+    with NexusApi(server.apiKey, apiUrl=server.url) as nexusMods:
+        files = [(modId, getFile(nexusMods, modId)) for modId in range(1, 13)]
+        files.insert(3, (1000, {"file_id": 10000, "file_name": "missing.zip", "size_in_bytes": 1024}))
+        progress = []
+        server.resetStats()
+        with DownloadManager(nexusMods, tmp_path, maxConcurrency=4) as downloader:
+            results = downloader.downloadFiles(gameDomain, files, progressCallback=lambda completed, total, result: progress.append(completed))
+    assert [(result.modId, result.fileId) for result in results] == [(modId, file["file_id"]) for modId, file in files]
+    # A file that can't be downloaded is reported in its result, without stopping the others
+    assert "not available" in str(results[3].error)
+    assert all(result.ok for index, result in enumerate(results) if index != 3)
+    assert progress == list(range(1, len(files) + 1))
+    assert 1 < server.getStats()["downloadPeak"] <= 4
+
+def test_filesOfTheSameNameDoNotShareAPartFile(startServer, tmp_path):
+    server = startServer(maxFileSize=200000, latency=0.05)
+    with NexusApi(server.apiKey, apiUrl=server.url) as nexusMods:
+        files = [(modId, dict(getFile(nexusMods, modId), file_name="same.zip")) for modId in (5, 6)]
+        with DownloadManager(nexusMods, tmp_path, chunkSize=16*1024, md5Search=False) as downloader:
+            results = downloader.downloadFiles(gameDomain, files)
+    # Each download wrote its own bytes only, whichever finished last is kept under the shared name
+    for (modId, file), result in zip(files, results):
+        content = server.getFileContent(file["file_id"])
+        assert result.ok and (result.resumedBytes == 0)
+        assert (result.size, result.md5) == (len(content), hashlib.md5(content).hexdigest())
+    assert [path.name for path in tmp_path.iterdir()] == ["same.zip"]
+    assert (tmp_path / "same.zip").read_bytes() in [server.getFileContent(file["file_id"]) for modId, file in files]
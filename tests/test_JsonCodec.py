@@ -0,0 +1,67 @@
+# test_JsonCodec.py
+
+# Compares every JSON backend installed (see JsonCodec.backends) with the stdlib json module, which is the reference of each operation.
+
+# Imports Required Dependencies
+import json
+
+import pytest
+
+from Engine import JsonCodec, ShardPool
+
+gameDomain = "baldursgate3"
+updatedFields = ("mod_id","latest_file_update","latest_mod_activity")
+
+backends = [backend for backend in JsonCodec.backends if JsonCodec.isAvailable(backend)]
+
+# Values written the same way by every backend (floats aside, see JsonCodec)
+values = [
+    {"name": "Mod 1 – Édition 日本語","id": 1,"updatedTime": "2024-01-01T00:00:00.000+00:00","lastDownloaded": None,"url": "https://www.nexusmods.com/baldursgate3/mods/1"},
+    [1, -2, True, False, None, "", "quote \" backslash \\ newline \n tab \t", "\u0001\u001f"],
+    {"nested": {"empty": {},"list": [],"deep": [{"a": [1, [2, [3]]]}]},"emoji": "🙂"},
+    {"big": 2 ** 70,"small": -2 ** 63},
+    {1: "key that isn't a string"},
+    "plain string",
+    0,
+]
+
+@pytest.fixture(params=backends)
+def codec(request) -> JsonCodec:
+    return JsonCodec(request.param)
+
+@pytest.mark.parametrize("value", values)
+def test_dumpsMatchesJson(codec, value):
+    assert codec.dumps(value) == json.dumps(value, ensure_ascii=False, separators=(",",":"))
+    assert codec.dumpsIndented(value) == json.dumps(value, ensure_ascii=False, indent=4)
+
+@pytest.mark.parametrize("value", values)
+def test_loadsMatchesJson(codec, value):
+    text = json.dumps(value)
+    assert codec.loads(text) == json.loads(text)
+    assert codec.loads(text.encode("utf-8")) == json.loads(text)
+
+def test_loadsAcceptsWhatJsonAccepts(codec):
+    assert codec.loads("[NaN, 1.5]")[1] == 1.5
+    with pytest.raises(ValueError):
+        codec.loads("{not json")
+
+def test_decodeFieldsMatchesJson(codec, fakeServer):
+    for modId in (1, 2, 50):
+        content = json.dumps(fakeServer.getModJson(gameDomain, modId)).encode("utf-8")
+        modJson = json.loads(content)
+        assert codec.decodeFields(content, ShardPool.modFields) == {field: modJson.get(field) for field in ShardPool.modFields}
+
+def test_decodeFieldsOfUnexpectedTypes(codec):
+    # Missing and null fields are None, fields of unexpected types are decoded as they are
+    content = b'{"mod_id": "12", "name": null, "updated_timestamp": 1.5, "extra": [1, 2]}'
+    assert codec.decodeFields(content, ("mod_id","name","updated_time","updated_timestamp","extra")) == {"mod_id": "12","name": None,"updated_time": None,"updated_timestamp": 1.5,"extra": [1, 2]}
+    with pytest.raises(ValueError):
+        codec.decodeFields(b"[1, 2]", ("mod_id",))
+
+def test_decodeFieldsListMatchesJson(codec):
+    updated = [{"mod_id": modId,"latest_file_update": 1700000000 + modId,"latest_mod_activity": None if (modId % 3 == 0) else 1700000100 + modId} for modId in range(1, 50)]
+    updated[10].pop("latest_file_update")
+    content = json.dumps(updated).encode("utf-8")
+    assert codec.decodeFieldsList(content, updatedFields) == [{field: mod.get(field) for field in updatedFields} for mod in updated]
+    with pytest.raises(ValueError):
+        codec.decodeFieldsList(b'{"mod_id": 1}', updatedFields)
@@ -0,0 +1,21 @@
+# test_ModListManager.py
+
+# Tests of the sync functions of ModListManager against a FakeNexusServer.
+
+# Imports Required Dependencies
+import ModListManager
+from Engine import NexusApi, NexusResponse
+
+gameDomain = "baldursgate3"
+
+def test_getUpdatedModIds(fakeServer):
+    with NexusApi(fakeServer.apiKey, apiUrl=fakeServer.url) as nexusMods:
+        updated = ModListManager.getUpdatedModIds(nexusMods, gameDomain, "1d")
+    assert updated == {modId: fakeServer.getModUpdated(modId) for modId in range(1, 101) if fakeServer.isUpdated(modId)}
+
+def test_getUpdatedModIdsSkipsMissingFields():
+    class UpdatedApi:
+        def getUpdated(self, game, period):
+            return NexusResponse("", 200, {}, b'[{"mod_id": 1, "latest_file_update": null, "latest_mod_activity": 5}, {"mod_id": 2, "latest_mod_activity": 7}, {"latest_file_update": 3}, {"mod_id": 3, "latest_file_update": 9, "latest_mod_activity": null}]')
+    # Null or missing times count as 0, and entries without a mod ID are skipped
+    assert ModListManager.getUpdatedModIds(UpdatedApi(), gameDomain, "1d") == {1: 5, 2: 7, 3: 9}
@@ -0,0 +1,52 @@
+# test_ModListStore.py
+
+# Tests of the SQLite database backing ModListStore.
+
+# Imports Required Dependencies
+import sqlite3
+
+from Engine import ModListStore
+
+gameDomain = "baldursgate3"
+
+def modInfo(modId: int, **extra) -> dict:
+    mod = {"name": "Mod " + str(modId),"id": modId,"updatedTime": "2024-01-01T00:00:00.000+00:00","lastDownloaded": "2024-01-02T00:00:00.000000+00:00","url": "https://www.nexusmods.com/" + gameDomain + "/mods/" + str(modId)}
+    mod.update(extra)
+    return mod
+
+def test_extraFieldsSurviveReload(tmp_path):
+    path = tmp_path / "mods.db"
+    modList = [modInfo(1, notes="Keep – enabled", tags=["ui", "qol"]), modInfo(2), modInfo(3, priority=1)]
+    with ModListStore.fromModList(gameDomain, modList, str(path), "data.json") as store:
+        assert store.commit() == 3
+    
+    with ModListStore(str(path), "data.json") as store:
+        assert store.toModList(gameDomain) == modList
+        # An unchanged list, extra fields included, is not written again
+        assert store.replace(gameDomain, modList) == 0
+        assert store.commit() == 0
+        
+        # A change to an extra field only is written
+        modList[2]["priority"] = 2
+        assert store.replace(gameDomain, modList) == 1
+        assert store.getChanged() == [(gameDomain, 3)]
+        assert store.commit() == 1
+    
+    with ModListStore(str(path), "data.json") as store:
+        assert store.get(gameDomain, 3).extra == {"priority": 2}
+        assert store.get(gameDomain, 2).extra is None
+
+def test_databaseWithoutExtraColumnIsUpgraded(tmp_path):
+    path = tmp_path / "mods.db"
+    # The schema of earlier versions
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE mods (list TEXT NOT NULL, game TEXT NOT NULL, id INTEGER NOT NULL, position INTEGER, name TEXT, updatedTime TEXT, lastDownloaded TEXT, url TEXT, PRIMARY KEY (list, game, id))")
+        connection.execute("INSERT INTO mods VALUES ('', ?, 1, 0, 'Mod 1', '2024-01-01T00:00:00.000+00:00', NULL, '')", (gameDomain,))
+    connection.close()
+    
+    with ModListStore(str(path)) as store:
+        assert store.get(gameDomain, 1).name == "Mod 1"
+        store.put(gameDomain, modInfo(1, notes="Added later"))
+        assert store.commit() == 1
+    with ModListStore(str(path)) as store:
+        assert store.get(gameDomain, 1).extra == {"notes": "Added later"}
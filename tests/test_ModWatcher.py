@@ -0,0 +1,179 @@
+# test_ModWatcher.py
+
+# Tests of ModWatcher and its sinks against the feeds of a FakeNexusServer. Polls are forced (ModWatcher.poll(force=True)), so no test waits for the schedule.
+
+# Imports Required Dependencies
+import json
+import socket
+import time
+
+import pytest
+
+from Engine import EventFile, EventSocket, ModWatcher, NexusApi, RateLimiter
+
+gameDomain = "baldursgate3"
+
+@pytest.fixture
+def nexusMods(fakeServer):
+    with NexusApi(fakeServer.apiKey, apiUrl=fakeServer.url, maxRetries=0, rateLimiter=RateLimiter(baseBackoff=0.01)) as nexusMods:
+        yield nexusMods
+
+def summarize(events: list) -> list:
+    """Returns the (event, modId, feed) of each event."""
+    return [(event["event"], event["modId"], event["feed"]) for event in events]
+
+def test_firstPollOnlyTakesSnapshots(nexusMods):
+    watcher = ModWatcher(nexusMods, [gameDomain])
+    assert watcher.poll(force=True) == []
+    assert watcher.getStats()["polls"] == 4
+
+def test_unchangedPayloadIsSkippedByHash(fakeServer, nexusMods, monkeypatch):
+    watcher = ModWatcher(nexusMods, [gameDomain])
+    watcher.poll(force=True)
+    # An unchanged payload is never decoded
+    monkeypatch.setattr(ModWatcher, "_compare", lambda self, key, payload: pytest.fail("Unchanged payload decoded"))
+    assert watcher.poll(force=True) == []
+    stats = watcher.getStats()
+    assert (stats["polls"], stats["unchanged"], stats["events"]) == (8, 4, 0)
+
+def test_reportsAddedUpdatedAndTrendingMods(fakeServer, nexusMods):
+    received = []
+    watcher = ModWatcher(nexusMods, [gameDomain], sinks=[received.append])
+    watcher.poll(force=True)
+    
+    # Mods updated before the server started, so their update is newer than their last snapshot
+    fakeServer.updateMods([42, 43])
+    modIds = fakeServer.addMods(2)
+    fakeServer.setTrending([50, 1, 2, 3])
+    events = watcher.poll(force=True)
+    
+    # Each change is reported once, by the first feed (in polling order) to show it
+    assert sorted(summarize(events)) == sorted([
+        ("added", modIds[0], "latestAdded"),
+        ("added", modIds[1], "latestAdded"),
+        ("updated", 42, "latestUpdated"),
+        ("updated", 43, "latestUpdated"),
+        ("trending", 50, "trending"),
+    ])
+    assert received == events
+    for event in events:
+        assert event["game"] == gameDomain
+        assert event["item"]["mod_id"] == event["modId"]
+    assert events[0]["version"] == fakeServer.getModUpdated(events[0]["modId"])
+    # The same changes are not reported again
+    assert watcher.poll(force=True) == []
+
+def test_intervalBacksOffThenResets(fakeServer, nexusMods):
+    watcher = ModWatcher(nexusMods, [gameDomain], feeds=["latestAdded", "trending"], minInterval=60, maxInterval=200)
+    watcher.poll(force=True)
+    assert watcher.getSchedule() == {gameDomain + "/latestAdded": 60, gameDomain + "/trending": 60}
+    watcher.poll(force=True)
+    watcher.poll(force=True)
+    assert watcher.getSchedule() == {gameDomain + "/latestAdded": 200, gameDomain + "/trending": 200}
+    
+    # Only the feed that changed is polled at the shortest interval again
+    fakeServer.addMods(1)
+    watcher.poll(force=True)
+    assert watcher.getSchedule() == {gameDomain + "/latestAdded": 60, gameDomain + "/trending": 200}
+    
+    # Failed polls back off too
+    fakeServer.failRequests(403, 2)
+    watcher.poll(force=True)
+    assert watcher.getSchedule() == {gameDomain + "/latestAdded": 120, gameDomain + "/trending": 200}
+    assert watcher.getStats()["errors"] == 2
+
+def test_dueFeedsOnly(nexusMods):
+    watcher = ModWatcher(nexusMods, [gameDomain], minInterval=60)
+    watcher.poll()
+    # No feed is due for another minute
+    assert watcher.poll() == []
+    assert watcher.getStats()["polls"] == 4
+
+def test_stateIsReloadedFromStateFile(fakeServer, nexusMods, tmp_path):
+    stateFile = tmp_path / "state" / "watcher.json"
+    ModWatcher(nexusMods, [gameDomain], stateFile=stateFile).poll(force=True)
+    assert stateFile.exists()
+    
+    # Changes made while no watcher runs are reported by the first poll of the next one
+    modIds = fakeServer.addMods(1)
+    fakeServer.updateMods([42])
+    watcher = ModWatcher(nexusMods, [gameDomain], stateFile=stateFile)
+    assert sorted(summarize(watcher.poll(force=True))) == [("added", modIds[0], "latestAdded"), ("updated", 42, "latestUpdated")]
+    # The trending feed didn't change, so its reloaded hash skips it
+    assert watcher.getStats()["unchanged"] == 1
+    
+    # Mods already reported are kept across restarts as well
+    watcher = ModWatcher(nexusMods, [gameDomain], stateFile=stateFile)
+    assert watcher.poll(force=True) == []
+    assert watcher.getStats()["unchanged"] == 4
+
+def test_sinkErrorsDontStopTheWatcher(fakeServer, nexusMods):
+    received = []
+    def failingSink(event):
+        raise ValueError("Sink failed")
+    watcher = ModWatcher(nexusMods, [gameDomain], sinks=[failingSink, received.append])
+    watcher.poll(force=True)
+    fakeServer.addMods(1)
+    events = watcher.poll(force=True)
+    assert received == events
+    assert watcher.getStats()["sinkErrors"] == len(events) == 1
+
+def test_eventFileWritesJsonLines(fakeServer, nexusMods, tmp_path):
+    path = tmp_path / "events" / "events.jsonl"
+    with EventFile(path) as eventFile:
+        watcher = ModWatcher(nexusMods, [gameDomain], sinks=[eventFile])
+        watcher.poll(force=True)
+        fakeServer.addMods(2)
+        events = watcher.poll(force=True)
+    assert [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()] == events
+    
+    # The file is appended to
+    with EventFile(path) as eventFile:
+        eventFile({"event": "added", "modId": 1})
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 3
+
+def receiveEvents(address, family: int, count: int, sendEvents) -> list:
+    """Connect a client to an EventSocket, then returns the first count events it receives once sendEvents() is called."""
+    with socket.socket(family, socket.SOCK_STREAM) as client:
+        client.settimeout(5)
+        client.connect(address)
+        sendEvents()
+        with client.makefile("r", encoding="utf-8") as lines:
+            return [json.loads(lines.readline()) for _ in range(count)]
+
+def waitForClients(eventSocket: EventSocket, count: int):
+    deadline = time.monotonic() + 5
+    while (eventSocket.clientCount < count):
+        assert time.monotonic() < deadline, "Client not accepted"
+        time.sleep(0.01)
+
+def test_eventSocketSendsEventsToClients(fakeServer, nexusMods):
+    with EventSocket("127.0.0.1:0") as eventSocket:
+        watcher = ModWatcher(nexusMods, [gameDomain], sinks=[eventSocket])
+        watcher.poll(force=True)
+        fakeServer.addMods(2)
+        events = []
+        def sendEvents():
+            waitForClients(eventSocket, 1)
+            events.extend(watcher.poll(force=True))
+        received = receiveEvents(eventSocket.address, socket.AF_INET, 2, sendEvents)
+        assert received == events
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available")
+def test_eventSocketOnUnixSocket(tmp_path):
+    path = str(tmp_path / "watcher.sock")
+    with EventSocket(path) as eventSocket:
+        def sendEvents():
+            waitForClients(eventSocket, 1)
+            eventSocket({"event": "trending", "modId": 7})
+        assert receiveEvents(path, socket.AF_UNIX, 1, sendEvents) == [{"event": "trending", "modId": 7}]
+
+def test_rejectsInvalidArguments(nexusMods):
+    with pytest.raises(Exception, match="Valid games"):
+        ModWatcher(nexusMods, [])
+    with pytest.raises(Exception, match="Valid feeds"):
+        ModWatcher(nexusMods, [gameDomain], feeds=["popular"])
+    with pytest.raises(Exception, match="Valid max interval"):
+        ModWatcher(nexusMods, [gameDomain], minInterval=60, maxInterval=30)
+    with pytest.raises(Exception, match="Valid address"):
+        EventSocket("")
@@ -0,0 +1,51 @@
+# test_NexusApi.py
+
+# Tests of the argument checks of NexusApi against a FakeNexusServer.
+
+# Imports Required Dependencies
+import pytest
+
+from Engine import NexusApi, RateLimiter, ResponseCache
+
+gameDomain = "baldursgate3"
+
+def test_rejectsInvalidModIds(fakeServer):
+    with NexusApi(fakeServer.apiKey, apiUrl=fakeServer.url) as nexusMods:
+        for method in (nexusMods.getMod, nexusMods.getModFiles, nexusMods.endorseMod, nexusMods.abstainMod):
+            for id in (0, -1, "5"):
+                with pytest.raises(Exception, match="Valid mod ID"):
+                    method(gameDomain, id)
+        assert nexusMods.getMod(gameDomain, 1).status_code == 200
+
+class EventRecorder:
+    """Request hook that keeps the (endpoint, attempt, status code) of every response."""
+    def __init__(self):
+        self.events = []
+    
+    def onResponse(self, event):
+        self.events.append((event.endpoint, event.attempt, event.response.status_code if (event.response is not None) else None))
+
+def test_validationIsSentThroughTheHooksAndRetried(fakeServer):
+    fakeServer.failRequests(503)
+    recorder = EventRecorder()
+    with NexusApi(fakeServer.apiKey, apiUrl=fakeServer.url, rateLimiter=RateLimiter(baseBackoff=0.01), hooks=[recorder]) as nexusMods:
+        assert recorder.events == [("validate", 0, 503), ("validate", 1, 200)]
+        assert nexusMods.getLastResponse() is None
+
+def test_validationKeepsTheReservationsOfASharedRateLimiter(fakeServer):
+    # A request of another user of the limiter (e.g. a worker process) is in flight while the key is validated
+    rateLimiter = RateLimiter()
+    rateLimiter.reserve()
+    with NexusApi(fakeServer.apiKey, apiUrl=fakeServer.url, rateLimiter=rateLimiter):
+        remaining = rateLimiter.getRemaining()
+    assert remaining["budget"] == max(remaining["dailyRemaining"], remaining["hourlyRemaining"]) - 1
+
+def test_cachedValidationIsLeftOutOfTheCacheStats(fakeServer, tmp_path):
+    with ResponseCache(str(tmp_path / "responses.db")) as cache:
+        for _ in range(2):
+            with NexusApi(fakeServer.apiKey, apiUrl=fakeServer.url, cache=cache, keyValidation="cached") as nexusMods:
+                nexusMods.getMod(gameDomain, 1)
+        # Only the two lookups of the mod are counted
+        assert cache.getStats() == {"hits": 1,"misses": 1,"revalidated": 0,"changed": 0,"requestsSaved": 1}
+    # The key was validated once, the second object used the cached validation
+    assert fakeServer.getStats()["endpoints"]["validate"] == 1
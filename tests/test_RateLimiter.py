@@ -0,0 +1,72 @@
+# test_RateLimiter.py
+
+# Tests of the pacing of RateLimiter, fed with the rate limit information of made-up responses.
+
+# Imports Required Dependencies
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from Engine import RateLimiter
+
+def rateLimit(dailyRemaining: int, hourlyRemaining: int, dailyReset: float = 72000, hourlyReset: float = 1800, dailyLimit: int = 20000, hourlyLimit: int = 100) -> dict:
+    """Returns the rate limit information of a response, with the reset times given in seconds from now."""
+    resetTime = lambda seconds: datetime.fromtimestamp(time.time() + seconds, timezone.utc).isoformat()
+    return {"hourlyLimit": hourlyLimit,"hourlyRemaining": hourlyRemaining,"hourlyReset": resetTime(hourlyReset),"dailyLimit": dailyLimit,"dailyRemaining": dailyRemaining,"dailyReset": resetTime(dailyReset)}
+
+def reserveMany(rateLimiter: RateLimiter, count: int) -> list:
+    return [rateLimiter.reserve() for _ in range(count)]
+
+def test_notPacedWhilePlentyRemains():
+    rateLimiter = RateLimiter()
+    rateLimiter.update(rateLimit(5000, 100))
+    assert reserveMany(rateLimiter, 100) == [0.0] * 100
+
+def test_notPacedWhileTheHourlyAllowanceRemains():
+    # The hourly allowance takes over once the daily quota is used up
+    rateLimiter = RateLimiter()
+    rateLimiter.update(rateLimit(10, 100))
+    assert rateLimiter.getRemaining()["budget"] == 100
+    assert reserveMany(rateLimiter, 50) == [0.0] * 50
+
+def test_endOfDailyQuotaIsSpreadUpToTheHourlyReset():
+    rateLimiter = RateLimiter(burst=10)
+    rateLimiter.update(rateLimit(40, 20, dailyReset=72000, hourlyReset=1800))
+    waits = reserveMany(rateLimiter, 12)
+    # The burst goes at once, then 40 requests over the 1800 seconds until the hourly reset, not over the 20 hours left of the day
+    assert waits[:10] == [0.0] * 10
+    assert waits[10] == pytest.approx(45, rel=0.05)
+    assert waits[11] == pytest.approx(90, rel=0.05)
+
+def test_hourlyQuotaIsPacedOnceTheDailyQuotaIsUsedUp():
+    rateLimiter = RateLimiter(burst=10)
+    rateLimiter.update(rateLimit(0, 30, hourlyReset=900))
+    assert rateLimiter.getRemaining()["budget"] == 30
+    waits = reserveMany(rateLimiter, 11)
+    assert waits[10] == pytest.approx(30, rel=0.05)
+
+def test_dailyResetIsUsedWithoutHourlyAllowance():
+    rateLimiter = RateLimiter(burst=10)
+    rateLimiter.update(rateLimit(40, 0, dailyReset=400, hourlyReset=10, hourlyLimit=0))
+    waits = reserveMany(rateLimiter, 11)
+    # The hourly reset restores nothing, so the daily quota is spread up to its own reset
+    assert waits[10] == pytest.approx(10, rel=0.05)
+
+def test_queuedRequestsAreSpreadAfterTheReset():
+    rateLimiter = RateLimiter(burst=10)
+    rateLimiter.update(rateLimit(0, 0, hourlyReset=100))
+    waits = reserveMany(rateLimiter, 25)
+    # The first burst requests are sent at the reset, then 10 more every second
+    assert waits[0] == pytest.approx(100, abs=1)
+    assert [round(wait - waits[0]) for wait in waits] == [0] * 10 + [1] * 10 + [2] * 5
+    assert rateLimiter.estimateWait() == pytest.approx(waits[0] + 2, abs=0.5)
+    
+    # Once the new quota is reported, requests are no longer held back
+    rateLimiter.update(rateLimit(0, 100, hourlyReset=3600))
+    assert rateLimiter.reserve() == 0.0
+
+def test_queuedRequestsAreSpreadWhenTheResetIsUnknown():
+    rateLimiter = RateLimiter(burst=2)
+    rateLimiter.update({"hourlyRemaining": 0,"dailyRemaining": 0})
+    assert reserveMany(rateLimiter, 5) == [0.0, 0.0, 1.0, 1.0, 2.0]
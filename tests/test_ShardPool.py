@@ -0,0 +1,33 @@
+# test_ShardPool.py
+
+# Tests of ShardPool (worker processes sharing one rate budget) against a FakeNexusServer.
+
+# Imports Required Dependencies
+import pytest
+
+from Engine import NexusApi, ShardPool
+
+gameDomain = "baldursgate3"
+
+@pytest.mark.parametrize("fields", [ShardPool.modFields, None])
+def test_getModsKeepsInputOrder(fakeServer, fields):
+    ids = [5, 1000, 3, 1, 4, 2]
+    with ShardPool(fakeServer.apiKey, processes=2, shardSize=2, fields=fields, apiUrl=fakeServer.url) as shardPool:
+        results = shardPool.getMods(gameDomain, ids)
+    assert [result.id for result in results] == ids
+    assert results[1].response.status_code == 404
+    for result in results:
+        if (result.id != 1000):
+            modJson = fakeServer.getModJson(gameDomain, result.id)
+            expected = modJson if (fields is None) else {field: modJson[field] for field in fields}
+            assert result.response.json() == expected
+
+def test_keyPoolSharesTheBudgetOfTheWorkers(fakeServer):
+    with ShardPool(fakeServer.apiKey, processes=2, apiUrl=fakeServer.url) as shardPool:
+        with NexusApi(shardPool.getKeyPool(), apiUrl=fakeServer.url) as nexusMods:
+            # The quota reported to the NexusApi object is seen by the workers, and the other way round
+            validated = nexusMods.getRateLimit()["dailyRemaining"]
+            assert shardPool.getRateLimit()["dailyRemaining"] == validated
+            shardPool.getMods(gameDomain, [1, 2, 3], maxConcurrency=1)
+            assert nexusMods.getRateLimit()["dailyRemaining"] == validated - 3
+    assert shardPool.getRateLimit() is None